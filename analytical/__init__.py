@@ -23,7 +23,7 @@ from .formulas.formulas import (
     paper_formula_9_mean_access_delay,
     paper_formula_10_collision_probability,
 )
-from .theoretical.theoretical import theoretical_calculation
+from .theoretical.theoretical import theoretical_calculation, theoretical_calculation_with_arrivals
 
 __all__ = [
     'paper_formula_1_pk_probability',
@@ -37,5 +37,6 @@ __all__ = [
     'paper_formula_9_mean_access_delay',
     'paper_formula_10_collision_probability',
     'theoretical_calculation',
+    'theoretical_calculation_with_arrivals',
 ]
 
@@ -4,23 +4,36 @@ Figure 分析模組
 運行各 Figure 的解析計算並保存結果。
 
 Input: config 配置, formulas 公式模組
-Output: run_figure*_analysis(), load_figure*_results()
+Output: run_figure*_analysis(), load_figure*_results(), load_figure1_stream()
 Position: 解析計算的執行層
 
 注意：一旦此文件被更新，請同步更新：
 - 項目根目錄 README.md
 """
 
-from .figure1_analysis import run_figure1_analysis, load_figure1_results
-from .figure2_analysis import run_figure2_analysis, load_figure2_results
-from .figure345_analysis import run_figure345_analysis, load_figure345_results
+import importlib
 
-__all__ = [
-    'run_figure1_analysis',
-    'run_figure2_analysis', 
-    'run_figure345_analysis',
-    'load_figure1_results',
-    'load_figure2_results',
-    'load_figure345_results',
-]
+# 導出名稱 -> 定義它的子模組（按需導入：工作進程只導入執行任務的 figure1_analysis，不連帶 Figure 2 / 3-5）
+_EXPORTS = {
+    'run_figure1_analysis': '.figure1_analysis',
+    'run_figure2_analysis': '.figure2_analysis',
+    'run_figure345_analysis': '.figure345_analysis',
+    'load_figure1_results': '.figure1_analysis',
+    'load_figure2_results': '.figure2_analysis',
+    'load_figure345_results': '.figure345_analysis',
+    'load_figure1_stream': '.figure1_analysis',
+}
 
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -3,8 +3,25 @@ Figure 1 解析數據生成
 
 NS,1/N & NC,1/N vs M/N - 分析模型 vs 近似公式
 
+精確公式的計算量隨 M 急劇增長（exact_formula_work()），按 M 升序逐個提交會讓最重的任務最後才開始。
+_parallel_compute 給定各任務的預估成本時按成本降序提交（最長任務優先，LPT），
+把輕量任務合併成批次以減少 future 與 IPC 開銷，並報告並行效率；預估牆鐘與進度的剩餘時間
+按同一成本模型計算（simulation/core/cost_model.py，dry-run 預估亦同）。
+
+時間預算：exact_budget_sec 給定時，預估耗時超出預算的點不做分割枚舉，改用 exact_fallback：
+- closed_form: 期望值閉式解（與公式 2、3 相同的精確值，O(1)）
+- approx_only: 只輸出近似公式，解析欄位為 NaN
+結果表的 analytical_method 欄記錄每個點實際使用的方法（enumeration / closed_form / approx_only）。
+
+每個 (N, M) 點完成後追加一行到 result/stream/analytical/figure1.ndjson（stream 配置），
+load_figure1_stream() 在計算進行中或中斷後讀取已完成的點。
+
+工作進程執行本模組的 compute_single_point（forkserver 預先導入本模組）：存儲層（sqlite3、運行目錄、
+對象庫、串流）只在保存 / 讀取函數內導入，不隨工作進程啟動載入。
+
 Input: config 配置, formulas 公式模組
-Output: run_figure1_analysis(), load_figure1_results()
+Output: run_figure1_analysis(), load_figure1_results(), load_figure1_stream(), estimate_point_seconds(),
+        choose_exact_method(), plan_point_costs()
 Position: Figure 1 的解析計算核心
 
 注意：一旦此文件被更新，請同步更新：
@@ -12,12 +29,19 @@ Position: Figure 1 的解析計算核心
 """
 
 import csv
-import os
 import time
 from pathlib import Path
 from datetime import datetime
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, wait
+from simulation.core.backend import DEFAULT_BACKEND, make_executor, resolve_backend
+from simulation.core.cancellation import STOP_POLL_SEC, raise_if_stopped
+from simulation.core.cost_model import effective_workers, format_duration, makespan_seconds, remaining_seconds
+from simulation.core.cpu_planner import describe_plan, plan_workers
+from simulation.core.worker_bootstrap import DEFAULT_START_METHOD
 from ..formulas.formulas import (
+    exact_formula_work,
+    expected_collision_raos_closed_form,
+    expected_success_raos_closed_form,
     paper_formula_2_collision_raos_exact,
     paper_formula_3_success_raos_exact,
     paper_formula_4_success_approx,
@@ -27,60 +51,212 @@ from ..formulas.formulas import (
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from performance import SimpleTimer
+    from storage import StreamWriter
+
+
+# 精確公式耗時模型: 秒數 ≈ EXACT_SECONDS_PER_UNIT × exact_formula_work(M, N) + POINT_BASE_SEC（實測）
+EXACT_SECONDS_PER_UNIT = 0.25e-6
+POINT_BASE_SEC = 2e-5
+
+# 輕量任務合併成批次時，每個工作進程約分到的批次數
+BATCHES_PER_WORKER = 4
+
+# 超出時間預算的點可改用的解析方法
+EXACT_FALLBACKS = ('closed_form', 'approx_only')
+DEFAULT_EXACT_FALLBACK = 'closed_form'
+
+# 逐點串流的結果種類（result/stream/analytical/figure1.ndjson）
+STREAM_KIND = 'analytical/figure1'
+
+
+def estimate_point_seconds(M: int, N: int, method: str = 'enumeration') -> float:
+    """預估 compute_single_point(M, N, method) 的耗時（秒）"""
+    if method != 'enumeration':
+        return POINT_BASE_SEC
+    return POINT_BASE_SEC + EXACT_SECONDS_PER_UNIT * exact_formula_work(M, N)
+
+
+def choose_exact_method(M: int, N: int, budget_sec: float = None,
+                        fallback: str = DEFAULT_EXACT_FALLBACK, seconds: float = None) -> str:
+    """
+    按時間預算選擇解析值的計算方法
+
+    Args:
+        budget_sec: 單點的時間預算（秒，None 表示不限制）
+        fallback: 超出預算時的方法 'closed_form' | 'approx_only'
+        seconds: 已算好的 estimate_point_seconds(M, N)（None 時在此計算）
+
+    Returns:
+        str: 'enumeration'（公式 2、3 的分割枚舉）或 fallback
+    """
+    if fallback not in EXACT_FALLBACKS:
+        raise ValueError(f"未知的精確公式退回方式: {fallback}（支援: {', '.join(EXACT_FALLBACKS)}）")
+    if budget_sec is None:
+        return 'enumeration'
+    if seconds is None:
+        seconds = estimate_point_seconds(M, N)
+    return 'enumeration' if seconds <= budget_sec else fallback
+
+
+def plan_point_costs(M_range, N: int, budget_sec: float = None,
+                     fallback: str = DEFAULT_EXACT_FALLBACK) -> tuple:
+    """
+    一個 N 值下每個 M 點的解析方法與預估耗時
+
+    exact_formula_work 是 O(N·M) 的求和，每個點只算一次，方法選擇與批次規劃共用同一份成本。
+
+    Returns:
+        tuple: (方法列表, 預估秒數列表)，與 M_range 順序相同
+    """
+    methods = []
+    costs = []
+    for M in M_range:
+        seconds = estimate_point_seconds(M, N)
+        method = choose_exact_method(M, N, budget_sec, fallback, seconds)
+        methods.append(method)
+        costs.append(seconds if method == 'enumeration' else estimate_point_seconds(M, N, method))
+    return methods, costs
+
+
+def _plan_batches(costs: list, n_jobs: int) -> list:
+    """
+    按成本規劃提交順序與批次（最長任務優先）
+
+    任務按成本降序排列；成本達到 總成本 / (n_jobs × BATCHES_PER_WORKER) 的任務單獨提交，
+    其餘輕量任務依序合併，直到批次成本達到該門檻。
+
+    Returns:
+        list: [[任務索引, ...], ...]，按提交順序排列（批次成本大致降序）
+    """
+    order = sorted(range(len(costs)), key=lambda idx: costs[idx], reverse=True)
+    target = sum(costs) / (n_jobs * BATCHES_PER_WORKER)
+    batches = []
+    current, current_cost = [], 0.0
+    for idx in order:
+        if costs[idx] >= target:
+            batches.append([idx])
+            continue
+        current.append(idx)
+        current_cost += costs[idx]
+        if current_cost >= target:
+            batches.append(current)
+            current, current_cost = [], 0.0
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _run_task_batch(func, args_batch: list) -> tuple:
+    """在工作進程中依序執行一個批次，返回 (結果列表, 耗時秒數)"""
+    start_time = time.perf_counter()
+    results = [func(*args) for args in args_batch]
+    return results, time.perf_counter() - start_time
 
 
 def _get_actual_n_jobs(n_jobs: int) -> int:
-    """獲取實際使用的 CPU 核心數"""
-    if n_jobs == -1:
-        return os.cpu_count() or 1
-    return n_jobs
+    """獲取實際使用的並行數（-1 時按 CPU 親和性與 cgroup 配額計算，見 cpu_planner.py）"""
+    return plan_workers(n_jobs)['workers']
 
 
-def _parallel_compute(func, args_list, n_jobs: int, desc: str = "計算中"):
+def _parallel_compute(func, args_list, n_jobs: int, desc: str = "計算中",
+                      backend: str = DEFAULT_BACKEND, start_method: str = DEFAULT_START_METHOD,
+                      pin_workers: bool = False, costs: list = None, on_result=None):
     """
     並行計算輔助函數
     
-    使用 ProcessPoolExecutor 實現多進程並行計算，可充分利用多核 CPU。
+    默認使用 ProcessPoolExecutor 實現多進程並行計算，可充分利用多核 CPU；
+    在無 GIL 的 Python 構建上（backend='auto'）改用線程池，免去進程啟動與 pickle 開銷。
     
     Args:
         func: 計算函數（必須是頂層函數，可被 pickle）
         args_list: 參數列表，每個元素是傳給 func 的參數元組
         n_jobs: 並行數 (-1 表示使用所有 CPU 核心)
         desc: 描述
+        backend: 執行後端 'process' | 'thread' | 'auto'
+        start_method: 進程啟動方式 'auto' | 'fork' | 'forkserver' | 'spawn'
+        pin_workers: True 時把每個工作進程綁定到一個 CPU 核心（僅進程池）
+        costs: 每個任務的預估成本（與 args_list 對應）；給定時最長任務優先提交並合併輕量任務，
+                   None 時按輸入順序逐個提交
+        on_result: 每個任務完成時調用 on_result(索引, 結果)（按完成順序；如逐點串流寫入）
     
     Returns:
         結果列表（保持輸入順序）
     """
-    actual_n_jobs = _get_actual_n_jobs(n_jobs)
+    cpu_plan = plan_workers(n_jobs, pin_workers)
+    actual_n_jobs = cpu_plan['workers']
+    backend = resolve_backend(backend)
     total_tasks = len(args_list)
-    print(f"  {desc}... (使用 {actual_n_jobs} 個進程, 共 {total_tasks} 個任務)")
+    worker_kind = '線程' if backend == 'thread' else '進程'
+    print(f"  {desc}... (使用 {actual_n_jobs} 個{worker_kind}, 共 {total_tasks} 個任務)")
+    print(f"  {describe_plan(cpu_plan, worker_kind)}")
+    
+    if costs is not None:
+        batches = _plan_batches(costs, actual_n_jobs)
+        total_cost = sum(costs)
+        # 單個最重任務決定的並行效率上限
+        bound = total_cost / (actual_n_jobs * max(max(costs), total_cost / actual_n_jobs)) if total_cost > 0 else 1.0
+        batch_costs = [sum(costs[idx] for idx in batch) for batch in batches]
+        predicted_wall = makespan_seconds(batch_costs, effective_workers(cpu_plan))
+        print(f"  調度: 最長任務優先 | {total_tasks} 個任務合併為 {len(batches)} 個批次 | "
+              f"預估總計算 {total_cost:,.1f} 秒 | 預估牆鐘 {format_duration(predicted_wall)} | "
+              f"並行效率上限 {bound:.0%}")
+    else:
+        batches = [[idx] for idx in range(total_tasks)]
     
     start_time = time.time()
     
-    # 使用 ProcessPoolExecutor 進行多進程並行
     results = [None] * total_tasks
     completed = 0
+    busy_seconds = 0.0
+    done_cost = 0.0
+    report_step = max(1, total_tasks // 10)
+    reported = 0
     
-    with ProcessPoolExecutor(max_workers=actual_n_jobs) as executor:
-        # 提交所有任務，保存 future 到索引的映射
-        future_to_idx = {
-            executor.submit(func, *args): idx 
-            for idx, args in enumerate(args_list)
+    pin_cpus = cpu_plan['affinity_cpus'] if pin_workers else None
+    with make_executor(backend, actual_n_jobs, start_method, pin_cpus=pin_cpus) as executor:
+        # 按批次順序提交（執行器先進先出，最重的批次最先開始），保存 future 到批次的映射
+        future_to_batch = {
+            executor.submit(_run_task_batch, func, [args_list[idx] for idx in batch]): batch
+            for batch in batches
         }
         
-        # 收集結果
-        for future in as_completed(future_to_idx):
-            idx = future_to_idx[future]
-            results[idx] = future.result()
-            completed += 1
-            
-            # 進度顯示（每 10% 或最後一個顯示一次）
-            if completed % max(1, total_tasks // 10) == 0 or completed == total_tasks:
-                progress = completed / total_tasks * 100
-                print(f"    進度: {completed}/{total_tasks} ({progress:.0f}%)")
+        # 收集結果：每 STOP_POLL_SEC 檢查一次停止請求（流水線後台線程收不到 Ctrl-C，見 cancellation.py），
+        # 中斷時取消尚未開始的批次
+        not_done = set(future_to_batch)
+        try:
+            while not_done:
+                raise_if_stopped()
+                done, not_done = wait(not_done, timeout=STOP_POLL_SEC, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = future_to_batch[future]
+                    batch_results, batch_seconds = future.result()
+                    for idx, result in zip(batch, batch_results):
+                        results[idx] = result
+                        if on_result is not None:
+                            on_result(idx, result)
+                    completed += len(batch)
+                    busy_seconds += batch_seconds
+                    if costs is not None:
+                        done_cost += sum(costs[idx] for idx in batch)
+                    
+                    # 進度顯示（每 10% 或最後一個顯示一次；批次可能一次跨過多個 10%）
+                    if completed // report_step > reported or completed == total_tasks:
+                        reported = completed // report_step
+                        progress = completed / total_tasks * 100
+                        eta_text = ""
+                        if costs is not None and completed < total_tasks and done_cost > 0:
+                            # 剩餘的預估成本按已完成任務的 實測 / 預估 比例修正（見 cost_model.py）
+                            eta = remaining_seconds(total_cost - done_cost, effective_workers(cpu_plan),
+                                                    busy_seconds / done_cost)
+                            eta_text = f" | 預估剩餘 {format_duration(eta)}"
+                        print(f"    進度: {completed}/{total_tasks} ({progress:.0f}%){eta_text}")
+        except KeyboardInterrupt:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
     
     elapsed = time.time() - start_time
-    print(f"  完成! 耗時: {elapsed:.2f}秒")
+    efficiency = busy_seconds / (actual_n_jobs * elapsed) if elapsed > 0 else 0.0
+    print(f"  完成! 耗時: {elapsed:.2f}秒 | 任務總耗時 {busy_seconds:.2f}秒 | 並行效率 {efficiency:.0%}")
     
     return results
 
@@ -88,8 +264,12 @@ def _parallel_compute(func, args_list, n_jobs: int, desc: str = "計算中"):
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 
 
-def compute_single_point(M, N):
-    """計算單個(M,N)點的分析模型和近似公式結果"""
+def compute_single_point(M, N, method: str = 'enumeration'):
+    """
+    計算單個(M,N)點的分析模型和近似公式結果
+    
+    method: 'enumeration'（公式 2、3）| 'closed_form'（期望值閉式解）| 'approx_only'（解析值為 NaN）
+    """
     start_time = time.time()
     
     # 處理 M=0 的邊界情況
@@ -99,8 +279,15 @@ def compute_single_point(M, N):
         N_S_approx = 0
         N_C_approx = 0
     else:
-        N_S_anal = paper_formula_3_success_raos_exact(M, N)
-        N_C_anal = paper_formula_2_collision_raos_exact(M, N)
+        if method == 'enumeration':
+            N_S_anal = paper_formula_3_success_raos_exact(M, N)
+            N_C_anal = paper_formula_2_collision_raos_exact(M, N)
+        elif method == 'closed_form':
+            N_S_anal = expected_success_raos_closed_form(M, N)
+            N_C_anal = expected_collision_raos_closed_form(M, N)
+        else:
+            N_S_anal = float('nan')
+            N_C_anal = float('nan')
         N_S_approx = paper_formula_4_success_approx(M, N)
         N_C_approx = paper_formula_5_collision_approx(M, N)
     
@@ -116,16 +303,20 @@ def run_figure1_analysis(config: dict, save_csv: bool = True, timer: 'SimpleTime
     
     Args:
         config: 配置字典
-        save_csv: 是否保存結果到 CSV
+        save_csv: 是否保存結果（列式結果表；config['export_csv'] 為 true 時同時導出 CSV）
         timer: 可選的計時器（用於記錄各 N 值的計算時間）
     
     Returns:
         結果字典
     """
+    from storage import StreamWriter, stream_path
+    
     n_values = config['n_values']
     m_over_n_max = config['m_over_n_max']
     m_start = config['m_start']
     n_jobs = config.get('n_jobs', -1)
+    exact_budget_sec = config.get('exact_budget_sec')
+    exact_fallback = config.get('exact_fallback', DEFAULT_EXACT_FALLBACK)
     
     actual_n_jobs = _get_actual_n_jobs(n_jobs)
     
@@ -134,130 +325,231 @@ def run_figure1_analysis(config: dict, save_csv: bool = True, timer: 'SimpleTime
     print(f"N 值: {n_values}")
     print(f"M 範圍: {m_start} 到 {m_over_n_max}*N")
     print(f"CPU 核心: {actual_n_jobs}")
+    budget_text = f"{exact_budget_sec:g} 秒/點，超出時 {exact_fallback}" if exact_budget_sec is not None else "不限"
+    print(f"精確公式時間預算: {budget_text}")
+    use_stream = config.get('stream', True)
+    print(f"逐點串流: {stream_path(STREAM_KIND) if use_stream else '停用'}")
     print("=" * 60)
     
     results = {}
+    stream = StreamWriter(
+        STREAM_KIND, {'n_values': n_values}, fsync=config.get('stream_fsync', False)
+    ) if use_stream else None
     
-    for N in n_values:
-        print(f"\n正在計算 N={N} 的數據...")
-        
-        # 論文: integer valued of M ranging from 1 to 10N
-        M_range = list(range(m_start, m_over_n_max * N + 1))
-        print(f"  M 範圍: {m_start} 到 {m_over_n_max * N}，共 {len(M_range)} 個數據點")
-        
-        # 記錄每個 N 的計算時間
-        n_start_time = time.time()
-        
-        args_list = [(M, N) for M in M_range]
-        results_list = _parallel_compute(
-            compute_single_point, args_list, n_jobs, 
-            f"計算 N={N}"
-        )
-        
-        # 記錄到計時器
-        n_elapsed = time.time() - n_start_time
-        if timer:
-            timer.record(f"N={N} 計算", n_elapsed)
-        
-        M_values = [r[0] for r in results_list]
-        analytical_N_S = [r[1] for r in results_list]
-        analytical_N_C = [r[2] for r in results_list]
-        approx_N_S = [r[3] for r in results_list]
-        approx_N_C = [r[4] for r in results_list]
-        
-        results[f'N_{N}'] = {
-            'M_values': M_values,
-            'M_over_N': [m/N for m in M_values],
-            'analytical_N_S': analytical_N_S,
-            'analytical_N_C': analytical_N_C,
-            'approx_N_S': approx_N_S,
-            'approx_N_C': approx_N_C
-        }
+    try:
+        for N in n_values:
+            results[f'N_{N}'] = _compute_figure1_n(N, config, stream, timer)
+        if stream is not None:
+            stream.finish()
+    finally:
+        if stream is not None:
+            stream.close()
     
     print("\n" + "=" * 60)
     print("Figure 1 解析計算完成!")
     print("=" * 60)
     
-    # 保存結果到 CSV
+    # 保存結果
     if save_csv:
-        save_figure1_results(results)
+        save_figure1_results(results, export_csv=config.get('export_csv', False), config=config)
     
     return results
 
 
-def save_figure1_results(results: dict):
-    """保存 Figure 1 解析結果到 CSV 文件"""
+def _compute_figure1_n(N: int, config: dict, stream: 'StreamWriter' = None, timer: 'SimpleTimer' = None) -> dict:
+    """計算一個 N 值的所有 M 點（stream 給定時每個點完成即寫入串流）"""
+    m_over_n_max = config['m_over_n_max']
+    m_start = config['m_start']
+    n_jobs = config.get('n_jobs', -1)
+    backend = config.get('backend', DEFAULT_BACKEND)
+    start_method = config.get('start_method', DEFAULT_START_METHOD)
+    pin_workers = config.get('pin_workers', False)
+    exact_budget_sec = config.get('exact_budget_sec')
+    exact_fallback = config.get('exact_fallback', DEFAULT_EXACT_FALLBACK)
+    
+    print(f"\n正在計算 N={N} 的數據...")
+    
+    # 論文: integer valued of M ranging from 1 to 10N
+    M_range = list(range(m_start, m_over_n_max * N + 1))
+    print(f"  M 範圍: {m_start} 到 {m_over_n_max * N}，共 {len(M_range)} 個數據點")
+    
+    # 記錄每個 N 的計算時間
+    n_start_time = time.time()
+    
+    methods, costs = plan_point_costs(M_range, N, exact_budget_sec, exact_fallback)
+    over_budget = [M for M, method in zip(M_range, methods) if method != 'enumeration']
+    if over_budget:
+        print(f"  ⚠ {len(over_budget)} 個點的預估耗時超出預算（M >= {over_budget[0]}，"
+              f"最長約 {estimate_point_seconds(max(over_budget), N):,.0f} 秒）→ {exact_fallback}")
+    
+    def on_result(idx, r):
+        stream.append({
+            'N': N, 'M': r[0], 'analytical_N_S': r[1], 'analytical_N_C': r[2],
+            'approx_N_S': r[3], 'approx_N_C': r[4], 'analytical_method': methods[idx],
+        })
+    
+    args_list = [(M, N, method) for M, method in zip(M_range, methods)]
+    results_list = _parallel_compute(
+        compute_single_point, args_list, n_jobs, 
+        f"計算 N={N}", backend, start_method, pin_workers, costs=costs,
+        on_result=on_result if stream is not None else None,
+    )
+    
+    # 記錄到計時器
+    n_elapsed = time.time() - n_start_time
+    if timer:
+        timer.record(f"N={N} 計算", n_elapsed)
+    
+    M_values = [r[0] for r in results_list]
+    return {
+        'M_values': M_values,
+        'M_over_N': [m/N for m in M_values],
+        'analytical_N_S': [r[1] for r in results_list],
+        'analytical_N_C': [r[2] for r in results_list],
+        'approx_N_S': [r[3] for r in results_list],
+        'approx_N_C': [r[4] for r in results_list],
+        'analytical_method': methods,
+    }
+
+
+# 結果表欄位: 鍵名 → 舊版 CSV 表頭
+FIGURE1_HEADERS = {
+    'M_values': 'M',
+    'M_over_N': 'M/N',
+    'analytical_N_S': 'analytical_N_S',
+    'analytical_N_C': 'analytical_N_C',
+    'approx_N_S': 'approx_N_S',
+    'approx_N_C': 'approx_N_C',
+    'analytical_method': 'analytical_method',
+}
+
+
+def save_figure1_results(results: dict, export_csv: bool = False, config: dict = None):
+    """
+    保存 Figure 1 解析結果（每個 N 值一張列式結果表 figure1_N{N}/），並登記到運行目錄
+    
+    Args:
+        results: 結果字典
+        export_csv: 同時導出 figure1_N{N}.csv
+        config: 運行配置（記錄其雜湊）
+    """
+    from storage import record_run, save_columns
+    
     # 創建結果目錄
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     result_dir = PROJECT_ROOT / 'result' / 'analytical' / 'figure1' / timestamp
     result_dir.mkdir(parents=True, exist_ok=True)
     
-    # 為每個 N 值保存一個 CSV 文件
+    # 為每個 N 值保存一張表
     for key, data in results.items():
         if key.startswith('N_'):
             N_value = key.split('_')[1]
-            save_path = result_dir / f"figure1_N{N_value}.csv"
-            
-            with open(save_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                # 寫入表頭
-                writer.writerow(['M', 'M/N', 'analytical_N_S', 'analytical_N_C', 'approx_N_S', 'approx_N_C'])
-                # 寫入數據
-                for i in range(len(data['M_values'])):
-                    writer.writerow([
-                        data['M_values'][i],
-                        data['M_over_N'][i],
-                        data['analytical_N_S'][i],
-                        data['analytical_N_C'][i],
-                        data['approx_N_S'][i],
-                        data['approx_N_C'][i]
-                    ])
-            
-            print(f"✓ 解析結果已保存: {save_path}")
-
-
-def load_figure1_results() -> dict:
-    """從最新的 CSV 文件讀取 Figure 1 解析結果"""
-    result_base = PROJECT_ROOT / 'result' / 'analytical' / 'figure1'
-    
-    if not result_base.exists():
-        return None
+            table_dir = result_dir / f"figure1_N{N_value}"
+            save_columns(
+                table_dir, {column: data[column] for column in FIGURE1_HEADERS},
+                headers=FIGURE1_HEADERS, integer=('M_values',),
+                csv_path=table_dir.with_suffix('.csv') if export_csv else None,
+            )
+            print(f"✓ 解析結果已保存: {table_dir}")
     
-    # 找到最新的時間戳目錄
-    timestamp_dirs = sorted(result_base.iterdir(), reverse=True)
-    if not timestamp_dirs:
-        return None
+    n_values = sorted(int(key.split('_')[1]) for key in results if key.startswith('N_'))
+    record_run('analytical/figure1', result_dir, {'n_values': n_values}, config=config)
+
+
+def _load_figure1_csv(csv_file: Path) -> dict:
+    """讀取舊版 CSV 格式的 Figure 1 結果"""
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        data = {column: [] for column in FIGURE1_HEADERS}
+        for row in reader:
+            data['M_values'].append(int(row['M']))
+            data['M_over_N'].append(float(row['M/N']))
+            data['analytical_N_S'].append(float(row['analytical_N_S']))
+            data['analytical_N_C'].append(float(row['analytical_N_C']))
+            data['approx_N_S'].append(float(row['approx_N_S']))
+            data['approx_N_C'].append(float(row['approx_N_C']))
+            # 舊版 CSV 沒有此欄，全部為分割枚舉
+            data['analytical_method'].append(row.get('analytical_method') or 'enumeration')
+    return data
+
+
+def _read_figure1_table(source: Path) -> dict:
+    """讀取一張 Figure 1 結果表（列式表或舊版 CSV）"""
+    from storage import is_columnar_table, load_columns
+    return load_columns(source)[0] if is_columnar_table(source) else _load_figure1_csv(source)
+
+
+def load_figure1_results(n_values: list = None) -> dict:
+    """
+    從運行目錄中最新的匹配運行讀取 Figure 1 解析結果
+    （列式表內存映射讀取；舊版目錄讀取 CSV；同一進程中重複讀取返回快取的唯讀陣列）
+    
+    Args:
+        n_values: 要求的 N 值列表（None 表示不限）
+    """
+    from storage import find_latest_run, is_columnar_table, load_cached
     
-    latest_dir = timestamp_dirs[0]
+    latest_dir = find_latest_run('analytical/figure1', n_values=sorted(n_values) if n_values else None)
+    if latest_dir is None:
+        return None
     print(f"✓ 讀取最新數據: {latest_dir}")
     
     results = {}
     
-    # 讀取所有 CSV 文件
-    for csv_file in latest_dir.glob('figure1_N*.csv'):
-        N_value = csv_file.stem.split('_N')[1]
+    tables = [path for path in latest_dir.glob('figure1_N*') if is_columnar_table(path)]
+    sources = tables or list(latest_dir.glob('figure1_N*.csv'))
+    for source in sources:
+        N_value = source.stem.split('_N')[1]
         key = f'N_{N_value}'
-        
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            data = {
-                'M_values': [],
-                'M_over_N': [],
-                'analytical_N_S': [],
-                'analytical_N_C': [],
-                'approx_N_S': [],
-                'approx_N_C': [],
-            }
-            for row in reader:
-                data['M_values'].append(int(row['M']))
-                data['M_over_N'].append(float(row['M/N']))
-                data['analytical_N_S'].append(float(row['analytical_N_S']))
-                data['analytical_N_C'].append(float(row['analytical_N_C']))
-                data['approx_N_S'].append(float(row['approx_N_S']))
-                data['approx_N_C'].append(float(row['approx_N_C']))
-            
-            results[key] = data
-            print(f"  ✓ 讀取 N={N_value}: {len(data['M_values'])} 個數據點")
+        data = load_cached(source, _read_figure1_table)
+        results[key] = data
+        print(f"  ✓ 讀取 N={N_value}: {len(data['M_values'])} 個數據點")
     
     return results if results else None
 
+
+def _read_figure1_stream(path: Path) -> dict:
+    """由串流文件組成與 load_figure1_results 相同佈局的結果字典（各 N 按 M 排序）"""
+    from storage import read_stream
+    stream = read_stream(path)
+    if stream is None:
+        return None
+    _, records, complete = stream
+    points = {}
+    for record in records:
+        points.setdefault(record['N'], {})[record['M']] = record
+    results = {}
+    for N in sorted(points):
+        ordered = [points[N][M] for M in sorted(points[N])]
+        results[f'N_{N}'] = {
+            'M_values': [record['M'] for record in ordered],
+            'M_over_N': [record['M'] / N for record in ordered],
+            'analytical_N_S': [record['analytical_N_S'] for record in ordered],
+            'analytical_N_C': [record['analytical_N_C'] for record in ordered],
+            'approx_N_S': [record['approx_N_S'] for record in ordered],
+            'approx_N_C': [record['approx_N_C'] for record in ordered],
+            'analytical_method': [record['analytical_method'] for record in ordered],
+        }
+    return {'results': results, 'complete': complete}
+
+
+def load_figure1_stream() -> dict:
+    """
+    讀取正在進行（或中斷、已完成）的 Figure 1 解析計算的逐點串流
+
+    Returns:
+        與 load_figure1_results 相同佈局的結果字典（只含已完成的點），沒有串流時返回 None
+    """
+    from storage import load_cached, stream_path
+    
+    path = stream_path(STREAM_KIND)
+    if not path.is_file():
+        return None
+    stream = load_cached(path, _read_figure1_stream)
+    if stream is None or not stream['results']:
+        return None
+    status = '已完成' if stream['complete'] else '進行中'
+    print(f"✓ 讀取逐點串流（{status}）: {path}")
+    for key, data in stream['results'].items():
+        print(f"  ✓ 讀取 {key.replace('_', '=')}: {len(data['M_values'])} 個數據點")
+    return dict(stream['results'])
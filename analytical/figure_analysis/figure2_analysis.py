@@ -17,6 +17,7 @@ Position: Figure 2 的誤差分析核心
 import csv
 from pathlib import Path
 from datetime import datetime
+from storage import find_latest_run, is_columnar_table, load_cached, load_columns, record_run, save_columns
 from .figure1_analysis import run_figure1_analysis, load_figure1_results
 
 # 可選的計時器支持
@@ -40,7 +41,7 @@ def run_figure2_analysis(config: dict, save_csv: bool = True, fig1_data: dict =
     
     Args:
         config: 配置字典
-        save_csv: 是否保存結果到 CSV
+        save_csv: 是否保存結果（列式結果表；config['export_csv'] 為 true 時同時導出 CSV）
         fig1_data: 可選，直接傳入 Figure 1 的計算結果，避免重複運算
     
     Returns:
@@ -59,7 +60,7 @@ def run_figure2_analysis(config: dict, save_csv: bool = True, fig1_data: dict =
     else:
         # 嘗試讀取已保存的結果
         print("\n嘗試讀取已保存的 Figure 1 結果...")
-        fig1_data = load_figure1_results()
+        fig1_data = load_figure1_results(n_values=n_values)
         
         if fig1_data is not None:
             # 驗證讀取的數據是否包含所需的 N 值
@@ -122,93 +123,100 @@ def run_figure2_analysis(config: dict, save_csv: bool = True, fig1_data: dict =
     print("Figure 2 解析計算完成!")
     print("=" * 60)
     
-    # 保存結果到 CSV
+    # 保存結果
     if save_csv:
-        save_figure2_results(error_results)
+        save_figure2_results(error_results, export_csv=config.get('export_csv', False), config=config)
     
     return error_results
 
 
-def save_figure2_results(results: dict):
-    """保存 Figure 2 解析結果到 CSV 文件"""
+# 結果表欄位: 鍵名 → 舊版 CSV 表頭
+FIGURE2_HEADERS = {
+    'M_values': 'M',
+    'M_over_N': 'M/N',
+    'analytical_N_S': 'analytical_N_S',
+    'analytical_N_C': 'analytical_N_C',
+    'approx_N_S': 'approx_N_S',
+    'approx_N_C': 'approx_N_C',
+    'N_S_error': 'N_S_error(%)',
+    'N_C_error': 'N_C_error(%)',
+}
+
+
+def save_figure2_results(results: dict, export_csv: bool = False, config: dict = None):
+    """
+    保存 Figure 2 解析結果（每個 N 值一張列式結果表 figure2_N{N}/），並登記到運行目錄
+    
+    Args:
+        results: 結果字典
+        export_csv: 同時導出 figure2_N{N}.csv
+        config: 運行配置（記錄其雜湊）
+    """
     # 創建結果目錄
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     result_dir = PROJECT_ROOT / 'result' / 'analytical' / 'figure2' / timestamp
     result_dir.mkdir(parents=True, exist_ok=True)
     
-    # 為每個 N 值保存一個 CSV 文件
+    # 為每個 N 值保存一張表
     for key, data in results.items():
         if key.startswith('N_'):
             N_value = key.split('_')[1]
-            save_path = result_dir / f"figure2_N{N_value}.csv"
-            
-            with open(save_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                # 寫入表頭
-                writer.writerow(['M', 'M/N', 'analytical_N_S', 'analytical_N_C', 
-                                'approx_N_S', 'approx_N_C', 'N_S_error(%)', 'N_C_error(%)'])
-                # 寫入數據
-                for i in range(len(data['M_values'])):
-                    writer.writerow([
-                        data['M_values'][i],
-                        data['M_over_N'][i],
-                        data['analytical_N_S'][i],
-                        data['analytical_N_C'][i],
-                        data['approx_N_S'][i],
-                        data['approx_N_C'][i],
-                        data['N_S_error'][i],
-                        data['N_C_error'][i]
-                    ])
-            
-            print(f"✓ 解析結果已保存: {save_path}")
+            table_dir = result_dir / f"figure2_N{N_value}"
+            save_columns(
+                table_dir, {column: data[column] for column in FIGURE2_HEADERS},
+                headers=FIGURE2_HEADERS, integer=('M_values',),
+                csv_path=table_dir.with_suffix('.csv') if export_csv else None,
+            )
+            print(f"✓ 解析結果已保存: {table_dir}")
+    
+    n_values = sorted(int(key.split('_')[1]) for key in results if key.startswith('N_'))
+    record_run('analytical/figure2', result_dir, {'n_values': n_values}, config=config)
 
 
-def load_figure2_results() -> dict:
-    """從最新的 CSV 文件讀取 Figure 2 解析結果"""
-    result_base = PROJECT_ROOT / 'result' / 'analytical' / 'figure2'
-    
-    if not result_base.exists():
-        return None
+def _load_figure2_csv(csv_file: Path) -> dict:
+    """讀取舊版 CSV 格式的 Figure 2 結果"""
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        data = {column: [] for column in FIGURE2_HEADERS}
+        for row in reader:
+            data['M_values'].append(int(row['M']))
+            data['M_over_N'].append(float(row['M/N']))
+            data['analytical_N_S'].append(float(row['analytical_N_S']))
+            data['analytical_N_C'].append(float(row['analytical_N_C']))
+            data['approx_N_S'].append(float(row['approx_N_S']))
+            data['approx_N_C'].append(float(row['approx_N_C']))
+            data['N_S_error'].append(float(row['N_S_error(%)']))
+            data['N_C_error'].append(float(row['N_C_error(%)']))
+    return data
+
+
+def _read_figure2_table(source: Path) -> dict:
+    """讀取一張 Figure 2 結果表（列式表或舊版 CSV）"""
+    return load_columns(source)[0] if is_columnar_table(source) else _load_figure2_csv(source)
+
+
+def load_figure2_results(n_values: list = None) -> dict:
+    """
+    從運行目錄中最新的匹配運行讀取 Figure 2 解析結果
+    （列式表內存映射讀取；舊版目錄讀取 CSV；同一進程中重複讀取返回快取的唯讀陣列）
     
-    # 找到最新的時間戳目錄
-    timestamp_dirs = sorted(result_base.iterdir(), reverse=True)
-    if not timestamp_dirs:
+    Args:
+        n_values: 要求的 N 值列表（None 表示不限）
+    """
+    latest_dir = find_latest_run('analytical/figure2', n_values=sorted(n_values) if n_values else None)
+    if latest_dir is None:
         return None
-    
-    latest_dir = timestamp_dirs[0]
     print(f"✓ 讀取最新數據: {latest_dir}")
     
     results = {}
     
-    # 讀取所有 CSV 文件
-    for csv_file in latest_dir.glob('figure2_N*.csv'):
-        N_value = csv_file.stem.split('_N')[1]
+    tables = [path for path in latest_dir.glob('figure2_N*') if is_columnar_table(path)]
+    sources = tables or list(latest_dir.glob('figure2_N*.csv'))
+    for source in sources:
+        N_value = source.stem.split('_N')[1]
         key = f'N_{N_value}'
-        
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            data = {
-                'M_values': [],
-                'M_over_N': [],
-                'analytical_N_S': [],
-                'analytical_N_C': [],
-                'approx_N_S': [],
-                'approx_N_C': [],
-                'N_S_error': [],
-                'N_C_error': [],
-            }
-            for row in reader:
-                data['M_values'].append(int(row['M']))
-                data['M_over_N'].append(float(row['M/N']))
-                data['analytical_N_S'].append(float(row['analytical_N_S']))
-                data['analytical_N_C'].append(float(row['analytical_N_C']))
-                data['approx_N_S'].append(float(row['approx_N_S']))
-                data['approx_N_C'].append(float(row['approx_N_C']))
-                data['N_S_error'].append(float(row['N_S_error(%)']))
-                data['N_C_error'].append(float(row['N_C_error(%)']))
-            
-            results[key] = data
-            print(f"  ✓ 讀取 N={N_value}: {len(data['M_values'])} 個數據點")
+        data = load_cached(source, _read_figure2_table)
+        results[key] = data
+        print(f"  ✓ 讀取 N={N_value}: {len(data['M_values'])} 個數據點")
     
     return results if results else None
-
@@ -21,6 +21,7 @@ import csv
 from pathlib import Path
 from datetime import datetime
 
+from storage import find_latest_run, is_columnar_table, load_cached, load_columns, record_run, save_columns
 from ..theoretical.theoretical import theoretical_calculation
 
 # 可選的計時器支持
@@ -38,7 +39,7 @@ def run_figure345_analysis(config: dict, save_csv: bool = True, timer: 'SimpleTi
     
     Args:
         config: 配置字典
-        save_csv: 是否保存結果到 CSV
+        save_csv: 是否保存結果（列式結果表；config['export_csv'] 為 true 時同時導出 CSV）
     
     Returns:
         結果字典，包含 P_S, T_a, P_C 三個指標
@@ -49,6 +50,9 @@ def run_figure345_analysis(config: dict, save_csv: bool = True, timer: 'SimpleTi
     N_stop = config['N_stop']
     N_step = config['N_step']
     N_range = range(N_start, N_stop, N_step)
+    acb_config = config.get('acb') or {}
+    barring_factor = acb_config.get('barring_factor', 1.0)
+    barring_time = acb_config.get('barring_time', 0)
     
     print("=" * 70)
     print("Figure 3, 4, 5 合併解析計算")
@@ -58,6 +62,8 @@ def run_figure345_analysis(config: dict, save_csv: bool = True, timer: 'SimpleTi
     print("=" * 70)
     print(f"M = {M}, I_max = {I_max}")
     print(f"N 範圍: {N_start} 到 {N_stop-1}")
+    if barring_factor < 1.0:
+        print(f"ACB: barring_factor={barring_factor}, barring_time={barring_time}")
     print("=" * 70)
     
     N_values = []
@@ -66,7 +72,7 @@ def run_figure345_analysis(config: dict, save_csv: bool = True, timer: 'SimpleTi
     P_C_values = []
     
     for N in N_range:
-        P_S, T_a, P_C, N_s, K = theoretical_calculation(M, N, I_max)
+        P_S, T_a, P_C, N_s, K = theoretical_calculation(M, N, I_max, barring_factor, barring_time)
         N_values.append(N)
         P_S_values.append(P_S)
         T_a_values.append(T_a)
@@ -86,89 +92,99 @@ def run_figure345_analysis(config: dict, save_csv: bool = True, timer: 'SimpleTi
     print("Figure 3, 4, 5 合併解析計算完成!")
     print("=" * 70)
     
-    # 保存結果到 CSV
+    # 保存結果
     if save_csv:
-        save_figure345_results(results)
+        save_figure345_results(results, export_csv=config.get('export_csv', False), config=config)
     
     return results
 
 
-def save_figure345_results(results: dict):
-    """保存 Figure 3, 4, 5 合併解析結果到 CSV 文件"""
+# 結果表欄位: 鍵名 → 舊版 CSV 表頭（M、I_max 為表級屬性）
+FIGURE345_HEADERS = {
+    'N_values': 'N',
+    'P_S_values': 'P_S',
+    'T_a_values': 'T_a',
+    'P_C_values': 'P_C',
+}
+
+
+def save_figure345_results(results: dict, export_csv: bool = False, config: dict = None):
+    """
+    保存 Figure 3, 4, 5 合併解析結果（列式結果表 figure345_analytical/），並登記到運行目錄
+    
+    Args:
+        results: 結果字典
+        export_csv: 同時導出 figure345_analytical.csv
+        config: 運行配置（記錄其雜湊）
+    """
     # 創建結果目錄
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     result_dir = PROJECT_ROOT / 'result' / 'analytical' / 'figure345' / timestamp
     result_dir.mkdir(parents=True, exist_ok=True)
     
-    save_path = result_dir / "figure345_analytical.csv"
-    
-    with open(save_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        # 寫入表頭
-        writer.writerow(['N', 'P_S', 'T_a', 'P_C', 'M', 'I_max'])
-        # 寫入數據
-        M = results['M']
-        I_max = results['I_max']
-        for i in range(len(results['N_values'])):
-            writer.writerow([
-                results['N_values'][i],
-                results['P_S_values'][i],
-                results['T_a_values'][i],
-                results['P_C_values'][i],
-                M,
-                I_max
-            ])
-    
-    print(f"✓ 合併解析結果已保存: {save_path}")
-
-
-def load_figure345_results() -> dict:
+    table_dir = result_dir / "figure345_analytical"
+    save_columns(
+        table_dir, {column: results[column] for column in FIGURE345_HEADERS},
+        attrs={'M': results['M'], 'I_max': results['I_max']}, headers=FIGURE345_HEADERS, integer=('N_values',),
+        csv_path=table_dir.with_suffix('.csv') if export_csv else None,
+    )
+    
+    record_run('analytical/figure345', result_dir, {
+        'M': results['M'],
+        'I_max': results['I_max'],
+        'N_min': min(results['N_values'], default=None),
+        'N_max': max(results['N_values'], default=None),
+    }, config=config)
+    
+    print(f"✓ 合併解析結果已保存: {table_dir}")
+
+
+def _load_figure345_csv(csv_path: Path) -> dict:
+    """讀取舊版 CSV 格式的 Figure 3, 4, 5 合併解析結果"""
+    results = {column: [] for column in FIGURE345_HEADERS}
+    results['M'] = None
+    results['I_max'] = None
+    
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            results['N_values'].append(int(row['N']))
+            results['P_S_values'].append(float(row['P_S']))
+            results['T_a_values'].append(float(row['T_a']))
+            results['P_C_values'].append(float(row['P_C']))
+            if results['M'] is None:
+                results['M'] = int(row['M'])
+                results['I_max'] = int(row['I_max'])
+    
+    return results
+
+
+def _read_figure345_table(source: Path) -> dict:
+    """讀取 Figure 3, 4, 5 解析結果表（列式表或舊版 CSV）"""
+    if is_columnar_table(source):
+        columns, attrs = load_columns(source)
+        return {**columns, 'M': attrs['M'], 'I_max': attrs['I_max']}
+    return _load_figure345_csv(source)
+
+
+def load_figure345_results(M: int = None, I_max: int = None) -> dict:
     """
-    從最新的 CSV 文件讀取 Figure 3, 4, 5 合併解析結果
+    從運行目錄中最新的匹配運行讀取 Figure 3, 4, 5 合併解析結果
+    （列式表內存映射讀取；舊版目錄讀取 CSV；同一進程中重複讀取返回快取的唯讀陣列）
+    
+    Args:
+        M: 要求的設備總數（None 表示不限）
+        I_max: 要求的最大接入周期數（None 表示不限）
     
     Returns:
         結果字典，如果找不到則返回 None
     """
-    result_base = PROJECT_ROOT / 'result' / 'analytical' / 'figure345'
-    
-    if not result_base.exists():
+    latest_dir = find_latest_run('analytical/figure345', M=M, I_max=I_max)
+    if latest_dir is None:
         return None
     
-    # 找到最新的時間戳目錄
-    timestamp_dirs = sorted(result_base.iterdir(), reverse=True)
-    if not timestamp_dirs:
+    table_dir = latest_dir / "figure345_analytical"
+    source = table_dir if is_columnar_table(table_dir) else latest_dir / "figure345_analytical.csv"
+    if not source.exists():
         return None
-    
-    latest_dir = timestamp_dirs[0]
-    csv_path = latest_dir / "figure345_analytical.csv"
-    
-    if not csv_path.exists():
-        return None
-    
-    # 讀取 CSV
-    N_values = []
-    P_S_values = []
-    T_a_values = []
-    P_C_values = []
-    M = None
-    I_max = None
-    
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            N_values.append(int(row['N']))
-            P_S_values.append(float(row['P_S']))
-            T_a_values.append(float(row['T_a']))
-            P_C_values.append(float(row['P_C']))
-            if M is None:
-                M = int(row['M'])
-                I_max = int(row['I_max'])
-    
-    return {
-        'N_values': N_values,
-        'P_S_values': P_S_values,
-        'T_a_values': T_a_values,
-        'P_C_values': P_C_values,
-        'M': M,
-        'I_max': I_max,
-    }
+    return load_cached(source, _read_figure345_table)
@@ -4,7 +4,7 @@
 導出論文中的所有數學公式。
 
 Input: 系統參數（M, N, k 等）
-Output: paper_formula_1 到 paper_formula_10, confidence_interval_95 等
+Output: paper_formula_1 到 paper_formula_10, confidence_interval_95, exact_formula_work 等
 Position: 數學公式的統一入口
 
 注意：一旦此文件被更新，請同步更新：
@@ -24,6 +24,9 @@ from .formulas import (
     paper_formula_10_collision_probability,
     confidence_interval_95,
     relative_error_percentage,
+    exact_formula_work,
+    expected_success_raos_closed_form,
+    expected_collision_raos_closed_form,
 )
 
 __all__ = [
@@ -39,5 +42,8 @@ __all__ = [
     'paper_formula_10_collision_probability',
     'confidence_interval_95',
     'relative_error_percentage',
+    'exact_formula_work',
+    'expected_success_raos_closed_form',
+    'expected_collision_raos_closed_form',
 ]
 
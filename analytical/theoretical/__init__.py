@@ -4,16 +4,18 @@
 使用論文公式計算系統性能指標。
 
 Input: M, N, I_max 參數
-Output: theoretical_calculation() 返回 (P_S, T_a, P_C, N_s_list, K_list)
+Output: theoretical_calculation() 返回 (P_S, T_a, P_C, N_s_list, K_list),
+        theoretical_calculation_with_arrivals() 隨機到達流量版本
 Position: 解析計算的核心引擎
 
 注意：一旦此文件被更新，請同步更新：
 - 項目根目錄 README.md
 """
 
-from .theoretical import theoretical_calculation
+from .theoretical import theoretical_calculation, theoretical_calculation_with_arrivals
 
 __all__ = [
     'theoretical_calculation',
+    'theoretical_calculation_with_arrivals',
 ]
 
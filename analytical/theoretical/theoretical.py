@@ -2,9 +2,10 @@
 理論計算核心實現
 
 使用論文公式迭代計算 P_S、T_a、P_C 等性能指標。
+支援可選的 Access Class Barring (ACB) 近似與隨機到達流量。
 
 Input: M（設備數）, N（RAO 數）, I_max（最大 AC 數）
-Output: theoretical_calculation() 返回完整性能指標
+Output: theoretical_calculation() 返回完整性能指標, theoretical_calculation_with_arrivals() 隨機到達版本
 Position: 解析計算的數學引擎
 
 注意：一旦此文件被更新，請同步更新：
@@ -23,7 +24,7 @@ from ..formulas.formulas import (
 )
 
 
-def theoretical_calculation(M, N, I_max):
+def theoretical_calculation(M, N, I_max, barring_factor=1.0, barring_time=0):
     """
     使用论文中的理论方法计算性能指标
     
@@ -31,10 +32,15 @@ def theoretical_calculation(M, N, I_max):
         M: 設備總數
         N: 每個AC的RAO數
         I_max: 最大AC數
+        barring_factor: ACB 通過概率（1.0 表示不啟用 ACB）
+        barring_time: ACB 未通過的設備需等待的 AC 數
     
     Returns:
         tuple: (P_S, T_a, P_C, N_s_list, K_list)
     """
+    if barring_factor < 1.0:
+        return _theoretical_calculation_with_acb(M, N, I_max, barring_factor, barring_time)
+    
     K = [M]
     N_s = []
     N_c = []
@@ -62,3 +68,101 @@ def theoretical_calculation(M, N, I_max):
     
     return P_S, T_a, P_C, N_s, K
 
+
+def _theoretical_calculation_with_acb(M, N, I_max, barring_factor, barring_time):
+    """
+    ACB 近似：在 Eq. (6)/(7) 迭代前先以期望值做 ACB 過濾
+    
+    第 i 個 AC 的就緒設備 R_i 中只有 p·R_i 台參與競爭 (K_i)，
+    競爭失敗的 K_{i+1} (Eq. 7) 在下一個 AC 重新就緒，
+    未通過 ACB 的 (1-p)·R_i 台在 barring_time 個 AC 後重新就緒。
+    
+    Returns:
+        tuple: (P_S, T_a, P_C, N_s_list, K_list)，K_list 為每個 AC 的競爭設備數
+    """
+    ready = M
+    barred = [0.0] * (barring_time + 1)
+    K = []
+    N_s = []
+    N_c = []
+    
+    for i in range(1, I_max + 1):
+        ready += barred.pop(0)
+        barred.append(0.0)
+        
+        current_K = barring_factor * ready
+        barred[-1] += ready - current_K
+        K.append(current_K)
+        
+        if current_K <= 0:
+            N_s.append(0)
+            N_c.append(0)
+            ready = 0
+            continue
+        
+        N_s.append(paper_formula_6_success_per_cycle(current_K, N))
+        N_c.append(paper_formula_5_collision_approx(current_K, N))
+        ready = paper_formula_7_next_contending_devices(current_K, N)
+    
+    P_S = paper_formula_8_access_success_probability(N_s, M)
+    T_a = paper_formula_9_mean_access_delay(N_s)
+    P_C = paper_formula_10_collision_probability(N_c, I_max, N)
+    
+    return P_S, T_a, P_C, N_s, K
+
+
+def theoretical_calculation_with_arrivals(arrivals, N, I_max):
+    """
+    隨機到達流量下的理論計算（把到達曲線代入 Eq. (6)/(7) 迭代）
+    
+    第 i 個 AC 的競爭設備數 K_i = 本 AC 新到達設備 + 前面 AC 碰撞且未用完 I_max 次嘗試的設備。
+    所有競爭設備的成功率相同 (e^(-K_i/N_i))，因此按嘗試次數分組追蹤，
+    成功設備按組別比例分配，用於計算 Eq. (9) 的平均接入延遲（以嘗試次數計）。
+    
+    Args:
+        arrivals: 每個 AC 的期望新到達設備數
+        N: 每個AC的RAO數
+        I_max: 每台設備的最大嘗試次數
+    
+    Returns:
+        tuple: (P_S, T_a, P_C, N_s_list, K_list)
+    """
+    num_slots = len(arrivals)
+    M = float(np.sum(arrivals))
+    
+    # attempt_groups[a]: 本 AC 中正在進行第 a+1 次嘗試的設備數
+    attempt_groups = np.zeros(I_max)
+    N_s = []
+    N_c = []
+    K = []
+    success_by_attempt = np.zeros(I_max)
+    
+    for i in range(num_slots):
+        attempt_groups[0] += arrivals[i]
+        current_K = float(attempt_groups.sum())
+        K.append(current_K)
+        
+        if current_K <= 0:
+            N_s.append(0)
+            N_c.append(0)
+            attempt_groups = np.zeros(I_max)
+            continue
+        
+        N_s_i = paper_formula_6_success_per_cycle(current_K, N)
+        N_s.append(N_s_i)
+        N_c.append(paper_formula_5_collision_approx(current_K, N))
+        success_by_attempt += attempt_groups * (N_s_i / current_K)
+        
+        # Eq. (7): 失敗比例 = K_{i+1} / K_i，最後一次嘗試失敗的設備離開系統
+        fail_ratio = paper_formula_7_next_contending_devices(current_K, N) / current_K
+        next_groups = np.zeros(I_max)
+        next_groups[1:] = attempt_groups[:-1] * fail_ratio
+        attempt_groups = next_groups
+    
+    P_S = paper_formula_8_access_success_probability(N_s, M)
+    total_success = success_by_attempt.sum()
+    T_a = (float(np.dot(np.arange(1, I_max + 1), success_by_attempt)) / total_success
+           if total_success > 0 else 0)
+    P_C = paper_formula_10_collision_probability(N_c, num_slots, N)
+    
+    return P_S, T_a, P_C, N_s, K
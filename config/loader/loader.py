@@ -3,7 +3,7 @@
 
 讀取和解析 YAML 配置文件，支持多種配置類型。
 
-Input: config_type（analytical/simulation）, config_name
+Input: config_type（analytical/simulation/storage）, config_name
 Output: load_config() 返回配置字典, list_available_configs() 列出可用配置
 Position: 配置系統的底層實現
 
@@ -79,7 +79,7 @@ def list_available_configs(config_type: str = None) -> dict:
     config_dir = get_config_dir()
     configs = {}
     
-    types = [config_type] if config_type else ['analytical', 'simulation']
+    types = [config_type] if config_type else ['analytical', 'simulation', 'storage']
     
     for ctype in types:
         type_dir = config_dir / ctype
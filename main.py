@@ -14,44 +14,46 @@ Position: 系統入口點，協調所有模組的調用
     python main.py                           # 互動式選單
     python main.py analytical figure1        # 運行 Figure 1 解析
     python main.py simulation figure345      # 運行 Figure 3, 4, 5 模擬
+    python main.py simulation figure345 --resume  # 從上次中斷的檢查點續跑
+    python main.py simulation traffic        # 運行隨機到達流量模擬
+    python main.py simulation acb            # 運行 ACB barring factor 掃描
     python main.py plot figure1              # 繪製 Figure 1
     python main.py run figure1               # 完整流程
     python main.py run figure1 --performance # 啟用性能監測
+    python main.py run figure345 --dry-run   # 預估各階段牆鐘時間、CPU 時數與峰值記憶體（不運行）
+    python main.py run all --force           # 重新運行所有階段（默認跳過輸入未變的階段）
+    python main.py benchmark rng             # Bit generator 吞吐量基準測試
+    python main.py benchmark draw            # RAO 抽樣方式 (integers vs packed) 基準測試
+    python main.py benchmark backend         # 執行後端 (process vs thread) 基準測試
+    python main.py top-up figure345 --samples 1000000        # 在最新模擬結果上補充樣本
+    python main.py merge figure345 --from DIR_A DIR_B        # 合併多台機器的模擬結果
+    python main.py coordinator figure345 --listen 0.0.0.0:5555  # 分佈式模擬協調器
+    python main.py worker --connect host:5555                  # 分佈式模擬工作節點
 
 注意：一旦此文件被更新，請同步更新：
 - 項目根目錄 README.md
 """
 
+from __future__ import annotations
+
 import sys
+import copy
 import argparse
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # 添加項目根目錄到路徑
 PROJECT_ROOT = Path(__file__).resolve().parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+# 只導入輕量的配置載入器；各命令的解析、模擬、繪圖與基準測試模組在命令函數內按需導入，
+# 互動式選單與單一命令都只載入實際用到的模組（繪圖命令才載入 matplotlib）
 from config import load_config
-from performance import SimpleTimer
-from analytical.figure_analysis import (
-    run_figure1_analysis,
-    run_figure2_analysis,
-    run_figure345_analysis,
-    load_figure1_results,
-    load_figure2_results,
-    load_figure345_results,
-)
-from simulation.figure_simulation import (
-    run_figure345_simulation,
-    load_figure345_simulation_results,
-)
-from plot import (
-    plot_figure1,
-    plot_figure2,
-    plot_figure3,
-    plot_figure4,
-    plot_figure5,
-)
+
+if TYPE_CHECKING:
+    from performance import SimpleTimer
+
 
 # 全局性能監測狀態
 _performance_enabled = False
@@ -69,9 +71,11 @@ def get_result_dir(result_type: str, figure_name: str) -> Path:
     return result_dir
 
 
-def _get_analytical_data_for_figure(figure_name: str):
-    """從 figure345 合併結果讀取指定 Figure 的解析數據"""
-    combined = load_figure345_results()
+def _get_analytical_data_for_figure(figure_name: str, combined: dict = None):
+    """從 figure345 合併結果取出指定 Figure 的解析數據（combined 為 None 時讀取最新的結果）"""
+    from analytical.figure_analysis import load_figure345_results
+    if combined is None:
+        combined = load_figure345_results()
     if combined is None:
         return None
     
@@ -99,9 +103,11 @@ def _get_analytical_data_for_figure(figure_name: str):
     return None
 
 
-def _get_simulation_data_for_figure(figure_name: str):
-    """從 figure345 合併結果讀取指定 Figure 的模擬數據（包含 Approximation Error）"""
-    combined = load_figure345_simulation_results()
+def _get_simulation_data_for_figure(figure_name: str, combined: dict = None):
+    """從 figure345 合併結果取出指定 Figure 的模擬數據（包含 Approximation Error；combined 為 None 時讀取最新的結果）"""
+    from simulation.figure_simulation import load_figure345_simulation_results
+    if combined is None:
+        combined = load_figure345_simulation_results()
     if combined is None:
         return None
     
@@ -148,6 +154,7 @@ def _get_simulation_data_for_figure(figure_name: str):
 
 def run_analytical_figure1(timer: SimpleTimer = None):
     """[選項 1] Figure 1: NS,1/N & NC,1/N 精確公式 + 近似公式"""
+    from analytical.figure_analysis import run_figure1_analysis
     config = load_config('analytical', 'figure1')
     run_figure1_analysis(config)
 
@@ -157,18 +164,21 @@ def run_analytical_figure2(timer: SimpleTimer = None):
     
     Note: Figure 2 使用 Figure 1 的配置，因為兩者基於相同的運算。
     """
+    from analytical.figure_analysis import run_figure2_analysis
     config = load_config('analytical', 'figure1')  # 使用 Figure 1 配置
     run_figure2_analysis(config)
 
 
 def run_analytical_figure345(timer: SimpleTimer = None):
     """[選項 3] Figure 3, 4, 5 合併解析 (P_S, T_a, P_C)"""
+    from analytical.figure_analysis import run_figure345_analysis
     config = load_config('analytical', 'figure345')
     run_figure345_analysis(config)
 
 
 def run_analytical_all(timer: SimpleTimer = None):
     """[選項 4] 運行所有解析計算"""
+    from analytical.figure_analysis import run_figure1_analysis, run_figure2_analysis
     print(f"\n{'='*60}")
     print("正在運行 Figure 1 解析計算...")
     print(f"{'='*60}")
@@ -192,10 +202,52 @@ def run_analytical_all(timer: SimpleTimer = None):
 #    5. Figure 3, 4, 5 合併模擬 (P_S, T_a, P_C)
 # ============================================================================
 
-def run_simulation_figure345(timer: SimpleTimer = None):
+def run_simulation_figure345(timer: SimpleTimer = None, resume: bool = False):
     """[選項 5] Figure 3, 4, 5 合併模擬 (P_S, T_a, P_C)"""
+    from simulation.figure_simulation import run_figure345_simulation
     config = load_config('simulation', 'figure345')
-    run_figure345_simulation(config)
+    run_figure345_simulation(config, timer=timer, resume=resume)
+
+
+def run_simulation_traffic(timer: SimpleTimer = None):
+    """隨機到達流量模擬（3GPP Beta 到達 + 重疊群組尋呼，含解析對照）"""
+    from simulation.figure_simulation import run_traffic_simulation
+    config = load_config('simulation', 'traffic')
+    run_traffic_simulation(config, timer=timer)
+
+
+def run_simulation_acb(timer: SimpleTimer = None):
+    """群組尋呼 + Access Class Barring 掃描（含解析近似對照）"""
+    from simulation.figure_simulation import run_acb_simulation
+    config = load_config('simulation', 'acb')
+    run_acb_simulation(config, timer=timer)
+
+
+def run_top_up_figure345(extra_samples: int = None, timer: SimpleTimer = None):
+    """在最新的 Figure 3, 4, 5 模擬結果上補充樣本"""
+    from simulation.figure_simulation import top_up_figure345_simulation
+    config = load_config('simulation', 'figure345')
+    if extra_samples is None:
+        extra_samples = config['performance']['num_samples']
+    return top_up_figure345_simulation(config, extra_samples, timer=timer)
+
+
+def run_coordinator_figure345(listen: str = None, timer: SimpleTimer = None):
+    """以協調器模式運行 Figure 3, 4, 5 模擬，任務分發給 TCP 工作節點"""
+    from simulation.figure_simulation import run_figure345_distributed
+    config = load_config('simulation', 'figure345')
+    return run_figure345_distributed(config, listen, timer=timer)
+
+
+def run_merge_figure345(sources: list, timer: SimpleTimer = None):
+    """合併多個 Figure 3, 4, 5 模擬結果目錄"""
+    from simulation.figure_simulation import merge_figure345_simulation_results
+    config = load_config('simulation', 'figure345')
+    try:
+        return merge_figure345_simulation_results(sources, config)
+    except ValueError as e:
+        print(f"✗ 合併失敗: {e}")
+        return None
 
 
 # ============================================================================
@@ -206,10 +258,16 @@ def run_simulation_figure345(timer: SimpleTimer = None):
 #    9. 繪製所有圖表
 # ============================================================================
 
-def run_plot_figure1(show: bool = True, timer: SimpleTimer = None):
-    """【選項 6】繪製 Figure 1"""
-    print("從 CSV 讀取 Figure 1 數據...")
-    data = load_figure1_results()
+def run_plot_figure1(show: bool = True, timer: SimpleTimer = None, data: dict = None, partial: bool = False):
+    """【選項 6】繪製 Figure 1（data 為 None 時讀取最新的結果；partial 時讀取進行中計算的逐點串流）"""
+    from analytical.figure_analysis import load_figure1_results, load_figure1_stream
+    from plot import plot_figure1
+    if data is None and partial:
+        print("讀取 Figure 1 逐點串流...")
+        data = load_figure1_stream()
+    elif data is None:
+        print("讀取 Figure 1 數據...")
+        data = load_figure1_results()
     if data is None:
         print("❌ 無法找到 Figure 1 數據。請先運行選項 1 進行解析計算。")
         return
@@ -219,10 +277,13 @@ def run_plot_figure1(show: bool = True, timer: SimpleTimer = None):
     plot_figure1(data, data_type='analytical', save_path=str(save_path), show=show)
 
 
-def run_plot_figure2(show: bool = True, timer: SimpleTimer = None):
-    """【選項 7】繪製 Figure 2"""
-    print("從 CSV 讀取 Figure 2 數據...")
-    data = load_figure2_results()
+def run_plot_figure2(show: bool = True, timer: SimpleTimer = None, data: dict = None):
+    """【選項 7】繪製 Figure 2（data 為 None 時讀取最新的結果）"""
+    from analytical.figure_analysis import load_figure2_results
+    from plot import plot_figure2
+    if data is None:
+        print("讀取 Figure 2 數據...")
+        data = load_figure2_results()
     if data is None:
         print("❌ 無法找到 Figure 2 數據。請先運行選項 2 進行解析計算。")
         return
@@ -232,12 +293,39 @@ def run_plot_figure2(show: bool = True, timer: SimpleTimer = None):
     plot_figure2(data, save_path=str(save_path), show=show)
 
 
-def run_plot_figure345(show: bool = True, timer: SimpleTimer = None):
-    """[選項 8] 繪製 Figure 3, 4, 5"""
+def run_plot_figure345(show: bool = True, timer: SimpleTimer = None,
+                       analytical: dict = None, simulation: dict = None, partial: bool = False):
+    """
+    [選項 8] 繪製 Figure 3, 4, 5（analytical / simulation 為 None 時讀取最新的結果；
+    partial 時模擬數據取自進行中掃描的逐點串流，只含已完成的 N 點）
+    """
+    from analytical.figure_analysis import load_figure345_results
+    from simulation.figure_simulation import load_figure345_simulation_results, load_figure345_simulation_stream
+    from plot import plot_figure3, plot_figure4, plot_figure5
+    if simulation is None and partial:
+        simulation = load_figure345_simulation_stream()
+        if simulation is None:
+            print("❌ 找不到 Figure 3, 4, 5 模擬的逐點串流")
+            return
+        status = '已完成' if simulation['complete'] else '進行中'
+        print(f"✓ 讀取逐點串流（{status}）: {len(simulation['N_values'])} 個 N 點")
+        if analytical is None:
+            # 只與 M、I_max 相同的解析結果配對
+            analytical = load_figure345_results(M=simulation['M'], I_max=simulation['I_max'])
+    elif analytical is None:
+        analytical = load_figure345_results()
+    if simulation is None:
+        # 只與解析結果 M、I_max 相同的模擬配對
+        simulation = load_figure345_simulation_results(
+            M=analytical['M'] if analytical else None, I_max=analytical['I_max'] if analytical else None
+        )
+        if simulation is None and analytical is not None:
+            print(f"⚠ 找不到 M={analytical['M']}, I_max={analytical['I_max']} 的模擬結果，只繪製解析曲線")
+    
     # Figure 3
-    print("從 CSV 讀取 Figure 3 數據...")
-    analytical_data = _get_analytical_data_for_figure('figure3')
-    simulation_data = _get_simulation_data_for_figure('figure3')
+    print("準備 Figure 3 數據...")
+    analytical_data = _get_analytical_data_for_figure('figure3', analytical)
+    simulation_data = _get_simulation_data_for_figure('figure3', simulation)
     if analytical_data is None and simulation_data is None:
         print("❌ 無法找到 Figure 3 數據。請先運行選項 3 進行解析計算或選項 5 進行模擬。")
     else:
@@ -246,9 +334,9 @@ def run_plot_figure345(show: bool = True, timer: SimpleTimer = None):
         plot_figure3(analytical_data=analytical_data, simulation_data=simulation_data, save_path=str(save_path), show=False)
     
     # Figure 4
-    print("從 CSV 讀取 Figure 4 數據...")
-    analytical_data = _get_analytical_data_for_figure('figure4')
-    simulation_data = _get_simulation_data_for_figure('figure4')
+    print("準備 Figure 4 數據...")
+    analytical_data = _get_analytical_data_for_figure('figure4', analytical)
+    simulation_data = _get_simulation_data_for_figure('figure4', simulation)
     if analytical_data is None and simulation_data is None:
         print("❌ 無法找到 Figure 4 數據。請先運行選項 3 進行解析計算或選項 5 進行模擬。")
     else:
@@ -257,9 +345,9 @@ def run_plot_figure345(show: bool = True, timer: SimpleTimer = None):
         plot_figure4(analytical_data=analytical_data, simulation_data=simulation_data, save_path=str(save_path), show=False)
     
     # Figure 5
-    print("從 CSV 讀取 Figure 5 數據...")
-    analytical_data = _get_analytical_data_for_figure('figure5')
-    simulation_data = _get_simulation_data_for_figure('figure5')
+    print("準備 Figure 5 數據...")
+    analytical_data = _get_analytical_data_for_figure('figure5', analytical)
+    simulation_data = _get_simulation_data_for_figure('figure5', simulation)
     if analytical_data is None and simulation_data is None:
         print("❌ 無法找到 Figure 5 數據。請先運行選項 3 進行解析計算或選項 5 進行模擬。")
     else:
@@ -286,100 +374,255 @@ def run_plot_all(timer: SimpleTimer = None):
 #   11. Figure 2 完整流程 (Analytical + Plot)
 #   12. Figure 3, 4, 5 完整流程 (Analytical + Simulation + Plot)
 #   13. 所有圖表完整流程
+#
+# 各流程以 DAG 運行（pipeline/dag.py）：階段間以記憶體傳遞結果，互不依賴的階段
+# （如 Figure 1 精確公式與 Figure 3, 4, 5 模擬）在同一 CPU 預算下並行，輸入未變的階段直接載入上次的輸出
 # ============================================================================
 
-def run_pipeline_figure1(timer: SimpleTimer = None):
-    """[選項 10] Figure 1 完整流程 (Analytical + Plot)"""
+def _simulation_stage_func(config: dict):
+    """Figure 3, 4, 5 模擬階段：以分得的工作進程數運行，解析結果直接用於 Approximation Error"""
+    from simulation.figure_simulation import run_figure345_simulation
+    def run(inputs, workers):
+        stage_config = copy.deepcopy(config)
+        stage_config['performance']['num_workers'] = workers
+        results = run_figure345_simulation(stage_config, approximation_data=inputs['figure345_analysis'])
+        if results is None:
+            raise RuntimeError("Figure 3, 4, 5 模擬被中斷（續跑: python main.py simulation figure345 --resume）")
+        return results
+    return run
+
+
+def _pipeline_stages(figures: tuple, show: bool = True) -> list:
+    """
+    建立完整流程的階段列表
+
+    Args:
+        figures: 要產出的圖表 'figure1' / 'figure2' / 'figure345'
+        show: 繪圖後是否顯示
+    """
+    from analytical.figure_analysis import run_figure1_analysis, run_figure2_analysis, run_figure345_analysis
+    from performance import estimate_figure1_analysis, estimate_figure345_simulation
+    from pipeline import Stage
+    stages = []
+    if 'figure1' in figures or 'figure2' in figures:
+        fig1_config = load_config('analytical', 'figure1')
+        stages.append(Stage(
+            'figure1_analysis',
+            lambda inputs, workers: run_figure1_analysis(dict(fig1_config, n_jobs=workers)),
+            params=fig1_config, packages=('analytical',), parallel=True,
+            cost=lambda: estimate_figure1_analysis(fig1_config)['cpu_sec'],
+        ))
+    if 'figure1' in figures:
+        stages.append(Stage(
+            'figure1_plot',
+            lambda inputs, workers: run_plot_figure1(show=show, data=inputs['figure1_analysis']),
+            inputs=('figure1_analysis',), cacheable=False, main_thread=True,
+        ))
+    if 'figure2' in figures:
+        stages.append(Stage(
+            'figure2_analysis',
+            lambda inputs, workers: run_figure2_analysis(fig1_config, fig1_data=inputs['figure1_analysis']),
+            inputs=('figure1_analysis',), params=fig1_config, packages=('analytical',),
+        ))
+        stages.append(Stage(
+            'figure2_plot',
+            lambda inputs, workers: run_plot_figure2(show=show, data=inputs['figure2_analysis']),
+            inputs=('figure2_analysis',), cacheable=False, main_thread=True,
+        ))
+    if 'figure345' in figures:
+        analytical_config = load_config('analytical', 'figure345')
+        simulation_config = load_config('simulation', 'figure345')
+        stages.append(Stage(
+            'figure345_analysis',
+            lambda inputs, workers: run_figure345_analysis(analytical_config),
+            params=analytical_config, packages=('analytical',),
+        ))
+        stages.append(Stage(
+            'figure345_simulation', _simulation_stage_func(simulation_config),
+            inputs=('figure345_analysis',), params=simulation_config, packages=('simulation',),
+            parallel=True,
+            # 未固定種子時每次運行的樣本不同，不跳過
+            cacheable=(simulation_config.get('rng') or {}).get('seed') is not None,
+            cost=lambda: estimate_figure345_simulation(simulation_config)['cpu_sec'],
+        ))
+        stages.append(Stage(
+            'figure345_plot',
+            lambda inputs, workers: run_plot_figure345(
+                show=show, analytical=inputs['figure345_analysis'], simulation=inputs['figure345_simulation']
+            ),
+            inputs=('figure345_analysis', 'figure345_simulation'), cacheable=False, main_thread=True,
+        ))
+    return stages
+
+
+def _run_pipeline(title: str, figures: tuple, timer: SimpleTimer = None, force: bool = False):
+    """以 DAG 運行完整流程"""
+    from pipeline import run_stages
     print(f"\n{'='*60}")
-    print("開始 Figure 1 完整流程")
+    print(f"開始 {title}")
     print(f"{'='*60}")
     
-    print(f"\n[1/2] 運行解析計算（精確公式 + 近似公式）...")
-    if timer:
-        with timer.step("解析計算"):
-            config = load_config('analytical', 'figure1')
-            run_figure1_analysis(config, timer=timer)
-    else:
-        run_analytical_figure1()
-    
-    print(f"\n[2/2] 繪製圖表...")
-    if timer:
-        with timer.step("繪圖"):
-            run_plot_figure1(show=True)
-    else:
-        run_plot_figure1()
+    run_stages(_pipeline_stages(figures), force=force, timer=timer)
     
     print(f"\n{'='*60}")
-    print("Figure 1 完整流程完成!")
+    print(f"{title}完成!")
     print(f"{'='*60}")
 
 
-def run_pipeline_figure2(timer: SimpleTimer = None):
+def run_pipeline_figure1(timer: SimpleTimer = None, force: bool = False):
+    """[選項 10] Figure 1 完整流程 (Analytical + Plot)"""
+    _run_pipeline("Figure 1 完整流程", ('figure1',), timer, force)
+
+
+def run_pipeline_figure2(timer: SimpleTimer = None, force: bool = False):
     """[選項 11] Figure 2 完整流程 (Analytical + Plot)"""
-    print(f"\n{'='*60}")
-    print("開始 Figure 2 完整流程")
-    print(f"{'='*60}")
-    
-    print(f"\n[1/2] 運行解析計算（精確 vs 近似誤差）...")
-    if timer:
-        with timer.step("解析計算"):
-            config = load_config('analytical', 'figure1')
-            run_figure2_analysis(config, timer=timer)
-    else:
-        run_analytical_figure2()
-    
-    print(f"\n[2/2] 繪製圖表...")
-    if timer:
-        with timer.step("繪圖"):
-            run_plot_figure2(show=True)
-    else:
-        run_plot_figure2()
-    
-    print(f"\n{'='*60}")
-    print("Figure 2 完整流程完成!")
-    print(f"{'='*60}")
+    _run_pipeline("Figure 2 完整流程", ('figure2',), timer, force)
 
 
-def run_pipeline_figure345(timer: SimpleTimer = None):
+def run_pipeline_figure345(timer: SimpleTimer = None, force: bool = False):
     """[選項 12] Figure 3, 4, 5 完整流程 (Analytical + Simulation + Plot)"""
-    print(f"\n{'='*60}")
-    print("開始 Figure 3, 4, 5 完整流程")
-    print(f"{'='*60}")
-    
-    print(f"\n[1/3] 運行 Figure 3, 4, 5 合併解析計算...")
-    if timer:
-        with timer.step("解析計算"):
-            config = load_config('analytical', 'figure345')
-            run_figure345_analysis(config, timer=timer)
-    else:
-        run_analytical_figure345()
+    _run_pipeline("Figure 3, 4, 5 完整流程", ('figure345',), timer, force)
+
+
+def run_pipeline_all(timer: SimpleTimer = None, force: bool = False):
+    """[選項 13] 所有圖表完整流程（Figure 1 精確公式與 Figure 3, 4, 5 模擬並行運行）"""
+    _run_pipeline("所有圖表完整流程", ('figure1', 'figure2', 'figure345'), timer, force)
+
+
+# ============================================================================
+# 【運行目錄 (Catalog)】
+#   result/catalog.sqlite 記錄每次運行的參數、配置雜湊、引擎、種子與結果位置
+# ============================================================================
+
+def run_catalog_list(kind: str = None):
+    """列出運行目錄中的運行（按時間由新到舊）"""
+    from storage import RunCatalog
+    runs = RunCatalog().runs(kind)
+    print("=" * 70)
+    print(f"運行目錄: {len(runs)} 次運行" + (f"（{kind}）" if kind else ""))
+    print("=" * 70)
+    for run in runs:
+        params = ', '.join(f"{key}={value}" for key, value in run['params'].items() if value is not None)
+        extra = ', '.join(
+            f"{key}={run[key]}" for key in ('engine', 'seed') if run[key] is not None
+        )
+        print(f"  {run['created_at'][:19]}  {run['path']}")
+        print(f"      {params}" + (f" | {extra}" if extra else ""))
+
+
+def run_catalog_rebuild():
+    """由 result/ 下各結果目錄的 run.json（舊版目錄由其表級屬性推斷）重建運行目錄"""
+    from storage import RunCatalog
+    count = RunCatalog().rebuild()
+    print(f"✓ 運行目錄已重建: {count} 次運行")
+
+
+def run_gc(keep_last: int = None, max_total_mb: float = None, dry_run: bool = False):
+    """
+    按保留策略清理 result/（config/storage/retention.yaml，命令行參數優先）並以內容雜湊去重
+    """
+    from storage import DEFAULT_KEEP_LAST, collect_garbage
+    config = load_config('storage', 'retention')
+    keep_last = keep_last if keep_last is not None else config.get('keep_last', DEFAULT_KEEP_LAST)
+    max_total_mb = max_total_mb if max_total_mb is not None else config.get('max_total_mb')
     
-    print(f"\n[2/3] 運行 Figure 3, 4, 5 合併模擬...")
-    if timer:
-        with timer.step("模擬"):
-            config = load_config('simulation', 'figure345')
-            run_figure345_simulation(config, timer=timer)
-    else:
-        run_simulation_figure345()
+    print("=" * 70)
+    print(f"結果保留策略: 每個參數組合保留 {keep_last} 次運行 | 總大小上限: "
+          f"{f'{max_total_mb} MB' if max_total_mb is not None else '不限'}" + (" | dry-run" if dry_run else ""))
+    print("=" * 70)
+    report = collect_garbage(keep_last=keep_last, max_total_mb=max_total_mb, dry_run=dry_run)
     
-    print(f"\n[3/3] 繪製圖表...")
-    if timer:
-        with timer.step("繪圖"):
-            run_plot_figure345(show=True)
-    else:
-        run_plot_figure345()
+    for path in report['deleted']:
+        print(f"  {'將刪除' if dry_run else '已刪除'}: {path}")
+    mb = 1024 * 1024
+    print(f"\n運行: {report['runs']} 次，刪除 {len(report['deleted'])} 次")
+    print(f"去重後總大小: {report['total_before'] / mb:.1f} MB → {report['total_after'] / mb:.1f} MB")
+    if not dry_run:
+        print(f"去重節省: {report['dedup_saved'] / mb:.1f} MB | "
+              f"刪除未引用對象: {report['pruned_objects']} 個 ({report['pruned_bytes'] / mb:.1f} MB)")
+
+
+# ============================================================================
+# 【成本預估 (Dry Run)】
+# ============================================================================
+
+def run_dry_run(command: str, target: str) -> bool:
+    """
+    預估 analytical / simulation / run 命令各階段與各掃描點的牆鐘時間、CPU 時數與峰值記憶體，不實際運行
+
+    Returns:
+        bool: 該命令與目標是否支援預估
+    """
+    from performance import (
+        estimate_acb_simulation,
+        estimate_figure1_analysis,
+        estimate_figure2_analysis,
+        estimate_figure345_analysis,
+        estimate_figure345_simulation,
+        estimate_traffic_simulation,
+        print_estimate,
+    )
+    stages = []
+    if command in ('analytical', 'run'):
+        if target in ('figure1', 'all'):
+            stages.append(estimate_figure1_analysis(load_config('analytical', 'figure1')))
+        if target in ('figure2', 'all'):
+            stages.append(estimate_figure2_analysis(load_config('analytical', 'figure1'),
+                                                    figure1_planned=target == 'all'))
+        if target in ('figure345', 'all'):
+            stages.append(estimate_figure345_analysis(load_config('analytical', 'figure345')))
+    if command in ('simulation', 'run') and target in ('figure345', 'all'):
+        stages.append(estimate_figure345_simulation(load_config('simulation', 'figure345')))
+    if command == 'simulation' and target == 'acb':
+        stages.append(estimate_acb_simulation(load_config('simulation', 'acb')))
+    if command == 'simulation' and target == 'traffic':
+        stages.append(estimate_traffic_simulation(load_config('simulation', 'traffic')))
     
-    print(f"\n{'='*60}")
-    print("Figure 3, 4, 5 完整流程完成!")
-    print(f"{'='*60}")
+    if not stages:
+        return False
+    print_estimate(f"{command} {target}", stages)
+    return True
 
 
-def run_pipeline_all(timer: SimpleTimer = None):
-    """[選項 13] 所有圖表完整流程"""
-    # Note: 當運行所有流程時，每個子流程會分別顯示性能報告
-    run_pipeline_figure1(timer=None)
-    run_pipeline_figure2(timer=None)
-    run_pipeline_figure345(timer=None)
+# ============================================================================
+# 【基準測試 (Benchmark)】
+# ============================================================================
+
+def run_benchmark_rng(timer: SimpleTimer = None):
+    """Bit generator 在群組尋呼工作負載上的吞吐量比較（使用 figure345 模擬配置的 M, I_max）"""
+    from performance import benchmark_bit_generators
+    config = load_config('simulation', 'figure345')
+    rng_config = config.get('rng') or {}
+    benchmark_bit_generators(
+        M=config['simulation']['M'],
+        I_max=config['simulation']['I_max'],
+        block_size=rng_config.get('block_size', 2048),
+    )
+
+
+def run_benchmark_draw(timer: SimpleTimer = None):
+    """打包低位元抽樣的均勻性檢定 + integers vs packed 吞吐量比較"""
+    from performance import benchmark_draw_modes, check_packed_uniformity
+    config = load_config('simulation', 'figure345')
+    rng_config = config.get('rng') or {}
+    check_packed_uniformity(bit_generator=rng_config.get('bit_generator', 'PCG64'))
+    benchmark_draw_modes(
+        M=config['simulation']['M'],
+        I_max=config['simulation']['I_max'],
+        block_size=rng_config.get('block_size', 2048),
+        bit_generator=rng_config.get('bit_generator', 'PCG64'),
+    )
+
+
+def run_benchmark_backend(timer: SimpleTimer = None):
+    """進程池 vs 線程池後端在模擬與解析工作負載上的牆鐘時間比較"""
+    from performance import benchmark_backends
+    config = load_config('simulation', 'figure345')
+    benchmark_backends(
+        M=config['simulation']['M'],
+        I_max=config['simulation']['I_max'],
+        num_workers=config['performance']['num_workers'],
+    )
 
 
 # ============================================================================
@@ -425,6 +668,7 @@ def print_menu():
 
 def _run_with_performance(func, name: str):
     """包裝函數以支持性能監測"""
+    from performance import SimpleTimer
     global _performance_enabled
     
     if _performance_enabled:
@@ -517,25 +761,107 @@ def parse_args():
   python main.py analytical figure345      # 運行 Figure 3, 4, 5 解析
   python main.py analytical all            # 運行所有解析
   python main.py simulation figure345      # 運行 Figure 3, 4, 5 模擬
+  python main.py simulation traffic        # 運行隨機到達流量模擬
+  python main.py simulation acb            # 運行 ACB barring factor 掃描
   python main.py plot figure1              # 繪製 Figure 1
   python main.py plot figure345            # 繪製 Figure 3, 4, 5
   python main.py plot all                  # 繪製所有圖表
+  python main.py plot figure345 --partial  # 以進行中模擬已完成的 N 點繪圖（逐點串流）
   python main.py run figure1               # Figure 1 完整流程
   python main.py run figure345             # Figure 3, 4, 5 完整流程
   python main.py run all                   # 所有完整流程
   python main.py run figure1 --performance # 啟用性能監測
+  python main.py run figure345 --dry-run   # 只預估牆鐘時間、CPU 時數與峰值記憶體
+  python main.py run all --force           # 忽略輸入雜湊，重新運行所有階段
+  python main.py benchmark rng             # Bit generator 吞吐量基準測試
+  python main.py benchmark draw            # RAO 抽樣方式 (integers vs packed) 基準測試
+  python main.py benchmark backend         # 執行後端 (process vs thread) 基準測試
+  python main.py top-up figure345 --samples 1000000   # 在最新模擬結果上補充樣本
+  python main.py merge figure345 --from DIR_A DIR_B   # 合併多台機器的模擬結果
+  python main.py coordinator figure345 --listen 0.0.0.0:5555  # 分佈式模擬協調器
+  python main.py worker --connect host:5555                  # 分佈式模擬工作節點
+  python main.py catalog list              # 列出運行目錄中各次運行的參數與位置
+  python main.py catalog rebuild           # 由各結果目錄重建運行目錄
+  python main.py gc --dry-run              # 預覽按保留策略要刪除的運行
+  python main.py gc --keep-last 1          # 每個參數組合只保留最新一次運行，並去重 result/
         """
     )
     parser.add_argument(
         'command',
         nargs='?',
-        choices=['analytical', 'simulation', 'plot', 'run'],
-        help='命令: analytical, simulation, plot, run'
+        choices=['analytical', 'simulation', 'plot', 'run', 'benchmark', 'top-up', 'merge',
+                 'coordinator', 'worker', 'catalog', 'gc'],
+        help='命令: analytical, simulation, plot, run, benchmark, top-up, merge, coordinator, worker, catalog, gc'
     )
     parser.add_argument(
         'target',
         nargs='?',
-        help='目標: figure1, figure2, figure345, all'
+        help='目標: figure1, figure2, figure345, all (simulation 另支援 traffic, acb; benchmark 支援 rng, draw, backend; '
+             'catalog 支援 list, rebuild)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='simulation figure345: 從上次中斷的檢查點續跑'
+    )
+    parser.add_argument(
+        '--samples',
+        type=int,
+        default=None,
+        help='top-up: 每個 N 點追加的樣本數（默認為配置中的 num_samples）'
+    )
+    parser.add_argument(
+        '--from',
+        dest='sources',
+        nargs='+',
+        default=None,
+        help='merge: 要合併的結果目錄（result/simulation/figure345/<時間戳> 或其 shards/ 目錄）'
+    )
+    parser.add_argument(
+        '--listen',
+        type=str,
+        default=None,
+        help='coordinator: 監聽地址 host:port（默認為配置中的 cluster.listen）'
+    )
+    parser.add_argument(
+        '--connect',
+        type=str,
+        default=None,
+        help='worker: 協調器地址 host:port'
+    )
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=-1,
+        help='worker: 本機並行進程數 (-1 表示使用所有 CPU 核心)'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='run: 忽略輸入雜湊，重新運行所有階段（默認跳過輸入未變的階段）'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='analytical / simulation / run: 只預估各階段與各掃描點的牆鐘時間、CPU 時數與峰值記憶體，不實際運行; '
+             'gc: 只列出將刪除的運行'
+    )
+    parser.add_argument(
+        '--partial',
+        action='store_true',
+        help='plot figure1 / figure345: 讀取進行中（或中斷）掃描的逐點串流 result/stream/，只含已完成的點'
+    )
+    parser.add_argument(
+        '--keep-last',
+        type=int,
+        default=None,
+        help='gc: 每個參數組合保留的運行數（默認為 config/storage/retention.yaml 的 keep_last）'
+    )
+    parser.add_argument(
+        '--max-size-mb',
+        type=float,
+        default=None,
+        help='gc: result/ 去重後的總大小上限 MB（默認為 config/storage/retention.yaml 的 max_total_mb）'
     )
     parser.add_argument(
         '--performance',
@@ -570,10 +896,31 @@ def main():
     command = args.command
     target = args.target
     
+    # worker 命令不需要目標
+    if command == 'worker':
+        if not args.connect:
+            print("請用 --connect host:port 指定協調器地址")
+            return
+        from simulation.core import run_worker
+        run_worker(args.connect, args.processes)
+        return
+    
+    # gc 命令不需要目標
+    if command == 'gc':
+        run_gc(args.keep_last, args.max_size_mb, dry_run=args.dry_run)
+        return
+    
     if target is None:
         print("請指定目標 (figure1, figure2, figure345, all)")
         return
     
+    # 成本預估：校準後打印預估，不運行任何階段
+    if args.dry_run:
+        if not run_dry_run(command, target):
+            print(f"--dry-run 不支援: {command} {target}")
+            print("支援: analytical / run (figure1, figure2, figure345, all), simulation (figure345, all, acb, traffic)")
+        return
+    
     try:
         # analytical 命令
         if command == 'analytical':
@@ -592,22 +939,26 @@ def main():
         # simulation 命令
         elif command == 'simulation':
             if target == 'figure345' or target == 'all':
-                run_simulation_figure345()
+                run_simulation_figure345(resume=args.resume)
+            elif target == 'traffic':
+                run_simulation_traffic()
+            elif target == 'acb':
+                run_simulation_acb()
             elif target in ['figure1', 'figure2']:
                 print(f"錯誤: {target} 不需要模擬（只有 Analytical vs Approximation 對比）")
                 print("請使用: python main.py simulation figure345")
             else:
                 print(f"未知的目標: {target}")
-                print("請使用: python main.py simulation figure345")
+                print("請使用: python main.py simulation figure345 / traffic / acb")
         
         # plot 命令
         elif command == 'plot':
             if target == 'figure1':
-                run_plot_figure1()
+                run_plot_figure1(partial=args.partial)
             elif target == 'figure2':
                 run_plot_figure2()
             elif target == 'figure345':
-                run_plot_figure345()
+                run_plot_figure345(partial=args.partial)
             elif target == 'all':
                 run_plot_all()
             else:
@@ -617,16 +968,64 @@ def main():
         # run 命令
         elif command == 'run':
             if target == 'figure1':
-                run_pipeline_figure1()
+                run_pipeline_figure1(force=args.force)
             elif target == 'figure2':
-                run_pipeline_figure2()
+                run_pipeline_figure2(force=args.force)
             elif target == 'figure345':
-                run_pipeline_figure345()
+                run_pipeline_figure345(force=args.force)
             elif target == 'all':
-                run_pipeline_all()
+                run_pipeline_all(force=args.force)
             else:
                 print(f"未知的目標: {target}")
                 print("支援的目標: figure1, figure2, figure345, all")
+        
+        # benchmark 命令
+        elif command == 'benchmark':
+            if target == 'rng':
+                run_benchmark_rng()
+            elif target == 'draw':
+                run_benchmark_draw()
+            elif target == 'backend':
+                run_benchmark_backend()
+            else:
+                print(f"未知的目標: {target}")
+                print("支援的目標: rng, draw, backend")
+        
+        # top-up 命令
+        elif command == 'top-up':
+            if target == 'figure345':
+                run_top_up_figure345(args.samples)
+            else:
+                print(f"未知的目標: {target}")
+                print("支援的目標: figure345")
+        
+        # coordinator 命令
+        elif command == 'coordinator':
+            if target == 'figure345':
+                run_coordinator_figure345(args.listen)
+            else:
+                print(f"未知的目標: {target}")
+                print("支援的目標: figure345")
+        
+        # merge 命令
+        elif command == 'merge':
+            if target != 'figure345':
+                print(f"未知的目標: {target}")
+                print("支援的目標: figure345")
+            elif not args.sources:
+                print("請用 --from 指定要合併的結果目錄")
+            else:
+                run_merge_figure345(args.sources)
+        
+        # catalog 命令
+        elif command == 'catalog':
+            if target == 'list':
+                run_catalog_list()
+            elif target == 'rebuild':
+                run_catalog_rebuild()
+            else:
+                print(f"未知的目標: {target}")
+                print("支援的目標: list, rebuild")
     
     finally:
         # 生成性能報告
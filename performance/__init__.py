@@ -4,7 +4,9 @@
 提供簡單的計時功能，測量程序各部分的執行時間。
 
 Input: 計時器名稱和步驟
-Output: SimpleTimer 計時器, 樹狀時間報告
+Output: SimpleTimer 計時器, 樹狀時間報告, benchmark_bit_generators() / benchmark_draw_modes() RNG 基準測試,
+        check_packed_uniformity() 打包抽樣均勻性檢定, benchmark_backends() 進程池 vs 線程池基準測試,
+        estimate_*() / print_estimate() 運行前成本預估 (dry-run)
 Position: 系統性能分析工具
 
 注意：一旦此文件被更新，請同步更新：
@@ -17,11 +19,33 @@ from .simple_timer import (
     get_timer,
     clear_timer,
 )
+from .rng_benchmark import benchmark_bit_generators, benchmark_draw_modes, check_packed_uniformity
+from .backend_benchmark import benchmark_backends
+from .cost_estimator import (
+    estimate_figure1_analysis,
+    estimate_figure2_analysis,
+    estimate_figure345_analysis,
+    estimate_figure345_simulation,
+    estimate_acb_simulation,
+    estimate_traffic_simulation,
+    print_estimate,
+)
 
 __all__ = [
     'SimpleTimer',
     'start_timer',
     'get_timer',
     'clear_timer',
+    'benchmark_bit_generators',
+    'benchmark_draw_modes',
+    'check_packed_uniformity',
+    'benchmark_backends',
+    'estimate_figure1_analysis',
+    'estimate_figure2_analysis',
+    'estimate_figure345_analysis',
+    'estimate_figure345_simulation',
+    'estimate_acb_simulation',
+    'estimate_traffic_simulation',
+    'print_estimate',
 ]
 
@@ -0,0 +1,87 @@
+"""
+執行後端基準測試（進程池 vs 線程池）
+
+在同一工作負載上比較兩種後端的牆鐘時間（含進程啟動、模組導入與 pickle 開銷）：
+- 群組尋呼模擬: simulate_group_paging_multi_samples，並檢查兩種後端結果逐位相同
+- 解析計算: Figure 1 的 _parallel_compute(compute_single_point)
+
+一般 CPython 構建上線程後端受 GIL 限制（只有 NumPy 大型運算與 numba nogil 核心能並行）；
+在 free-threaded 構建（python3.13t）上線程後端可完全並行。
+
+Input: M, N, I_max, 樣本數, 並行數
+Output: benchmark_backends()
+Position: 執行後端選型的性能測試工具
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import io
+import time
+from contextlib import redirect_stderr, redirect_stdout
+
+import numpy as np
+
+from analytical.figure_analysis.figure1_analysis import _parallel_compute, compute_single_point
+from simulation.core.backend import gil_disabled
+from simulation.core.one_shot_access import simulate_group_paging_multi_samples
+
+
+def _quietly(func, *args, **kwargs):
+    """執行函數並丟棄其進度輸出，返回 (結果, 耗時秒數)"""
+    sink = io.StringIO()
+    start_time = time.perf_counter()
+    with redirect_stdout(sink), redirect_stderr(sink):
+        result = func(*args, **kwargs)
+    return result, time.perf_counter() - start_time
+
+
+def benchmark_backends(M: int = 100, N: int = 20, I_max: int = 10, num_samples: int = 20000,
+                       num_workers: int = -1, analytical_N: int = 3, seed: int = 0) -> list:
+    """
+    比較進程池與線程池後端
+
+    Args:
+        M, N, I_max: 群組尋呼模擬參數
+        num_samples: 模擬樣本數
+        num_workers: 並行數 (-1 表示使用所有 CPU 核心)
+        analytical_N: 解析計算工作負載的 N（M 從 1 到 10N）
+        seed: 根種子
+
+    Returns:
+        list: [{'workload', 'backend', 'seconds'}, ...]
+    """
+    print("=" * 70)
+    print("執行後端基準測試 (process vs thread)")
+    print("=" * 70)
+    print(f"  GIL: {'已停用 (free-threaded)' if gil_disabled() else '啟用'}")
+    print(f"  模擬: M={M}, N={N}, I_max={I_max}, 樣本數={num_samples:,} | 解析: N={analytical_N}, M=1..{10 * analytical_N}")
+    print("=" * 70)
+    print(f"  {'工作負載':<14}{'後端':<10}{'耗時 (秒)':>12}{'相對 process':>16}")
+
+    results = []
+    simulation_outputs = {}
+    args_list = [(m, analytical_N) for m in range(1, 10 * analytical_N + 1)]
+
+    for workload in ('simulation', 'analytical'):
+        baseline = None
+        for backend in ('process', 'thread'):
+            if workload == 'simulation':
+                output, seconds = _quietly(
+                    simulate_group_paging_multi_samples, M, N, I_max, num_samples, num_workers,
+                    seed=seed, engine='numpy', keep_samples=True, backend=backend
+                )
+                simulation_outputs[backend] = output
+            else:
+                _, seconds = _quietly(
+                    _parallel_compute, compute_single_point, args_list, num_workers, backend=backend
+                )
+            baseline = baseline or seconds
+            results.append({'workload': workload, 'backend': backend, 'seconds': seconds})
+            print(f"  {workload:<14}{backend:<10}{seconds:>12.2f}{baseline / seconds:>15.2f}x")
+
+    identical = np.array_equal(simulation_outputs['process'], simulation_outputs['thread'])
+    print("=" * 70)
+    print(f"  模擬結果逐位相同: {'✓' if identical else '✗'}")
+    print("=" * 70)
+    return results
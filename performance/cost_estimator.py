@@ -0,0 +1,340 @@
+"""
+運行前成本預估（dry-run）
+
+不實際運行，按各流程的配置預估每個階段與每個掃描點的牆鐘時間、CPU 時數與峰值記憶體：
+- 群組尋呼模擬（figure345 / acb）: 在本機以所選引擎校準每個掃描點的每樣本成本
+  （calibrate_group_paging_cost，與運行時自適應分塊的校準相同），牆鐘按 cost_model.simulation_wall_seconds，
+  峰值記憶體按 memory_planner.plan_memory；固定種子且結果快取已有的點計為 0
+- 流量模擬（traffic）: 以 calibrate_traffic_cost 校準每個 N 點
+- Figure 1 / 2 解析: 精確公式的分割數模型（estimate_point_seconds，含時間預算的退回方法），
+  按 _parallel_compute 的最長任務優先批次模擬執行器，得到完工時間
+- Figure 3, 4, 5 解析: 計時一個 N 點的 theoretical_calculation，按點數外推
+
+運行中的進度剩餘時間使用同一模型（simulation/core/cost_model.py）。繪圖階段不計入。
+
+Input: 各流程的配置字典
+Output: estimate_figure1_analysis(), estimate_figure2_analysis(), estimate_figure345_analysis(),
+        estimate_figure345_simulation(), estimate_acb_simulation(), estimate_traffic_simulation(),
+        print_estimate()
+Position: main.py --dry-run 的成本預估
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import time
+
+from analytical.figure_analysis.figure1_analysis import (
+    DEFAULT_EXACT_FALLBACK,
+    _plan_batches,
+    load_figure1_results,
+    plan_point_costs,
+)
+from analytical.theoretical import theoretical_calculation
+from simulation.core.backend import DEFAULT_BACKEND, resolve_backend
+from simulation.core.chunk_scheduler import DEFAULT_TARGET_TASK_SEC, estimate_chunk_count
+from simulation.core.cost_model import (
+    POOL_STARTUP_SEC,
+    effective_workers,
+    format_duration,
+    makespan_seconds,
+    simulation_wall_seconds,
+)
+from simulation.core.cpu_planner import plan_workers
+from simulation.core.jit_kernel import resolve_engine
+from simulation.core.memory_planner import MB, WORKER_BASELINE_BYTES, plan_memory, process_rss_bytes
+from simulation.core.metrics import compact_tally_dtype
+from simulation.core.one_shot_access import calibrate_group_paging_cost
+from simulation.core.result_cache import DEFAULT_CACHE_SIZE_MB, ResultCache, simulation_cache_params
+from simulation.core.rng import DEFAULT_BIT_GENERATOR, DEFAULT_BLOCK_SIZE, DEFAULT_DRAW_MODE
+from simulation.core.traffic import (
+    _total_slots,
+    calibrate_traffic_cost,
+    get_arrival_probabilities,
+)
+
+# 計算方法的顯示名稱
+METHOD_NAMES = {
+    'enumeration': '枚舉',
+    'closed_form': '閉式解',
+    'approx_only': '僅近似',
+}
+
+
+def _pool_baseline_bytes(num_workers: int, backend: str) -> int:
+    """父進程當前常駐記憶體 + 工作進程基線（僅進程池）"""
+    return process_rss_bytes() + (num_workers * WORKER_BASELINE_BYTES if backend == 'process' else 0)
+
+
+def _stage(name: str, workers: int, points: list, notes: list = None) -> dict:
+    """把各點的預估匯總為一個階段（各點依序運行：牆鐘與 CPU 相加，記憶體取最大）"""
+    return {
+        'name': name,
+        'workers': workers,
+        'points': points,
+        'wall_sec': sum(point['wall_sec'] for point in points),
+        'cpu_sec': sum(point['cpu_sec'] for point in points),
+        'peak_bytes': max((point['peak_bytes'] for point in points), default=process_rss_bytes()),
+        'notes': notes or [],
+    }
+
+
+def estimate_figure1_analysis(config: dict, name: str = 'Figure 1 解析') -> dict:
+    """
+    預估 run_figure1_analysis：每個 N 一個掃描點（M = m_start..m_over_n_max × N）
+
+    Returns:
+        dict: {'name', 'workers', 'points': [{'label', 'detail', 'wall_sec', 'cpu_sec', 'peak_bytes'}, ...],
+               'wall_sec', 'cpu_sec', 'peak_bytes', 'notes'}
+    """
+    cpu_plan = plan_workers(config.get('n_jobs', -1), config.get('pin_workers', False))
+    backend = resolve_backend(config.get('backend', DEFAULT_BACKEND))
+    workers = effective_workers(cpu_plan)
+    budget_sec = config.get('exact_budget_sec')
+    fallback = config.get('exact_fallback', DEFAULT_EXACT_FALLBACK)
+    baseline = _pool_baseline_bytes(cpu_plan['workers'], backend)
+
+    points = []
+    for N in config['n_values']:
+        M_range = range(config['m_start'], config['m_over_n_max'] * N + 1)
+        methods, costs = plan_point_costs(M_range, N, budget_sec, fallback)
+        batches = _plan_batches(costs, cpu_plan['workers'])
+        batch_costs = [sum(costs[idx] for idx in batch) for batch in batches]
+        startup = POOL_STARTUP_SEC if backend == 'process' else 0.0
+        counts = {method: methods.count(method) for method in METHOD_NAMES if method in methods}
+        heaviest = max(range(len(costs)), key=costs.__getitem__)
+        detail = ', '.join(f"{METHOD_NAMES[method]} {count}" for method, count in counts.items())
+        points.append({
+            'label': f"N={N}",
+            'detail': f"M={M_range.start}..{M_range.stop - 1} ({detail}; 最重 M={M_range[heaviest]} "
+                      f"{format_duration(costs[heaviest])})",
+            'wall_sec': startup + makespan_seconds(batch_costs, workers),
+            'cpu_sec': sum(costs),
+            'peak_bytes': baseline,
+        })
+    notes = []
+    if budget_sec is not None:
+        notes.append(f"精確公式時間預算 {budget_sec:g} 秒/點，超出時 {fallback}")
+    return _stage(name, cpu_plan['workers'], points, notes)
+
+
+def estimate_figure2_analysis(config: dict, figure1_planned: bool = False) -> dict:
+    """
+    預估 run_figure2_analysis：誤差計算本身可忽略，成本取決於能否重用 Figure 1 的結果
+
+    Args:
+        figure1_planned: 同一流程中 Figure 1 會先運行（結果直接傳入或剛保存），不需重算
+    """
+    if not figure1_planned:
+        saved = load_figure1_results()
+        required = {f'N_{N}' for N in config['n_values']}
+        if saved is None or not required.issubset(saved):
+            return estimate_figure1_analysis(config, name='Figure 2 解析（需重算 Figure 1）')
+    source = '同一流程中 Figure 1 的結果' if figure1_planned else '已保存的 Figure 1 結果'
+    return _stage('Figure 2 解析', 1, [{
+        'label': '誤差計算', 'detail': f"使用{source}",
+        'wall_sec': 0.0, 'cpu_sec': 0.0, 'peak_bytes': process_rss_bytes(),
+    }])
+
+
+def estimate_figure345_analysis(config: dict) -> dict:
+    """預估 run_figure345_analysis：計時第一個 N 點的 theoretical_calculation，按點數外推"""
+    N_range = range(config['N_start'], config['N_stop'], config['N_step'])
+    acb_config = config.get('acb') or {}
+    start_time = time.perf_counter()
+    theoretical_calculation(config['M'], N_range[0], config['I_max'],
+                            acb_config.get('barring_factor', 1.0), acb_config.get('barring_time', 0))
+    point_sec = time.perf_counter() - start_time
+    return _stage('Figure 3, 4, 5 解析', 1, [{
+        'label': f"N={N_range[0]}..{N_range[-1]}",
+        'detail': f"{len(N_range)} 點 × {point_sec * 1000:.2f} ms（單進程）",
+        'wall_sec': point_sec * len(N_range), 'cpu_sec': point_sec * len(N_range),
+        'peak_bytes': process_rss_bytes(),
+    }])
+
+
+def _estimate_group_paging_sweep(name: str, points: list, performance: dict, rng_config: dict,
+                                 cache: ResultCache = None) -> dict:
+    """
+    預估一組群組尋呼模擬點（每點一次 simulate_group_paging_multi_samples）
+
+    Args:
+        points: [{'label', 'M', 'N', 'I_max', 'barring_factor', 'barring_time', 'cache_params'（可選）}, ...]
+        performance / rng_config: 配置中的 performance 與 rng 區塊
+        cache: 結果快取（給定時已快取的點計為 0）
+    """
+    num_samples = performance['num_samples']
+    backend = resolve_backend(performance.get('backend', DEFAULT_BACKEND))
+    cpu_plan = plan_workers(performance['num_workers'], performance.get('pin_workers', False))
+    num_workers = cpu_plan['workers']
+    workers = effective_workers(cpu_plan)
+    engine = resolve_engine(performance.get('engine', 'numpy'))
+    target_task_sec = performance.get('target_task_sec', DEFAULT_TARGET_TASK_SEC)
+    bit_generator = rng_config.get('bit_generator', DEFAULT_BIT_GENERATOR)
+    block_size = rng_config.get('block_size', DEFAULT_BLOCK_SIZE)
+    draw_mode = rng_config.get('draw_mode', DEFAULT_DRAW_MODE)
+
+    rows = []
+    cached = 0
+    for point in points:
+        M, N, I_max = point['M'], point['N'], point['I_max']
+        if cache is not None and cache.contains(point['cache_params']):
+            cached += 1
+            rows.append({'label': point['label'], 'detail': '快取命中', 'wall_sec': 0.0, 'cpu_sec': 0.0,
+                         'peak_bytes': process_rss_bytes()})
+            continue
+        per_sample_sec, _, calibration_sec = calibrate_group_paging_cost(
+            M, N, I_max, point['barring_factor'], point['barring_time'], engine,
+            bit_generator, block_size, draw_mode
+        )
+        num_chunks = (estimate_chunk_count(num_samples, per_sample_sec, target_task_sec, num_workers)
+                      if target_task_sec else num_workers * 4)
+        try:
+            memory_plan = plan_memory(
+                num_samples, block_size, num_workers, compact_tally_dtype(M, M * I_max, I_max * N),
+                num_chunks, performance.get('max_memory_mb'), backend=backend
+            )
+            peak_bytes = memory_plan['peak_bytes']
+            mode_text = ' | 串流累加' if memory_plan['mode'] == 'stream' else ''
+        except MemoryError:
+            # 運行時會拋出 MemoryError；峰值記為預算本身
+            peak_bytes = performance['max_memory_mb'] * MB
+            mode_text = ' | ⚠ 記憶體預算不足，運行時將拋出 MemoryError'
+        rows.append({
+            'label': point['label'],
+            'detail': f"{per_sample_sec * 1000:.3f} ms/樣本{mode_text}",
+            'wall_sec': simulation_wall_seconds(num_samples, per_sample_sec, workers,
+                                                calibration_sec if target_task_sec else 0.0, backend),
+            'cpu_sec': num_samples * per_sample_sec,
+            'peak_bytes': peak_bytes,
+        })
+    notes = [f"樣本數 {num_samples:,}/點 | 引擎 {engine} | 並行 {num_workers} ({backend})"]
+    if cache is not None:
+        notes.append(f"結果快取: {cached}/{len(points)} 點已快取")
+    return _stage(name, num_workers, rows, notes)
+
+
+def estimate_figure345_simulation(config: dict) -> dict:
+    """預估 run_figure345_simulation：每個 N 點校準一次（固定種子時已快取的點計為 0）"""
+    M = config['simulation']['M']
+    I_max = config['simulation']['I_max']
+    scan_config = config['scan']['range']
+    performance = config['performance']
+    num_samples = performance['num_samples']
+    engine = resolve_engine(performance.get('engine', 'numpy'))
+    rng_config = config.get('rng') or {}
+    bit_generator = rng_config.get('bit_generator', DEFAULT_BIT_GENERATOR)
+    block_size = rng_config.get('block_size', DEFAULT_BLOCK_SIZE)
+    draw_mode = rng_config.get('draw_mode', DEFAULT_DRAW_MODE)
+    acb_config = config.get('acb') or {}
+    barring_factor = acb_config.get('barring_factor', 1.0)
+    barring_time = acb_config.get('barring_time', 0)
+    cache_config = config.get('cache') or {}
+    seed = rng_config.get('seed')
+    cache = None
+    if cache_config.get('enabled', True) and seed is not None:
+        cache = ResultCache(max_size_mb=cache_config.get('max_size_mb', DEFAULT_CACHE_SIZE_MB))
+
+    points = []
+    for N in range(scan_config['start'], scan_config['stop'], scan_config['step']):
+        points.append({
+            'label': f"N={N}", 'M': M, 'N': N, 'I_max': I_max,
+            'barring_factor': barring_factor, 'barring_time': barring_time,
+            'cache_params': simulation_cache_params(
+                M, N, I_max, num_samples, engine, seed, bit_generator, block_size, draw_mode,
+                barring_factor, barring_time
+            ) if cache is not None else None,
+        })
+    return _estimate_group_paging_sweep('Figure 3, 4, 5 模擬', points, performance, rng_config, cache)
+
+
+def estimate_acb_simulation(config: dict) -> dict:
+    """預估 run_acb_simulation：每個 barring factor 校準一次"""
+    simulation = config['simulation']
+    points = [{
+        'label': f"p={barring_factor}", 'M': simulation['M'], 'N': simulation['N'],
+        'I_max': simulation['I_max'], 'barring_factor': barring_factor,
+        'barring_time': config['acb']['barring_time'],
+    } for barring_factor in config['scan']['values']]
+    return _estimate_group_paging_sweep('ACB 掃描模擬', points, config['performance'], config.get('rng') or {})
+
+
+def estimate_traffic_simulation(config: dict) -> dict:
+    """預估 run_traffic_simulation：每個 N 點校準一次（與群組尋呼相同的分塊與記憶體規劃）"""
+    I_max = config['simulation']['I_max']
+    groups = config['traffic']['groups']
+    scan_config = config['scan']['range']
+    performance = config['performance']
+    rng_config = config.get('rng') or {}
+    num_samples = performance['num_samples']
+    backend = resolve_backend(performance.get('backend', DEFAULT_BACKEND))
+    cpu_plan = plan_workers(performance['num_workers'], performance.get('pin_workers', False))
+    num_workers = cpu_plan['workers']
+    workers = effective_workers(cpu_plan)
+    target_task_sec = performance.get('target_task_sec', DEFAULT_TARGET_TASK_SEC)
+    bit_generator = rng_config.get('bit_generator', DEFAULT_BIT_GENERATOR)
+    block_size = rng_config.get('block_size', DEFAULT_BLOCK_SIZE)
+    probabilities = get_arrival_probabilities(config['traffic'])
+    total_devices = sum(group['M'] for group in groups)
+    num_slots = _total_slots(groups, probabilities, I_max)
+
+    points = []
+    for N in range(scan_config['start'], scan_config['stop'], scan_config['step']):
+        per_sample_sec, _, calibration_sec = calibrate_traffic_cost(
+            groups, probabilities, N, I_max, bit_generator, block_size
+        )
+        num_chunks = (estimate_chunk_count(num_samples, per_sample_sec, target_task_sec, num_workers)
+                      if target_task_sec else num_workers * 4)
+        try:
+            memory_plan = plan_memory(
+                num_samples, block_size, num_workers,
+                compact_tally_dtype(total_devices, total_devices * I_max, num_slots * N),
+                num_chunks, performance.get('max_memory_mb'), backend=backend
+            )
+            peak_bytes = memory_plan['peak_bytes']
+            mode_text = ' | 串流累加' if memory_plan['mode'] == 'stream' else ''
+        except MemoryError:
+            peak_bytes = performance['max_memory_mb'] * MB
+            mode_text = ' | ⚠ 記憶體預算不足，運行時將拋出 MemoryError'
+        points.append({
+            'label': f"N={N}",
+            'detail': f"{per_sample_sec * 1000:.3f} ms/樣本{mode_text}",
+            'wall_sec': simulation_wall_seconds(num_samples, per_sample_sec, workers,
+                                                calibration_sec if target_task_sec else 0.0, backend),
+            'cpu_sec': num_samples * per_sample_sec,
+            'peak_bytes': peak_bytes,
+        })
+    notes = [f"樣本數 {num_samples:,}/點 | 並行 {num_workers} ({backend})"]
+    return _stage('隨機到達流量模擬', num_workers, points, notes)
+
+
+def print_estimate(title: str, stages: list) -> dict:
+    """
+    打印預估結果（每個階段的各掃描點與小計，以及整個流程的合計；各階段依序運行）
+
+    Returns:
+        dict: {'wall_sec', 'cpu_sec', 'peak_bytes'}
+    """
+    total = {
+        'wall_sec': sum(stage['wall_sec'] for stage in stages),
+        'cpu_sec': sum(stage['cpu_sec'] for stage in stages),
+        'peak_bytes': max((stage['peak_bytes'] for stage in stages), default=0),
+    }
+    print("=" * 70)
+    print(f"成本預估 (dry-run): {title}")
+    print("=" * 70)
+    for index, stage in enumerate(stages, 1):
+        print(f"\n[{index}/{len(stages)}] {stage['name']}")
+        for note in stage['notes']:
+            print(f"  {note}")
+        print(f"  {'掃描點':<12}{'牆鐘':>10}{'CPU 秒':>12}{'峰值記憶體':>14}  說明")
+        for point in stage['points']:
+            print(f"  {point['label']:<12}{format_duration(point['wall_sec']):>10}"
+                  f"{point['cpu_sec']:>12,.1f}{point['peak_bytes'] / MB:>12,.0f} MB  {point['detail']}")
+        print(f"  小計: 牆鐘 {format_duration(stage['wall_sec'])} | CPU {stage['cpu_sec'] / 3600:,.3f} 小時 | "
+              f"佔用 {stage['workers']} 個工作者 | 峰值記憶體 {stage['peak_bytes'] / MB:,.0f} MB")
+    print("\n" + "=" * 70)
+    print(f"合計: 牆鐘 {format_duration(total['wall_sec'])} | CPU {total['cpu_sec'] / 3600:,.3f} 小時 | "
+          f"峰值記憶體 {total['peak_bytes'] / MB:,.0f} MB（未計繪圖；未實際運行任何計算）")
+    print("=" * 70)
+    return total
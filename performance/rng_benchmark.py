@@ -0,0 +1,221 @@
+"""
+隨機數生成器基準測試
+
+比較各 bit generator（PCG64, PCG64DXSM, Philox, SFC64）在本項目工作負載上的吞吐量：
+- 原始抽樣: 每個 AC 的 rng.integers(0, N, size=M) 調用
+- 完整工作負載: 單進程執行群組尋呼批量模擬（與 simulate_group_paging_multi_samples 的工作進程相同）
+
+並比較 RAO 抽樣方式（integers vs packed），附帶打包抽樣的卡方均勻性檢定。
+
+Input: M, N, I_max, 樣本數
+Output: benchmark_bit_generators(), benchmark_draw_modes(), check_packed_uniformity()
+Position: 模擬引擎 RNG 選型的性能測試工具
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import time
+from math import exp, lgamma, log
+
+import numpy as np
+
+from simulation.core.rng import (
+    BIT_GENERATORS,
+    DEFAULT_BLOCK_SIZE,
+    DRAW_MODES,
+    PackedChoiceStream,
+    make_block_generator,
+    plan_sample_blocks,
+)
+from simulation.core.one_shot_access import _simulate_batch_worker
+
+
+def _measure_raw_draws(bit_generator: str, M: int, N: int, num_draws: int, seed: int) -> float:
+    """測量每秒可完成的 rng.integers(0, N, size=M) 調用次數"""
+    rng = make_block_generator(bit_generator, seed, 0)
+    start_time = time.perf_counter()
+    for _ in range(num_draws):
+        rng.integers(0, N, size=M)
+    return num_draws / (time.perf_counter() - start_time)
+
+
+def _measure_packed_draws(bit_generator: str, M: int, N: int, num_draws: int, seed: int) -> float:
+    """測量每秒可完成的 PackedChoiceStream.take(M) 調用次數"""
+    stream = PackedChoiceStream(make_block_generator(bit_generator, seed, 0), N)
+    start_time = time.perf_counter()
+    for _ in range(num_draws):
+        stream.take(M)
+    return num_draws / (time.perf_counter() - start_time)
+
+
+def _measure_workload(bit_generator: str, M: int, N: int, I_max: int, num_samples: int,
+                      block_size: int, seed: int, draw_mode: str = 'integers') -> float:
+    """測量單進程群組尋呼模擬的樣本/秒"""
+    blocks = plan_sample_blocks(num_samples, block_size)
+    start_time = time.perf_counter()
+    _simulate_batch_worker(M, N, I_max, blocks, seed, bit_generator, draw_mode=draw_mode)
+    return num_samples / (time.perf_counter() - start_time)
+
+
+def benchmark_bit_generators(M: int = 100, N: int = 20, I_max: int = 10,
+                             num_samples: int = 20000, block_size: int = DEFAULT_BLOCK_SIZE,
+                             seed: int = 0) -> list:
+    """
+    對所有支援的 bit generator 運行基準測試
+
+    Args:
+        M: 設備數
+        N: RAO 數
+        I_max: 最大 AC 數
+        num_samples: 完整工作負載的樣本數
+        block_size: 隨機數流區塊大小
+        seed: 根種子
+
+    Returns:
+        list: [{'bit_generator', 'draws_per_sec', 'samples_per_sec'}, ...]
+    """
+    print("=" * 70)
+    print("Bit Generator 基準測試")
+    print("=" * 70)
+    print(f"  參數: M={M}, N={N}, I_max={I_max}, 樣本數={num_samples:,}, 區塊={block_size}")
+    print("=" * 70)
+
+    results = []
+    for bit_generator in BIT_GENERATORS:
+        draws_per_sec = _measure_raw_draws(bit_generator, M, N, num_samples * 2, seed)
+        samples_per_sec = _measure_workload(bit_generator, M, N, I_max, num_samples, block_size, seed)
+        results.append({
+            'bit_generator': bit_generator,
+            'draws_per_sec': draws_per_sec,
+            'samples_per_sec': samples_per_sec,
+        })
+
+    baseline = results[0]['samples_per_sec']
+    print(f"  {'Generator':<12}{'抽樣 (次/秒)':>18}{'模擬 (樣本/秒)':>20}{'相對 PCG64':>14}")
+    for row in results:
+        print(f"  {row['bit_generator']:<12}{row['draws_per_sec']:>18,.0f}"
+              f"{row['samples_per_sec']:>20,.0f}{row['samples_per_sec'] / baseline:>14.2f}x")
+    print("=" * 70)
+
+    return results
+
+
+def _chi2_survival(statistic: float, dof: int) -> float:
+    """卡方分佈右尾概率 Q(dof/2, statistic/2)（正則化不完全 Gamma 函數）"""
+    a = dof / 2.0
+    x = statistic / 2.0
+    if x <= 0:
+        return 1.0
+    log_prefix = a * log(x) - x - lgamma(a)
+
+    if x < a + 1:
+        # 級數展開求 P(a, x)
+        term = total = 1.0 / a
+        n = a
+        while abs(term) > abs(total) * 1e-15:
+            n += 1
+            term *= x / n
+            total += term
+        return 1.0 - total * exp(log_prefix)
+
+    # 連分式（Lentz 方法）求 Q(a, x)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 10000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return exp(log_prefix) * h
+
+
+def check_packed_uniformity(N_values=(2, 3, 5, 20, 45, 100, 255, 256), num_draws: int = 2_000_000,
+                            bit_generator: str = 'PCG64', seed: int = 0,
+                            significance: float = 0.001) -> bool:
+    """
+    打包抽樣的卡方均勻性檢定
+
+    對每個 N 抽取 num_draws 個選擇，檢定各 RAO 的計數是否符合均勻分佈。
+    同時做「相鄰選擇對」的 N^2 格卡方檢定，確認同一 64 位整數內切出的欄位互相獨立。
+
+    Returns:
+        bool: 所有檢定的 p 值都不低於 significance
+    """
+    print("=" * 70)
+    print(f"打包抽樣均勻性檢定 (卡方, 每個 N {num_draws:,} 次抽樣, α={significance})")
+    print("=" * 70)
+
+    all_passed = True
+    for N in N_values:
+        stream = PackedChoiceStream(make_block_generator(bit_generator, seed, 0), N)
+        choices = stream.take(num_draws)
+
+        counts = np.bincount(choices, minlength=N)
+        expected = num_draws / N
+        p_single = _chi2_survival(float(((counts - expected) ** 2 / expected).sum()), N - 1)
+
+        pairs = choices[:num_draws - num_draws % 2].reshape(-1, 2)
+        pair_counts = np.bincount(pairs[:, 0] * N + pairs[:, 1], minlength=N * N)
+        pair_expected = pairs.shape[0] / (N * N)
+        p_pair = _chi2_survival(
+            float(((pair_counts - pair_expected) ** 2 / pair_expected).sum()), N * N - 1
+        )
+
+        passed = min(p_single, p_pair) >= significance
+        all_passed &= passed
+        print(f"  N={N:<4} 單值 p={p_single:.4f} | 相鄰對 p={p_pair:.4f} | {'✓ 通過' if passed else '✗ 不通過'}")
+
+    print("=" * 70)
+    return all_passed
+
+
+def benchmark_draw_modes(M: int = 100, N_values=(5, 20, 45), I_max: int = 10,
+                         num_samples: int = 20000, block_size: int = DEFAULT_BLOCK_SIZE,
+                         bit_generator: str = 'PCG64', seed: int = 0) -> list:
+    """
+    比較 RAO 抽樣方式（integers vs packed）的吞吐量
+
+    Returns:
+        list: [{'N', 'draw_mode', 'draws_per_sec', 'samples_per_sec'}, ...]
+    """
+    print("=" * 70)
+    print("RAO 抽樣方式基準測試 (integers vs packed)")
+    print("=" * 70)
+    print(f"  參數: M={M}, I_max={I_max}, 樣本數={num_samples:,}, Generator={bit_generator}")
+    print("=" * 70)
+    print(f"  {'N':<6}{'抽樣方式':<12}{'抽樣 (次/秒)':>16}{'模擬 (樣本/秒)':>18}{'加速':>10}")
+
+    results = []
+    for N in N_values:
+        baseline = None
+        for draw_mode in DRAW_MODES:
+            if draw_mode == 'packed':
+                draws_per_sec = _measure_packed_draws(bit_generator, M, N, num_samples * 2, seed)
+            else:
+                draws_per_sec = _measure_raw_draws(bit_generator, M, N, num_samples * 2, seed)
+            samples_per_sec = _measure_workload(
+                bit_generator, M, N, I_max, num_samples, block_size, seed, draw_mode
+            )
+            baseline = baseline or samples_per_sec
+            results.append({
+                'N': N,
+                'draw_mode': draw_mode,
+                'draws_per_sec': draws_per_sec,
+                'samples_per_sec': samples_per_sec,
+            })
+            print(f"  {N:<6}{draw_mode:<12}{draws_per_sec:>16,.0f}{samples_per_sec:>18,.0f}"
+                  f"{samples_per_sec / baseline:>9.2f}x")
+
+    print("=" * 70)
+    return results
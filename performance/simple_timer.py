@@ -12,6 +12,7 @@ Position: 性能監測的簡化替代方案
 """
 
 import json
+import os
 import time
 from contextlib import contextmanager
 from datetime import datetime
@@ -84,6 +85,23 @@ class SimpleTimer:
                 'duration': duration,
             })
     
+    def add_step(self, name: str, duration: float):
+        """
+        記錄一個已完成的步驟（用於並行運行、無法以 step() 包住的階段，如流水線 DAG）
+
+        Args:
+            name: 步驟名稱
+            duration: 持續時間（秒）
+        """
+        end_time = time.time()
+        self.steps.append({
+            'name': name,
+            'start_time': end_time - duration,
+            'end_time': end_time,
+            'duration': duration,
+            'children': [],
+        })
+
     def finish(self) -> float:
         """結束計時，返回總時間"""
         self.end_time = time.time()
@@ -174,8 +192,11 @@ class SimpleTimer:
         
         # 保存文件
         json_path = output_dir / 'performance_data.json'
-        with open(json_path, 'w', encoding='utf-8') as f:
+        # 臨時檔 + os.replace：同一秒內的兩次保存共用目錄時，不原地覆寫已被 gc 去重（硬連結）的文件
+        tmp_path = json_path.with_name(json_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, json_path)
         
         print(f"✅ 性能數據已保存: {json_path}")
         return str(json_path)
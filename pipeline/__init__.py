@@ -0,0 +1,21 @@
+"""
+流水線模組
+
+以 DAG 描述完整流程的各階段（解析 → 模擬 → 繪圖），階段間以記憶體傳遞數據，
+互不依賴的階段在同一 CPU 預算下並行運行，輸入未變的階段直接載入上次的輸出。
+
+Input: Stage 列表
+Output: Stage, StageStore, run_stages()
+Position: main.py 完整流程的執行層
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+from .dag import Stage, StageStore, run_stages
+
+__all__ = [
+    'Stage',
+    'StageStore',
+    'run_stages',
+]
@@ -0,0 +1,336 @@
+"""
+流水線 DAG 執行器
+
+每個階段聲明輸入（上游階段名稱）與輸出（函數的回傳值），上游的輸出直接以記憶體中的物件傳給下游，
+不再經「寫 CSV → 讀取最新時間戳目錄」交接（各階段仍照常保存 CSV，供單獨的 plot 命令使用）。
+
+- 並行: 依賴已滿足的階段同時運行（後台線程；繪圖等必須在主線程的階段在主線程運行），
+  所有階段共用一個 CPU 預算（默認為 usable_cpu_count()）。使用進程池的階段（parallel=True）
+  在啟動時按成本權重分得工作進程數：權重 / (自身 + 運行中 + 尚未開始且互不依賴的並行階段的權重和) × 預算，
+  至少 1 個、不超過剩餘預算；剩餘預算為 0 時等待。單線程的輕量階段不佔預算
+- 中斷: Ctrl-C 只送到主線程；主線程被中斷（或任一階段出錯）時以 request_stop() 通知後台階段
+  （simulation.core.cancellation），模擬與 Figure 1 的收集迴圈在各自的線程中按 Ctrl-C 處理
+  （取消未開始的任務、寫入檢查點），全部結束後才向上拋出
+- 跳過: 階段的輸入雜湊 = SHA-256(階段名稱, 參數, 相關套件的程式碼內容, 上游階段的輸入雜湊)；
+  與上次成功運行的雜湊相同時不運行，直接載入保存的輸出（result/pipeline/<階段>.json）。
+  cacheable=False 的階段（繪圖、未固定種子的模擬）每次都運行，其下游也隨之重新運行
+
+Input: Stage 列表, CPU 預算
+Output: Stage, StageStore, run_stages()
+Position: main.py 完整流程（run figure1 / figure2 / figure345 / all）的執行層
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import hashlib
+import json
+import os
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+from simulation.core.cancellation import clear_stop, request_stop
+from simulation.core.cost_model import format_duration
+from simulation.core.cpu_planner import usable_cpu_count
+
+# 項目根目錄
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# 階段輸出的保存目錄
+DEFAULT_STORE_DIR = PROJECT_ROOT / 'result' / 'pipeline'
+
+
+class Stage:
+    """
+    流水線階段
+
+    Attributes:
+        name: 階段名稱（在同一流水線中唯一）
+        func: func(inputs, workers) -> 輸出；inputs 為 {上游階段名稱: 輸出}，workers 為分得的工作進程數
+        inputs: 上游階段名稱
+        params: 決定輸出的參數（可 JSON 序列化，通常為配置字典）
+        packages: 程式碼會影響輸出的套件目錄（相對項目根目錄，如 'analytical'）
+        parallel: 是否使用進程池（按成本權重分配 CPU 預算）
+        cacheable: 輸入雜湊相同時能否跳過
+        main_thread: 是否必須在主線程運行（繪圖）
+        cost: cost() -> 預估 CPU 秒數，作為分配 CPU 預算的權重（None 表示權重 1）
+    """
+
+    def __init__(self, name: str, func, inputs: tuple = (), params: dict = None, packages: tuple = (),
+                 parallel: bool = False, cacheable: bool = True, main_thread: bool = False, cost=None):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.params = params or {}
+        self.packages = tuple(packages)
+        self.parallel = parallel
+        self.cacheable = cacheable
+        self.main_thread = main_thread
+        self.cost = cost
+
+
+def _code_fingerprint(packages: tuple) -> str:
+    """套件目錄下所有 .py 文件內容的雜湊（按相對路徑排序）"""
+    digest = hashlib.sha256()
+    for package in sorted(packages):
+        for path in sorted((PROJECT_ROOT / package).rglob('*.py')):
+            digest.update(str(path.relative_to(PROJECT_ROOT)).encode('utf-8'))
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def stage_hash(stage: Stage, upstream_hashes: list) -> str:
+    """階段的輸入雜湊；不可快取的階段附加隨機值，保證下游重新運行"""
+    canonical = json.dumps({
+        'name': stage.name,
+        'params': stage.params,
+        'code': _code_fingerprint(stage.packages),
+        'upstream': upstream_hashes,
+        'nonce': None if stage.cacheable else uuid.uuid4().hex,
+    }, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _to_json(value):
+    """numpy 純量 / 陣列轉為 Python 型別"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"無法序列化的輸出型別: {type(value).__name__}")
+
+
+class StageStore:
+    """
+    階段輸出的保存與載入（每個階段只保留最近一次成功運行的輸出）
+
+    文件以臨時檔 + os.replace 原子寫入。
+    """
+
+    def __init__(self, store_dir=None):
+        self.store_dir = Path(store_dir) if store_dir is not None else DEFAULT_STORE_DIR
+
+    def _path(self, name: str) -> Path:
+        return self.store_dir / f"{name}.json"
+
+    def load(self, name: str, input_hash: str):
+        """
+        載入輸入雜湊相同的保存輸出
+
+        Returns:
+            tuple: (是否命中, 輸出)
+        """
+        try:
+            with open(self._path(name), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False, None
+        if entry.get('input_hash') != input_hash:
+            return False, None
+        return True, entry['output']
+
+    def save(self, name: str, input_hash: str, output):
+        """保存輸出；無法 JSON 序列化時不保存（下次重新運行）"""
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(name)
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'stage': name,
+                    'input_hash': input_hash,
+                    'saved': datetime.now().isoformat(timespec='seconds'),
+                    'output': output,
+                }, f, ensure_ascii=False, default=_to_json)
+        except TypeError as e:
+            tmp_path.unlink(missing_ok=True)
+            print(f"⚠ 階段 {name} 的輸出無法保存，下次將重新運行: {e}")
+            return
+        os.replace(tmp_path, path)
+
+
+def _topological_order(stages: list) -> list:
+    """檢查名稱唯一、輸入存在且無環，回傳拓撲順序"""
+    by_name = {}
+    for stage in stages:
+        if stage.name in by_name:
+            raise ValueError(f"重複的階段名稱: {stage.name}")
+        by_name[stage.name] = stage
+    for stage in stages:
+        for name in stage.inputs:
+            if name not in by_name:
+                raise ValueError(f"階段 {stage.name} 的輸入 {name} 不存在")
+
+    order = []
+    state = {}
+
+    def visit(stage, path):
+        if state.get(stage.name) == 'done':
+            return
+        if state.get(stage.name) == 'visiting':
+            raise ValueError(f"階段依賴存在環: {' -> '.join(path + [stage.name])}")
+        state[stage.name] = 'visiting'
+        for name in stage.inputs:
+            visit(by_name[name], path + [stage.name])
+        state[stage.name] = 'done'
+        order.append(stage)
+
+    for stage in stages:
+        visit(stage, [])
+    return order
+
+
+def _ancestors(order: list) -> dict:
+    """每個階段的所有上游階段名稱"""
+    ancestors = {}
+    for stage in order:
+        ancestors[stage.name] = set(stage.inputs).union(*(ancestors[name] for name in stage.inputs))
+    return ancestors
+
+
+def run_stages(stages: list, cpu_budget: int = None, force: bool = False, store: StageStore = None,
+               timer=None) -> dict:
+    """
+    運行流水線
+
+    Args:
+        stages: Stage 列表（順序不限）
+        cpu_budget: 所有階段共用的工作進程數上限（None 表示 usable_cpu_count()）
+        force: 忽略輸入雜湊，運行所有階段
+        store: 階段輸出的保存位置（None 表示 result/pipeline/）
+        timer: 可選的 SimpleTimer，每個運行的階段記錄為一個步驟
+
+    Returns:
+        dict: {階段名稱: 輸出}
+    """
+    order = _topological_order(stages)
+    ancestors = _ancestors(order)
+    store = store or StageStore()
+    budget = cpu_budget or usable_cpu_count()
+
+    hashes = {}
+    outputs = {}
+    pending = []
+    for stage in order:
+        hashes[stage.name] = stage_hash(stage, [hashes[name] for name in stage.inputs])
+        if stage.cacheable and not force:
+            hit, output = store.load(stage.name, hashes[stage.name])
+            # 上游需要重新運行時，下游的雜湊必然不同，不會命中
+            if hit:
+                outputs[stage.name] = output
+                continue
+        pending.append(stage)
+
+    weights = {stage.name: max(stage.cost(), 1e-6) if stage.cost else 1.0
+               for stage in pending if stage.parallel}
+
+    print("=" * 70)
+    print(f"流水線: {len(order)} 個階段 | CPU 預算: {budget} 個工作進程")
+    for stage in order:
+        if stage.name in outputs:
+            status = "跳過（輸入未變，載入上次的輸出）"
+        elif stage.parallel:
+            status = f"運行（進程池，成本權重 {weights[stage.name]:,.1f}）"
+        else:
+            status = "運行（主線程）" if stage.main_thread else "運行"
+        inputs_text = f" ← {', '.join(stage.inputs)}" if stage.inputs else ""
+        print(f"  {stage.name}{inputs_text}: {status}")
+    print("=" * 70)
+
+    summary = {stage.name: {'status': 'skipped', 'workers': 0, 'seconds': 0.0}
+               for stage in order if stage.name in outputs}
+    running = {}
+    held = {}
+
+    def ready(stage):
+        return all(name in outputs for name in stage.inputs)
+
+    def allocate(stage):
+        """按成本權重分配工作進程數（0 表示需等待）"""
+        available = budget - sum(held.values())
+        if available < 1:
+            return 0
+        competing = [other.name for other in pending
+                     if other.parallel and other is not stage
+                     and other.name not in ancestors[stage.name] and stage.name not in ancestors[other.name]]
+        total = weights[stage.name] + sum(weights[name] for name in competing + list(held))
+        share = max(1, int(budget * weights[stage.name] / total))
+        return min(share, available)
+
+    def execute(stage, workers):
+        start_time = time.time()
+        output = stage.func({name: outputs[name] for name in stage.inputs}, workers)
+        return output, time.time() - start_time
+
+    def finish(stage, workers, output, seconds):
+        outputs[stage.name] = output
+        held.pop(stage.name, None)
+        summary[stage.name] = {'status': 'ran', 'workers': workers, 'seconds': seconds}
+        if stage.cacheable:
+            store.save(stage.name, hashes[stage.name], output)
+        if timer is not None:
+            timer.add_step(stage.name, seconds)
+        print(f"\n✓ 階段 {stage.name} 完成（{format_duration(seconds)}）")
+
+    start_time = time.time()
+    executor = ThreadPoolExecutor(max_workers=max(1, len(pending)))
+    clear_stop()
+    try:
+        while pending or running:
+            # 先啟動所有可在後台運行的階段，再在主線程運行一個主線程階段
+            for stage in list(pending):
+                if stage.main_thread or not ready(stage):
+                    continue
+                workers = allocate(stage) if stage.parallel else 1
+                if workers == 0:
+                    continue
+                pending.remove(stage)
+                if stage.parallel:
+                    held[stage.name] = workers
+                    print(f"\n▶ 階段 {stage.name} 開始（{workers} 個工作進程）")
+                else:
+                    print(f"\n▶ 階段 {stage.name} 開始")
+                running[executor.submit(execute, stage, workers)] = (stage, workers)
+
+            main_stage = next((stage for stage in pending if stage.main_thread and ready(stage)), None)
+            if main_stage is not None:
+                pending.remove(main_stage)
+                print(f"\n▶ 階段 {main_stage.name} 開始")
+                output, seconds = execute(main_stage, 1)
+                finish(main_stage, 1, output, seconds)
+                continue
+
+            if not running:
+                raise RuntimeError(f"無法啟動的階段: {', '.join(stage.name for stage in pending)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, workers = running.pop(future)
+                output, seconds = future.result()
+                finish(stage, workers, output, seconds)
+    except BaseException:
+        # Ctrl-C 或階段出錯：KeyboardInterrupt 只送到主線程，後台階段由停止請求在各自的收集迴圈中
+        # 拋出 KeyboardInterrupt（取消未開始的任務、寫入檢查點），等它們結束後再向上拋出
+        if running:
+            names = ', '.join(stage.name for stage, _ in running.values())
+            print(f"\n⚠ 流水線中斷，等待運行中的階段停止: {names}")
+            request_stop()
+            wait(running)
+        raise
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        clear_stop()
+
+    elapsed = time.time() - start_time
+    busy = sum(entry['seconds'] for entry in summary.values())
+    print("\n" + "=" * 70)
+    print(f"流水線完成! 牆鐘 {format_duration(elapsed)} | 各階段耗時總和 {format_duration(busy)}")
+    for stage in order:
+        entry = summary[stage.name]
+        if entry['status'] == 'skipped':
+            print(f"  {stage.name}: 跳過")
+        else:
+            workers_text = f" | {entry['workers']} 個工作進程" if stage.parallel else ""
+            print(f"  {stage.name}: {format_duration(entry['seconds'])}{workers_text}")
+    print("=" * 70)
+    return outputs
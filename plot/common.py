@@ -4,13 +4,16 @@
 Matplotlib 配置和共用繪圖工具函數。
 
 Input: matplotlib 配置參數
-Output: setup_figure(), save_figure(), show_figure() 等
+Output: setup_figure(), write_figure(), save_figure(), show_figure() 等
 Position: 繪圖模組的基礎設施
 
 注意：一旦此文件被更新，請同步更新：
 - 項目根目錄 README.md
 """
 
+import os
+from pathlib import Path
+
 import matplotlib
 import matplotlib.pyplot as plt
 
@@ -31,9 +34,21 @@ def setup_figure(figsize=(10, 6)):
     return fig, ax
 
 
+def write_figure(fig, filepath, dpi=300):
+    """
+    寫入圖檔：先寫臨時檔再 os.replace
+
+    結果目錄會被 gc 以硬連結去重，原地覆寫（如同一秒內重繪到同一時間戳目錄）會同時改變所有引用同一對象的運行。
+    """
+    filepath = Path(filepath)
+    tmp_path = filepath.with_name(filepath.name + '.tmp')
+    fig.savefig(tmp_path, dpi=dpi, bbox_inches='tight', format=filepath.suffix.lstrip('.') or None)
+    os.replace(tmp_path, filepath)
+
+
 def save_figure(fig, filepath, dpi=300):
     """保存圖表"""
-    fig.savefig(filepath, dpi=dpi, bbox_inches='tight')
+    write_figure(fig, filepath, dpi)
     print(f"✓ 圖表已保存: {filepath}")
 
 
@@ -21,7 +21,7 @@ Position: Figure 1 可視化
 
 import matplotlib.pyplot as plt
 import numpy as np
-from .common import extract_n_values_from_data
+from .common import extract_n_values_from_data, write_figure
 
 
 def plot_figure1(data: dict, data_type: str = 'analytical', save_path: str = None, show: bool = False):
@@ -180,7 +180,7 @@ def plot_figure1(data: dict, data_type: str = 'analytical', save_path: str = Non
     plt.subplots_adjust(bottom=0.08, top=0.95)
     
     if save_path:
-        fig.savefig(save_path, dpi=300, bbox_inches='tight')
+        write_figure(fig, save_path)
         print(f"✓ Figure 1 已保存: {save_path}")
     
     if show:
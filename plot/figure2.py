@@ -20,7 +20,7 @@ Position: Figure 2 可視化
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.gridspec import GridSpec
-from .common import extract_n_values_from_data
+from .common import extract_n_values_from_data, write_figure
 
 
 def plot_figure2(data: dict, save_path: str = None, show: bool = False):
@@ -146,7 +146,7 @@ def plot_figure2(data: dict, save_path: str = None, show: bool = False):
     plt.subplots_adjust(bottom=0.08, top=0.95)
     
     if save_path:
-        fig.savefig(save_path, dpi=300, bbox_inches='tight')
+        write_figure(fig, save_path)
         print(f"✓ Figure 2 已保存: {save_path}")
     
     if show:
@@ -15,6 +15,7 @@ Position: Figure 3, 4, 5 可視化
 
 import matplotlib.pyplot as plt
 import numpy as np
+from .common import write_figure
 
 
 def plot_figure3(analytical_data: dict = None, simulation_data: dict = None, save_path: str = None, show: bool = False):
@@ -84,7 +85,7 @@ def plot_figure3(analytical_data: dict = None, simulation_data: dict = None, sav
     plt.tight_layout()
     
     if save_path:
-        fig.savefig(save_path, dpi=300, bbox_inches='tight')
+        write_figure(fig, save_path)
         print(f"✓ Figure 3 已保存: {save_path}")
     
     if show:
@@ -158,7 +159,7 @@ def plot_figure4(analytical_data: dict = None, simulation_data: dict = None, sav
     plt.tight_layout()
     
     if save_path:
-        fig.savefig(save_path, dpi=300, bbox_inches='tight')
+        write_figure(fig, save_path)
         print(f"✓ Figure 4 已保存: {save_path}")
     
     if show:
@@ -232,7 +233,7 @@ def plot_figure5(analytical_data: dict = None, simulation_data: dict = None, sav
     plt.tight_layout()
     
     if save_path:
-        fig.savefig(save_path, dpi=300, bbox_inches='tight')
+        write_figure(fig, save_path)
         print(f"✓ Figure 5 已保存: {save_path}")
     
     if show:
@@ -3,25 +3,41 @@
 
 提供蒙特卡洛模擬功能。
 
+導出的名稱在第一次訪問時才導入對應子模組（PEP 562 模組 __getattr__）：
+多進程工作進程導入 simulation.core.one_shot_access 等子模組時，
+不會因為本套件而連帶導入流量引擎、分佈式模組等不需要的依賴。
+
 Input: 系統參數（M, N, I_max, num_samples）
-Output: simulate_one_shot_access_single_ac(), simulate_group_paging_multi_samples()
+Output: simulate_one_shot_access_single_ac(), simulate_group_paging_multi_samples(),
+        simulate_traffic_multi_samples()
 Position: 蒙特卡洛模擬的統一入口
 
 注意：一旦此文件被更新，請同步更新：
 - 項目根目錄 README.md
 """
 
-from .core.one_shot_access import (
-    simulate_one_shot_access_single_ac,
-    simulate_group_paging_single_sample,
-    simulate_group_paging_multi_samples,
-)
-from .core.metrics import calculate_performance_metrics
+import importlib
+
+# 導出名稱 -> 定義它的子模組
+_EXPORTS = {
+    'simulate_one_shot_access_single_ac': '.core.one_shot_access',
+    'simulate_group_paging_single_sample': '.core.one_shot_access',
+    'simulate_group_paging_multi_samples': '.core.one_shot_access',
+    'calculate_performance_metrics': '.core.metrics',
+    'simulate_one_shot_access_batch': '.core.one_shot_access',
+    'simulate_traffic_multi_samples': '.core.traffic',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
 
-__all__ = [
-    'simulate_one_shot_access_single_ac',
-    'simulate_group_paging_single_sample',
-    'simulate_group_paging_multi_samples',
-    'calculate_performance_metrics',
-]
 
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
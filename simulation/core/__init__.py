@@ -3,25 +3,49 @@
 
 提供底層模擬引擎和性能指標計算。
 
+導出的名稱在第一次訪問時才導入對應子模組（PEP 562 模組 __getattr__），
+工作進程只導入模擬核心用到的子模組（見 worker_bootstrap.py）。
+
 Input: M, N, I_max, num_samples 參數
-Output: simulate_one_shot_access_single_ac(), simulate_group_paging_multi_samples()
+Output: simulate_one_shot_access_single_ac(), simulate_group_paging_multi_samples(), calibrate_group_paging_cost(),
+        simulate_traffic_multi_samples(), tallies_to_results()
 Position: 模擬系統的核心引擎
 
 注意：一旦此文件被更新，請同步更新：
 - 項目根目錄 README.md
 """
 
-from .one_shot_access import (
-    simulate_one_shot_access_single_ac,
-    simulate_group_paging_single_sample,
-    simulate_group_paging_multi_samples,
-)
-from .metrics import calculate_performance_metrics
+import importlib
+
+# 導出名稱 -> 定義它的子模組
+_EXPORTS = {
+    'simulate_one_shot_access_single_ac': '.one_shot_access',
+    'simulate_group_paging_single_sample': '.one_shot_access',
+    'simulate_group_paging_multi_samples': '.one_shot_access',
+    'calibrate_group_paging_cost': '.one_shot_access',
+    'calculate_performance_metrics': '.metrics',
+    'simulate_one_shot_access_batch': '.one_shot_access',
+    'simulate_traffic_multi_samples': '.traffic',
+    'compact_tally_dtype': '.metrics',
+    'tallies_to_results': '.metrics',
+    'MetricsAccumulator': '.metrics',
+    'ResultCache': '.result_cache',
+    'ResultShard': '.shards',
+    'SharedResultBuffer': '.shared_buffer',
+    'Coordinator': '.cluster',
+    'run_worker': '.cluster',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
 
-__all__ = [
-    'simulate_one_shot_access_single_ac',
-    'simulate_group_paging_single_sample',
-    'simulate_group_paging_multi_samples',
-    'calculate_performance_metrics',
-]
 
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,103 @@
+"""
+並行執行後端（進程池 / 線程池）
+
+- process: ProcessPoolExecutor，每個工作進程需啟動解釋器、導入模組，參數與結果經 pickle 傳遞
+- thread: ThreadPoolExecutor，無啟動與 pickle 開銷；在 free-threaded（無 GIL）的 Python 3.13t
+  上可完全並行，在一般構建上只有釋放 GIL 的部分（NumPy 大型運算、numba nogil 核心）能並行
+- auto: 解釋器運行在無 GIL 模式時使用 thread，否則使用 process
+
+線程後端下各任務不能共用同一個 Generator：批量模擬的每個區塊本來就有獨立隨機數流，
+未傳入 rng 的單次模擬使用 rng.thread_local_generator()。
+
+進程池的啟動方式與工作進程初始化見 worker_bootstrap.py。
+
+Input: backend 名稱, 並行數
+Output: BACKENDS, gil_disabled(), resolve_backend(), make_executor()
+Position: simulate_group_paging_multi_samples 與解析計算 _parallel_compute 的執行器選擇
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .cpu_planner import acquire_blas_limit, release_blas_limit
+from .worker_bootstrap import DEFAULT_START_METHOD, init_worker, worker_context
+
+# 支援的執行後端
+BACKENDS = ('process', 'thread', 'auto')
+DEFAULT_BACKEND = 'auto'
+
+
+def gil_disabled() -> bool:
+    """當前解釋器是否運行在無 GIL（free-threaded）模式"""
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def resolve_backend(backend: str = DEFAULT_BACKEND) -> str:
+    """
+    解析實際使用的執行後端
+
+    Args:
+        backend: 'process' | 'thread' | 'auto'（auto 表示無 GIL 時用線程）
+
+    Returns:
+        str: 'process' 或 'thread'
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"未知的執行後端: {backend}（支援: {', '.join(BACKENDS)}）")
+    if backend == 'auto':
+        return 'thread' if gil_disabled() else 'process'
+    return backend
+
+
+class _BlasLimitedProcessPool(ProcessPoolExecutor):
+    """存續期間父進程的 BLAS 線程數環境變數設為 1 的進程池（工作進程按需啟動時繼承；關閉時恢復原值）"""
+
+    def __init__(self, *args, **kwargs):
+        acquire_blas_limit()
+        self._blas_limited = True
+        try:
+            super().__init__(*args, **kwargs)
+        except BaseException:
+            self._release_blas()
+            raise
+
+    def _release_blas(self):
+        if self._blas_limited:
+            self._blas_limited = False
+            release_blas_limit()
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        try:
+            super().shutdown(wait=wait, cancel_futures=cancel_futures)
+        finally:
+            self._release_blas()
+
+
+def make_executor(backend: str, max_workers: int, start_method: str = DEFAULT_START_METHOD,
+                  engine: str = 'numpy', pin_cpus: list = None):
+    """
+    建立執行器
+
+    Args:
+        backend: 'process' | 'thread' | 'auto'
+        max_workers: 並行數
+        start_method: 進程啟動方式 'auto' | 'fork' | 'forkserver' | 'spawn'（僅進程池）
+        engine: 工作進程初始化時預熱的模擬引擎
+        pin_cpus: 把工作進程輪流綁定到這些 CPU（None 表示不綁核，僅進程池）
+
+    Returns:
+        concurrent.futures.Executor: ThreadPoolExecutor 或 ProcessPoolExecutor
+    """
+    if resolve_backend(backend) == 'thread':
+        return ThreadPoolExecutor(max_workers=max_workers)
+    context = worker_context(start_method)
+    pin_counter = context.Value('i', 0) if pin_cpus else None
+    # 工作進程在啟動時繼承環境變數，BLAS 線程數必須在它們導入 numpy 之前設定（見 cpu_planner.acquire_blas_limit）
+    return _BlasLimitedProcessPool(
+        max_workers=max_workers, mp_context=context,
+        initializer=init_worker, initargs=(engine, pin_cpus, pin_counter)
+    )
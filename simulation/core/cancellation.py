@@ -0,0 +1,44 @@
+"""
+跨線程的停止請求
+
+Ctrl-C（SIGINT）的 KeyboardInterrupt 只送到主線程。流水線（pipeline/dag.py）在後台線程運行的階段
+收不到它，因此主線程被中斷時調用 request_stop()；長時間運行的收集迴圈以 STOP_POLL_SEC 為間隔
+調用 raise_if_stopped()，在自己的線程中拋出 KeyboardInterrupt，走與前台 Ctrl-C 相同的清理路徑
+（取消尚未開始的任務、寫入檢查點）。
+
+停止請求是進程內全局的，由發出請求的一方在結束時 clear_stop()。
+
+Input: 無
+Output: request_stop(), clear_stop(), stop_requested(), raise_if_stopped(), STOP_POLL_SEC
+Position: chunk_runner 與 figure1_analysis 收集迴圈的中斷點，由 pipeline/dag.py 觸發
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import threading
+
+# 收集迴圈等待任務完成時檢查停止請求的間隔（秒）
+STOP_POLL_SEC = 0.2
+
+_stop_event = threading.Event()
+
+
+def request_stop():
+    """請求所有收集迴圈停止（在它們各自的線程中拋出 KeyboardInterrupt）"""
+    _stop_event.set()
+
+
+def clear_stop():
+    """清除停止請求"""
+    _stop_event.clear()
+
+
+def stop_requested() -> bool:
+    return _stop_event.is_set()
+
+
+def raise_if_stopped():
+    """已請求停止時拋出 KeyboardInterrupt"""
+    if _stop_event.is_set():
+        raise KeyboardInterrupt
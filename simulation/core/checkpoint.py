@@ -0,0 +1,96 @@
+"""
+長時間掃描的檢查點（checkpoint）模組
+
+掃描過程中把每個 N 點的結果分片（ResultShard：累加器 + 已完成的隨機數流區塊）定期寫入磁碟。
+中斷（Ctrl-C、斷電、被終止）後以 resume 重新運行時，已完成的點直接使用，
+部分完成的點只模擬尚未完成的區塊；由於每個區塊的隨機數流固定，續跑結果與不中斷運行的樣本完全相同。
+
+檢查點文件以臨時檔 + os.replace 原子寫入，中途被終止也不會損壞上一份檢查點。
+
+Input: 檢查點路徑, 掃描元數據 (seed, num_samples), 每個 N 點的 ResultShard
+Output: SweepCheckpoint
+Position: 模擬執行層的容錯基礎設施
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import os
+import json
+import time
+from pathlib import Path
+from datetime import datetime
+
+from .shards import ResultShard
+
+# 項目根目錄
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# 默認檢查點目錄與寫入間隔
+DEFAULT_CHECKPOINT_DIR = PROJECT_ROOT / 'result' / 'checkpoint'
+DEFAULT_CHECKPOINT_INTERVAL = 60
+
+
+class SweepCheckpoint:
+    """
+    掃描檢查點：掃描元數據 + {N: ResultShard}
+
+    用法:
+        checkpoint = SweepCheckpoint.load(path) or SweepCheckpoint(path, meta)
+        checkpoint.shards[N] = shard
+        checkpoint.maybe_save()            # 距上次寫入超過 interval 秒才寫入
+        checkpoint.save()                  # 立即寫入（N 點完成、Ctrl-C 時）
+        checkpoint.clear()                 # 掃描完成後刪除
+    """
+
+    def __init__(self, path, meta: dict, interval: float = DEFAULT_CHECKPOINT_INTERVAL):
+        self.path = Path(path)
+        self.meta = meta
+        self.interval = interval
+        self.shards = {}
+        self._last_save = time.time()
+
+    @classmethod
+    def load(cls, path, interval: float = DEFAULT_CHECKPOINT_INTERVAL):
+        """
+        載入檢查點
+
+        Returns:
+            SweepCheckpoint: 找不到或文件損壞時返回 None
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        checkpoint = cls(path, data['meta'], interval)
+        checkpoint.shards = {
+            int(N): ResultShard.from_dict(shard) for N, shard in data['shards'].items()
+        }
+        return checkpoint
+
+    def save(self):
+        """立即寫入檢查點（原子替換）"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'meta': self.meta,
+            'saved': datetime.now().isoformat(timespec='seconds'),
+            'shards': {str(N): shard.to_dict() for N, shard in self.shards.items()},
+        }
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._last_save = time.time()
+
+    def maybe_save(self) -> bool:
+        """距上次寫入超過 interval 秒時寫入，返回是否寫入"""
+        if time.time() - self._last_save < self.interval:
+            return False
+        self.save()
+        return True
+
+    def clear(self):
+        """刪除檢查點文件（掃描完成後調用）"""
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,234 @@
+"""
+分塊並行執行器
+
+群組尋呼（one_shot_access.py）與隨機到達流量（traffic.py）兩個引擎共用的多樣本執行路徑：
+1. 規劃: CPU / 後端（cpu_planner.py, backend.py）、可選的每樣本成本校準與分塊數估計
+   （chunk_scheduler.py）、記憶體預算下的串流 / 逐樣本結果模式（memory_planner.py）
+2. 執行: 同時在途的分塊數不超過 max_in_flight，完成一個補交一個；分塊在提交時才由
+   ChunkScheduler 切出，工作進程回傳緊湊整數計數（或寫入共享記憶體緩衝區）
+3. 歸約: 串流模式下逐分塊併入 MetricsAccumulator，否則按起始行拼接後一次轉換為比率
+
+引擎只需提供工作函數 worker(blocks=..., out=...)（可 pickle，通常為頂層函數的 functools.partial）
+與計數 → 比率的歸約參數；Ctrl-C（或在後台線程運行時收到 request_stop()，見 cancellation.py）時
+取消尚未開始的分塊，已完成的分塊已通過 on_chunk_done 交給調用方。
+
+Input: 工作函數, 樣本區塊列表, 計數型別, 並行 / 記憶體 / 分塊參數
+Output: run_sample_chunks()
+Position: simulate_group_paging_multi_samples 與 simulate_traffic_multi_samples 的共用執行器
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import time
+import numpy as np
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, wait
+from tqdm import tqdm
+
+from .backend import DEFAULT_BACKEND, make_executor, resolve_backend
+from .cancellation import STOP_POLL_SEC, raise_if_stopped
+from .chunk_scheduler import (
+    DEFAULT_TARGET_TASK_SEC,
+    ChunkScheduler,
+    describe_report,
+    estimate_chunk_count,
+    worker_id,
+)
+from .cost_model import effective_workers, format_duration, remaining_seconds, simulation_wall_seconds
+from .cpu_planner import describe_plan, plan_workers
+from .memory_planner import describe_memory_plan, plan_memory
+from .metrics import MetricsAccumulator, tallies_to_results
+from .rng import DEFAULT_BLOCK_SIZE
+from .shared_buffer import SharedResultBuffer
+from .worker_bootstrap import DEFAULT_START_METHOD
+
+
+def _timed_chunk(worker, blocks: list, out: tuple = None):
+    """
+    在工作進程中執行一個分塊並計時（供自適應分塊調度使用）
+
+    Returns:
+        tuple: (worker 的回傳值, 耗時秒數, 工作者標識)
+    """
+    start_time = time.perf_counter()
+    result = worker(blocks=blocks, out=out)
+    return result, time.perf_counter() - start_time, worker_id()
+
+
+def run_sample_chunks(worker, blocks: list, tally_dtype, num_devices: int, total_rao_count: int,
+                      num_workers: int, title: str, describe: list = (),
+                      engine: str = 'numpy', calibrate=None,
+                      block_size: int = DEFAULT_BLOCK_SIZE,
+                      return_tallies: bool = False, keep_samples: bool = False,
+                      on_chunk_done=None, shared_memory: bool = False,
+                      result_buffer: SharedResultBuffer = None,
+                      backend: str = DEFAULT_BACKEND,
+                      start_method: str = DEFAULT_START_METHOD,
+                      pin_workers: bool = False,
+                      max_memory_mb: float = None,
+                      target_task_sec: float = DEFAULT_TARGET_TASK_SEC):
+    """
+    並行執行樣本區塊並歸約結果
+
+    Args:
+        worker: 工作函數 worker(blocks=[(block_id, block_length), ...], out=(buffer_spec, row_offset) 或 None)，
+                回傳 Shape [batch_size, 3] 的 tally_dtype 計數；給定 out 時寫入共享記憶體緩衝區並回傳 batch_size
+        blocks: 待模擬的樣本區塊 [(block_id, block_length), ...]（已排除 skip_blocks）
+        tally_dtype: 工作函數回傳的計數型別（compact_tally_dtype）
+        num_devices / total_rao_count: 計數 → 比率的分母（見 tallies_to_results）
+        num_workers: 並行工作進程數 (-1 表示使用所有可用 CPU，按親和性與 cgroup 配額計算)
+        title: 標題橫幅
+        describe: 標題下方的參數說明行
+        engine: 已解析的模擬引擎（決定工作進程初始化時是否預載 JIT 核心）
+        calibrate: calibrate() 在父進程校準每樣本成本，回傳 calibrate_per_sample_cost 的結果；
+                   target_task_sec 為 None 時不調用
+        其餘參數: 見 simulate_group_paging_multi_samples
+
+    Returns:
+        np.ndarray | MetricsAccumulator: 見 simulate_group_paging_multi_samples
+    """
+    backend = resolve_backend(backend)
+    cpu_plan = plan_workers(num_workers, pin_workers)
+    num_workers = cpu_plan['workers']
+    num_samples = sum(length for _, length in blocks)
+    keep_samples = keep_samples or return_tallies or result_buffer is not None
+    if not blocks:
+        # 所有區塊都已完成（從檢查點續跑已完成的點）：回傳型別與正常運行一致
+        if keep_samples:
+            return np.empty((0, 3), dtype=tally_dtype if return_tallies else np.float64)
+        return MetricsAccumulator()
+
+    # 校準：以獨立的隨機數流（根種子 0）在父進程估計每樣本成本，結果丟棄
+    calibration = None
+    num_chunks = num_workers * 4
+    if target_task_sec:
+        calibration = calibrate()
+        num_chunks = estimate_chunk_count(num_samples, calibration[0], target_task_sec, num_workers)
+
+    memory_plan = plan_memory(
+        num_samples, block_size, num_workers, tally_dtype, num_chunks, max_memory_mb,
+        keep_samples=keep_samples,
+        shared_memory=shared_memory or result_buffer is not None, backend=backend
+    )
+    streaming = memory_plan['mode'] == 'stream'
+    scheduler = ChunkScheduler(
+        blocks, num_workers, calibration[0] if calibration else None, target_task_sec,
+        memory_plan['num_chunks'], memory_plan['max_chunk_samples']
+    )
+
+    # 共享記憶體緩衝區只在保留逐樣本結果時使用（串流模式沒有常駐結果可寫入）
+    owns_buffer = shared_memory and result_buffer is None and not streaming
+    if result_buffer is not None:
+        if (result_buffer.shape[0] < num_samples or result_buffer.shape[1:] != (3,)
+                or result_buffer.dtype != tally_dtype):
+            raise ValueError(
+                f"結果緩衝區 {result_buffer.shape} {result_buffer.dtype} 不符合需求 "
+                f"({num_samples}, 3) {np.dtype(tally_dtype)}"
+            )
+        buffer_bytes = result_buffer.nbytes
+    else:
+        buffer_bytes = num_samples * 3 * np.dtype(tally_dtype).itemsize if owns_buffer else None
+
+    print("=" * 70)
+    print(title)
+    print("=" * 70)
+    for line in describe:
+        print(f"  {line}")
+    worker_kind = '線程' if backend == 'thread' else '進程'
+    chunk_text = f"自動 (約 {memory_plan['num_chunks']} 個)" if scheduler.dynamic else f"{memory_plan['num_chunks']}"
+    print(f"  樣本數: {num_samples:,} | {worker_kind}: {num_workers} | 分塊: {chunk_text} | 引擎: {engine}")
+    if calibration:
+        per_sample_sec, calibration_samples, calibration_sec = calibration
+        print(f"  校準: {calibration_samples} 樣本 {calibration_sec * 1000:.0f} ms → {per_sample_sec * 1000:.3f} ms/樣本 | "
+              f"目標任務時長 {target_task_sec:g} 秒 | 預估總計算 {per_sample_sec * num_samples:,.1f} 秒 | "
+              f"預估牆鐘 {format_duration(simulation_wall_seconds(num_samples, per_sample_sec, effective_workers(cpu_plan), backend=backend))}")
+    print(f"  {describe_plan(cpu_plan, worker_kind)}")
+    if buffer_bytes is not None:
+        print(f"  結果緩衝區: 共享記憶體 {buffer_bytes / 1024**2:,.1f} MB ({np.dtype(tally_dtype)})")
+    print(f"  {describe_memory_plan(memory_plan, num_workers)}")
+    print("=" * 70)
+
+    parallelism = effective_workers(cpu_plan)
+
+    def update_eta(pbar):
+        if scheduler.per_sample_sec is not None:
+            eta = remaining_seconds((num_samples - pbar.n) * scheduler.per_sample_sec, parallelism)
+            pbar.set_postfix_str(f"剩餘 {format_duration(eta)}")
+
+    start_time = time.time()
+    chunk_results = {}
+    accumulator = MetricsAccumulator() if streaming else None
+
+    # 自行分配的緩衝區在 with 結束時釋放；此前所有指向它的視圖都已在區塊內用完（見 shared_buffer.py）
+    buffer_context = (SharedResultBuffer.create((num_samples, 3), tally_dtype) if owns_buffer
+                      else nullcontext(result_buffer))
+    with buffer_context as result_buffer:
+        pin_cpus = cpu_plan['affinity_cpus'] if pin_workers else None
+        with make_executor(backend, num_workers, start_method, engine, pin_cpus) as executor:
+            # 提交任務：同時在途的分塊數不超過 max_in_flight，完成一個補交一個；
+            # 分塊在提交時才切出，大小按當前的每樣本成本估計決定
+            future_to_chunk = {}
+
+            # 收集結果（按起始行放回，保證與完成順序無關）
+            try:
+                # 剩餘時間由成本模型給出（剩餘樣本 × 當前每樣本成本 / 並行數，見 cost_model.py）
+                with tqdm(total=num_samples, desc="模擬進度", unit="樣本",
+                          bar_format='{desc}: {percentage:3.0f}%|{bar}| {n:,}/{total:,} [{elapsed}{postfix}]') as pbar:
+                    update_eta(pbar)
+                    while future_to_chunk or scheduler.has_next():
+                        # 後台線程收不到 Ctrl-C：流水線以 request_stop() 通知（見 cancellation.py）
+                        raise_if_stopped()
+                        while scheduler.has_next() and len(future_to_chunk) < memory_plan['max_in_flight']:
+                            chunk, row_offset = scheduler.next_chunk()
+                            future = executor.submit(
+                                _timed_chunk, worker, chunk,
+                                (result_buffer.spec, row_offset) if result_buffer is not None else None
+                            )
+                            future_to_chunk[future] = (chunk, row_offset)
+                        done, _ = wait(future_to_chunk, timeout=STOP_POLL_SEC, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            chunk, row_offset = future_to_chunk.pop(future)
+                            batch_res, task_sec, task_worker = future.result()
+                            chunk_size = sum(length for _, length in chunk)
+                            scheduler.record(chunk_size, task_sec, task_worker)
+                            if not streaming and result_buffer is None:
+                                chunk_results[row_offset] = batch_res
+                            if on_chunk_done is not None or streaming:
+                                if result_buffer is not None:
+                                    # 複製該分塊的計數，不在本幀保留指向緩衝區的視圖
+                                    batch_res = result_buffer.array[row_offset:row_offset + chunk_size].copy()
+                                chunk_rates = tallies_to_results(batch_res, num_devices, total_rao_count)
+                                if streaming:
+                                    accumulator.merge(MetricsAccumulator.from_results(chunk_rates))
+                                if on_chunk_done is not None:
+                                    on_chunk_done(chunk, chunk_rates)
+                                del chunk_rates
+                            pbar.update(chunk_size)
+                            update_eta(pbar)
+                            del batch_res
+            except KeyboardInterrupt:
+                # Ctrl-C：取消尚未開始的分塊，已完成的分塊已通過 on_chunk_done 交給調用方
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        if streaming:
+            final_results = accumulator
+        elif result_buffer is None:
+            final_tallies = np.vstack([chunk_results.pop(row) for row in sorted(chunk_results)])
+            final_results = final_tallies if return_tallies else tallies_to_results(final_tallies, num_devices, total_rao_count)
+            del final_tallies
+        elif not return_tallies:
+            final_results = tallies_to_results(result_buffer.array[:num_samples], num_devices, total_rao_count)
+        elif owns_buffer:
+            final_results = result_buffer.array[:num_samples].copy()  # 內部緩衝區在 with 結束時釋放
+        else:
+            final_results = result_buffer.array[:num_samples]  # 調用方的緩衝區：零複製視圖
+    elapsed = time.time() - start_time
+
+    print("=" * 70)
+    print(f"  完成! 耗時: {elapsed:.2f}s | 速度: {num_samples/elapsed:,.0f} 樣本/秒")
+    print(f"  {describe_report(scheduler.report(elapsed))}")
+    print("=" * 70)
+
+    return final_results
@@ -0,0 +1,178 @@
+"""
+自適應分塊調度
+
+固定的「CPU 核心數 × 4」分塊在兩端都不理想：小 N（每個樣本的 AC 數多、成本高）時分塊過大，
+最後幾個分塊拖慢整體；便宜的參數點上分塊過小，IPC 與調度開銷佔主導。
+
+本模組以目標任務時長決定分塊大小：
+1. 校準: 在父進程以獨立的隨機數流跑一小批樣本（樣本數倍增到耗時超過 CALIBRATION_MIN_SEC），
+   估計當前 (M, N, I_max, engine) 的每樣本成本；結果丟棄，不影響正式樣本
+2. 動態分塊: 分塊不再預先切好，而是在提交時按目標時長切出下一個分塊；
+   每個分塊完成後以工作進程實測的耗時更新每樣本成本（自動修正校準的偏差與超額訂閱）；
+   剩餘樣本不足時分塊按剩餘量 / (2 × 工作進程數) 縮小，讓尾部任務同時結束
+3. 報告: 任務數、任務耗時分佈、各工作進程忙碌時間的最大 / 平均比與並行效率
+
+分塊的最小粒度是一個樣本區塊（rng.py），分塊如何切分不影響結果（每個區塊的隨機數流固定）。
+
+Input: 樣本區塊列表, 工作進程數, 校準函數, 目標任務時長
+Output: calibrate_per_sample_cost(), estimate_chunk_count(), ChunkScheduler, describe_report()
+Position: simulate_group_paging_multi_samples 的分塊調度
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import math
+import os
+import threading
+import time
+
+from .rng import split_blocks
+
+# 默認目標任務時長（秒）
+DEFAULT_TARGET_TASK_SEC = 1.0
+
+# 校準批次的最短耗時（秒）與樣本數範圍
+CALIBRATION_MIN_SEC = 0.05
+CALIBRATION_START_SAMPLES = 16
+
+
+def worker_id() -> str:
+    """執行任務的工作進程 / 線程標識"""
+    return f"{os.getpid()}:{threading.get_ident()}"
+
+
+def calibrate_per_sample_cost(run_batch, max_samples: int) -> tuple:
+    """
+    估計每樣本成本
+
+    先跑一個樣本預熱（numba 引擎的 JIT 載入、首次分配），再把樣本數倍增到耗時超過 CALIBRATION_MIN_SEC。
+
+    Args:
+        run_batch: run_batch(num_samples) 以獨立隨機數流模擬一批樣本（結果丟棄）
+        max_samples: 校準樣本數上限（通常為一個區塊）
+
+    Returns:
+        tuple: (每樣本秒數, 校準樣本數, 校準耗時秒數)
+    """
+    run_batch(1)
+    samples = min(CALIBRATION_START_SAMPLES, max_samples)
+    while True:
+        start_time = time.perf_counter()
+        run_batch(samples)
+        elapsed = time.perf_counter() - start_time
+        if elapsed >= CALIBRATION_MIN_SEC or samples >= max_samples:
+            return max(elapsed, 1e-9) / samples, samples, elapsed
+        samples = min(max_samples, samples * 2)
+
+
+def estimate_chunk_count(num_samples: int, per_sample_sec: float, target_task_sec: float,
+                         num_workers: int) -> int:
+    """按目標任務時長估計分塊數（至少為工作進程數）"""
+    return max(num_workers, math.ceil(num_samples * per_sample_sec / target_task_sec))
+
+
+class ChunkScheduler:
+    """
+    分塊調度器
+
+    按順序從樣本區塊中切出分塊；target_task_sec 為 None 時使用預先切好的固定分塊。
+
+    Attributes:
+        per_sample_sec: 當前的每樣本成本估計（校準值，之後由實測耗時更新）
+        tasks: 已完成任務的記錄 [{'samples', 'seconds', 'worker'}, ...]
+    """
+
+    def __init__(self, blocks: list, num_workers: int, per_sample_sec: float = None,
+                 target_task_sec: float = None, num_chunks: int = None, max_chunk_samples: int = None):
+        self.blocks = blocks
+        self.num_workers = num_workers
+        self.per_sample_sec = per_sample_sec
+        self.target_task_sec = target_task_sec
+        self.max_chunk_samples = max_chunk_samples
+        self.total_samples = sum(length for _, length in blocks)
+        self.fixed_chunks = None if target_task_sec else split_blocks(blocks, num_chunks or num_workers * 4)
+        self.next_fixed = 0
+        self.next_block = 0
+        self.next_row = 0
+        self.tasks = []
+        self._busy_samples = 0
+        self._busy_seconds = 0.0
+
+    @property
+    def dynamic(self) -> bool:
+        return self.fixed_chunks is None
+
+    def has_next(self) -> bool:
+        return self.next_block < len(self.blocks)
+
+    def _next_num_blocks(self) -> int:
+        """按目標任務時長決定下一個動態分塊的區塊數（至少一個區塊）"""
+        remaining = self.total_samples - self.next_row
+        samples = self.target_task_sec / self.per_sample_sec
+        # 尾部縮小分塊：讓最後一批任務大致同時結束
+        samples = min(samples, remaining / (2 * self.num_workers))
+        if self.max_chunk_samples is not None:
+            samples = min(samples, self.max_chunk_samples)
+        num_blocks = 0
+        taken = 0
+        for _, length in self.blocks[self.next_block:]:
+            if num_blocks and taken + length > samples:
+                break
+            num_blocks += 1
+            taken += length
+        return num_blocks
+
+    def next_chunk(self) -> tuple:
+        """
+        切出下一個分塊
+
+        Returns:
+            tuple: (區塊列表, 在結果矩陣中的起始行)
+        """
+        if self.dynamic:
+            num_blocks = self._next_num_blocks()
+        else:
+            num_blocks = len(self.fixed_chunks[self.next_fixed])
+            self.next_fixed += 1
+        chunk = self.blocks[self.next_block:self.next_block + num_blocks]
+        row_offset = self.next_row
+        self.next_block += num_blocks
+        self.next_row += sum(length for _, length in chunk)
+        return chunk, row_offset
+
+    def record(self, samples: int, seconds: float, worker: str):
+        """記錄一個完成的任務，並以累計實測耗時更新每樣本成本"""
+        self.tasks.append({'samples': samples, 'seconds': seconds, 'worker': worker})
+        self._busy_samples += samples
+        self._busy_seconds += seconds
+        self.per_sample_sec = self._busy_seconds / self._busy_samples
+
+    def report(self, wall_seconds: float) -> dict:
+        """
+        負載均衡報告
+
+        Returns:
+            dict: {'tasks', 'min_task_sec', 'mean_task_sec', 'max_task_sec',
+                   'imbalance'（各工作者忙碌時間 最大 / 平均）, 'efficiency'（忙碌總和 / (工作者數 × 牆鐘)）}
+        """
+        durations = [task['seconds'] for task in self.tasks]
+        busy = {}
+        for task in self.tasks:
+            busy[task['worker']] = busy.get(task['worker'], 0.0) + task['seconds']
+        mean_busy = sum(busy.values()) / self.num_workers if busy else 0.0
+        return {
+            'tasks': len(durations),
+            'min_task_sec': min(durations, default=0.0),
+            'mean_task_sec': sum(durations) / len(durations) if durations else 0.0,
+            'max_task_sec': max(durations, default=0.0),
+            'imbalance': max(busy.values()) / mean_busy if mean_busy > 0 else 1.0,
+            'efficiency': sum(busy.values()) / (self.num_workers * wall_seconds) if wall_seconds > 0 else 0.0,
+        }
+
+
+def describe_report(report: dict) -> str:
+    """負載均衡報告的單行描述（用於打印）"""
+    return (f"負載均衡: {report['tasks']} 個任務 | 任務耗時 {report['min_task_sec']:.2f} / "
+            f"{report['mean_task_sec']:.2f} / {report['max_task_sec']:.2f} 秒 (最小/平均/最大) | "
+            f"忙碌時間 最大/平均 {report['imbalance']:.2f} | 並行效率 {report['efficiency']:.0%}")
@@ -0,0 +1,379 @@
+"""
+多機分佈式模擬：協調器（coordinator）與 TCP 工作節點（worker）
+
+協調器把掃描切分為 (N 點, 樣本區塊組) 任務，通過純 TCP + 換行分隔 JSON 協議分發給工作節點；
+工作節點用本機所有核心模擬任務中的區塊，回傳該任務的 MetricsAccumulator，由協調器合併。
+
+協議（每條消息一行 JSON）:
+    worker → {"type": "hello", "host", "pid", "engines"}
+    worker → {"type": "request"}
+    coord  → {"type": "task", "task_id", "params", "seed", "blocks"}
+           | {"type": "wait", "seconds"}      # 暫無待分配任務，但仍有任務在執行
+           | {"type": "done"}                 # 全部完成（或掃描因錯誤停止），工作節點退出
+    worker → {"type": "result", "task_id", "accumulator"}
+    worker → {"type": "error", "task_id", "message"}
+
+容錯: 工作節點斷線（進程被殺、網路中斷）時，其手上的任務立即重新排隊；
+任務執行超過 task_timeout 秒也會重新分配，先回傳的結果生效，重複結果被忽略。
+任務在工作節點上拋出異常（或節點不支援其引擎）時回傳 error 並繼續領取任務；
+同一任務失敗或隨斷線丟失達 max_attempts 次時協調器停止掃描並拋出 RuntimeError，不會無限重試。
+每個區塊的隨機數流只由 (seed, block_id) 決定，因此重新分配不影響結果。
+
+協議沒有認證，只應在受信任的網路內使用（默認只監聽 127.0.0.1）。
+
+Input: 任務列表 [{'params', 'seed', 'blocks'}], 監聽地址
+Output: Coordinator, run_worker(), parse_address()
+Position: simulate_group_paging_multi_samples 的多機擴展
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import os
+import json
+import time
+import socket
+import threading
+import socketserver
+from collections import deque
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+
+from tqdm import tqdm
+
+from .backend import make_executor
+from .cpu_planner import usable_cpu_count
+from .jit_kernel import NUMBA_AVAILABLE
+from .metrics import MetricsAccumulator, tallies_to_results
+from .one_shot_access import _simulate_batch_worker
+from .rng import DEFAULT_DRAW_MODE, split_blocks
+
+# 默認監聽地址與任務超時
+DEFAULT_LISTEN = '127.0.0.1:5555'
+DEFAULT_TASK_TIMEOUT = 600
+
+# 同一任務最多嘗試的次數（失敗與斷線丟失都計入；超時重新分配不計入）
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+def parse_address(address: str, default_host: str = '127.0.0.1'):
+    """
+    解析 'host:port'（或只有 ':port' / 'port'）
+
+    Returns:
+        tuple: (host, port)
+    """
+    host, _, port = str(address).rpartition(':')
+    return host or default_host, int(port)
+
+
+def _send(wfile, message: dict):
+    """發送一條 JSON 消息（二進制流，UTF-8 + 換行）"""
+    wfile.write((json.dumps(message, ensure_ascii=False) + '\n').encode('utf-8'))
+    wfile.flush()
+
+
+class _CoordinatorHandler(socketserver.StreamRequestHandler):
+    """每個工作節點連線一個處理線程"""
+
+    def handle(self):
+        coordinator = self.server.coordinator
+        conn_id = coordinator._register()
+        name = f"{self.client_address[0]}:{self.client_address[1]}"
+        try:
+            for line in self.rfile:
+                message = json.loads(line)
+                kind = message.get('type')
+                if kind == 'hello':
+                    name = f"{message.get('host')} (pid {message.get('pid')})"
+                    coordinator._log(f"工作節點已連線: {name}")
+                elif kind == 'request':
+                    _send(self.wfile, coordinator._assign(conn_id))
+                elif kind == 'result':
+                    coordinator._complete(conn_id, message['task_id'],
+                                          MetricsAccumulator.from_dict(message['accumulator']))
+                elif kind == 'error':
+                    coordinator._log(f"工作節點 {name} 任務 {message.get('task_id')} 失敗: {message.get('message')}")
+                    coordinator._fail(conn_id, message['task_id'], message.get('message'))
+        except (ConnectionError, json.JSONDecodeError, OSError):
+            pass
+        finally:
+            requeued = coordinator._release(conn_id)
+            note = f"，{requeued} 個任務重新排隊" if requeued else ""
+            coordinator._log(f"工作節點已斷線: {name}{note}")
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class Coordinator:
+    """
+    任務協調器
+
+    用法:
+        coordinator = Coordinator(tasks, listen='0.0.0.0:5555', on_result=callback)
+        coordinator.run()      # 阻塞直到所有任務完成；on_result(task, accumulator) 在完成時調用
+
+    on_result 在狀態鎖之外調用（慢的回調不會阻塞其他工作節點的分配與斷線處理），
+    並以獨立的回調鎖串行化，回調內無需自行加鎖；run() 在最後一個回調返回後才結束。
+    同一任務失敗（error 消息或節點斷線）達 max_attempts 次時 run() 拋出 RuntimeError。
+    """
+
+    def __init__(self, tasks: list, listen: str = DEFAULT_LISTEN, on_result=None,
+                 task_timeout: float = DEFAULT_TASK_TIMEOUT, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.tasks = {task_id: task for task_id, task in enumerate(tasks)}
+        self.listen = listen
+        self.on_result = on_result
+        self.task_timeout = task_timeout
+        self.max_attempts = max_attempts
+        self.address = None
+
+        self._lock = threading.Condition()
+        self._callback_lock = threading.Lock()
+        self._pending = deque(self.tasks)
+        self._in_flight = {}          # task_id -> (conn_id, start_time)
+        self._done = set()            # 已收到結果的任務（用於忽略重複結果）
+        self._failures = {}           # task_id -> 失敗 / 斷線丟失次數
+        self._reported = 0            # on_result 已返回的任務數
+        self._error = None
+        self._next_conn = 0
+        self._completed_samples = 0
+
+    def _log(self, text: str):
+        tqdm.write(f"  [coordinator] {text}")
+
+    def _register(self) -> int:
+        with self._lock:
+            self._next_conn += 1
+            return self._next_conn
+
+    def _assign(self, conn_id: int) -> dict:
+        """為工作節點分配下一個任務"""
+        with self._lock:
+            if self._error is not None:
+                return {'type': 'done'}  # 掃描已停止：讓工作節點退出
+            while self._pending:
+                task_id = self._pending.popleft()
+                if task_id in self._done:
+                    continue
+                self._in_flight[task_id] = (conn_id, time.time())
+                task = self.tasks[task_id]
+                return {'type': 'task', 'task_id': task_id, 'params': task['params'],
+                        'seed': task['seed'], 'blocks': task['blocks']}
+            if len(self._done) == len(self.tasks):
+                return {'type': 'done'}
+            return {'type': 'wait', 'seconds': 1.0}
+
+    def _complete(self, conn_id: int, task_id: int, accumulator: MetricsAccumulator):
+        """接收任務結果（重複結果忽略）；先在鎖內登記，再在鎖外調用 on_result"""
+        with self._lock:
+            self._in_flight.pop(task_id, None)
+            if task_id in self._done:
+                return
+            self._done.add(task_id)
+
+        try:
+            if self.on_result is not None:
+                with self._callback_lock:
+                    self.on_result(self.tasks[task_id], accumulator)
+        except Exception as e:
+            with self._lock:
+                self._error = e
+                self._lock.notify_all()
+            raise
+
+        with self._lock:
+            self._reported += 1
+            self._completed_samples += accumulator.num_samples
+            self._lock.notify_all()
+
+    def _record_failure(self, task_id: int, reason: str) -> bool:
+        """
+        記錄一次失敗（調用方持有 _lock）；未達 max_attempts 時回傳 True，
+        否則設置 _error 讓 run() 停止掃描
+        """
+        self._failures[task_id] = self._failures.get(task_id, 0) + 1
+        if self._failures[task_id] < self.max_attempts:
+            return True
+        if self._error is None:
+            self._error = RuntimeError(
+                f"任務 {task_id} 已失敗 {self._failures[task_id]} 次，停止掃描: {reason}"
+            )
+        return False
+
+    def _fail(self, conn_id: int, task_id: int, reason: str):
+        """工作節點回報任務失敗：未達嘗試上限時放回隊尾（優先讓其他節點嘗試）"""
+        with self._lock:
+            owner, _ = self._in_flight.get(task_id, (None, None))
+            if owner != conn_id or task_id in self._done:
+                return  # 已重新分配（超時）或已由其他節點完成
+            del self._in_flight[task_id]
+            if self._record_failure(task_id, reason):
+                self._pending.append(task_id)
+            self._lock.notify_all()
+
+    def _release(self, conn_id: int) -> int:
+        """工作節點斷線：把它手上未完成的任務放回隊首（計入該任務的嘗試次數）"""
+        with self._lock:
+            lost = [task_id for task_id, (owner, _) in self._in_flight.items() if owner == conn_id]
+            for task_id in lost:
+                del self._in_flight[task_id]
+                if self._record_failure(task_id, "工作節點斷線"):
+                    self._pending.appendleft(task_id)
+            self._lock.notify_all()
+            return len(lost)
+
+    def _requeue_timeouts(self) -> int:
+        """執行超過 task_timeout 的任務重新排隊（原節點之後回傳的結果仍可被接受）"""
+        now = time.time()
+        with self._lock:
+            expired = [task_id for task_id, (_, start) in self._in_flight.items()
+                       if now - start > self.task_timeout]
+            for task_id in expired:
+                del self._in_flight[task_id]
+                self._pending.append(task_id)
+            return len(expired)
+
+    def run(self):
+        """啟動服務並阻塞直到所有任務完成"""
+        host, port = parse_address(self.listen)
+        server = _ThreadingServer((host, port), _CoordinatorHandler)
+        server.coordinator = self
+        self.address = f"{host}:{server.server_address[1]}"
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        total_samples = sum(length for task in self.tasks.values() for _, length in task['blocks'])
+        print(f"  協調器監聽: {self.address} | 任務: {len(self.tasks)} | 樣本: {total_samples:,}")
+        print(f"  啟動工作節點: python main.py worker --connect {self.address}")
+
+        try:
+            with tqdm(total=total_samples, desc="分佈式進度", unit="樣本",
+                      bar_format='{desc}: {percentage:3.0f}%|{bar}| {n:,}/{total:,} [{elapsed}<{remaining}]') as pbar:
+                while True:
+                    with self._lock:
+                        self._lock.wait(timeout=1.0)
+                        if self._error is not None:
+                            raise self._error
+                        finished = self._reported == len(self.tasks)
+                        pbar.update(self._completed_samples - pbar.n)
+                    if finished:
+                        break
+                    expired = self._requeue_timeouts()
+                    if expired:
+                        self._log(f"{expired} 個任務超時，重新分配")
+        finally:
+            # 給仍在詢問的工作節點一點時間收到 'done'
+            time.sleep(0.5)
+            server.shutdown()
+            server.server_close()
+
+
+def _run_task(task: dict, executor: Executor, num_workers: int) -> MetricsAccumulator:
+    """在本機進程池中執行一個任務的所有區塊"""
+    params = task['params']
+    M, N, I_max = params['M'], params['N'], params['I_max']
+    blocks = [tuple(block) for block in task['blocks']]
+    futures = [
+        executor.submit(
+            _simulate_batch_worker, M, N, I_max, chunk, task['seed'], params['bit_generator'],
+            params['barring_factor'], params['barring_time'], params['engine'],
+            params['draw_mode'] or DEFAULT_DRAW_MODE
+        )
+        for chunk in split_blocks(blocks, num_workers)
+    ]
+    accumulator = MetricsAccumulator()
+    for future in futures:
+        accumulator.merge(MetricsAccumulator.from_results(
+            tallies_to_results(future.result(), M, I_max * N)
+        ))
+    return accumulator
+
+
+def run_worker(address: str, num_workers: int = -1, connect_timeout: float = 60.0) -> int:
+    """
+    作為工作節點連線到協調器並執行任務，直到協調器通知完成
+
+    Args:
+        address: 協調器地址 'host:port'
+        num_workers: 本機並行進程數 (-1 表示使用所有 CPU 核心)
+        connect_timeout: 連線重試的總時長（秒），允許先啟動工作節點
+
+    Returns:
+        int: 完成的任務數
+    """
+    host, port = parse_address(address)
+    if num_workers == -1:
+        num_workers = usable_cpu_count()
+
+    deadline = time.time() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection((host, port), timeout=10)
+            break
+        except OSError:
+            if time.time() > deadline:
+                raise ConnectionError(f"無法連線到協調器 {host}:{port}")
+            time.sleep(1.0)
+    sock.settimeout(None)
+
+    print("=" * 70)
+    print("【Worker】分佈式模擬工作節點")
+    print("=" * 70)
+    print(f"  協調器: {host}:{port} | 本機進程: {num_workers}")
+    print("=" * 70)
+
+    rfile = sock.makefile('rb')
+    wfile = sock.makefile('wb')
+    engines = ['numpy', 'numba'] if NUMBA_AVAILABLE else ['numpy']
+    _send(wfile, {'type': 'hello', 'host': socket.gethostname(), 'pid': os.getpid(), 'engines': engines})
+
+    completed = 0
+    start_time = time.time()
+    try:
+        with make_executor('process', num_workers, engine=engines[-1]) as executor:
+            while True:
+                _send(wfile, {'type': 'request'})
+                line = rfile.readline()
+                if not line:
+                    break  # 協調器已關閉
+                message = json.loads(line)
+
+                if message['type'] == 'done':
+                    break
+                if message['type'] == 'wait':
+                    time.sleep(message.get('seconds', 1.0))
+                    continue
+
+                if message['params']['engine'] not in engines:
+                    # 交由其他節點執行；協調器按嘗試次數決定是否停止掃描
+                    _send(wfile, {'type': 'error', 'task_id': message['task_id'],
+                                  'message': f"本機不支援引擎 {message['params']['engine']}"})
+                    continue
+
+                try:
+                    accumulator = _run_task(message, executor, num_workers)
+                except BrokenProcessPool as e:
+                    # 本機工作進程異常終止：通知協調器重新分配後退出
+                    _send(wfile, {'type': 'error', 'task_id': message['task_id'], 'message': str(e)})
+                    print(f"  ✗ 本機進程池異常，退出: {e}")
+                    break
+                except Exception as e:
+                    # 任務本身出錯（參數、模擬核心）：回報協調器後繼續領取任務
+                    _send(wfile, {'type': 'error', 'task_id': message['task_id'],
+                                  'message': f"{type(e).__name__}: {e}"})
+                    print(f"  ✗ 任務 {message['task_id']} 失敗: {type(e).__name__}: {e}")
+                    continue
+                _send(wfile, {'type': 'result', 'task_id': message['task_id'],
+                              'accumulator': accumulator.to_dict()})
+                completed += 1
+                print(f"  ✓ 任務 {message['task_id']} (N={message['params']['N']}, "
+                      f"{accumulator.num_samples:,} 樣本)")
+    except (ConnectionError, OSError):
+        print("  ⚠ 與協調器的連線中斷")
+    finally:
+        sock.close()
+
+    print(f"  完成 {completed} 個任務, 耗時 {time.time() - start_time:.1f}s")
+    return completed
@@ -0,0 +1,208 @@
+"""
+容器與 CPU 親和性感知的工作進程規劃
+
+os.cpu_count() 回傳主機的核心數；在 Kubernetes / Docker 容器中，進程實際可用的 CPU
+受兩者限制：
+- CPU 親和性（sched_getaffinity，cpuset / taskset）: 可以運行的核心集合
+- cgroup CPU 配額（v2: cpu.max；v1: cpu.cfs_quota_us / cpu.cfs_period_us）: 可用的 CPU 時間
+
+num_workers = -1 時以兩者的較小值作為工作進程數，避免超額訂閱。
+工作進程內的 BLAS / OpenMP 線程數固定為 1（每個進程已佔用一個核心，再開線程只會互相爭搶），
+並可選擇把每個工作進程綁定到親和性集合中的一個核心。
+
+工作進程在啟動時繼承父進程的環境變數，BLAS 線程數必須在它們導入 numpy 之前設定；進程池按需啟動工作進程，
+因此父進程在進程池存續期間（acquire_blas_limit 到 release_blas_limit）設定這些變數，關閉後恢復原值，
+不影響 CLI 之後啟動的其他子進程。多個進程池同時存在時（流水線的並行階段）以引用計數在最後一個關閉時恢復。
+
+Input: 請求的工作進程數, 是否綁核
+Output: usable_cpu_count(), plan_workers(), describe_plan(), limit_blas_threads(), acquire_blas_limit(),
+        release_blas_limit(), pin_current_worker()
+Position: simulate_group_paging_multi_samples 與 _parallel_compute 的並行度規劃
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import os
+import threading
+from pathlib import Path
+
+# 控制 BLAS / OpenMP 線程池大小的環境變數
+BLAS_THREAD_VARS = (
+    'OMP_NUM_THREADS',
+    'OPENBLAS_NUM_THREADS',
+    'MKL_NUM_THREADS',
+    'BLIS_NUM_THREADS',
+    'VECLIB_MAXIMUM_THREADS',
+    'NUMEXPR_NUM_THREADS',
+)
+
+CGROUP_ROOT = Path('/sys/fs/cgroup')
+
+# 父進程中限制 BLAS 線程數的進程池數量，以及限制前的原值（None 表示原本未設定）
+_blas_lock = threading.Lock()
+_blas_users = 0
+_blas_saved = {}
+
+
+def affinity_cpus() -> list:
+    """
+    當前進程可運行的 CPU 編號（不支援 sched_getaffinity 的平台回傳 0..cpu_count-1）
+
+    Returns:
+        list: 排序後的 CPU 編號
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _cgroup_paths() -> dict:
+    """從 /proc/self/cgroup 讀取各 cgroup 控制器的路徑 {controller: path}，v2 的鍵為 ''"""
+    paths = {}
+    try:
+        with open('/proc/self/cgroup', 'r', encoding='utf-8') as f:
+            for line in f:
+                _, controllers, path = line.rstrip('\n').split(':', 2)
+                for controller in controllers.split(','):
+                    paths[controller] = path
+    except (OSError, ValueError):
+        pass
+    return paths
+
+
+def _read_text(path: Path):
+    try:
+        return path.read_text(encoding='utf-8').strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit():
+    """
+    cgroup CPU 配額（以 CPU 數計，如 2.5）
+
+    依次嘗試 cgroup v2 的 cpu.max 與 v1 的 cpu.cfs_quota_us / cpu.cfs_period_us；
+    容器內通常掛載在根目錄，因此每個版本都先試進程所屬路徑，再試根路徑。
+
+    Returns:
+        float: 配額對應的 CPU 數；沒有配額或無法讀取時回傳 None
+    """
+    paths = _cgroup_paths()
+
+    # cgroup v2: "max 100000" 或 "200000 100000"
+    if '' in paths:
+        for directory in (CGROUP_ROOT / paths[''].lstrip('/'), CGROUP_ROOT):
+            content = _read_text(directory / 'cpu.max')
+            if content:
+                quota, _, period = content.partition(' ')
+                if quota == 'max':
+                    return None
+                return int(quota) / int(period or 100000)
+
+    # cgroup v1: quota = -1 表示不限制
+    if 'cpu' in paths:
+        for mount in ('cpu', 'cpu,cpuacct'):
+            for directory in (CGROUP_ROOT / mount / paths['cpu'].lstrip('/'), CGROUP_ROOT / mount):
+                quota = _read_text(directory / 'cpu.cfs_quota_us')
+                period = _read_text(directory / 'cpu.cfs_period_us')
+                if quota is not None and period is not None:
+                    return int(quota) / int(period) if int(quota) > 0 else None
+    return None
+
+
+def usable_cpu_count() -> int:
+    """
+    實際可用的 CPU 數：min(親和性集合大小, cgroup 配額向下取整)，至少為 1
+    """
+    return plan_workers()['usable_cpus']
+
+
+def plan_workers(num_workers: int = -1, pin_workers: bool = False) -> dict:
+    """
+    規劃工作進程數
+
+    Args:
+        num_workers: 請求的工作進程數（-1 表示使用全部可用 CPU）
+        pin_workers: 是否把工作進程綁定到單個核心
+
+    Returns:
+        dict: {'workers', 'usable_cpus', 'affinity_cpus', 'cgroup_limit', 'host_cpus', 'pin_workers'}
+    """
+    cpus = affinity_cpus()
+    limit = cgroup_cpu_limit()
+    usable = len(cpus) if limit is None else min(len(cpus), max(1, int(limit)))
+    return {
+        'workers': usable if num_workers == -1 else num_workers,
+        'usable_cpus': usable,
+        'affinity_cpus': cpus,
+        'cgroup_limit': limit,
+        'host_cpus': os.cpu_count() or 1,
+        'pin_workers': pin_workers,
+    }
+
+
+def describe_plan(plan: dict, worker_kind: str = '進程') -> str:
+    """規劃結果的單行描述（用於打印）"""
+    limit = plan['cgroup_limit']
+    limit_text = f"{limit:g}" if limit is not None else "無"
+    text = (f"CPU 規劃: {plan['workers']} 個{worker_kind} | 可用 CPU {plan['usable_cpus']} "
+            f"(親和性 {len(plan['affinity_cpus'])}, cgroup 配額 {limit_text}, 主機 {plan['host_cpus']}) | "
+            f"BLAS 線程 1 | 綁核: {'是' if plan['pin_workers'] else '否'}")
+    if plan['workers'] > plan['usable_cpus']:
+        text += f" | ⚠ 超額訂閱 ({plan['workers']} > {plan['usable_cpus']})"
+    return text
+
+
+def limit_blas_threads():
+    """把當前進程的 BLAS / OpenMP 線程數環境變數設為 1（工作進程初始化時調用）"""
+    for name in BLAS_THREAD_VARS:
+        os.environ[name] = '1'
+
+
+def acquire_blas_limit():
+    """進程池建立時調用：保存原值並把 BLAS / OpenMP 線程數設為 1，供之後啟動的工作進程繼承"""
+    global _blas_users
+    with _blas_lock:
+        if _blas_users == 0:
+            _blas_saved.clear()
+            _blas_saved.update({name: os.environ.get(name) for name in BLAS_THREAD_VARS})
+            limit_blas_threads()
+        _blas_users += 1
+
+
+def release_blas_limit():
+    """進程池關閉時調用：最後一個進程池關閉後恢復原值"""
+    global _blas_users
+    with _blas_lock:
+        if _blas_users == 0:
+            return
+        _blas_users -= 1
+        if _blas_users == 0:
+            for name, value in _blas_saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+            _blas_saved.clear()
+
+
+def pin_current_worker(cpus: list, counter) -> int:
+    """
+    把當前工作進程綁定到 cpus 中的一個核心（按啟動順序輪流分配）
+
+    Args:
+        cpus: 可用的 CPU 編號
+        counter: 進程間共享的計數器 multiprocessing.Value('i')
+
+    Returns:
+        int: 綁定的 CPU 編號；平台不支援時回傳 -1
+    """
+    if not cpus or not hasattr(os, 'sched_setaffinity'):
+        return -1
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+    cpu = cpus[index % len(cpus)]
+    os.sched_setaffinity(0, {cpu})
+    return cpu
@@ -0,0 +1,80 @@
+"""
+JIT 編譯模擬核心（可選，依賴 numba）
+
+把整個「樣本 × AC」迴圈（RAO 抽樣、佔用計數、結果統計）編譯成機器碼，
+避免 NumPy 在小 M、N（如論文的 M=100, N=5..45）下每個 AC 的臨時陣列與調度開銷。
+
+numba 是可選依賴：未安裝時 NUMBA_AVAILABLE 為 False，
+resolve_engine() 會自動退回 NumPy 引擎。兩個引擎模擬同一隨機過程，
+結果在統計上一致（但隨機數流不同，數值不會逐位相同）。
+
+numba 在第一次調用 simulate_batch_jit 時才導入，numpy 引擎的工作進程無需承擔其導入時間。
+核心（numba_kernel.py）以 nogil=True 編譯，線程池後端下多個線程可真正並行；numba 的內建 RNG 狀態為線程局部，
+因此每個區塊 np.random.seed(block_seed) 之後的隨機數流與所在線程無關。
+
+安裝: pip install numba  （或 uv sync --extra jit）
+
+Input: M, N, I_max, 輸出計數陣列, seed, ACB 參數
+Output: NUMBA_AVAILABLE, resolve_engine(), simulate_batch_jit()
+Position: simulate_group_paging_multi_samples 的可選高速後端
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import importlib.util
+
+import numpy as np
+
+# 只檢查 numba 是否已安裝，不導入：numba 的導入耗時較長，
+# 核心（numba_kernel.py）在第一次調用 simulate_batch_jit 時才導入
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
+
+
+# 支援的模擬引擎
+ENGINES = ('numpy', 'numba', 'auto')
+
+
+def resolve_engine(engine: str) -> str:
+    """
+    解析實際使用的模擬引擎
+
+    Args:
+        engine: 'numpy' | 'numba' | 'auto'（auto 表示有 numba 就用）
+
+    Returns:
+        str: 'numpy' 或 'numba'
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"未知的模擬引擎: {engine}（支援: {', '.join(ENGINES)}）")
+
+    if engine == 'numpy':
+        return 'numpy'
+    if NUMBA_AVAILABLE:
+        return 'numba'
+    if engine == 'numba':
+        print("⚠ 未安裝 numba，退回 NumPy 引擎（pip install numba 以啟用 JIT 核心）")
+    return 'numpy'
+
+
+def simulate_batch_jit(M: int, N: int, I_max: int, out: np.ndarray, seed: int,
+                       barring_factor: float = 1.0, barring_time: int = 0) -> np.ndarray:
+    """
+    使用 JIT 核心執行一批樣本模擬
+
+    Args:
+        out: Shape [batch_size, 3] 的整數陣列（可為工作進程結果的切片），
+             寫入 (成功設備數, 成功延遲總和, 碰撞 RAO 數)
+
+    Returns:
+        np.ndarray: out
+    """
+    if not NUMBA_AVAILABLE:
+        raise RuntimeError("numba 未安裝，無法使用 JIT 核心")
+
+    from .numba_kernel import group_paging_batch_kernel
+
+    group_paging_batch_kernel(
+        M, N, I_max, np.uint32(seed), barring_factor, barring_time, out
+    )
+    return out
@@ -0,0 +1,157 @@
+"""
+記憶體預算感知的分塊規劃
+
+批量模擬的記憶體由三部分組成：
+- 基線: 父進程當前常駐記憶體 + 每個工作進程的解釋器與 numpy（僅進程池）
+- 常駐結果: 逐樣本結果矩陣。默認路徑保留各分塊的整數計數、np.vstack 拼接後再轉為 float64 比率，
+  約為每樣本 2 × 計數 + 48 bytes；共享記憶體模式省去一份計數
+- 在途分塊: 每個已提交、結果尚未歸約的分塊（工作進程的計數陣列、pickle 位元組、父進程解包後的副本，
+  以及歸約時的 float64 暫存）
+
+結果模式: 調用方需要逐樣本結果（keep_samples）時保留逐樣本結果（materialize），否則串流累加（stream）：
+每個分塊歸約後立即併入 MetricsAccumulator 並丟棄，沒有常駐結果，預估峰值總是不高於 materialize，
+因此不論是否給定預算都是默認模式。
+
+給定 max_memory_mb 時按以下順序收緊，直到預估峰值不超過預算：
+1. 把分塊切小（分塊數加倍，最小為一個樣本區塊）
+2. 減少同時在途的分塊數（低於工作進程數時並行度受限）
+仍然放不下時拋出 MemoryError。
+
+Input: 樣本數, 區塊大小, 工作進程數, 計數型別, 記憶體預算
+Output: plan_memory(), describe_memory_plan(), process_rss_bytes()
+Position: simulate_group_paging_multi_samples 的分塊與在途任務數規劃
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import math
+
+import numpy as np
+
+MB = 1024 ** 2
+
+# 工作進程的基線常駐記憶體（解釋器 + numpy + 模擬核心，實測約 30~45 MB）
+WORKER_BASELINE_BYTES = 48 * MB
+
+# 每個樣本 float64 比率結果與歸約暫存的位元組數（結果 3 x 8 + tallies_to_results 暫存約 3 x 8）
+RESULT_BYTES_PER_SAMPLE = 48
+
+# 在途分塊歸約時的額外暫存（on_chunk_done 的比率矩陣與 MetricsAccumulator.from_results 的欄位副本）
+REDUCE_BYTES_PER_SAMPLE = 72
+
+# 同時在途的分塊數默認為工作進程數的 2 倍（保持工作進程不閒置，動態分塊也能及時按實測成本調整）
+IN_FLIGHT_PER_WORKER = 2
+
+
+def process_rss_bytes() -> int:
+    """當前進程的常駐記憶體（讀取 /proc/self/status；不支援的平台回傳 0）"""
+    try:
+        with open('/proc/self/status', 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def _estimate(num_samples: int, chunk_samples: int, max_in_flight: int, tally_bytes: int,
+              mode: str, shared_memory: bool, baseline: int) -> dict:
+    """給定分塊與在途數，估算各部分記憶體"""
+    if mode == 'stream':
+        resident = 0
+    elif shared_memory:
+        resident = num_samples * (tally_bytes + RESULT_BYTES_PER_SAMPLE)
+    else:
+        resident = num_samples * (2 * tally_bytes + RESULT_BYTES_PER_SAMPLE)
+    # 共享記憶體模式下工作進程直接寫入緩衝區，在途分塊只有歸約暫存
+    per_sample = REDUCE_BYTES_PER_SAMPLE + (0 if shared_memory and mode != 'stream' else 3 * tally_bytes)
+    in_flight = max_in_flight * chunk_samples * per_sample
+    return {
+        'baseline_bytes': baseline,
+        'resident_bytes': resident,
+        'in_flight_bytes': in_flight,
+        'peak_bytes': baseline + resident + in_flight,
+    }
+
+
+def plan_memory(num_samples: int, block_size: int, num_workers: int, tally_dtype,
+                num_chunks: int, max_memory_mb: float = None, keep_samples: bool = False,
+                shared_memory: bool = False, backend: str = 'process') -> dict:
+    """
+    規劃分塊數、同時在途的分塊數與結果模式
+
+    Args:
+        num_samples: 樣本數
+        block_size: 樣本區塊大小（分塊的最小粒度）
+        num_workers: 工作進程 / 線程數
+        tally_dtype: 整數計數型別（compact_tally_dtype）
+        num_chunks: 不受記憶體限制時的分塊數
+        max_memory_mb: 記憶體預算（MB，None 表示不限制，只估算峰值）
+        keep_samples: 調用方需要逐樣本結果（keep_samples / return_tallies / result_buffer）時保留，否則串流累加
+        shared_memory: 結果是否寫入共享記憶體緩衝區
+        backend: 'process' | 'thread'（線程池沒有工作進程的基線記憶體）
+
+    Returns:
+        dict: {'mode': 'materialize' | 'stream', 'num_chunks', 'max_chunk_samples', 'max_in_flight',
+               'budget_bytes', 'baseline_bytes', 'resident_bytes', 'in_flight_bytes', 'peak_bytes'}
+              （max_chunk_samples 為預算允許的最大分塊樣本數，不限制時為 None）
+    """
+    tally_bytes = 3 * np.dtype(tally_dtype).itemsize
+    num_blocks = max(1, math.ceil(num_samples / block_size))
+    baseline = process_rss_bytes() + (num_workers * WORKER_BASELINE_BYTES if backend == 'process' else 0)
+
+    def chunk_samples(chunks):
+        return min(num_samples, math.ceil(num_blocks / chunks) * block_size)
+
+    num_chunks = max(1, min(num_chunks, num_blocks))
+    mode = 'materialize' if keep_samples else 'stream'
+    chunks = num_chunks
+    in_flight = min(chunks, IN_FLIGHT_PER_WORKER * num_workers)
+    if max_memory_mb is None:
+        plan = {'mode': mode, 'num_chunks': chunks, 'max_chunk_samples': None,
+                'max_in_flight': in_flight, 'budget_bytes': None}
+        plan.update(_estimate(num_samples, chunk_samples(chunks), in_flight, tally_bytes,
+                              mode, shared_memory, baseline))
+        return plan
+
+    budget = int(max_memory_mb * MB)
+    while True:
+        estimate = _estimate(num_samples, chunk_samples(chunks), in_flight, tally_bytes,
+                             mode, shared_memory, baseline)
+        if estimate['peak_bytes'] <= budget:
+            plan = {'mode': mode, 'num_chunks': chunks, 'max_chunk_samples': chunk_samples(chunks),
+                    'max_in_flight': in_flight, 'budget_bytes': budget}
+            plan.update(estimate)
+            return plan
+        if chunks < num_blocks:
+            chunks = min(num_blocks, chunks * 2)
+            in_flight = min(chunks, IN_FLIGHT_PER_WORKER * num_workers)
+        elif in_flight > 1:
+            per_chunk = max(1, estimate['in_flight_bytes'] // in_flight)
+            room = budget - estimate['baseline_bytes'] - estimate['resident_bytes']
+            in_flight = max(1, min(in_flight - 1, room // per_chunk))
+        else:
+            break
+
+    hint = "（需要逐樣本結果，無法改用串流累加）" if keep_samples else ""
+    raise MemoryError(
+        f"記憶體預算 {max_memory_mb:,.0f} MB 不足{hint}：最小分塊（{block_size} 樣本）、"
+        f"單一在途分塊時預估峰值仍為 {estimate['peak_bytes'] / MB:,.1f} MB"
+    )
+
+
+def describe_memory_plan(plan: dict, num_workers: int) -> str:
+    """規劃結果的單行描述（用於打印）"""
+    budget = plan['budget_bytes']
+    budget_text = f"{budget / MB:,.0f} MB" if budget is not None else "不限"
+    mode_text = '串流累加（不保留逐樣本結果）' if plan['mode'] == 'stream' else '逐樣本結果'
+    text = (f"記憶體: 預估峰值 {plan['peak_bytes'] / MB:,.1f} MB / 預算 {budget_text} "
+            f"(基線 {plan['baseline_bytes'] / MB:,.1f}, 結果 {plan['resident_bytes'] / MB:,.1f}, "
+            f"在途 {plan['in_flight_bytes'] / MB:,.1f}) | 模式: {mode_text}")
+    if budget is not None:
+        text += f" | 同時在途分塊: {plan['max_in_flight']}"
+        if plan['max_in_flight'] < num_workers:
+            text += " ⚠ 並行度受記憶體限制"
+    return text
@@ -3,8 +3,16 @@
 
 計算模擬結果的統計指標和置信區間。
 
-Input: 模擬結果數組 [num_samples, 3]
-Output: calculate_performance_metrics() 返回均值和 95% 置信區間
+工作進程以原始整數計數（成功設備數、成功延遲總和、碰撞 RAO 數）回傳結果，
+使用能容納上限的最窄無符號整數型別（uint8/uint16/uint32），
+比率 (P_S, T_a, P_C) 只在歸約時由 tallies_to_results() 計算。
+
+MetricsAccumulator 以 (樣本數, 均值, 平方偏差和) 保存每個指標，可跨分塊、跨運行合併
+（Chan 並行方差合併公式），合併後的均值與置信區間與把所有樣本放在一起計算相同。
+
+Input: 模擬結果數組 [num_samples, 3] 或整數計數 [num_samples, 3]
+Output: calculate_performance_metrics() 返回均值和 95% 置信區間,
+        compact_tally_dtype(), tallies_to_results(), MetricsAccumulator
 Position: 模擬結果的統計處理
 
 注意：一旦此文件被更新，請同步更新：
@@ -14,6 +22,50 @@ Position: 模擬結果的統計處理
 import numpy as np
 
 
+# 整數計數的欄位順序
+TALLY_SUCCESS = 0
+TALLY_DELAY_SUM = 1
+TALLY_COLLISION = 2
+
+
+def compact_tally_dtype(*max_values) -> np.dtype:
+    """
+    選擇能容納所有計數上限的最窄無符號整數型別
+    
+    Args:
+        max_values: 各計數欄位的上限（如 M, M*I_max, I_max*N）
+    
+    Returns:
+        np.dtype: uint8 | uint16 | uint32 | uint64
+    """
+    largest = max(max_values)
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if largest <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+def tallies_to_results(tallies: np.ndarray, num_devices: int, total_rao_count: int) -> np.ndarray:
+    """
+    把整數計數轉為比率結果（歸約時調用）
+    
+    Args:
+        tallies: Shape [num_samples, 3]，欄位為 (成功設備數, 成功延遲總和, 碰撞 RAO 數)
+        num_devices: 設備總數（P_S 的分母）
+        total_rao_count: RAO 總數（P_C 的分母）
+    
+    Returns:
+        np.ndarray: Shape [num_samples, 3] 的結果矩陣 (P_S, T_a, P_C)，無成功設備時 T_a 為 -1
+    """
+    success_count = tallies[:, TALLY_SUCCESS].astype(np.float64)
+    results = np.empty((tallies.shape[0], 3), dtype=np.float64)
+    results[:, 0] = success_count / num_devices if num_devices > 0 else 0.0
+    results[:, 1] = np.divide(tallies[:, TALLY_DELAY_SUM], success_count,
+                              out=np.full(tallies.shape[0], -1.0), where=success_count > 0)
+    results[:, 2] = tallies[:, TALLY_COLLISION] / total_rao_count if total_rao_count > 0 else 0.0
+    return results
+
+
 def confidence_interval_95(data):
     """計算95%置信區間（半寬）"""
     return 1.96 * np.std(data) / np.sqrt(len(data))
@@ -45,3 +97,93 @@ def calculate_performance_metrics(results_array):
     
     return (mean_ps, mean_ta, mean_pc), (ci_ps, ci_ta, ci_pc)
 
+
+class MetricsAccumulator:
+    """
+    可合併的性能指標累加器
+    
+    每個指標保存 [樣本數, 均值, 平方偏差和]；T_a 只累計有成功設備的樣本（T_a >= 0），
+    與 calculate_performance_metrics() 的定義一致。
+    
+    用法:
+        acc = MetricsAccumulator.from_results(results_array)
+        acc.merge(MetricsAccumulator.from_results(more_results))
+        means, cis = acc.metrics()
+    """
+    
+    METRICS = ('P_S', 'T_a', 'P_C')
+    
+    def __init__(self):
+        self.stats = {name: [0, 0.0, 0.0] for name in self.METRICS}
+    
+    @property
+    def num_samples(self) -> int:
+        """已累計的樣本數"""
+        return self.stats['P_S'][0]
+    
+    @classmethod
+    def from_results(cls, results_array: np.ndarray) -> 'MetricsAccumulator':
+        """由結果矩陣 [num_samples, 3] 建立累加器"""
+        accumulator = cls()
+        columns = (
+            results_array[:, 0],
+            results_array[results_array[:, 1] >= 0, 1],
+            results_array[:, 2],
+        )
+        for name, data in zip(cls.METRICS, columns):
+            if len(data) > 0:
+                mean = float(np.mean(data))
+                accumulator.stats[name] = [int(len(data)), mean, float(np.sum((data - mean) ** 2))]
+        return accumulator
+    
+    def update(self, results_array: np.ndarray) -> 'MetricsAccumulator':
+        """累計一批結果矩陣"""
+        return self.merge(MetricsAccumulator.from_results(results_array))
+    
+    def merge(self, other: 'MetricsAccumulator') -> 'MetricsAccumulator':
+        """合併另一個累加器（原地修改並返回自身）"""
+        for name in self.METRICS:
+            n_a, mean_a, m2_a = self.stats[name]
+            n_b, mean_b, m2_b = other.stats[name]
+            n = n_a + n_b
+            if n_b == 0:
+                continue
+            delta = mean_b - mean_a
+            self.stats[name] = [
+                n,
+                mean_a + delta * n_b / n,
+                m2_a + m2_b + delta * delta * n_a * n_b / n,
+            ]
+        return self
+    
+    def metrics(self):
+        """
+        計算平均性能指標
+        
+        Returns:
+            tuple: ((mean_ps, mean_ta, mean_pc), (ci_ps, ci_ta, ci_pc))，與 calculate_performance_metrics() 相同
+        """
+        means = []
+        cis = []
+        for name in self.METRICS:
+            n, mean, m2 = self.stats[name]
+            if n == 0:
+                means.append(0)
+                cis.append(0)
+                continue
+            means.append(mean)
+            cis.append(float(1.96 * np.sqrt(m2 / n) / np.sqrt(n)))
+        return tuple(means), tuple(cis)
+    
+    def to_dict(self) -> dict:
+        """序列化為 JSON 可保存的字典"""
+        return {name: list(values) for name, values in self.stats.items()}
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'MetricsAccumulator':
+        """由 to_dict() 的輸出還原"""
+        accumulator = cls()
+        for name in cls.METRICS:
+            n, mean, m2 = data[name]
+            accumulator.stats[name] = [int(n), float(mean), float(m2)]
+        return accumulator
@@ -0,0 +1,70 @@
+"""
+numba JIT 群組尋呼核心（由 jit_kernel 按需導入）
+
+本模組在頂層導入 numba；只有實際使用 engine='numba' 時才會被導入，
+numpy 引擎的工作進程不承擔 numba 的導入時間。
+
+Input: M, N, I_max, seed, ACB 參數, 輸出計數陣列
+Output: group_paging_batch_kernel()
+Position: jit_kernel.simulate_batch_jit 的實現
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import numba
+import numpy as np
+
+
+@numba.njit(cache=True, nogil=True)
+def group_paging_batch_kernel(M, N, I_max, seed, barring_factor, barring_time, out):
+    """JIT 核心：逐樣本、逐 AC 模擬，整數計數寫入 out [batch_size, 3]"""
+    np.random.seed(seed)
+    rao_usage = np.zeros(N, dtype=np.int64)
+    barred = np.zeros(barring_time + 1, dtype=np.int64)
+    use_acb = barring_factor < 1.0
+
+    for s in range(out.shape[0]):
+        remaining_devices = M
+        success_count = 0
+        success_delay_sum = 0
+        total_collision_count = 0
+        barred[:] = 0
+
+        for ac_index in range(1, I_max + 1):
+            if use_acb:
+                remaining_devices += barred[0]
+                for j in range(barring_time):
+                    barred[j] = barred[j + 1]
+                barred[barring_time] = 0
+
+            if remaining_devices == 0:
+                if not use_acb or barred.sum() == 0:
+                    break
+                continue
+
+            contending_devices = remaining_devices
+            if use_acb:
+                contending_devices = np.random.binomial(remaining_devices, barring_factor)
+                barred[barring_time] += remaining_devices - contending_devices
+
+            rao_usage[:] = 0
+            for _ in range(contending_devices):
+                rao_usage[np.random.randint(0, N)] += 1
+
+            success_raos = 0
+            collision_raos = 0
+            for r in range(N):
+                if rao_usage[r] == 1:
+                    success_raos += 1
+                elif rao_usage[r] >= 2:
+                    collision_raos += 1
+
+            success_count += success_raos
+            success_delay_sum += success_raos * ac_index
+            total_collision_count += collision_raos
+            remaining_devices = contending_devices - success_raos
+
+        out[s, 0] = success_count
+        out[s, 1] = success_delay_sum
+        out[s, 2] = total_collision_count
@@ -5,26 +5,59 @@ One-Shot Random Access 模擬模組
 
 架構層次：
 1. simulate_one_shot_access_single_ac - 單次 AC 模擬（核心）
+   simulate_one_shot_access_batch - 單次 AC 模擬（跨樣本批量版本，供流量引擎使用）
 2. simulate_group_paging_single_sample - 單次完整群組尋呼（多個 AC）
 3. simulate_group_paging_multi_samples - 批量多樣本並行模擬（10^7 級別）
 
+可選的 Access Class Barring (ACB) 過載控制（barring_factor, barring_time）在群組尋呼
+引擎中以二項分佈抽樣直接作用於競爭設備數，無需逐設備迴圈。
+
 優化策略：
 1. Batch Processing - 減少 IPC 開銷
-2. 獨立 RNG - 確保並行正確性
-3. 預分配 numpy array - 減少記憶體碎片
+2. 獨立 RNG - 按固定大小樣本區塊分配隨機數流（見 rng.py），結果與進程數無關
+3. 預分配 numpy array - 減少記憶體碎片；工作進程只回傳最窄整數型別的原始計數，
+   比率在歸約時計算（IPC 與記憶體量為 float64 結果的 1/4 ~ 1/8）
+4. 可選 JIT 核心 (engine='numba') - 整個樣本迴圈編譯為機器碼，見 jit_kernel.py
+5. 可選共享記憶體結果緩衝區 (shared_memory=True) - 工作進程直接寫入父進程分配的
+   [num_samples, 3] 陣列的行區間，結果不經 pickle 回傳、不經 np.vstack 拼接，見 shared_buffer.py
+6. 可選線程池後端 (backend='thread' / 無 GIL 時 'auto') - 免去進程啟動與 pickle，見 backend.py
+7. 容器感知並行度 - num_workers=-1 時按 CPU 親和性與 cgroup 配額決定工作進程數，
+   工作進程內 BLAS 線程數為 1，可選綁核 (pin_workers=True)，見 cpu_planner.py
+8. 可選記憶體預算 (max_memory_mb) - 按預算切小分塊、限制同時在途的分塊數，
+   逐樣本結果放不下時改用串流累加（回傳 MetricsAccumulator），見 memory_planner.py
+9. 自適應分塊 (target_task_sec) - 校準每樣本成本後按目標任務時長動態切分塊，
+   以工作進程實測耗時持續修正，並報告負載均衡，見 chunk_scheduler.py
+10. 成本模型 - 進度條的剩餘時間 = 剩餘樣本 × 當前每樣本成本 / 並行數，與 dry-run 預估
+   （calibrate_group_paging_cost，見 cost_model.py 與 performance/cost_estimator.py）使用同一模型
+
+以上 5~10 的並行執行路徑（規劃、提交 / 收集、歸約）與流量引擎共用，見 chunk_runner.py；
+本模組只提供工作函數 _simulate_batch_worker 與校準函數。
 
 注意：一旦此文件被更新，請同步更新項目根目錄 README.md
 """
 
-import os
-import time
 import numpy as np
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from tqdm import tqdm
-
+from functools import partial
 
-# 模組級別的默認 RNG（用於非並行場景）
-_default_rng = np.random.default_rng()
+from .backend import DEFAULT_BACKEND
+from .chunk_runner import run_sample_chunks
+from .chunk_scheduler import DEFAULT_TARGET_TASK_SEC, calibrate_per_sample_cost
+from .worker_bootstrap import DEFAULT_START_METHOD
+from .jit_kernel import resolve_engine, simulate_batch_jit
+from .metrics import compact_tally_dtype
+from .rng import (
+    DEFAULT_BIT_GENERATOR,
+    DEFAULT_BLOCK_SIZE,
+    DEFAULT_DRAW_MODE,
+    DRAW_MODES,
+    PackedChoiceStream,
+    make_block_generator,
+    block_seed,
+    plan_sample_blocks,
+    resolve_root_seed,
+    thread_local_generator,
+)
+from .shared_buffer import SharedResultBuffer
 
 
 def simulate_one_shot_access_single_ac(M: int, N: int, rng: np.random.Generator = None):
@@ -34,15 +67,18 @@ def simulate_one_shot_access_single_ac(M: int, N: int, rng: np.random.Generator
     Args:
         M: 嘗試接入的設備數量
         N: 可用的 RAO 數量
-        rng: numpy Generator（可選，用於並行計算）
+        rng: numpy Generator 或 PackedChoiceStream（可選，用於並行計算）
     
     Returns:
         tuple: (success_raos, collision_raos, idle_raos)
     """
     if rng is None:
-        rng = _default_rng
+        rng = thread_local_generator()
     
-    choices = rng.integers(0, N, size=M)
+    if isinstance(rng, PackedChoiceStream):
+        choices = rng.take(M)
+    else:
+        choices = rng.integers(0, N, size=M)
     rao_usage = np.bincount(choices, minlength=N)
     
     success_raos = np.sum(rao_usage == 1)
@@ -52,36 +88,125 @@ def simulate_one_shot_access_single_ac(M: int, N: int, rng: np.random.Generator
     return success_raos, collision_raos, idle_raos
 
 
-def simulate_group_paging_single_sample(M: int, N: int, I_max: int, rng=None):
+def simulate_one_shot_access_batch(active: np.ndarray, N: int, rng: np.random.Generator = None):
     """
-    模擬一次完整的群組尋呼過程（多個 AC）
+    模擬一次 One-Shot Random Access（跨樣本批量版本）
+    
+    每一行是一個獨立樣本，每一列是一台設備；只有 active 為 True 的設備參與本次 AC。
+    各樣本的 RAO 佔用以「樣本偏移」方式合併成單次 bincount，避免逐樣本 Python 迴圈。
     
     Args:
-        M: 初始設備數
-        N: 每個 AC 的 RAO 數
-        I_max: 最大 AC 數
+        active: Shape [S, D] 的布林矩陣，表示本 AC 參與競爭的設備
+        N: 可用的 RAO 數量
         rng: numpy Generator（可選，用於並行計算）
     
     Returns:
-        tuple: (access_success_prob, mean_access_delay, collision_prob)
+        tuple: (success_mask [S, D], success_raos [S], collision_raos [S])
+    """
+    if rng is None:
+        rng = thread_local_generator()
+    
+    num_samples = active.shape[0]
+    rows, cols = np.nonzero(active)
+    
+    choices = rng.integers(0, N, size=rows.size)
+    flat_index = rows * N + choices
+    rao_usage = np.bincount(flat_index, minlength=num_samples * N)
+    
+    success_mask = np.zeros(active.shape, dtype=bool)
+    success_mask[rows, cols] = rao_usage[flat_index] == 1
+    
+    rao_usage = rao_usage.reshape(num_samples, N)
+    success_raos = np.sum(rao_usage == 1, axis=1)
+    collision_raos = np.sum(rao_usage >= 2, axis=1)
+    
+    return success_mask, success_raos, collision_raos
+
+
+def _apply_access_class_barring(ready_devices: int, barred: np.ndarray, barring_factor: float,
+                                rng: np.random.Generator) -> int:
+    """
+    Access Class Barring (ACB) 過濾：對競爭設備數做 Bernoulli 抽樣
+    
+    每台就緒設備以 barring_factor 的概率通過 ACB；未通過的設備計入 barred 計時器，
+    barred[j] 表示 j+1 個 AC 後重新就緒的設備數。
+    
+    Returns:
+        int: 通過 ACB、在本 AC 參與競爭的設備數
+    """
+    contending = rng.binomial(ready_devices, barring_factor)
+    barred[-1] += ready_devices - contending
+    return contending
+
+
+def _simulate_group_paging_tallies(M: int, N: int, I_max: int, rng,
+                                   barring_factor: float = 1.0, barring_time: int = 0):
+    """
+    模擬一次完整的群組尋呼過程，回傳原始整數計數
+    
+    Returns:
+        tuple: (success_count, success_delay_sum, total_collision_count)
     """
     remaining_devices = M
     success_count = 0
     success_delay_sum = 0
     total_collision_count = 0
     
+    # ACB 計時器：barred[0] 在下一個 AC 開始時重新就緒
+    barred = np.zeros(barring_time + 1, dtype=np.int64) if barring_factor < 1.0 else None
+    
     for ac_index in range(1, I_max + 1):
+        if barred is not None:
+            remaining_devices += barred[0]
+            barred[:-1] = barred[1:]
+            barred[-1] = 0
+        
         if remaining_devices == 0:
-            break
+            if barred is None or not barred.any():
+                break
+            continue
+        
+        contending_devices = remaining_devices
+        if barred is not None:
+            generator = rng.generator if isinstance(rng, PackedChoiceStream) else rng
+            contending_devices = _apply_access_class_barring(
+                remaining_devices, barred, barring_factor, generator
+            )
         
         success_raos, collision_raos, _ = simulate_one_shot_access_single_ac(
-            remaining_devices, N, rng
+            contending_devices, N, rng
         )
         
         success_count += success_raos
         success_delay_sum += success_raos * ac_index
         total_collision_count += collision_raos
-        remaining_devices -= success_raos
+        remaining_devices = contending_devices - success_raos
+    
+    return success_count, success_delay_sum, total_collision_count
+
+
+def simulate_group_paging_single_sample(M: int, N: int, I_max: int, rng=None,
+                                        barring_factor: float = 1.0, barring_time: int = 0):
+    """
+    模擬一次完整的群組尋呼過程（多個 AC）
+    
+    Args:
+        M: 初始設備數
+        N: 每個 AC 的 RAO 數
+        I_max: 最大 AC 數
+        rng: numpy Generator 或 PackedChoiceStream（可選，用於並行計算）
+        barring_factor: ACB 通過概率（1.0 表示不啟用 ACB）
+        barring_time: ACB 未通過的設備需等待的 AC 數
+    
+    Returns:
+        tuple: (access_success_prob, mean_access_delay, collision_prob)
+    """
+    if rng is None:
+        rng = thread_local_generator()
+    
+    success_count, success_delay_sum, total_collision_count = _simulate_group_paging_tallies(
+        M, N, I_max, rng, barring_factor, barring_time
+    )
     
     # 計算指標
     access_success_prob = success_count / M if M > 0 else 0.0
@@ -92,80 +217,176 @@ def simulate_group_paging_single_sample(M: int, N: int, I_max: int, rng=None):
     return access_success_prob, mean_access_delay, collision_prob
 
 
-def _simulate_batch_worker(M: int, N: int, I_max: int, batch_size: int, seed: int):
-    """批量處理：在單個進程中執行多個樣本模擬"""
-    rng = np.random.default_rng(seed)
-    batch_results = np.empty((batch_size, 3), dtype=np.float64)
+def _simulate_batch_worker(M: int, N: int, I_max: int, blocks: list, root_seed: int,
+                           bit_generator: str = DEFAULT_BIT_GENERATOR,
+                           barring_factor: float = 1.0, barring_time: int = 0,
+                           engine: str = 'numpy', draw_mode: str = DEFAULT_DRAW_MODE,
+                           out: tuple = None):
+    """
+    批量處理：在單個進程中執行多個樣本區塊的模擬
+    
+    每個區塊使用由 (bit_generator, root_seed, block_id) 決定的獨立隨機數流，
+    因此結果與區塊被分配到哪個進程無關。
+    
+    Args:
+        blocks: [(block_id, block_length), ...]
+        draw_mode: 'integers'（rng.integers）| 'packed'（PackedChoiceStream 打包低位元抽樣）
+        out: (buffer_spec, row_offset)；給定時直接寫入共享記憶體緩衝區的
+             [row_offset, row_offset + batch_size) 行，只回傳樣本數
+    
+    Returns:
+        np.ndarray: Shape [batch_size, 3] 的整數計數（成功設備數, 成功延遲總和, 碰撞 RAO 數），
+                    型別為 compact_tally_dtype(M, M * I_max, I_max * N)；給定 out 時回傳 batch_size
+    """
+    batch_size = sum(length for _, length in blocks)
+    shared = None
+    if out is not None:
+        buffer_spec, row_offset = out
+        shared = SharedResultBuffer.attach(buffer_spec)
+        batch_tallies = shared.array[row_offset:row_offset + batch_size]
+    else:
+        batch_tallies = np.empty((batch_size, 3), dtype=compact_tally_dtype(M, M * I_max, I_max * N))
     
-    for i in range(batch_size):
-        result = simulate_group_paging_single_sample(M, N, I_max, rng)
-        batch_results[i, 0] = result[0]
-        batch_results[i, 1] = result[1]
-        batch_results[i, 2] = result[2]
+    offset = 0
+    for block_id, length in blocks:
+        if engine == 'numba':
+            simulate_batch_jit(
+                M, N, I_max, batch_tallies[offset:offset + length],
+                block_seed(root_seed, block_id), barring_factor, barring_time
+            )
+            offset += length
+            continue
+        
+        rng = make_block_generator(bit_generator, root_seed, block_id)
+        if draw_mode == 'packed':
+            rng = PackedChoiceStream(rng, N)
+        for i in range(offset, offset + length):
+            batch_tallies[i] = _simulate_group_paging_tallies(
+                M, N, I_max, rng, barring_factor, barring_time
+            )
+        offset += length
     
-    return batch_results
+    if shared is not None:
+        del batch_tallies
+        shared.close()
+        return batch_size
+    return batch_tallies
+
+
+def calibrate_group_paging_cost(M: int, N: int, I_max: int, barring_factor: float = 1.0,
+                                barring_time: int = 0, engine: str = 'numpy',
+                                bit_generator: str = DEFAULT_BIT_GENERATOR,
+                                block_size: int = DEFAULT_BLOCK_SIZE,
+                                draw_mode: str = DEFAULT_DRAW_MODE) -> tuple:
+    """
+    在當前進程校準群組尋呼的每樣本成本（引擎微基準）
+
+    以獨立的隨機數流（根種子 0）跑一小批樣本，結果丟棄；分塊調度、dry-run 成本預估
+    （performance/cost_estimator.py）與進度條的剩餘時間共用這個估計。
+
+    Returns:
+        tuple: (每樣本秒數, 校準樣本數, 校準耗時秒數)，見 calibrate_per_sample_cost
+    """
+    engine = resolve_engine(engine)
+
+    def run_calibration_batch(samples):
+        _simulate_batch_worker(M, N, I_max, [(0, samples)], 0, bit_generator,
+                               barring_factor, barring_time, engine, draw_mode)
+    return calibrate_per_sample_cost(run_calibration_batch, block_size)
 
 
 def simulate_group_paging_multi_samples(M: int, N: int, I_max: int, num_samples: int, 
-                                        num_workers: int):
+                                        num_workers: int, barring_factor: float = 1.0,
+                                        barring_time: int = 0, engine: str = 'numpy',
+                                        seed: int = None,
+                                        bit_generator: str = DEFAULT_BIT_GENERATOR,
+                                        block_size: int = DEFAULT_BLOCK_SIZE,
+                                        draw_mode: str = DEFAULT_DRAW_MODE,
+                                        return_tallies: bool = False, keep_samples: bool = False,
+                                        first_block: int = 0,
+                                        skip_blocks: set = None, on_chunk_done=None,
+                                        shared_memory: bool = False,
+                                        result_buffer: SharedResultBuffer = None,
+                                        backend: str = DEFAULT_BACKEND,
+                                        start_method: str = DEFAULT_START_METHOD,
+                                        pin_workers: bool = False,
+                                        max_memory_mb: float = None,
+                                        target_task_sec: float = DEFAULT_TARGET_TASK_SEC):
     """
     高效並行多樣本模擬（Batch Optimization）
     
+    樣本被切分為固定大小的區塊，每個區塊有獨立的隨機數流；
+    給定 seed 時，結果與 num_workers 無關，可逐位重現。
+    工作進程回傳緊湊整數計數，比率在所有分塊收齊後才計算。
+    
     Args:
         M: 初始設備總數
         N: 每個 AC 的 RAO 數量
         I_max: 最大接入周期數
         num_samples: 模擬樣本數
-        num_workers: 並行工作進程數 (-1 表示使用所有 CPU 核心)
+        num_workers: 並行工作進程數 (-1 表示使用所有可用 CPU，按親和性與 cgroup 配額計算)
+        barring_factor: ACB 通過概率（1.0 表示不啟用 ACB）
+        barring_time: ACB 未通過的設備需等待的 AC 數
+        engine: 模擬引擎 'numpy' | 'numba' | 'auto'（numba 未安裝時自動退回 numpy）
+        seed: 根種子（None 表示隨機生成並打印）
+        bit_generator: 'PCG64' | 'PCG64DXSM' | 'Philox' | 'SFC64'（numba 引擎使用其內建 RNG）
+        block_size: 每個隨機數流區塊的樣本數
+        draw_mode: RAO 選擇抽樣方式 'integers' | 'packed'（僅 numpy 引擎）
+        return_tallies: True 時直接回傳整數計數，不轉換為比率（隱含 keep_samples=True）
+        keep_samples: True 時回傳逐樣本結果矩陣；False 時各分塊歸約後立即併入 MetricsAccumulator
+                      並丟棄（見 memory_planner.py），供只需要均值與置信區間的調用方使用
+        first_block: 第一個樣本區塊的編號（補充樣本時從未使用的區塊開始，保證隨機數流不重疊）
+        skip_blocks: 已完成、不需再模擬的區塊編號集合（從檢查點續跑時使用）
+        on_chunk_done: 每個分塊完成時的回調 on_chunk_done(blocks, chunk_results)，
+                       chunk_results 為該分塊的比率結果 [chunk_size, 3]（用於寫入檢查點）
+        shared_memory: True 時工作進程把計數直接寫入共享記憶體緩衝區（不 pickle 回傳、不 vstack），
+                       函數結束前釋放緩衝區；只在保留逐樣本結果（keep_samples / return_tallies）時生效
+        result_buffer: 調用方分配的 SharedResultBuffer（形狀至少 [num_samples, 3]，
+                       型別為 compact_tally_dtype(M, M * I_max, I_max * N)）；
+                       給定時隱含 shared_memory=True，緩衝區由調用方釋放，
+                       return_tallies=True 時直接回傳其前 num_samples 行的視圖（零複製）
+        backend: 執行後端 'process' | 'thread' | 'auto'（auto: 無 GIL 的 Python 構建使用線程池）
+        start_method: 進程啟動方式 'auto' | 'fork' | 'forkserver' | 'spawn'（見 worker_bootstrap.py）
+        pin_workers: True 時把每個工作進程綁定到一個 CPU 核心（僅進程池，見 cpu_planner.py）
+        max_memory_mb: 記憶體預算（MB）；按預算規劃分塊大小與同時在途的分塊數
+                       （見 memory_planner.py）；None 表示不限制
+        target_task_sec: 目標任務時長（秒）；先校準每樣本成本，再按此時長動態切分塊
+                         （見 chunk_scheduler.py）；None 表示使用固定的「工作進程數 × 4」分塊
     
     Returns:
-        np.ndarray: Shape [num_samples, 3] 的結果矩陣
+        np.ndarray: Shape [num_samples, 3] 的結果矩陣（按區塊順序排列，不含 skip_blocks）；
+                    return_tallies=True 時為整數計數 (成功設備數, 成功延遲總和, 碰撞 RAO 數)；
+                    不需要逐樣本結果（keep_samples、return_tallies 均為 False 且未給 result_buffer）時
+                    回傳串流累加的 MetricsAccumulator（所有區塊都在 skip_blocks 中時為空的累加器）
     """
-    if num_workers == -1:
-        num_workers = os.cpu_count() or 1
-    
-    # 分塊策略：CPU核心數 * 4，確保負載均衡
-    num_chunks = num_workers * 4
-    base_chunk_size = num_samples // num_chunks
-    remainder = num_samples % num_chunks
+    engine = resolve_engine(engine)
+    if draw_mode not in DRAW_MODES:
+        raise ValueError(f"未知的抽樣方式: {draw_mode}（支援: {', '.join(DRAW_MODES)}）")
     
-    print("=" * 70)
-    print("【Group Paging】高效並行模擬 (Batch Optimization)")
-    print("=" * 70)
-    print(f"  參數: M={M}, N={N}, I_max={I_max}")
-    print(f"  樣本數: {num_samples:,} | 進程: {num_workers} | 分塊: {num_chunks}")
-    print("=" * 70)
+    # 每個分塊由若干個固定大小的區塊組成；分塊大小由 ChunkScheduler 決定
+    blocks = plan_sample_blocks(num_samples, block_size, first_block)
+    if skip_blocks:
+        blocks = [block for block in blocks if block[0] not in skip_blocks]
     
-    start_time = time.time()
-    all_results = []
+    root_seed = resolve_root_seed(seed)
+    describe = [f"參數: M={M}, N={N}, I_max={I_max}"]
+    if barring_factor < 1.0:
+        describe.append(f"ACB: barring_factor={barring_factor}, barring_time={barring_time}")
+    rng_name = f"{bit_generator} ({draw_mode})" if engine == 'numpy' else 'numba 內建'
+    first_block_note = f" (起始區塊 {first_block})" if first_block else ""
+    describe.append(f"RNG: {rng_name} | 根種子: {root_seed} | 區塊: {len(blocks)} x {block_size}{first_block_note}")
     
-    with ProcessPoolExecutor(max_workers=num_workers) as executor:
-        # 生成獨立種子
-        child_seeds = np.random.SeedSequence().spawn(num_chunks)
-        
-        # 提交任務
-        futures = []
-        for i in range(num_chunks):
-            chunk_size = base_chunk_size + (1 if i < remainder else 0)
-            if chunk_size == 0:
-                continue
-            seed = child_seeds[i].generate_state(1)[0]
-            futures.append(executor.submit(_simulate_batch_worker, M, N, I_max, chunk_size, seed))
-        
-        # 收集結果
-        with tqdm(total=num_samples, desc="模擬進度", unit="樣本",
-                  bar_format='{desc}: {percentage:3.0f}%|{bar}| {n:,}/{total:,} [{elapsed}<{remaining}]') as pbar:
-            for future in as_completed(futures):
-                batch_res = future.result()
-                all_results.append(batch_res)
-                pbar.update(batch_res.shape[0])
-
-    final_results = np.vstack(all_results)
-    elapsed = time.time() - start_time
-    
-    print("=" * 70)
-    print(f"  完成! 耗時: {elapsed:.2f}s | 速度: {num_samples/elapsed:,.0f} 樣本/秒")
-    print("=" * 70)
-    
-    return final_results
-
+    worker = partial(
+        _simulate_batch_worker, M, N, I_max, root_seed=root_seed, bit_generator=bit_generator,
+        barring_factor=barring_factor, barring_time=barring_time, engine=engine, draw_mode=draw_mode
+    )
+    return run_sample_chunks(
+        worker, blocks, compact_tally_dtype(M, M * I_max, I_max * N), M, I_max * N, num_workers,
+        "【Group Paging】高效並行模擬 (Batch Optimization)", describe, engine=engine,
+        calibrate=lambda: calibrate_group_paging_cost(M, N, I_max, barring_factor, barring_time, engine,
+                                                      bit_generator, block_size, draw_mode),
+        block_size=block_size, return_tallies=return_tallies, keep_samples=keep_samples,
+        on_chunk_done=on_chunk_done, shared_memory=shared_memory, result_buffer=result_buffer,
+        backend=backend, start_method=start_method, pin_workers=pin_workers,
+        max_memory_mb=max_memory_mb, target_task_sec=target_task_sec
+    )
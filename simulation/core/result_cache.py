@@ -0,0 +1,188 @@
+"""
+模擬結果快取模組（內容定址）
+
+以模擬參數、引擎版本與種子的雜湊作為鍵，把每個模擬點的結果分片
+（ResultShard = MetricsAccumulator + 隨機數流列表）保存為 result/cache/simulation/<key>.json。
+擴大掃描範圍後重新運行時，已有的點直接從快取讀取，只模擬缺少的點。
+
+快取目錄有大小上限；超出時按最近使用時間（檔案 mtime，命中時更新）淘汰最舊的條目（LRU）。
+
+只有固定種子的運行才會寫入快取：未指定種子時每次運行的隨機數流不同，結果不可重現。
+
+Input: 模擬參數字典 (M, N, I_max, engine, seed, num_samples, ...)
+Output: ResultCache, simulation_cache_params(), engine_fingerprint()
+Position: 模擬執行層與核心引擎之間的結果重用層
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from datetime import datetime
+
+import numpy as np
+
+from .jit_kernel import NUMBA_AVAILABLE
+from .shards import ResultShard, simulation_point_params
+
+# 項目根目錄
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# 默認快取目錄與大小上限
+DEFAULT_CACHE_DIR = PROJECT_ROOT / 'result' / 'cache' / 'simulation'
+DEFAULT_CACHE_SIZE_MB = 256
+
+# 模擬引擎版本：引擎輸出（隨機數流用法、計數定義）改變時必須遞增，使舊快取失效
+SIMULATION_ENGINE_VERSION = 1
+
+
+def engine_fingerprint(engine: str) -> str:
+    """
+    引擎版本指紋：引擎版本 + 影響隨機數流的函式庫版本
+
+    Args:
+        engine: 實際使用的引擎 'numpy' | 'numba'
+    """
+    if engine == 'numba' and NUMBA_AVAILABLE:
+        import numba
+        return f"v{SIMULATION_ENGINE_VERSION}/numba-{numba.__version__}"
+    return f"v{SIMULATION_ENGINE_VERSION}/numpy-{np.__version__}"
+
+
+def simulation_cache_params(M: int, N: int, I_max: int, num_samples: int, engine: str, seed: int,
+                            bit_generator: str, block_size: int, draw_mode: str,
+                            barring_factor: float = 1.0, barring_time: int = 0) -> dict:
+    """
+    群組尋呼模擬點的快取參數（決定結果的全部輸入）
+
+    Returns:
+        dict: 用於 ResultCache 的參數字典
+    """
+    params = simulation_point_params(
+        M, N, I_max, engine, bit_generator, block_size, draw_mode, barring_factor, barring_time
+    )
+    params.update({
+        'engine_version': engine_fingerprint(engine),
+        'num_samples': num_samples,
+        'seed': seed,
+    })
+    return params
+
+
+class ResultCache:
+    """
+    模擬結果的磁碟快取（內容定址 + LRU 淘汰）
+
+    用法:
+        cache = ResultCache(max_size_mb=256)
+        shard = cache.get(params)
+        if shard is None:
+            ...
+            cache.put(params, shard)
+    """
+
+    def __init__(self, cache_dir=None, max_size_mb: float = DEFAULT_CACHE_SIZE_MB):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(params: dict) -> str:
+        """參數字典的內容雜湊（與鍵的順序無關）"""
+        canonical = json.dumps(params, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, params: dict):
+        """
+        讀取快取條目
+
+        Returns:
+            ResultShard: 快取的結果分片，未命中返回 None
+        """
+        path = self._path(self.key(params))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        # 雜湊碰撞或手動編輯的防護
+        if entry.get('cache_params') != params:
+            self.misses += 1
+            return None
+
+        os.utime(path)  # 更新最近使用時間（LRU）
+        self.hits += 1
+        return ResultShard.from_dict(entry)
+
+    def contains(self, params: dict) -> bool:
+        """是否有對應的快取條目（不計入命中統計、不更新最近使用時間；供 dry-run 預估使用）"""
+        try:
+            with open(self._path(self.key(params)), 'r', encoding='utf-8') as f:
+                return json.load(f).get('cache_params') == params
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+    def put(self, params: dict, shard: ResultShard):
+        """
+        寫入快取條目，並在超出大小上限時淘汰最久未使用的條目
+
+        Args:
+            params: 快取參數
+            shard: 該點的結果分片
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        key = self.key(params)
+        entry = shard.to_dict()
+        entry.update({
+            'key': key,
+            'cache_params': params,
+            'created': datetime.now().isoformat(timespec='seconds'),
+        })
+
+        # 先寫臨時檔再替換，避免中斷時留下損壞的條目
+        path = self._path(key)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        按 LRU 淘汰條目直到總大小不超過上限
+
+        Returns:
+            int: 被刪除的條目數
+        """
+        if not self.cache_dir.exists():
+            return 0
+
+        entries = [(path.stat().st_mtime, path.stat().st_size, path)
+                   for path in self.cache_dir.glob('*.json')]
+        total_size = sum(size for _, size, _ in entries)
+        removed = 0
+
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= size
+            removed += 1
+
+        return removed
+
+    def size_bytes(self) -> int:
+        """快取目錄目前的總大小"""
+        if not self.cache_dir.exists():
+            return 0
+        return sum(path.stat().st_size for path in self.cache_dir.glob('*.json'))
@@ -0,0 +1,206 @@
+"""
+隨機數流管理模組
+
+可配置的 bit generator（PCG64, PCG64DXSM, Philox, SFC64）與根種子，
+並以「固定大小的樣本區塊」為單位分配獨立隨機數流：
+
+- Philox: counter-based，區塊編號寫入計數器最高位 (counter[3] = block_id)
+- PCG64 / PCG64DXSM: jump-based，根狀態 jumped(block_id)
+- SFC64: 無 jump 功能，使用 SeedSequence(root_seed, spawn_key=(block_id,))
+
+每個區塊的隨機數流只由 (bit_generator, root_seed, block_id) 決定，
+與工作進程數、分塊方式、機器數量無關，因此結果可逐位重現。
+
+另提供 PackedChoiceStream（draw_mode='packed'）：把 bit generator 輸出的 64 位原始整數
+切成多個 ceil(log2 N) 位的小欄位，以拒絕採樣去除偏差後作為 RAO 選擇，
+並批量預生成、逐 AC 取用，避免每個 AC 一次 rng.integers 的有界整數抽樣開銷。
+
+未傳入 rng 的單次模擬使用 thread_local_generator()：每個線程一個 Generator
+（Generator 不是線程安全的，線程池後端下不能共用模組級實例）。
+
+Input: bit_generator 名稱, root_seed, block_id
+Output: make_block_generator(), plan_sample_blocks(), resolve_root_seed(), PackedChoiceStream,
+        thread_local_generator()
+Position: 模擬引擎的隨機數流基礎設施
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import threading
+
+import numpy as np
+
+
+# 支援的 bit generator
+BIT_GENERATORS = {
+    'PCG64': np.random.PCG64,
+    'PCG64DXSM': np.random.PCG64DXSM,
+    'Philox': np.random.Philox,
+    'SFC64': np.random.SFC64,
+}
+
+# 默認 bit generator 與區塊大小（改變區塊大小會改變結果）
+DEFAULT_BIT_GENERATOR = 'PCG64'
+DEFAULT_BLOCK_SIZE = 2048
+
+# RAO 選擇的抽樣方式
+DRAW_MODES = ('integers', 'packed')
+DEFAULT_DRAW_MODE = 'integers'
+
+# 每個線程專屬的默認 Generator
+_thread_state = threading.local()
+
+
+def resolve_root_seed(seed=None) -> int:
+    """
+    解析根種子：None 時從系統熵生成一個新種子並打印，以便重現該次運行
+
+    Returns:
+        int: 根種子
+    """
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy)
+        print(f"  未指定種子，使用隨機根種子: {seed}（填入 rng.seed 可重現此次運行）")
+    return int(seed)
+
+
+def thread_local_generator() -> np.random.Generator:
+    """
+    當前線程的默認 Generator（首次調用時以系統熵建立）
+
+    Returns:
+        np.random.Generator: 只在當前線程使用的 Generator
+    """
+    rng = getattr(_thread_state, 'rng', None)
+    if rng is None:
+        rng = _thread_state.rng = np.random.default_rng()
+    return rng
+
+
+def make_block_generator(bit_generator: str, root_seed: int, block_id: int) -> np.random.Generator:
+    """
+    為指定樣本區塊建立獨立的 Generator
+
+    Args:
+        bit_generator: 'PCG64' | 'PCG64DXSM' | 'Philox' | 'SFC64'
+        root_seed: 根種子
+        block_id: 樣本區塊編號（從 0 開始）
+
+    Returns:
+        np.random.Generator
+    """
+    if bit_generator not in BIT_GENERATORS:
+        raise ValueError(
+            f"未知的 bit generator: {bit_generator}（支援: {', '.join(BIT_GENERATORS)}）"
+        )
+
+    root = np.random.SeedSequence(root_seed)
+
+    if bit_generator == 'Philox':
+        key = root.generate_state(2, dtype=np.uint64)
+        counter = np.array([0, 0, 0, block_id], dtype=np.uint64)
+        return np.random.Generator(np.random.Philox(counter=counter, key=key))
+
+    if bit_generator in ('PCG64', 'PCG64DXSM'):
+        base = BIT_GENERATORS[bit_generator](root)
+        return np.random.Generator(base.jumped(block_id) if block_id > 0 else base)
+
+    child = np.random.SeedSequence(root_seed, spawn_key=(block_id,))
+    return np.random.Generator(BIT_GENERATORS[bit_generator](child))
+
+
+def block_seed(root_seed: int, block_id: int) -> int:
+    """為不接受 numpy Generator 的核心（如 numba JIT）生成區塊的 32 位種子"""
+    return int(np.random.SeedSequence(root_seed, spawn_key=(block_id,)).generate_state(1)[0])
+
+
+def plan_sample_blocks(num_samples: int, block_size: int = DEFAULT_BLOCK_SIZE,
+                       first_block: int = 0) -> list:
+    """
+    把樣本切分為固定大小的區塊
+
+    Args:
+        num_samples: 樣本總數
+        block_size: 每個區塊的樣本數（最後一個區塊可能較小）
+        first_block: 第一個區塊的編號
+
+    Returns:
+        list: [(block_id, block_length), ...]
+    """
+    num_blocks = (num_samples + block_size - 1) // block_size
+    return [
+        (first_block + i, min(block_size, num_samples - i * block_size))
+        for i in range(num_blocks)
+    ]
+
+
+def split_blocks(blocks: list, num_chunks: int) -> list:
+    """
+    把區塊列表按順序切分為最多 num_chunks 個連續分塊（用於提交給工作進程）
+
+    Returns:
+        list: [[(block_id, block_length), ...], ...]
+    """
+    num_chunks = max(1, min(num_chunks, len(blocks)))
+    base, remainder = divmod(len(blocks), num_chunks)
+    chunks = []
+    start = 0
+    for i in range(num_chunks):
+        stop = start + base + (1 if i < remainder else 0)
+        chunks.append(blocks[start:stop])
+        start = stop
+    return chunks
+
+
+class PackedChoiceStream:
+    """
+    打包低位元抽樣：從 64 位原始輸出切出 [0, N) 的均勻 RAO 選擇
+    
+    每個 64 位整數切成 64 // b 個 b 位欄位（b = ceil(log2 N)），
+    欄位值 >= N 的直接丟棄（拒絕採樣），接受的值在 [0, N) 上嚴格均勻。
+    接受率 N / 2^b >= 1/2，因此每個 64 位整數平均至少產生 (64 // b) / 2 個選擇。
+    
+    用法:
+        stream = PackedChoiceStream(rng, N)
+        choices = stream.take(M)        # 等價於 rng.integers(0, N, size=M) 的分佈
+    """
+    
+    def __init__(self, generator: np.random.Generator, N: int, pool_size: int = 65536):
+        if N < 1 or N > 2 ** 32:
+            raise ValueError(f"打包抽樣需要 1 <= N <= 2^32，收到 N={N}")
+        self.generator = generator
+        self.N = N
+        self.pool_size = pool_size
+        self._bits = max(1, (N - 1).bit_length())
+        self._mask = np.uint64((1 << self._bits) - 1)
+        self._shifts = np.arange(64 // self._bits, dtype=np.uint64) * np.uint64(self._bits)
+        self._pool = np.empty(0, dtype=np.int64)
+        self._position = 0
+    
+    def _refill(self, needed: int):
+        """生成至少 needed 個新選擇，接在未使用的剩餘值後面"""
+        fields_per_word = len(self._shifts)
+        acceptance = self.N / (1 << self._bits)
+        target = max(needed, self.pool_size)
+        chunks = [self._pool[self._position:]]
+        available = chunks[0].size
+        
+        while available < target:
+            num_words = int((target - available) / (fields_per_word * acceptance)) + 1
+            raw = self.generator.bit_generator.random_raw(num_words)
+            fields = ((raw[:, None] >> self._shifts) & self._mask).ravel()
+            accepted = fields[fields < self.N].astype(np.int64)
+            chunks.append(accepted)
+            available += accepted.size
+        
+        self._pool = np.concatenate(chunks)
+        self._position = 0
+    
+    def take(self, size: int) -> np.ndarray:
+        """取出 size 個 [0, N) 的均勻選擇"""
+        if self._position + size > self._pool.size:
+            self._refill(size)
+        choices = self._pool[self._position:self._position + size]
+        self._position += size
+        return choices
@@ -0,0 +1,198 @@
+"""
+可合併的模擬結果分片（shard）
+
+一個分片 = 某個模擬點的 MetricsAccumulator + 產生這些樣本所用的隨機數流列表。
+每條隨機數流記錄為 {'seed', 'first_block', 'num_samples'}，對應
+plan_sample_blocks(num_samples, block_size, first_block) 的區塊，
+因此可以精確判斷兩個分片是否使用了重疊的樣本區塊。
+
+用途:
+- 補充樣本 (top-up): 在已有結果上以 next_block() 之後的全新區塊追加樣本
+- 跨機器合併: 不同機器（不同 seed 或不重疊的區塊範圍）產生的分片合併為一個估計，
+  合併後的均值與置信區間與一次性模擬全部樣本等價
+
+Input: 模擬點參數, MetricsAccumulator, 隨機數流列表
+Output: ResultShard, simulation_point_params(), streams_from_blocks()
+Position: 模擬結果的可合併表示（結果快取、補充樣本、跨機器合併的共同基礎）
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import json
+import os
+import socket
+from pathlib import Path
+from datetime import datetime
+
+from .metrics import MetricsAccumulator
+
+
+def simulation_point_params(M: int, N: int, I_max: int, engine: str, bit_generator: str,
+                            block_size: int, draw_mode: str, barring_factor: float = 1.0,
+                            barring_time: int = 0) -> dict:
+    """
+    群組尋呼模擬點的參數（決定模擬的隨機過程與隨機數流用法，不含種子與樣本數）
+
+    只有參數完全相同的分片才能合併。
+
+    Returns:
+        dict: 模擬點參數字典
+    """
+    return {
+        'scenario': 'group_paging',
+        'engine': engine,
+        'M': M,
+        'N': N,
+        'I_max': I_max,
+        'bit_generator': bit_generator,
+        'block_size': block_size,
+        'draw_mode': draw_mode if engine == 'numpy' else None,
+        'barring_factor': barring_factor,
+        'barring_time': barring_time if barring_factor < 1.0 else 0,
+    }
+
+
+def _stream_block_range(stream: dict, block_size: int) -> range:
+    """隨機數流使用的區塊編號範圍"""
+    num_blocks = (stream['num_samples'] + block_size - 1) // block_size
+    return range(stream['first_block'], stream['first_block'] + num_blocks)
+
+
+def streams_from_blocks(seed: int, blocks: list) -> list:
+    """
+    把區塊列表 [(block_id, block_length), ...] 壓縮為隨機數流記錄
+
+    編號連續的區塊合併為一條 {'seed', 'first_block', 'num_samples'}。
+
+    Returns:
+        list: 隨機數流列表
+    """
+    streams = []
+    for block_id, length in sorted(blocks):
+        last = streams[-1] if streams else None
+        if last is not None and last['_next'] == block_id:
+            last['num_samples'] += length
+            last['_next'] += 1
+        else:
+            streams.append({'seed': seed, 'first_block': block_id, 'num_samples': length,
+                            '_next': block_id + 1})
+    for stream in streams:
+        del stream['_next']
+    return streams
+
+
+class ResultShard:
+    """
+    模擬點的可合併結果分片
+
+    用法:
+        shard = ResultShard(params, accumulator, [{'seed': 1, 'first_block': 0, 'num_samples': 10**6}])
+        shard.merge(other_shard)           # 參數不同或區塊重疊時拋出 ValueError
+        means, cis = shard.accumulator.metrics()
+    """
+
+    def __init__(self, params: dict, accumulator: MetricsAccumulator = None, streams: list = None,
+                 host: str = None):
+        self.params = params
+        self.accumulator = accumulator if accumulator is not None else MetricsAccumulator()
+        self.streams = list(streams) if streams else []
+        self.hosts = [host or socket.gethostname()]
+
+    @property
+    def num_samples(self) -> int:
+        """分片包含的樣本數"""
+        return self.accumulator.num_samples
+
+    def _used_blocks(self) -> set:
+        """已使用的 (seed, block_id) 集合"""
+        block_size = self.params['block_size']
+        return {
+            (stream['seed'], block_id)
+            for stream in self.streams
+            for block_id in _stream_block_range(stream, block_size)
+        }
+
+    def blocks(self, seed: int) -> set:
+        """指定種子下已使用的區塊編號集合"""
+        return {block_id for stream_seed, block_id in self._used_blocks() if stream_seed == seed}
+
+    def next_block(self, seed: int) -> int:
+        """指定種子下第一個未使用的區塊編號（補充樣本從這裡開始）"""
+        block_size = self.params['block_size']
+        return max(
+            (_stream_block_range(stream, block_size).stop
+             for stream in self.streams if stream['seed'] == seed),
+            default=0,
+        )
+
+    def merge(self, other: 'ResultShard') -> 'ResultShard':
+        """
+        合併另一個分片（原地修改並返回自身）
+
+        Raises:
+            ValueError: 模擬點參數不同，或兩個分片使用了相同的隨機數流區塊
+        """
+        if other.params != self.params:
+            raise ValueError(f"無法合併參數不同的分片: {self.params} vs {other.params}")
+        overlap = self._used_blocks() & other._used_blocks()
+        if overlap:
+            seed, block_id = min(overlap)
+            raise ValueError(
+                f"分片的隨機數流重疊（{len(overlap)} 個區塊，例如 seed={seed}, block={block_id}），"
+                "合併會重複計算相同樣本"
+            )
+
+        # 先算好合併結果再一次替換，Ctrl-C 打斷時分片不會處於半更新狀態
+        accumulator = MetricsAccumulator.from_dict(self.accumulator.to_dict()).merge(other.accumulator)
+        streams = self._compact_streams(self.streams + other.streams)
+        self.accumulator, self.streams = accumulator, streams
+        self.hosts.extend(host for host in other.hosts if host not in self.hosts)
+        return self
+
+    def _compact_streams(self, streams: list) -> list:
+        """把同一種子下首尾相接（前一條以完整區塊結束）的隨機數流合併為一條"""
+        block_size = self.params['block_size']
+        compacted = []
+        for stream in sorted(streams, key=lambda item: (item['seed'], item['first_block'])):
+            last = compacted[-1] if compacted else None
+            if (last is not None and last['seed'] == stream['seed']
+                    and last['num_samples'] % block_size == 0
+                    and _stream_block_range(last, block_size).stop == stream['first_block']):
+                last['num_samples'] += stream['num_samples']
+            else:
+                compacted.append(dict(stream))
+        return compacted
+
+    def to_dict(self) -> dict:
+        """序列化為 JSON 可保存的字典"""
+        return {
+            'params': self.params,
+            'accumulator': self.accumulator.to_dict(),
+            'streams': self.streams,
+            'hosts': self.hosts,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ResultShard':
+        """由 to_dict() 的輸出還原"""
+        shard = cls(data['params'], MetricsAccumulator.from_dict(data['accumulator']), data['streams'])
+        shard.hosts = list(data.get('hosts', shard.hosts))
+        return shard
+
+    def save(self, path):
+        """保存分片到 JSON 文件（臨時檔 + os.replace：不原地覆寫可能已被去重的文件）"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = self.to_dict()
+        data['saved'] = datetime.now().isoformat(timespec='seconds')
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path) -> 'ResultShard':
+        """從 JSON 文件載入分片"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,80 @@
+"""
+共享記憶體結果緩衝區
+
+父進程預先分配一塊 multiprocessing.shared_memory，視為 [num_samples, k] 的 NumPy 陣列；
+工作進程按名稱附加到同一塊記憶體，把分塊結果直接寫入自己的行區間。
+父進程看到的就是最終的逐樣本矩陣：不需要 pickle 回傳結果，也不需要 np.vstack 拼接。
+
+生命週期:
+- 創建者（父進程）負責 unlink：with 語句結束或 close() 時自動 unlink
+- close() 前必須釋放所有指向 array 的視圖，否則 SharedMemory 會拋出 BufferError
+- 工作進程只附加、寫入、close()，不 unlink，也不註冊到 resource_tracker
+
+Input: 形狀 (num_samples, k), dtype
+Output: SharedResultBuffer
+Position: simulate_group_paging_multi_samples 的零複製結果組裝
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedResultBuffer:
+    """
+    以共享記憶體為底層的結果陣列
+
+    用法:
+        with SharedResultBuffer.create((num_samples, 3), np.uint16) as buffer:
+            spec = buffer.spec                          # 傳給工作進程（可 pickle 的小元組）
+            ...                                         # 工作進程: SharedResultBuffer.attach(spec)
+            results = buffer.array                      # 逐樣本矩陣，無複製
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, shape: tuple, dtype, owner: bool):
+        self._shm = shm
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.owner = owner
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, shape: tuple, dtype) -> 'SharedResultBuffer':
+        """分配新的共享記憶體區塊（創建者負責 unlink）"""
+        nbytes = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        return cls(shared_memory.SharedMemory(create=True, size=nbytes), shape, dtype, owner=True)
+
+    @classmethod
+    def attach(cls, spec: tuple) -> 'SharedResultBuffer':
+        """按 spec = (name, shape, dtype) 附加到已存在的區塊（工作進程使用）"""
+        name, shape, dtype = spec
+        # track=False：附加方不登記到 resource_tracker，避免工作進程退出時誤刪或誤報洩漏
+        return cls(shared_memory.SharedMemory(name=name, track=False), shape, dtype, owner=False)
+
+    @property
+    def spec(self) -> tuple:
+        """附加所需的信息 (name, shape, dtype)"""
+        return self._shm.name, self.shape, self.dtype.str
+
+    @property
+    def nbytes(self) -> int:
+        return self.array.nbytes
+
+    def close(self):
+        """解除本進程的映射（之後 array 不可再使用）"""
+        if self._shm is None:
+            return
+        self.array = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,319 @@
+"""
+隨機到達流量模擬模組
+
+模擬設備在激活窗口內隨機到達（3GPP Beta 分佈流量模型），
+且多個群組尋呼（paging group）在時間上重疊的情況。
+
+架構層次：
+1. beta_arrival_probabilities / uniform_arrival_probabilities - 單一群組每個 AC 的到達概率
+2. build_arrival_profile - 合併多個重疊群組，得到每個 AC 的期望新到達設備數
+3. simulate_traffic_batch - 逐 AC 把到達設備送入 simulate_one_shot_access_batch（跨樣本批量）
+4. simulate_traffic_multi_samples - 並行多樣本模擬（與群組尋呼共用區塊隨機數流與分塊執行器 chunk_runner.py）
+
+每台設備從到達的 AC 開始最多嘗試 I_max 次；接入延遲定義為成功時的嘗試次數，
+與論文 Eq. (9) 的定義一致。
+
+Input: 群組列表（每組 M 與起始 AC）, N, I_max, 激活窗口參數
+Output: build_arrival_profile(), simulate_traffic_multi_samples(), calibrate_traffic_cost()
+Position: 隨機到達流量場景的模擬引擎
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import numpy as np
+from functools import partial
+from math import lgamma
+
+from .backend import DEFAULT_BACKEND
+from .chunk_runner import run_sample_chunks
+from .chunk_scheduler import DEFAULT_TARGET_TASK_SEC, calibrate_per_sample_cost
+from .one_shot_access import simulate_one_shot_access_batch
+from .metrics import compact_tally_dtype, tallies_to_results
+from .rng import (
+    DEFAULT_BIT_GENERATOR,
+    DEFAULT_BLOCK_SIZE,
+    make_block_generator,
+    plan_sample_blocks,
+    resolve_root_seed,
+    thread_local_generator,
+)
+from .shared_buffer import SharedResultBuffer
+from .worker_bootstrap import DEFAULT_START_METHOD
+
+
+# 每個子批次同時模擬的樣本數（限制 [S, D] 狀態矩陣的記憶體）
+_SUB_BATCH_SIZE = 1024
+
+
+# ============================================================================
+# 到達分佈
+# ============================================================================
+
+def beta_arrival_probabilities(num_slots: int, alpha: float = 3.0, beta: float = 4.0,
+                               resolution: int = 200) -> np.ndarray:
+    """
+    3GPP Beta 分佈流量模型：每個 AC 的到達概率
+
+    激活窗口 [0, T] 被切分為 num_slots 個 AC，
+    p(t) = t^(α-1) (T-t)^(β-1) / (T^(α+β-1) B(α, β))，
+    每個 AC 的概率為 p(t) 在該 AC 區間上的積分（中點法數值積分）。
+
+    Args:
+        num_slots: 激活窗口包含的 AC 數
+        alpha: Beta 分佈參數 α（3GPP TR 37.868: 3）
+        beta: Beta 分佈參數 β（3GPP TR 37.868: 4）
+        resolution: 每個 AC 的積分點數
+
+    Returns:
+        np.ndarray: Shape [num_slots]，總和為 1
+    """
+    points = (np.arange(num_slots * resolution) + 0.5) / (num_slots * resolution)
+    log_norm = lgamma(alpha + beta) - lgamma(alpha) - lgamma(beta)
+    density = np.exp(log_norm) * points ** (alpha - 1) * (1 - points) ** (beta - 1)
+    probabilities = density.reshape(num_slots, resolution).sum(axis=1)
+    return probabilities / probabilities.sum()
+
+
+def uniform_arrival_probabilities(num_slots: int) -> np.ndarray:
+    """均勻分佈流量模型：每個 AC 的到達概率相同"""
+    return np.full(num_slots, 1.0 / num_slots)
+
+
+def get_arrival_probabilities(traffic_config: dict) -> np.ndarray:
+    """根據 traffic 配置生成單一群組的到達概率"""
+    num_slots = traffic_config['activation_slots']
+    distribution = traffic_config.get('distribution', 'beta')
+
+    if distribution == 'beta':
+        return beta_arrival_probabilities(
+            num_slots, traffic_config.get('alpha', 3.0), traffic_config.get('beta', 4.0)
+        )
+    elif distribution == 'uniform':
+        return uniform_arrival_probabilities(num_slots)
+    raise ValueError(f"未知的到達分佈: {distribution}（支援: beta, uniform）")
+
+
+def build_arrival_profile(groups: list, probabilities: np.ndarray, I_max: int) -> np.ndarray:
+    """
+    合併多個重疊群組的到達曲線
+
+    Args:
+        groups: 群組列表，每個元素為 {'M': 設備數, 'start_slot': 起始 AC}
+        probabilities: 單一群組在激活窗口內每個 AC 的到達概率
+        I_max: 每台設備的最大嘗試次數（最後到達的設備仍需 I_max 個 AC）
+
+    Returns:
+        np.ndarray: Shape [num_slots_total]，每個 AC 的期望新到達設備數
+    """
+    window = len(probabilities)
+    last_slot = max(group['start_slot'] for group in groups) + window
+    arrivals = np.zeros(last_slot + I_max - 1, dtype=np.float64)
+
+    for group in groups:
+        start = group['start_slot']
+        arrivals[start:start + window] += group['M'] * probabilities
+
+    return arrivals
+
+
+# ============================================================================
+# 模擬核心
+# ============================================================================
+
+def _draw_arrival_slots(groups: list, probabilities: np.ndarray, num_samples: int,
+                        rng: np.random.Generator) -> np.ndarray:
+    """為每個樣本的每台設備抽取到達 AC，返回 Shape [S, D]"""
+    cdf = np.cumsum(probabilities)
+    cdf[-1] = 1.0
+    arrival_slots = []
+    for group in groups:
+        u = rng.random((num_samples, group['M']))
+        arrival_slots.append(np.searchsorted(cdf, u, side='right') + group['start_slot'])
+    return np.concatenate(arrival_slots, axis=1)
+
+
+def _total_slots(groups: list, probabilities: np.ndarray, I_max: int) -> int:
+    """所有群組的設備完成最多 I_max 次嘗試所需的總 AC 數"""
+    return max(group['start_slot'] for group in groups) + len(probabilities) + I_max - 1
+
+
+def _simulate_traffic_tallies(groups: list, probabilities: np.ndarray, N: int, I_max: int,
+                              num_samples: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    跨樣本批量模擬隨機到達流量，回傳原始整數計數
+    
+    Returns:
+        np.ndarray: Shape [num_samples, 3] 的 int64 計數 (成功設備數, 成功延遲總和, 碰撞 RAO 數)
+    """
+    num_slots = _total_slots(groups, probabilities, I_max)
+
+    arrival_slots = _draw_arrival_slots(groups, probabilities, num_samples, rng)
+    attempts = np.zeros(arrival_slots.shape, dtype=np.int16)
+    done = np.zeros(arrival_slots.shape, dtype=bool)
+
+    tallies = np.zeros((num_samples, 3), dtype=np.int64)
+
+    for slot in range(num_slots):
+        active = (arrival_slots <= slot) & ~done & (attempts < I_max)
+        if not active.any():
+            continue
+
+        success_mask, success_raos, collision_raos = simulate_one_shot_access_batch(active, N, rng)
+        attempts[active] += 1
+        done |= success_mask
+
+        tallies[:, 0] += success_raos
+        tallies[:, 1] += np.sum(np.where(success_mask, attempts, 0), axis=1)
+        tallies[:, 2] += collision_raos
+
+    return tallies
+
+
+def simulate_traffic_batch(groups: list, probabilities: np.ndarray, N: int, I_max: int,
+                           num_samples: int, rng: np.random.Generator = None):
+    """
+    跨樣本批量模擬隨機到達流量（逐 AC 推進）
+
+    Args:
+        groups: 群組列表，每個元素為 {'M': 設備數, 'start_slot': 起始 AC}
+        probabilities: 單一群組的到達概率
+        N: 每個 AC 的 RAO 數
+        I_max: 每台設備的最大嘗試次數
+        num_samples: 樣本數
+        rng: numpy Generator（可選；重現結果時傳入 make_block_generator 的區塊 Generator）
+
+    Returns:
+        np.ndarray: Shape [num_samples, 3] 的結果矩陣 (P_S, T_a, P_C)
+    """
+    if rng is None:
+        rng = thread_local_generator()
+
+    total_devices = sum(group['M'] for group in groups)
+    num_slots = _total_slots(groups, probabilities, I_max)
+    tallies = _simulate_traffic_tallies(groups, probabilities, N, I_max, num_samples, rng)
+    return tallies_to_results(tallies, total_devices, num_slots * N)
+
+
+def _simulate_traffic_worker(groups: list, probabilities: np.ndarray, N: int, I_max: int,
+                             blocks: list, root_seed: int,
+                             bit_generator: str = DEFAULT_BIT_GENERATOR, out: tuple = None):
+    """
+    批量處理：在單個進程中執行多個樣本區塊的流量模擬，回傳緊湊整數計數
+
+    每個區塊使用由 (bit_generator, root_seed, block_id) 決定的獨立隨機數流（與群組尋呼相同），
+    區塊內再分子批次限制 [S, D] 狀態矩陣的記憶體，因此結果與分塊方式和進程數無關。
+
+    Args:
+        blocks: [(block_id, block_length), ...]
+        out: (buffer_spec, row_offset)；給定時直接寫入共享記憶體緩衝區的
+             [row_offset, row_offset + batch_size) 行，只回傳樣本數
+
+    Returns:
+        np.ndarray: Shape [batch_size, 3] 的整數計數（成功設備數, 成功延遲總和, 碰撞 RAO 數）；
+                    給定 out 時回傳 batch_size
+    """
+    batch_size = sum(length for _, length in blocks)
+    total_devices = sum(group['M'] for group in groups)
+    num_slots = _total_slots(groups, probabilities, I_max)
+    shared = None
+    if out is not None:
+        buffer_spec, row_offset = out
+        shared = SharedResultBuffer.attach(buffer_spec)
+        batch_tallies = shared.array[row_offset:row_offset + batch_size]
+    else:
+        batch_tallies = np.empty(
+            (batch_size, 3),
+            dtype=compact_tally_dtype(total_devices, total_devices * I_max, num_slots * N),
+        )
+
+    offset = 0
+    for block_id, length in blocks:
+        rng = make_block_generator(bit_generator, root_seed, block_id)
+        for start in range(0, length, _SUB_BATCH_SIZE):
+            stop = min(start + _SUB_BATCH_SIZE, length)
+            batch_tallies[offset + start:offset + stop] = _simulate_traffic_tallies(
+                groups, probabilities, N, I_max, stop - start, rng
+            )
+        offset += length
+
+    if shared is not None:
+        del batch_tallies
+        shared.close()
+        return batch_size
+    return batch_tallies
+
+
+def calibrate_traffic_cost(groups: list, probabilities: np.ndarray, N: int, I_max: int,
+                           bit_generator: str = DEFAULT_BIT_GENERATOR,
+                           block_size: int = DEFAULT_BLOCK_SIZE) -> tuple:
+    """
+    在當前進程校準流量模擬的每樣本成本（引擎微基準）
+
+    以獨立的隨機數流（根種子 0）跑一小批樣本，結果丟棄；分塊調度與 dry-run 成本預估共用這個估計。
+
+    Returns:
+        tuple: (每樣本秒數, 校準樣本數, 校準耗時秒數)，見 calibrate_per_sample_cost
+    """
+    def run_calibration_batch(samples):
+        _simulate_traffic_worker(groups, probabilities, N, I_max, [(0, samples)], 0, bit_generator)
+    return calibrate_per_sample_cost(run_calibration_batch, block_size)
+
+
+def simulate_traffic_multi_samples(groups: list, probabilities: np.ndarray, N: int, I_max: int,
+                                   num_samples: int, num_workers: int, seed: int = None,
+                                   bit_generator: str = DEFAULT_BIT_GENERATOR,
+                                   block_size: int = DEFAULT_BLOCK_SIZE,
+                                   return_tallies: bool = False, keep_samples: bool = False,
+                                   backend: str = DEFAULT_BACKEND,
+                                   start_method: str = DEFAULT_START_METHOD,
+                                   pin_workers: bool = False,
+                                   max_memory_mb: float = None,
+                                   target_task_sec: float = DEFAULT_TARGET_TASK_SEC):
+    """
+    並行多樣本隨機到達流量模擬
+
+    與 simulate_group_paging_multi_samples 共用同一個執行器（chunk_runner.run_sample_chunks）：
+    樣本按固定大小的區塊切分，每個區塊有獨立的隨機數流（rng.py）；並行數、後端、記憶體預算與
+    自適應分塊分別由 cpu_planner / backend / memory_planner / chunk_scheduler 決定。
+    給定 seed 時結果與 num_workers 無關。
+
+    Args:
+        groups: 群組列表，每個元素為 {'M': 設備數, 'start_slot': 起始 AC}
+        probabilities: 單一群組的到達概率
+        N: 每個 AC 的 RAO 數
+        I_max: 每台設備的最大嘗試次數
+        num_samples: 模擬樣本數
+        num_workers: 並行工作進程數 (-1 表示使用所有可用 CPU，按親和性與 cgroup 配額計算)
+        seed: 根種子（None 表示隨機生成並打印）
+        bit_generator: 'PCG64' | 'PCG64DXSM' | 'Philox' | 'SFC64'
+        block_size: 每個隨機數流區塊的樣本數
+        return_tallies: True 時直接回傳整數計數，不轉換為比率（隱含 keep_samples=True）
+        keep_samples: True 時回傳逐樣本結果矩陣，False 時回傳串流累加的 MetricsAccumulator
+        backend / start_method / pin_workers / max_memory_mb / target_task_sec:
+            見 simulate_group_paging_multi_samples
+
+    Returns:
+        np.ndarray: Shape [num_samples, 3] 的結果矩陣（按區塊順序排列）；
+                    return_tallies=True 時為整數計數；keep_samples、return_tallies 均為 False 時回傳 MetricsAccumulator
+    """
+    total_devices = sum(group['M'] for group in groups)
+    num_slots = _total_slots(groups, probabilities, I_max)
+    blocks = plan_sample_blocks(num_samples, block_size)
+
+    root_seed = resolve_root_seed(seed)
+    describe = [
+        f"群組: {len(groups)} | 設備: {total_devices:,} | N={N}, I_max={I_max} | 總 AC 數: {num_slots}",
+        f"RNG: {bit_generator} | 根種子: {root_seed} | 區塊: {len(blocks)} x {block_size}",
+    ]
+
+    worker = partial(_simulate_traffic_worker, groups, probabilities, N, I_max,
+                     root_seed=root_seed, bit_generator=bit_generator)
+    return run_sample_chunks(
+        worker, blocks, compact_tally_dtype(total_devices, total_devices * I_max, num_slots * N),
+        total_devices, num_slots * N, num_workers, "【Traffic】隨機到達流量並行模擬", describe,
+        calibrate=lambda: calibrate_traffic_cost(groups, probabilities, N, I_max, bit_generator, block_size),
+        block_size=block_size, return_tallies=return_tallies, keep_samples=keep_samples,
+        backend=backend, start_method=start_method, pin_workers=pin_workers,
+        max_memory_mb=max_memory_mb, target_task_sec=target_task_sec
+    )
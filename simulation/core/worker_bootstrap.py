@@ -0,0 +1,105 @@
+"""
+輕量工作進程啟動（bootstrap）
+
+進程池工作進程的啟動成本主要來自導入：spawn / forkserver 啟動的子進程會重新導入主模組
+(main.py) 與任務函數所在套件的 __init__，連帶導入繪圖、CLI、基準測試等工作進程用不到的模組。
+本模組集中處理：
+
+- 啟動方式: auto 在支援時使用 forkserver（否則 spawn）；forkserver 只啟動一次，
+  預先導入 PRELOAD_MODULES（numpy 與模擬 / 解析核心），之後每個工作進程都從它分叉，
+  不再各自導入。fork 最快但在多線程父進程中可能死鎖，需明確指定
+- 初始化: init_worker() 在每個工作進程啟動時執行一次，把 BLAS / OpenMP 線程數固定為 1、
+  可選綁核（見 cpu_planner.py），預熱隨機數生成器，
+  engine='numba' 時預先載入 JIT 核心的磁碟快取，避免算在第一個任務上
+
+配合的輕量化措施: simulation、simulation.core 與 analytical.figure_analysis 的 __init__ 按需導入子模組，
+figure1_analysis 只在保存 / 讀取函數內導入存儲層，
+jit_kernel 只在使用 numba 引擎時才導入 numba；main.py 頂層只導入配置載入器（各命令在函數內導入），
+spawn 工作進程重新執行主模組時不會載入繪圖、CLI 與基準測試模組。
+
+Input: 啟動方式, 模擬引擎
+Output: START_METHODS, resolve_start_method(), worker_context(), init_worker()
+Position: backend.make_executor() 的進程池配置
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import multiprocessing
+
+import numpy as np
+
+from .cpu_planner import limit_blas_threads, pin_current_worker
+from .jit_kernel import NUMBA_AVAILABLE, simulate_batch_jit
+from .rng import DEFAULT_BIT_GENERATOR, make_block_generator, thread_local_generator
+
+# 支援的進程啟動方式
+START_METHODS = ('auto', 'fork', 'forkserver', 'spawn')
+DEFAULT_START_METHOD = 'auto'
+
+# forkserver 預先導入的模組：只有 numpy 與工作進程執行的核心模組
+# （figure1_analysis 的存儲層導入在函數內，analytical.figure_analysis 按需導入子模組，不會連帶載入 sqlite3 與 Figure 2 / 3-5）
+PRELOAD_MODULES = [
+    'numpy',
+    'simulation.core.one_shot_access',
+    'analytical.figure_analysis.figure1_analysis',
+]
+
+
+def resolve_start_method(start_method: str = DEFAULT_START_METHOD) -> str:
+    """
+    解析實際使用的進程啟動方式
+
+    Args:
+        start_method: 'auto' | 'fork' | 'forkserver' | 'spawn'
+
+    Returns:
+        str: 本平台支援的啟動方式（auto: 有 forkserver 就用，否則 spawn）
+    """
+    if start_method not in START_METHODS:
+        raise ValueError(f"未知的啟動方式: {start_method}（支援: {', '.join(START_METHODS)}）")
+
+    available = multiprocessing.get_all_start_methods()
+    if start_method == 'auto':
+        return 'forkserver' if 'forkserver' in available else 'spawn'
+    if start_method not in available:
+        raise ValueError(f"本平台不支援啟動方式 {start_method}（可用: {', '.join(available)}）")
+    return start_method
+
+
+def worker_context(start_method: str = DEFAULT_START_METHOD):
+    """
+    建立工作進程的 multiprocessing 上下文
+
+    forkserver 時設定預先導入的模組（只在 forkserver 首次啟動前生效，之後的進程池共用同一個 forkserver）。
+
+    Returns:
+        multiprocessing.context.BaseContext: 傳給 ProcessPoolExecutor(mp_context=...)
+    """
+    start_method = resolve_start_method(start_method)
+    context = multiprocessing.get_context(start_method)
+    if start_method == 'forkserver':
+        context.set_forkserver_preload(PRELOAD_MODULES)
+    return context
+
+
+def init_worker(engine: str = 'numpy', pin_cpus: list = None, pin_counter=None,
+                bit_generator: str = DEFAULT_BIT_GENERATOR):
+    """
+    工作進程初始化（每個工作進程執行一次）
+
+    Args:
+        engine: 實際使用的模擬引擎；'numba' 時預先載入已編譯的 JIT 核心
+        pin_cpus: 綁核時可分配的 CPU 編號（None 表示不綁核）
+        pin_counter: 綁核用的進程間計數器 multiprocessing.Value('i')
+        bit_generator: 預熱的 bit generator
+    """
+    # 進程池存續期間父進程已設定環境變數（工作進程繼承）；這裡再設一次，供之後才初始化的線程池（如 numba）讀取
+    limit_blas_threads()
+    if pin_cpus:
+        pin_current_worker(pin_cpus, pin_counter)
+    make_block_generator(bit_generator, 0, 0).integers(0, 2, size=8)
+    thread_local_generator()
+    if engine == 'numba' and NUMBA_AVAILABLE:
+        # 導入 numba 並載入核心（cache=True 時從磁碟快取讀取已編譯的機器碼）
+        simulate_batch_jit(1, 1, 1, np.zeros((1, 3), dtype=np.uint8), 0)
@@ -4,17 +4,39 @@ Figure 模擬模組
 運行各 Figure 的蒙特卡洛模擬。
 
 Input: config 配置, group_paging 模擬引擎
-Output: run_figure345_simulation(), load_figure345_simulation_results()
+Output: run_figure345_simulation(), load_figure345_simulation_results(), load_figure345_simulation_stream(),
+        run_figure345_distributed(), top_up_figure345_simulation(), merge_figure345_simulation_results(),
+        run_traffic_simulation(), load_traffic_simulation_results(),
+        run_acb_simulation(), load_acb_simulation_results()
 Position: 模擬任務的執行層
 
 注意：一旦此文件被更新，請同步更新：
 - 項目根目錄 README.md
 """
 
-from .figure345_simulation import run_figure345_simulation, load_figure345_simulation_results
+from .figure345_simulation import (
+    run_figure345_simulation,
+    run_figure345_distributed,
+    load_figure345_simulation_results,
+    top_up_figure345_simulation,
+    merge_figure345_simulation_results,
+    load_figure345_simulation_shards,
+    load_figure345_simulation_stream,
+)
+from .traffic_simulation import run_traffic_simulation, load_traffic_simulation_results
+from .acb_simulation import run_acb_simulation, load_acb_simulation_results
 
 __all__ = [
     'run_figure345_simulation',
+    'run_figure345_distributed',
     'load_figure345_simulation_results',
+    'top_up_figure345_simulation',
+    'merge_figure345_simulation_results',
+    'load_figure345_simulation_shards',
+    'load_figure345_simulation_stream',
+    'run_traffic_simulation',
+    'load_traffic_simulation_results',
+    'run_acb_simulation',
+    'load_acb_simulation_results',
 ]
 
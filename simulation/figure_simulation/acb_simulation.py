@@ -0,0 +1,223 @@
+"""
+Access Class Barring (ACB) 掃描模擬
+
+固定 M, N, I_max，掃描 ACB 的 barring factor，同時計算:
+- 模擬: 群組尋呼批量引擎 + ACB 二項分佈過濾
+- 解析: theoretical_calculation 的 ACB 近似
+
+Input: config 配置, group_paging 模擬引擎, theoretical 理論計算模組
+Output: run_acb_simulation(), load_acb_simulation_results()
+Position: ACB 過載控制場景的執行層
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import gc
+import csv
+import time
+from pathlib import Path
+from datetime import datetime
+
+from ..core.one_shot_access import simulate_group_paging_multi_samples
+from ..core.chunk_scheduler import DEFAULT_TARGET_TASK_SEC
+from ..core.rng import DEFAULT_BIT_GENERATOR, DEFAULT_BLOCK_SIZE, DEFAULT_DRAW_MODE, resolve_root_seed
+from analytical.theoretical import theoretical_calculation
+from storage import find_latest_run, is_columnar_table, load_cached, load_columns, record_run, save_columns
+
+# 可選的計時器支持
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from performance import SimpleTimer
+
+# 項目根目錄
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+def run_acb_simulation(config: dict, timer: 'SimpleTimer' = None) -> dict:
+    """
+    運行 ACB barring factor 掃描（含解析對照）
+
+    Args:
+        config: 配置字典
+
+    Returns:
+        結果字典，包含模擬與解析的 P_S, T_a, P_C
+    """
+    M = config['simulation']['M']
+    N = config['simulation']['N']
+    I_max = config['simulation']['I_max']
+    barring_time = config['acb']['barring_time']
+    barring_factors = config['scan']['values']
+    num_samples = config['performance']['num_samples']
+    num_workers = config['performance']['num_workers']
+    engine = config['performance'].get('engine', 'numpy')
+    backend = config['performance'].get('backend', 'auto')
+    start_method = config['performance'].get('start_method', 'auto')
+    pin_workers = config['performance'].get('pin_workers', False)
+    max_memory_mb = config['performance'].get('max_memory_mb')
+    target_task_sec = config['performance'].get('target_task_sec', DEFAULT_TARGET_TASK_SEC)
+    rng_config = config.get('rng') or {}
+    bit_generator = rng_config.get('bit_generator', DEFAULT_BIT_GENERATOR)
+    block_size = rng_config.get('block_size', DEFAULT_BLOCK_SIZE)
+    draw_mode = rng_config.get('draw_mode', DEFAULT_DRAW_MODE)
+
+    print("=" * 70)
+    print("Group Paging + Access Class Barring 掃描")
+    print("=" * 70)
+    print(f"M = {M}, N = {N}, I_max = {I_max}, barring_time = {barring_time}")
+    print(f"barring_factor: {barring_factors}")
+    print(f"樣本數: {num_samples}, 工作進程: {num_workers}, 引擎: {engine}")
+    root_seed = resolve_root_seed(rng_config.get('seed'))
+    print(f"RNG: {bit_generator} ({draw_mode}), 根種子: {root_seed}, 區塊大小: {block_size}")
+    print("=" * 70)
+
+    results = {
+        'barring_factors': [],
+        'P_S_values': [],
+        'T_a_values': [],
+        'P_C_values': [],
+        'P_S_analytical': [],
+        'T_a_analytical': [],
+        'P_C_analytical': [],
+        'M': M,
+        'N': N,
+        'I_max': I_max,
+        'barring_time': barring_time,
+    }
+
+    for barring_factor in barring_factors:
+        print(f"\n正在模擬 barring_factor={barring_factor}...")
+
+        point_start_time = time.time()
+        # 只需要均值與置信區間：各分塊歸約後串流併入累加器，不保留逐樣本結果
+        accumulator = simulate_group_paging_multi_samples(
+            M, N, I_max, num_samples, num_workers, barring_factor, barring_time, engine,
+            root_seed, bit_generator, block_size, draw_mode,
+            backend=backend, start_method=start_method, pin_workers=pin_workers,
+            max_memory_mb=max_memory_mb, target_task_sec=target_task_sec
+        )
+        if timer is not None:
+            timer.record(f"p={barring_factor} 模擬", time.time() - point_start_time)
+        means, _ = accumulator.metrics()
+        mean_ps, mean_ta, mean_pc = means
+
+        P_S, T_a, P_C, _, _ = theoretical_calculation(M, N, I_max, barring_factor, barring_time)
+
+        results['barring_factors'].append(barring_factor)
+        results['P_S_values'].append(mean_ps)
+        results['T_a_values'].append(mean_ta)
+        results['P_C_values'].append(mean_pc)
+        results['P_S_analytical'].append(P_S)
+        results['T_a_analytical'].append(T_a)
+        results['P_C_analytical'].append(P_C)
+        print(f"  模擬: P_S={mean_ps:.6f}, T_a={mean_ta:.4f}, P_C={mean_pc:.6f}")
+        print(f"  解析: P_S={P_S:.6f}, T_a={T_a:.4f}, P_C={P_C:.6f}")
+
+        del accumulator
+        gc.collect()
+
+    print("\n" + "=" * 70)
+    print("ACB 掃描模擬完成!")
+    print("=" * 70)
+
+    output_config = config.get('output', {})
+    if output_config.get('save_csv', True):
+        save_acb_simulation_results(results, export_csv=output_config.get('export_csv', False), config=config)
+
+    return results
+
+
+# 結果表欄位: 鍵名 → 舊版 CSV 表頭（M、N、I_max、barring_time 為表級屬性）
+ACB_HEADERS = {
+    'barring_factors': 'barring_factor',
+    'P_S_values': 'P_S',
+    'T_a_values': 'T_a',
+    'P_C_values': 'P_C',
+    'P_S_analytical': 'P_S_analytical',
+    'T_a_analytical': 'T_a_analytical',
+    'P_C_analytical': 'P_C_analytical',
+}
+ACB_ATTRS = ('M', 'N', 'I_max', 'barring_time')
+
+
+def save_acb_simulation_results(results: dict, export_csv: bool = False, config: dict = None):
+    """
+    保存 ACB 掃描結果（列式結果表 acb_simulation/），並登記到運行目錄
+
+    Args:
+        results: 結果字典
+        export_csv: 同時導出 acb_simulation.csv
+        config: 運行配置（記錄其雜湊、引擎與種子）
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    result_dir = PROJECT_ROOT / 'result' / 'simulation' / 'acb' / timestamp
+    result_dir.mkdir(parents=True, exist_ok=True)
+
+    table_dir = result_dir / "acb_simulation"
+    save_columns(
+        table_dir, {key: results[key] for key in ACB_HEADERS},
+        attrs={key: results[key] for key in ACB_ATTRS}, headers=ACB_HEADERS,
+        csv_path=table_dir.with_suffix('.csv') if export_csv else None,
+    )
+
+    config = config or {}
+    record_run('simulation/acb', result_dir, {key: results[key] for key in ACB_ATTRS},
+               config=config or None, engine=config.get('performance', {}).get('engine'),
+               seed=(config.get('rng') or {}).get('seed'))
+
+    print(f"✓ ACB 掃描結果已保存: {table_dir}")
+
+
+def _load_acb_csv(csv_path: Path) -> dict:
+    """讀取舊版 CSV 格式的 ACB 掃描結果"""
+    result = {key: [] for key in ACB_HEADERS}
+    result.update({key: None for key in ACB_ATTRS})
+
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            result['barring_factors'].append(float(row['barring_factor']))
+            result['P_S_values'].append(float(row['P_S']))
+            result['T_a_values'].append(float(row['T_a']))
+            result['P_C_values'].append(float(row['P_C']))
+            result['P_S_analytical'].append(float(row['P_S_analytical']))
+            result['T_a_analytical'].append(float(row['T_a_analytical']))
+            result['P_C_analytical'].append(float(row['P_C_analytical']))
+            if result['M'] is None:
+                result['M'] = int(row['M'])
+                result['N'] = int(row['N'])
+                result['I_max'] = int(row['I_max'])
+                result['barring_time'] = int(row['barring_time'])
+
+    return result
+
+
+def _read_acb_table(source: Path) -> dict:
+    """讀取ACB 掃描結果表（列式表或舊版 CSV）"""
+    if is_columnar_table(source):
+        columns, attrs = load_columns(source)
+        return {**columns, **attrs}
+    return _load_acb_csv(source)
+
+
+def load_acb_simulation_results(M: int = None, I_max: int = None) -> dict:
+    """
+    載入最新的 ACB 掃描結果（列式表內存映射讀取；舊版目錄讀取 CSV；重複讀取返回快取）
+
+    Args:
+        M: 要求的設備總數（None 表示不限）
+        I_max: 要求的最大接入周期數（None 表示不限）
+
+    Returns:
+        結果字典，如果找不到則返回 None
+    """
+    latest_dir = find_latest_run('simulation/acb', M=M, I_max=I_max)
+    if latest_dir is None:
+        return None
+
+    table_dir = latest_dir / "acb_simulation"
+    source = table_dir if is_columnar_table(table_dir) else latest_dir / "acb_simulation.csv"
+    if not source.exists():
+        return None
+    return load_cached(source, _read_acb_table)
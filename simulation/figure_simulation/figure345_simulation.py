@@ -12,10 +12,28 @@ Figure 3, 4, 5 合併模擬
 模擬完成後會自動計算 Approximation Error（與近似公式結果對比）。
 根據論文定義: Error = |Approximation - Simulation| / |Approximation| * 100%
 
-記憶體優化：每次 N 迴圈後強制 gc，避免記憶體累積。
+記憶體優化：每次 N 迴圈後強制 gc，避免記憶體累積；指標經分片累加器匯總，不需要逐樣本結果，
+模擬以串流累加完成；設定 performance.max_memory_mb 時再按預算切小分塊、限制在途分塊數。
 
-Input: config 配置, group_paging 模擬引擎, metrics 指標計算
-Output: run_figure345_simulation(), load_figure345_simulation_results()
+結果快取：固定種子時每個 N 點的指標累加器寫入內容定址快取（result_cache.py），
+擴大 N 範圍後重新運行只模擬缺少的點。
+
+每個 N 點的結果同時保存為可合併分片（shards/N{N}.json），支援:
+- top_up_figure345_simulation: 以不重疊的新隨機數流在最新結果上補充樣本
+- merge_figure345_simulation_results: 合併多個結果目錄（例如不同機器）的分片
+
+長時間掃描每隔 checkpoint.interval_sec 秒把各 N 點的分片寫入檢查點，
+Ctrl-C 時寫入最後一份檢查點；run_figure345_simulation(resume=True) 從檢查點續跑。
+
+每個 N 點完成後追加一行到 result/stream/simulation/figure345.ndjson（output.stream），
+load_figure345_simulation_stream() 在掃描進行中或中斷後讀取已完成的點。
+
+run_figure345_distributed 以協調器模式把 (N, 區塊組) 任務分發給多台機器的 TCP 工作節點（cluster.py）。
+
+Input: config 配置, group_paging 模擬引擎, metrics 指標計算, result_cache 結果快取, shards 結果分片
+Output: run_figure345_simulation(), run_figure345_distributed(), top_up_figure345_simulation(),
+        merge_figure345_simulation_results(), load_figure345_simulation_results(),
+        load_figure345_simulation_shards(), load_figure345_simulation_stream()
 Position: Figure 3, 4, 5 的蒙特卡洛模擬核心
 
 注意：一旦此文件被更新，請同步更新：
@@ -24,12 +42,37 @@ Position: Figure 3, 4, 5 的蒙特卡洛模擬核心
 
 import gc
 import csv
+import time
 from pathlib import Path
 from datetime import datetime
 
-from ..core.group_paging import simulate_group_paging_multi_samples
-from ..core.metrics import calculate_performance_metrics
+from ..core.one_shot_access import simulate_group_paging_multi_samples
+from ..core.chunk_scheduler import DEFAULT_TARGET_TASK_SEC
+from ..core.metrics import MetricsAccumulator
+from ..core.jit_kernel import resolve_engine
+from ..core.rng import (
+    DEFAULT_BIT_GENERATOR,
+    DEFAULT_BLOCK_SIZE,
+    DEFAULT_DRAW_MODE,
+    plan_sample_blocks,
+    resolve_root_seed,
+)
+from ..core.result_cache import DEFAULT_CACHE_SIZE_MB, ResultCache, simulation_cache_params
+from ..core.shards import ResultShard, simulation_point_params, streams_from_blocks
+from ..core.checkpoint import DEFAULT_CHECKPOINT_DIR, DEFAULT_CHECKPOINT_INTERVAL, SweepCheckpoint
+from ..core.cluster import DEFAULT_LISTEN, DEFAULT_MAX_ATTEMPTS, DEFAULT_TASK_TIMEOUT, Coordinator
 from analytical.figure_analysis import load_figure345_results
+from storage import (
+    StreamWriter,
+    find_latest_run,
+    is_columnar_table,
+    load_cached,
+    load_columns,
+    read_stream,
+    record_run,
+    save_columns,
+    stream_path,
+)
 
 # 可選的計時器支持
 from typing import TYPE_CHECKING
@@ -39,6 +82,12 @@ if TYPE_CHECKING:
 # 項目根目錄
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 
+# 掃描檢查點文件
+CHECKPOINT_PATH = DEFAULT_CHECKPOINT_DIR / 'figure345_simulation.json'
+
+# 逐點串流的結果種類（result/stream/simulation/figure345.ndjson）
+STREAM_KIND = 'simulation/figure345'
+
 
 def calculate_approximation_error(approximation_value: float, simulation_value: float) -> float:
     """
@@ -63,15 +112,63 @@ def calculate_approximation_error(approximation_value: float, simulation_value:
         return abs(simulation_value) * 100 if simulation_value != 0 else 0.0
 
 
-def run_figure345_simulation(config: dict, timer: 'SimpleTimer' = None) -> dict:
+def _simulate_point(params: dict, num_samples: int, num_workers: int, seed: int,
+                    first_block: int = 0, timer: 'SimpleTimer' = None,
+                    shard: ResultShard = None, checkpoint: SweepCheckpoint = None,
+                    backend: str = 'auto',
+                    start_method: str = 'auto', pin_workers: bool = False,
+                    max_memory_mb: float = None,
+                    target_task_sec: float = DEFAULT_TARGET_TASK_SEC) -> ResultShard:
+    """
+    模擬一個 N 點，返回結果分片
+    
+    每個分塊完成時立即併入分片；給定 shard 時跳過其中已完成的區塊（從檢查點續跑），
+    給定 checkpoint 時按間隔寫入檢查點；backend / start_method / pin_workers / max_memory_mb /
+    target_task_sec 見 simulate_group_paging_multi_samples。
+    """
+    if shard is None:
+        shard = ResultShard(params)
+    
+    def on_chunk_done(blocks, chunk_results):
+        shard.merge(ResultShard(
+            params, MetricsAccumulator.from_results(chunk_results), streams_from_blocks(seed, blocks)
+        ))
+        if checkpoint is not None:
+            checkpoint.maybe_save()
+    
+    n_start_time = time.time()
+    accumulator = simulate_group_paging_multi_samples(
+        params['M'], params['N'], params['I_max'], num_samples, num_workers,
+        params['barring_factor'], params['barring_time'], params['engine'], seed,
+        params['bit_generator'], params['block_size'], params['draw_mode'] or DEFAULT_DRAW_MODE,
+        first_block=first_block, skip_blocks=shard.blocks(seed), on_chunk_done=on_chunk_done,
+        backend=backend, start_method=start_method, pin_workers=pin_workers,
+        max_memory_mb=max_memory_mb, target_task_sec=target_task_sec,
+    )
+    if timer is not None:
+        timer.record(f"N={params['N']} 模擬", time.time() - n_start_time)
+    
+    # 記憶體優化：釋放累加器並強制 gc
+    del accumulator
+    gc.collect()
+    return shard
+
+
+def run_figure345_simulation(config: dict, timer: 'SimpleTimer' = None, resume: bool = False,
+                             approximation_data: dict = None) -> dict:
     """
     運行 Figure 3, 4, 5 合併模擬
     
+    掃描過程中定期把每個 N 點的分片寫入檢查點；Ctrl-C 時寫入最後一份檢查點後返回 None。
+    
     Args:
         config: 配置字典
+        resume: 從上次中斷的檢查點續跑（沿用檢查點中的根種子）
+        approximation_data: run_figure345_analysis 的結果（用於 Approximation Error；
+                            None 時讀取最新保存的解析結果）
     
     Returns:
-        結果字典，包含 P_S, T_a, P_C 三個指標
+        結果字典，包含 P_S, T_a, P_C 三個指標；被中斷時返回 None
     """
     M = config['simulation']['M']
     I_max = config['simulation']['I_max']
@@ -79,6 +176,39 @@ def run_figure345_simulation(config: dict, timer: 'SimpleTimer' = None) -> dict:
     N_range = range(scan_config['start'], scan_config['stop'], scan_config['step'])
     num_samples = config['performance']['num_samples']
     num_workers = config['performance']['num_workers']
+    backend = config['performance'].get('backend', 'auto')
+    start_method = config['performance'].get('start_method', 'auto')
+    pin_workers = config['performance'].get('pin_workers', False)
+    max_memory_mb = config['performance'].get('max_memory_mb')
+    target_task_sec = config['performance'].get('target_task_sec', DEFAULT_TARGET_TASK_SEC)
+    engine = resolve_engine(config['performance'].get('engine', 'numpy'))
+    rng_config = config.get('rng') or {}
+    bit_generator = rng_config.get('bit_generator', DEFAULT_BIT_GENERATOR)
+    block_size = rng_config.get('block_size', DEFAULT_BLOCK_SIZE)
+    draw_mode = rng_config.get('draw_mode', DEFAULT_DRAW_MODE)
+    acb_config = config.get('acb') or {}
+    barring_factor = acb_config.get('barring_factor', 1.0)
+    barring_time = acb_config.get('barring_time', 0)
+    cache_config = config.get('cache') or {}
+    # 只有固定種子的結果可重現，才能被快取重用
+    use_cache = cache_config.get('enabled', True) and rng_config.get('seed') is not None
+    cache = ResultCache(max_size_mb=cache_config.get('max_size_mb', DEFAULT_CACHE_SIZE_MB)) if use_cache else None
+    checkpoint_config = config.get('checkpoint') or {}
+    use_checkpoint = checkpoint_config.get('enabled', True)
+    checkpoint_interval = checkpoint_config.get('interval_sec', DEFAULT_CHECKPOINT_INTERVAL)
+    output_config = config.get('output') or {}
+    use_stream = output_config.get('stream', True)
+    checkpoint = None
+    if not resume and use_checkpoint and CHECKPOINT_PATH.exists():
+        print(f"⚠ 發現未完成的檢查點 {CHECKPOINT_PATH}，本次運行將覆蓋（續跑請加 --resume）")
+    if resume:
+        checkpoint = SweepCheckpoint.load(CHECKPOINT_PATH, checkpoint_interval)
+        if checkpoint is None:
+            print("⚠ 找不到檢查點，將從頭開始模擬")
+        elif checkpoint.meta.get('num_samples') != num_samples:
+            print(f"⚠ 檢查點的樣本數 ({checkpoint.meta.get('num_samples')}) 與配置 ({num_samples}) 不同，"
+                  "將從頭開始模擬")
+            checkpoint = None
     
     print("=" * 70)
     print("Figure 3, 4, 5 合併模擬")
@@ -88,54 +218,339 @@ def run_figure345_simulation(config: dict, timer: 'SimpleTimer' = None) -> dict:
     print("=" * 70)
     print(f"M = {M}, I_max = {I_max}")
     print(f"N 範圍: {scan_config['start']} 到 {scan_config['stop']-1}")
-    print(f"樣本數: {num_samples}, 工作進程: {num_workers}")
+    print(f"樣本數: {num_samples}, 工作進程: {num_workers}, 引擎: {engine}")
+    if checkpoint is not None:
+        root_seed = checkpoint.meta['seed']
+        print(f"從檢查點續跑: {CHECKPOINT_PATH}（{len(checkpoint.shards)} 個 N 點有進度）")
+    else:
+        root_seed = resolve_root_seed(rng_config.get('seed'))
+    print(f"RNG: {bit_generator} ({draw_mode}), 根種子: {root_seed}, 區塊大小: {block_size}")
+    print(f"結果快取: {'啟用 (' + str(cache.cache_dir) + ')' if cache else '停用（需固定 rng.seed）'}")
+    print(f"檢查點: {'每 ' + str(checkpoint_interval) + ' 秒寫入 ' + str(CHECKPOINT_PATH) if use_checkpoint else '停用'}")
+    print(f"逐點串流: {stream_path(STREAM_KIND) if use_stream else '停用'}")
     print("=" * 70)
     
-    N_values = []
-    P_S_values = []
-    T_a_values = []
-    P_C_values = []
+    if checkpoint is None and use_checkpoint:
+        checkpoint = SweepCheckpoint(
+            CHECKPOINT_PATH, {'seed': root_seed, 'num_samples': num_samples}, checkpoint_interval
+        )
+    
+    shards = {}
+    stream = StreamWriter(
+        STREAM_KIND, {'M': M, 'I_max': I_max, 'num_samples': num_samples, 'seed': root_seed},
+        fsync=output_config.get('stream_fsync', False),
+    ) if use_stream else None
     
+    try:
+        for N in N_range:
+            params = simulation_point_params(
+                M, N, I_max, engine, bit_generator, block_size, draw_mode, barring_factor, barring_time
+            )
+            cache_params = simulation_cache_params(
+                M, N, I_max, num_samples, engine, root_seed, bit_generator, block_size, draw_mode,
+                barring_factor, barring_time
+            )
+            shard = cache.get(cache_params) if cache else None
+            saved = checkpoint.shards.get(N) if checkpoint else None
+            if saved is not None and saved.params != params:
+                saved = None
+            
+            if shard is not None:
+                print(f"\nN={N}: ✓ 使用快取結果")
+            elif saved is not None and saved.num_samples >= num_samples:
+                print(f"\nN={N}: ✓ 使用檢查點結果")
+                shard = saved
+            else:
+                if saved is not None:
+                    print(f"\n正在續跑 N={N}（已完成 {saved.num_samples:,} / {num_samples:,} 樣本）...")
+                else:
+                    print(f"\n正在模擬 N={N}...")
+                    saved = ResultShard(params)
+                if checkpoint is not None:
+                    checkpoint.shards[N] = saved
+                shard = _simulate_point(params, num_samples, num_workers, root_seed, timer=timer,
+                                        shard=saved, checkpoint=checkpoint, backend=backend,
+                                        start_method=start_method, pin_workers=pin_workers,
+                                        max_memory_mb=max_memory_mb, target_task_sec=target_task_sec)
+                if cache:
+                    cache.put(cache_params, shard)
+            
+            shards[N] = shard
+            if checkpoint is not None:
+                checkpoint.shards[N] = shard
+                checkpoint.save()
+            (mean_ps, mean_ta, mean_pc), cis = shard.accumulator.metrics()
+            print(f"  結果: P_S={mean_ps:.6f}, T_a={mean_ta:.4f}, P_C={mean_pc:.6f}")
+            if stream is not None:
+                stream.append({
+                    'N': N, 'P_S': mean_ps, 'T_a': mean_ta, 'P_C': mean_pc,
+                    'P_S_ci': cis[0], 'T_a_ci': cis[1], 'P_C_ci': cis[2], 'num_samples': shard.num_samples,
+                })
+        if stream is not None:
+            stream.finish()
+    except KeyboardInterrupt:
+        print("\n⚠ 模擬被中斷")
+        if checkpoint is not None:
+            checkpoint.save()
+            print(f"✓ 已寫入檢查點: {CHECKPOINT_PATH}")
+            print("  續跑: python main.py simulation figure345 --resume")
+        return None
+    finally:
+        if stream is not None:
+            stream.close()
+    
+    if checkpoint is not None:
+        checkpoint.clear()
+    
+    print("\n" + "=" * 70)
+    print("Figure 3, 4, 5 合併模擬完成!")
+    if cache:
+        print(f"快取: 命中 {cache.hits} 點, 新模擬 {cache.misses} 點, "
+              f"大小 {cache.size_bytes() / 1024:.1f} KB")
+    print("=" * 70)
+    
+    return _finalize_figure345_results(shards, M, I_max, config, approximation_data)
+
+
+def run_figure345_distributed(config: dict, listen: str = None, timer: 'SimpleTimer' = None) -> dict:
+    """
+    以協調器模式運行 Figure 3, 4, 5 合併模擬（多機）
+    
+    每個 N 點的樣本區塊按 cluster.task_blocks 分組為任務，由通過
+    `python main.py worker --connect host:port` 連線的工作節點執行；
+    工作節點斷線或超時的任務會重新分配。快取中已有的點不會下發。
+    
+    Args:
+        config: 配置字典
+        listen: 監聽地址 'host:port'（None 表示使用 cluster.listen）
+    
+    Returns:
+        結果字典，包含 P_S, T_a, P_C 三個指標
+    """
+    M = config['simulation']['M']
+    I_max = config['simulation']['I_max']
+    scan_config = config['scan']['range']
+    N_range = range(scan_config['start'], scan_config['stop'], scan_config['step'])
+    num_samples = config['performance']['num_samples']
+    engine = resolve_engine(config['performance'].get('engine', 'numpy'))
+    rng_config = config.get('rng') or {}
+    bit_generator = rng_config.get('bit_generator', DEFAULT_BIT_GENERATOR)
+    block_size = rng_config.get('block_size', DEFAULT_BLOCK_SIZE)
+    draw_mode = rng_config.get('draw_mode', DEFAULT_DRAW_MODE)
+    acb_config = config.get('acb') or {}
+    barring_factor = acb_config.get('barring_factor', 1.0)
+    barring_time = acb_config.get('barring_time', 0)
+    cache_config = config.get('cache') or {}
+    use_cache = cache_config.get('enabled', True) and rng_config.get('seed') is not None
+    cache = ResultCache(max_size_mb=cache_config.get('max_size_mb', DEFAULT_CACHE_SIZE_MB)) if use_cache else None
+    cluster_config = config.get('cluster') or {}
+    listen = listen or cluster_config.get('listen', DEFAULT_LISTEN)
+    task_blocks = cluster_config.get('task_blocks', 16)
+    
+    print("=" * 70)
+    print("Figure 3, 4, 5 合併模擬（分佈式協調器）")
+    print("=" * 70)
+    print(f"M = {M}, I_max = {I_max}")
+    print(f"N 範圍: {scan_config['start']} 到 {scan_config['stop']-1}")
+    print(f"樣本數: {num_samples}, 引擎: {engine}, 每個任務 {task_blocks} 個區塊")
+    root_seed = resolve_root_seed(rng_config.get('seed'))
+    print(f"RNG: {bit_generator} ({draw_mode}), 根種子: {root_seed}, 區塊大小: {block_size}")
+    print("=" * 70)
+    
+    shards = {}
+    cache_params = {}
+    tasks = []
     for N in N_range:
-        print(f"\n正在模擬 N={N}...")
-        
-        if timer is not None:
-            timer.start(f"simulate_group_paging_multi_samples(N={N})")
-        results_array = simulate_group_paging_multi_samples(
-            M, N, I_max, num_samples, num_workers
+        params = simulation_point_params(
+            M, N, I_max, engine, bit_generator, block_size, draw_mode, barring_factor, barring_time
         )
-        if timer is not None:
-            timer.end(f"simulate_group_paging_multi_samples(N={N})")
-        means, _ = calculate_performance_metrics(results_array)
-        mean_ps, mean_ta, mean_pc = means
-        
-        N_values.append(N)
-        P_S_values.append(mean_ps)
-        T_a_values.append(mean_ta)
-        P_C_values.append(mean_pc)
-        print(f"  結果: P_S={mean_ps:.6f}, T_a={mean_ta:.4f}, P_C={mean_pc:.6f}")
+        cache_params[N] = simulation_cache_params(
+            M, N, I_max, num_samples, engine, root_seed, bit_generator, block_size, draw_mode,
+            barring_factor, barring_time
+        )
+        shard = cache.get(cache_params[N]) if cache else None
+        if shard is not None:
+            print(f"N={N}: ✓ 使用快取結果")
+            shards[N] = shard
+            continue
         
-        # 記憶體優化：釋放大型結果陣列並強制 gc
-        del results_array
-        gc.collect()
+        shards[N] = ResultShard(params)
+        blocks = plan_sample_blocks(num_samples, block_size)
+        for start in range(0, len(blocks), task_blocks):
+            tasks.append({'params': params, 'seed': root_seed, 'blocks': blocks[start:start + task_blocks]})
+    
+    def on_result(task, accumulator):
+        N = task['params']['N']
+        shards[N].merge(ResultShard(
+            task['params'], accumulator, streams_from_blocks(task['seed'], task['blocks'])
+        ))
+        if cache and shards[N].num_samples == num_samples:
+            cache.put(cache_params[N], shards[N])
+    
+    start_time = time.time()
+    Coordinator(
+        tasks, listen, on_result, cluster_config.get('task_timeout_sec', DEFAULT_TASK_TIMEOUT),
+        cluster_config.get('max_attempts', DEFAULT_MAX_ATTEMPTS)
+    ).run()
+    if timer is not None:
+        timer.record("分佈式模擬", time.time() - start_time)
+    
+    print("\n" + "=" * 70)
+    print(f"分佈式模擬完成! 耗時: {time.time() - start_time:.2f}s")
+    for N, shard in shards.items():
+        (mean_ps, mean_ta, mean_pc), _ = shard.accumulator.metrics()
+        print(f"  N={N}: P_S={mean_ps:.6f}, T_a={mean_ta:.4f}, P_C={mean_pc:.6f} "
+              f"({', '.join(shard.hosts)})")
+    print("=" * 70)
+    
+    return _finalize_figure345_results(shards, M, I_max, config)
+
+
+def top_up_figure345_simulation(config: dict, extra_samples: int,
+                                timer: 'SimpleTimer' = None) -> dict:
+    """
+    在 M、I_max 與配置相同的最新 Figure 3, 4, 5 模擬結果上補充樣本
+    
+    每個 N 點沿用原結果的模擬參數與根種子，從該種子下第一個未使用的區塊開始模擬
+    extra_samples 個新樣本（隨機數流與已有樣本不重疊），再與原分片合併。
+    原結果的模擬引擎在本機不可用時（例如以 numba 模擬、本機未安裝 numba）拒絕補充。
     
+    Args:
+        config: 配置字典（使用 performance.num_workers 與 output 設定）
+        extra_samples: 每個 N 點追加的樣本數
+    
+    Returns:
+        合併後的結果字典，找不到可補充的結果或引擎不可用時返回 None
+    """
+    shards = load_figure345_simulation_shards(M=config['simulation']['M'], I_max=config['simulation']['I_max'])
+    if not shards:
+        print("⚠ 找不到帶分片的 Figure 3, 4, 5 模擬結果，請先運行: python main.py simulation figure345")
+        return None
+    
+    # 補充的樣本必須與原分片使用同一引擎：本機缺少原引擎時 resolve_engine 會退回 numpy，
+    # 混入的樣本卻仍標記為原引擎，因此拒絕補充
+    for engine in sorted({shard.params['engine'] for shard in shards.values()}):
+        available = resolve_engine(engine)
+        if available != engine:
+            print(f"✗ 原結果以 {engine} 引擎模擬，本機只能使用 {available}，拒絕補充樣本"
+                  f"（請在有 {engine} 的環境運行，或重新運行 python main.py simulation figure345）")
+            return None
+    
+    num_workers = config['performance']['num_workers']
+    backend = config['performance'].get('backend', 'auto')
+    start_method = config['performance'].get('start_method', 'auto')
+    pin_workers = config['performance'].get('pin_workers', False)
+    max_memory_mb = config['performance'].get('max_memory_mb')
+    target_task_sec = config['performance'].get('target_task_sec', DEFAULT_TARGET_TASK_SEC)
+    first_shard = next(iter(shards.values()))
+    
+    print("=" * 70)
+    print("Figure 3, 4, 5 補充樣本 (Top-up)")
+    print("=" * 70)
+    print(f"N 點數: {len(shards)}, 每點追加樣本: {extra_samples:,}, 工作進程: {num_workers}")
+    print(f"現有樣本: {first_shard.num_samples:,} / 點")
+    print("=" * 70)
+    
+    for N, shard in shards.items():
+        seed = shard.streams[0]['seed']
+        first_block = shard.next_block(seed)
+        print(f"\n正在補充 N={N}（種子 {seed}, 起始區塊 {first_block}）...")
+        shard.merge(_simulate_point(shard.params, extra_samples, num_workers, seed, first_block, timer,
+                                    backend=backend, start_method=start_method, pin_workers=pin_workers,
+                                    max_memory_mb=max_memory_mb, target_task_sec=target_task_sec))
+        (mean_ps, mean_ta, mean_pc), (ci_ps, _, _) = shard.accumulator.metrics()
+        print(f"  結果 ({shard.num_samples:,} 樣本): P_S={mean_ps:.6f} ± {ci_ps:.6f}, "
+              f"T_a={mean_ta:.4f}, P_C={mean_pc:.6f}")
+    
+    print("\n" + "=" * 70)
+    print("補充樣本完成!")
+    print("=" * 70)
+    
+    return _finalize_figure345_results(shards, first_shard.params['M'], first_shard.params['I_max'], config)
+
+
+def merge_figure345_simulation_results(sources: list, config: dict = None) -> dict:
+    """
+    合併多個 Figure 3, 4, 5 模擬結果（例如在不同機器上產生的結果）
+    
+    每個來源可以是結果目錄（含 shards/ 子目錄）或分片目錄本身。
+    同一 N 點的分片必須模擬參數相同、隨機數流不重疊（不同機器應使用不同的 rng.seed），
+    合併後的均值與置信區間等價於一次性模擬全部樣本。
+    
+    Args:
+        sources: 結果目錄路徑列表
+        config: 配置字典（可選，使用 output 設定）
+    
+    Returns:
+        合併後的結果字典
+    
+    Raises:
+        ValueError: 分片參數不相容或隨機數流重疊
+    """
+    shards = {}
+    for source in sources:
+        for N, shard in load_figure345_simulation_shards(source).items():
+            if N in shards:
+                shards[N].merge(shard)
+            else:
+                shards[N] = shard
+    
+    if not shards:
+        print("⚠ 指定的來源中找不到任何分片")
+        return None
+    
+    first_shard = next(iter(shards.values()))
+    print("=" * 70)
+    print("Figure 3, 4, 5 結果合併")
+    print("=" * 70)
+    print(f"來源: {len(sources)} 個, N 點數: {len(shards)}")
+    for N, shard in sorted(shards.items()):
+        (mean_ps, _, _), (ci_ps, _, _) = shard.accumulator.metrics()
+        print(f"  N={N}: {shard.num_samples:,} 樣本, {len(shard.streams)} 條隨機數流, "
+              f"主機 {', '.join(shard.hosts)} | P_S={mean_ps:.6f} ± {ci_ps:.6f}")
+    print("=" * 70)
+    
+    return _finalize_figure345_results(
+        dict(sorted(shards.items())), first_shard.params['M'], first_shard.params['I_max'], config or {}
+    )
+
+
+def _finalize_figure345_results(shards: dict, M: int, I_max: int, config: dict,
+                                approximation_data: dict = None) -> dict:
+    """由每個 N 點的分片計算結果字典、Approximation Error（approximation_data 為 None 時讀取 M、I_max 相同的最新解析結果），並保存"""
     results = {
-        'N_values': N_values,
-        'P_S_values': P_S_values,
-        'T_a_values': T_a_values,
-        'P_C_values': P_C_values,
+        'N_values': [],
+        'P_S_values': [],
+        'T_a_values': [],
+        'P_C_values': [],
+        'P_S_ci': [],
+        'T_a_ci': [],
+        'P_C_ci': [],
+        'num_samples': [],
         'M': M,
         'I_max': I_max,
     }
+    for N, shard in shards.items():
+        means, cis = shard.accumulator.metrics()
+        results['N_values'].append(N)
+        results['P_S_values'].append(means[0])
+        results['T_a_values'].append(means[1])
+        results['P_C_values'].append(means[2])
+        results['P_S_ci'].append(cis[0])
+        results['T_a_ci'].append(cis[1])
+        results['P_C_ci'].append(cis[2])
+        results['num_samples'].append(shard.num_samples)
     
-    print("\n" + "=" * 70)
-    print("Figure 3, 4, 5 合併模擬完成!")
-    print("=" * 70)
+    N_values = results['N_values']
+    P_S_values = results['P_S_values']
+    T_a_values = results['T_a_values']
+    P_C_values = results['P_C_values']
     
     # 計算 Approximation Error（與近似公式結果對比）
     # 根據論文: Error = |Approximation - Simulation| / |Approximation| * 100%
     print("\n正在計算 Approximation Error...")
-    approximation_data = load_figure345_results()  # 這是近似公式的結果
+    if approximation_data is None:
+        approximation_data = load_figure345_results(M=M, I_max=I_max)  # 這是近似公式的結果
     
     if approximation_data is not None:
         # 建立 N -> index 的映射
@@ -170,87 +585,115 @@ def run_figure345_simulation(config: dict, timer: 'SimpleTimer' = None) -> dict:
         print("⚠ 找不到 Approximation 結果，無法計算 Approximation Error")
         print("  請先運行選項 3 進行解析計算")
     
-    # 保存結果到 CSV
-    if config.get('output', {}).get('save_csv', True):
-        save_figure345_simulation_results(results)
+    # 保存結果（連同每個 N 點的分片，供補充樣本與合併使用）
+    output_config = config.get('output', {})
+    if output_config.get('save_csv', True):
+        save_figure345_simulation_results(results, shards, export_csv=output_config.get('export_csv', False),
+                                          config=config)
     
     return results
 
 
-def save_figure345_simulation_results(results: dict):
-    """保存 Figure 3, 4, 5 合併模擬結果到 CSV 文件（包含 Approximation Error）"""
+# 結果表欄位: 鍵名 → 舊版 CSV 表頭（M、I_max 為表級屬性）
+SIMULATION_HEADERS = {
+    'N_values': 'N',
+    'P_S_values': 'P_S',
+    'T_a_values': 'T_a',
+    'P_C_values': 'P_C',
+}
+ERROR_COLUMNS = ('P_S_error', 'T_a_error', 'P_C_error')
+CI_COLUMNS = ('P_S_ci', 'T_a_ci', 'P_C_ci', 'num_samples')
+
+
+def save_figure345_simulation_results(results: dict, shards: dict = None, export_csv: bool = False,
+                                      config: dict = None):
+    """
+    保存 Figure 3, 4, 5 合併模擬結果（列式結果表 figure345_simulation/，包含 Approximation Error），
+    並登記到運行目錄（引擎與根種子取自分片，未給分片時取自配置）
+    
+    Args:
+        results: 結果字典
+        shards: {N: ResultShard}（可選），保存到同一時間戳目錄的 shards/ 子目錄
+        export_csv: 同時導出 figure345_simulation.csv
+        config: 運行配置（記錄其雜湊）
+    """
     # 創建結果目錄
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     result_dir = PROJECT_ROOT / 'result' / 'simulation' / 'figure345' / timestamp
     result_dir.mkdir(parents=True, exist_ok=True)
     
-    save_path = result_dir / "figure345_simulation.csv"
-    
-    # 檢查是否有誤差數據
+    # 檢查是否有誤差與置信區間數據
     has_error = 'P_S_error' in results and results['P_S_error'] is not None
+    has_ci = 'P_S_ci' in results
     
-    with open(save_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        # 寫入表頭
-        if has_error:
-            writer.writerow(['N', 'P_S', 'T_a', 'P_C', 'P_S_error', 'T_a_error', 'P_C_error', 'M', 'I_max'])
-        else:
-            writer.writerow(['N', 'P_S', 'T_a', 'P_C', 'M', 'I_max'])
-        
-        # 寫入數據
-        M = results['M']
-        I_max = results['I_max']
-        for i in range(len(results['N_values'])):
-            if has_error:
-                row = [
-                    results['N_values'][i],
-                    results['P_S_values'][i],
-                    results['T_a_values'][i],
-                    results['P_C_values'][i],
-                    results['P_S_error'][i] if results['P_S_error'][i] is not None else '',
-                    results['T_a_error'][i] if results['T_a_error'][i] is not None else '',
-                    results['P_C_error'][i] if results['P_C_error'][i] is not None else '',
-                    M,
-                    I_max
-                ]
-            else:
-                row = [
-                    results['N_values'][i],
-                    results['P_S_values'][i],
-                    results['T_a_values'][i],
-                    results['P_C_values'][i],
-                    M,
-                    I_max
-                ]
-            writer.writerow(row)
+    columns = {key: results[key] for key in SIMULATION_HEADERS}
+    if has_error:
+        columns.update({key: results[key] for key in ERROR_COLUMNS})
+    if has_ci:
+        columns.update({key: results[key] for key in CI_COLUMNS})
+    
+    table_dir = result_dir / "figure345_simulation"
+    save_columns(
+        table_dir, columns, attrs={'M': results['M'], 'I_max': results['I_max']},
+        headers=SIMULATION_HEADERS, integer=('N_values', 'num_samples'),
+        nullable=ERROR_COLUMNS if has_error else (),
+        csv_path=table_dir.with_suffix('.csv') if export_csv else None,
+    )
+    
+    if shards:
+        for N, shard in shards.items():
+            shard.save(result_dir / 'shards' / f"N{N}.json")
+    
+    config = config or {}
+    first_shard = next(iter(shards.values())) if shards else None
+    if first_shard is not None:
+        engine = first_shard.params['engine']
+        seed = first_shard.streams[0]['seed'] if first_shard.streams else None
+    else:
+        engine = config.get('performance', {}).get('engine')
+        seed = (config.get('rng') or {}).get('seed')
+    record_run('simulation/figure345', result_dir, {
+        'M': results['M'],
+        'I_max': results['I_max'],
+        'N_min': min(results['N_values'], default=None),
+        'N_max': max(results['N_values'], default=None),
+        'num_samples': min(results['num_samples'], default=None) if has_ci else None,
+    }, config=config or None, engine=engine, seed=seed)
     
-    print(f"✓ 合併模擬結果已保存: {save_path}")
+    print(f"✓ 合併模擬結果已保存: {table_dir}")
+
+
+def _latest_result_dir(M: int = None, I_max: int = None):
+    """運行目錄中最新的匹配 Figure 3, 4, 5 模擬結果目錄，找不到時返回 None"""
+    return find_latest_run('simulation/figure345', M=M, I_max=I_max)
 
 
-def load_figure345_simulation_results() -> dict:
+def load_figure345_simulation_shards(result_dir=None, M: int = None, I_max: int = None) -> dict:
     """
-    載入最新的 Figure 3, 4, 5 合併模擬結果（包含 Approximation Error）
+    載入 Figure 3, 4, 5 模擬結果的分片
+    
+    Args:
+        result_dir: 結果目錄或分片目錄（None 表示運行目錄中最新的匹配結果目錄）
+        M: result_dir 為 None 時要求的設備總數
+        I_max: result_dir 為 None 時要求的最大接入周期數
     
     Returns:
-        結果字典，如果找不到則返回 None
+        dict: {N: ResultShard}，按 N 排序；找不到時返回空字典
     """
-    result_base = PROJECT_ROOT / 'result' / 'simulation' / 'figure345'
-    
-    if not result_base.exists():
-        return None
-    
-    # 找到最新的時間戳目錄
-    timestamp_dirs = sorted(result_base.iterdir(), reverse=True)
-    if not timestamp_dirs:
-        return None
-    
-    latest_dir = timestamp_dirs[0]
-    csv_path = latest_dir / "figure345_simulation.csv"
+    result_dir = Path(result_dir) if result_dir is not None else _latest_result_dir(M, I_max)
+    if result_dir is None:
+        return {}
     
-    if not csv_path.exists():
-        return None
-    
-    # 讀取 CSV
+    shard_dir = result_dir / 'shards' if (result_dir / 'shards').is_dir() else result_dir
+    shards = {}
+    for path in shard_dir.glob('N*.json'):
+        shard = ResultShard.load(path)
+        shards[shard.params['N']] = shard
+    return dict(sorted(shards.items()))
+
+
+def _load_figure345_simulation_csv(csv_path: Path) -> dict:
+    """讀取舊版 CSV 格式的 Figure 3, 4, 5 合併模擬結果"""
     N_values = []
     P_S_values = []
     T_a_values = []
@@ -258,9 +701,14 @@ def load_figure345_simulation_results() -> dict:
     P_S_error = []
     T_a_error = []
     P_C_error = []
+    P_S_ci = []
+    T_a_ci = []
+    P_C_ci = []
+    num_samples = []
     M = None
     I_max = None
     has_error = False
+    has_ci = False
     
     with open(csv_path, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
@@ -277,6 +725,14 @@ def load_figure345_simulation_results() -> dict:
                 T_a_error.append(float(row['T_a_error']) if row['T_a_error'] else None)
                 P_C_error.append(float(row['P_C_error']) if row['P_C_error'] else None)
             
+            # 讀取置信區間欄位（如果存在）
+            if 'P_S_ci' in row:
+                has_ci = True
+                P_S_ci.append(float(row['P_S_ci']))
+                T_a_ci.append(float(row['T_a_ci']))
+                P_C_ci.append(float(row['P_C_ci']))
+                num_samples.append(int(row['num_samples']))
+            
             if M is None:
                 M = int(row['M'])
                 I_max = int(row['I_max'])
@@ -296,4 +752,78 @@ def load_figure345_simulation_results() -> dict:
         result['T_a_error'] = T_a_error
         result['P_C_error'] = P_C_error
     
+    if has_ci:
+        result['P_S_ci'] = P_S_ci
+        result['T_a_ci'] = T_a_ci
+        result['P_C_ci'] = P_C_ci
+        result['num_samples'] = num_samples
+    
     return result
+
+
+def _read_figure345_simulation_table(source: Path) -> dict:
+    """讀取 Figure 3, 4, 5 模擬結果表（列式表或舊版 CSV）"""
+    if is_columnar_table(source):
+        columns, attrs = load_columns(source)
+        return {**columns, 'M': attrs['M'], 'I_max': attrs['I_max']}
+    return _load_figure345_simulation_csv(source)
+
+
+def load_figure345_simulation_results(M: int = None, I_max: int = None) -> dict:
+    """
+    載入運行目錄中最新的匹配 Figure 3, 4, 5 合併模擬結果
+    （包含 Approximation Error；列式表內存映射讀取，舊版目錄讀取 CSV；同一進程中重複讀取返回快取）
+    
+    Args:
+        M: 要求的設備總數（None 表示不限）
+        I_max: 要求的最大接入周期數（None 表示不限）
+    
+    Returns:
+        結果字典，如果找不到則返回 None
+    """
+    latest_dir = _latest_result_dir(M, I_max)
+    if latest_dir is None:
+        return None
+    
+    table_dir = latest_dir / "figure345_simulation"
+    source = table_dir if is_columnar_table(table_dir) else latest_dir / "figure345_simulation.csv"
+    if not source.exists():
+        return None
+    return load_cached(source, _read_figure345_simulation_table)
+
+
+def _read_figure345_simulation_stream(path: Path) -> dict:
+    """由串流文件組成與 load_figure345_simulation_results 相同佈局的結果字典（不含 Approximation Error）"""
+    stream = read_stream(path)
+    if stream is None:
+        return None
+    header, records, complete = stream
+    # 同一 N 點只取最後一行
+    points = {record['N']: record for record in records}
+    ordered = [points[N] for N in sorted(points)]
+    return {
+        'N_values': [record['N'] for record in ordered],
+        'P_S_values': [record['P_S'] for record in ordered],
+        'T_a_values': [record['T_a'] for record in ordered],
+        'P_C_values': [record['P_C'] for record in ordered],
+        'P_S_ci': [record['P_S_ci'] for record in ordered],
+        'T_a_ci': [record['T_a_ci'] for record in ordered],
+        'P_C_ci': [record['P_C_ci'] for record in ordered],
+        'num_samples': [record['num_samples'] for record in ordered],
+        'M': header['attrs']['M'],
+        'I_max': header['attrs']['I_max'],
+        'complete': complete,
+    }
+
+
+def load_figure345_simulation_stream() -> dict:
+    """
+    讀取正在進行（或中斷、已完成）的 Figure 3, 4, 5 模擬的逐點串流
+
+    Returns:
+        結果字典（已完成的 N 點；complete 表示掃描是否已結束），沒有串流時返回 None
+    """
+    path = stream_path(STREAM_KIND)
+    if not path.is_file():
+        return None
+    return load_cached(path, _read_figure345_simulation_stream)
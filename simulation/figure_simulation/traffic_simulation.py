@@ -0,0 +1,236 @@
+"""
+隨機到達流量模擬（3GPP Beta 流量模型 + 重疊群組尋呼）
+
+對每個 N 值同時計算:
+- 模擬: 設備按到達曲線逐 AC 進入 One-Shot 接入核心（跨樣本批量）
+- 解析: 把到達曲線代入 Eq. (6)/(7) 迭代（theoretical_calculation_with_arrivals）
+
+用於在真實負載下估算所需的 RAO 數量。
+
+Input: config 配置, traffic 模擬引擎, theoretical 理論計算模組
+Output: run_traffic_simulation(), load_traffic_simulation_results()
+Position: 隨機到達流量場景的執行層
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import gc
+import csv
+import time
+from pathlib import Path
+from datetime import datetime
+
+from ..core.traffic import (
+    get_arrival_probabilities,
+    build_arrival_profile,
+    simulate_traffic_multi_samples,
+)
+from ..core.chunk_scheduler import DEFAULT_TARGET_TASK_SEC
+from ..core.rng import DEFAULT_BIT_GENERATOR, DEFAULT_BLOCK_SIZE, resolve_root_seed
+from analytical.theoretical import theoretical_calculation_with_arrivals
+from storage import find_latest_run, is_columnar_table, load_cached, load_columns, record_run, save_columns
+
+# 可選的計時器支持
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from performance import SimpleTimer
+
+# 項目根目錄
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+def run_traffic_simulation(config: dict, timer: 'SimpleTimer' = None) -> dict:
+    """
+    運行隨機到達流量模擬（含解析對照）
+
+    Args:
+        config: 配置字典
+
+    Returns:
+        結果字典，包含模擬與解析的 P_S, T_a, P_C
+    """
+    I_max = config['simulation']['I_max']
+    traffic_config = config['traffic']
+    groups = traffic_config['groups']
+    scan_config = config['scan']['range']
+    N_range = range(scan_config['start'], scan_config['stop'], scan_config['step'])
+    num_samples = config['performance']['num_samples']
+    num_workers = config['performance']['num_workers']
+    backend = config['performance'].get('backend', 'auto')
+    start_method = config['performance'].get('start_method', 'auto')
+    pin_workers = config['performance'].get('pin_workers', False)
+    max_memory_mb = config['performance'].get('max_memory_mb')
+    target_task_sec = config['performance'].get('target_task_sec', DEFAULT_TARGET_TASK_SEC)
+    rng_config = config.get('rng') or {}
+    bit_generator = rng_config.get('bit_generator', DEFAULT_BIT_GENERATOR)
+    block_size = rng_config.get('block_size', DEFAULT_BLOCK_SIZE)
+
+    probabilities = get_arrival_probabilities(traffic_config)
+    arrivals = build_arrival_profile(groups, probabilities, I_max)
+    total_devices = sum(group['M'] for group in groups)
+
+    print("=" * 70)
+    print("隨機到達流量模擬 (Random-Arrival Traffic)")
+    print("=" * 70)
+    print(f"到達分佈: {traffic_config.get('distribution', 'beta')}, "
+          f"激活窗口: {traffic_config['activation_slots']} AC")
+    for i, group in enumerate(groups):
+        print(f"  群組 {i + 1}: M={group['M']}, 起始 AC={group['start_slot']}")
+    print(f"設備總數 = {total_devices}, I_max = {I_max}, 總 AC 數 = {len(arrivals)}")
+    print(f"峰值期望到達: {arrivals.max():.2f} 設備/AC")
+    print(f"N 範圍: {scan_config['start']} 到 {scan_config['stop']-1}")
+    print(f"樣本數: {num_samples}, 工作進程: {num_workers}")
+    root_seed = resolve_root_seed(rng_config.get('seed'))
+    print(f"RNG: {bit_generator}, 根種子: {root_seed}, 區塊大小: {block_size}")
+    print("=" * 70)
+
+    results = {
+        'N_values': [],
+        'P_S_values': [],
+        'T_a_values': [],
+        'P_C_values': [],
+        'P_S_analytical': [],
+        'T_a_analytical': [],
+        'P_C_analytical': [],
+        'M': total_devices,
+        'I_max': I_max,
+        'seed': root_seed,
+    }
+
+    for N in N_range:
+        print(f"\n正在模擬 N={N}...")
+
+        n_start_time = time.time()
+        # 只需要均值與置信區間：各分塊歸約後串流併入累加器，不保留逐樣本結果
+        accumulator = simulate_traffic_multi_samples(
+            groups, probabilities, N, I_max, num_samples, num_workers, root_seed,
+            bit_generator, block_size, backend=backend, start_method=start_method,
+            pin_workers=pin_workers, max_memory_mb=max_memory_mb, target_task_sec=target_task_sec
+        )
+        if timer is not None:
+            timer.record(f"N={N} 模擬", time.time() - n_start_time)
+        means, _ = accumulator.metrics()
+        mean_ps, mean_ta, mean_pc = means
+
+        P_S, T_a, P_C, _, _ = theoretical_calculation_with_arrivals(arrivals, N, I_max)
+
+        results['N_values'].append(N)
+        results['P_S_values'].append(mean_ps)
+        results['T_a_values'].append(mean_ta)
+        results['P_C_values'].append(mean_pc)
+        results['P_S_analytical'].append(P_S)
+        results['T_a_analytical'].append(T_a)
+        results['P_C_analytical'].append(P_C)
+        print(f"  模擬: P_S={mean_ps:.6f}, T_a={mean_ta:.4f}, P_C={mean_pc:.6f}")
+        print(f"  解析: P_S={P_S:.6f}, T_a={T_a:.4f}, P_C={P_C:.6f}")
+
+        del accumulator
+        gc.collect()
+
+    print("\n" + "=" * 70)
+    print("隨機到達流量模擬完成!")
+    print("=" * 70)
+
+    output_config = config.get('output', {})
+    if output_config.get('save_csv', True):
+        save_traffic_simulation_results(results, export_csv=output_config.get('export_csv', False), config=config)
+
+    return results
+
+
+# 結果表欄位: 鍵名 → 舊版 CSV 表頭（M、I_max 為表級屬性）
+TRAFFIC_HEADERS = {
+    'N_values': 'N',
+    'P_S_values': 'P_S',
+    'T_a_values': 'T_a',
+    'P_C_values': 'P_C',
+    'P_S_analytical': 'P_S_analytical',
+    'T_a_analytical': 'T_a_analytical',
+    'P_C_analytical': 'P_C_analytical',
+}
+
+
+def save_traffic_simulation_results(results: dict, export_csv: bool = False, config: dict = None):
+    """
+    保存隨機到達流量模擬結果（列式結果表 traffic_simulation/），並登記到運行目錄
+
+    Args:
+        results: 結果字典
+        export_csv: 同時導出 traffic_simulation.csv
+        config: 運行配置（記錄其雜湊、引擎與種子）
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    result_dir = PROJECT_ROOT / 'result' / 'simulation' / 'traffic' / timestamp
+    result_dir.mkdir(parents=True, exist_ok=True)
+
+    table_dir = result_dir / "traffic_simulation"
+    save_columns(
+        table_dir, {key: results[key] for key in TRAFFIC_HEADERS},
+        attrs={'M': results['M'], 'I_max': results['I_max']}, headers=TRAFFIC_HEADERS, integer=('N_values',),
+        csv_path=table_dir.with_suffix('.csv') if export_csv else None,
+    )
+
+    config = config or {}
+    record_run('simulation/traffic', result_dir, {
+        'M': results['M'],
+        'I_max': results['I_max'],
+        'N_min': min(results['N_values'], default=None),
+        'N_max': max(results['N_values'], default=None),
+    }, config=config or None, engine=config.get('performance', {}).get('engine'),
+        seed=results.get('seed'))
+
+    print(f"✓ 流量模擬結果已保存: {table_dir}")
+
+
+def _load_traffic_csv(csv_path: Path) -> dict:
+    """讀取舊版 CSV 格式的隨機到達流量模擬結果"""
+    result = {key: [] for key in TRAFFIC_HEADERS}
+    result['M'] = None
+    result['I_max'] = None
+
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            result['N_values'].append(int(row['N']))
+            result['P_S_values'].append(float(row['P_S']))
+            result['T_a_values'].append(float(row['T_a']))
+            result['P_C_values'].append(float(row['P_C']))
+            result['P_S_analytical'].append(float(row['P_S_analytical']))
+            result['T_a_analytical'].append(float(row['T_a_analytical']))
+            result['P_C_analytical'].append(float(row['P_C_analytical']))
+            if result['M'] is None:
+                result['M'] = int(row['M'])
+                result['I_max'] = int(row['I_max'])
+
+    return result
+
+
+def _read_traffic_table(source: Path) -> dict:
+    """讀取隨機到達流量模擬結果表（列式表或舊版 CSV）"""
+    if is_columnar_table(source):
+        columns, attrs = load_columns(source)
+        return {**columns, **attrs}
+    return _load_traffic_csv(source)
+
+
+def load_traffic_simulation_results(M: int = None, I_max: int = None) -> dict:
+    """
+    載入運行目錄中最新的匹配隨機到達流量模擬結果（列式表內存映射讀取；舊版目錄讀取 CSV；重複讀取返回快取）
+
+    Args:
+        M: 要求的設備總數（None 表示不限）
+        I_max: 要求的最大接入周期數（None 表示不限）
+
+    Returns:
+        結果字典，如果找不到則返回 None
+    """
+    latest_dir = find_latest_run('simulation/traffic', M=M, I_max=I_max)
+    if latest_dir is None:
+        return None
+
+    table_dir = latest_dir / "traffic_simulation"
+    source = table_dir if is_columnar_table(table_dir) else latest_dir / "traffic_simulation.csv"
+    if not source.exists():
+        return None
+    return load_cached(source, _read_traffic_table)
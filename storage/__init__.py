@@ -0,0 +1,49 @@
+"""
+結果存儲模組
+
+解析與模擬結果的持久化格式：每欄一個 .npy + JSON schema 的列式二進位表，讀取時內存映射，
+CSV 作為可選的導出格式；運行目錄（result/catalog.sqlite）記錄每次運行的參數與位置，
+載入函數按參數查詢最新的匹配運行，同一進程中重複讀取的表由快取返回；
+長時間掃描逐點追加到 NDJSON 串流，運行中即可讀取；
+結果文件按內容雜湊以硬連結去重，gc 按保留策略清理。
+
+Input: 結果欄位字典, 運行參數
+Output: SCHEMA_FILE, save_columns(), load_columns(), is_columnar_table(), export_csv(),
+        RunCatalog, record_run(), find_latest_run(), config_hash(),
+        ObjectStore, file_digest(), collect_garbage(), plan_retention(), DEFAULT_KEEP_LAST,
+        load_cached(), clear_cache(), cache_info(), StreamWriter, read_stream(), stream_path()
+Position: 各 save_* / load_* 函數共用的存儲層
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+from .columnar import SCHEMA_FILE, save_columns, load_columns, is_columnar_table, export_csv
+from .catalog import RunCatalog, record_run, find_latest_run, config_hash
+from .cas import ObjectStore, file_digest
+from .retention import DEFAULT_KEEP_LAST, collect_garbage, plan_retention
+from .cache import load_cached, clear_cache, cache_info
+from .stream import StreamWriter, read_stream, stream_path
+
+__all__ = [
+    'SCHEMA_FILE',
+    'save_columns',
+    'load_columns',
+    'is_columnar_table',
+    'export_csv',
+    'RunCatalog',
+    'record_run',
+    'find_latest_run',
+    'config_hash',
+    'ObjectStore',
+    'file_digest',
+    'DEFAULT_KEEP_LAST',
+    'collect_garbage',
+    'plan_retention',
+    'load_cached',
+    'clear_cache',
+    'cache_info',
+    'StreamWriter',
+    'read_stream',
+    'stream_path',
+]
@@ -0,0 +1,109 @@
+"""
+進程內結果快取
+
+同一進程中重複讀取同一張結果表（互動選單反覆繪圖、流水線中繪圖階段讀取剛保存的結果、
+Figure 2 與成本預估讀取 Figure 1 結果……）時，只在第一次解析 CSV / 映射 .npy，
+之後直接返回共享的唯讀陣列。
+
+- 鍵為表路徑；失效以文件狀態判斷：列式表看 schema.json，CSV / 串流看文件本身的
+  (st_ino, st_mtime_ns, st_size)。寫入端以臨時檔 + os.replace 更新（inode 改變），
+  即使 mtime 解析度較粗也能失效
+- 返回值的 NumPy 陣列設為不可寫（內存映射本來即唯讀），列表轉為 tuple；頂層字典每次返回
+  淺拷貝，調用方可加鍵但不能改動共享的數據
+- 最多保留 MAX_ENTRIES 張表（LRU）；流水線的並行階段在不同線程讀取，以鎖保護
+
+Input: 表路徑, 讀取函數
+Output: load_cached(), clear_cache(), cache_info()
+Position: 各 load_* 函數與列式表 / 舊版 CSV 讀取之間的快取層
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from .columnar import SCHEMA_FILE
+
+MAX_ENTRIES = 64
+
+_entries = OrderedDict()
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def _stamp(path: Path):
+    """文件狀態指紋（列式表取 schema.json）；不存在時返回 None"""
+    target = path / SCHEMA_FILE if path.is_dir() else path
+    try:
+        stat = target.stat()
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _freeze(value):
+    """把讀取結果轉為唯讀：陣列不可寫，列表轉 tuple，字典遞歸處理"""
+    if isinstance(value, np.ndarray):
+        if value.flags.writeable:
+            value.setflags(write=False)
+        return value
+    if isinstance(value, dict):
+        return {key: _freeze(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _copy(value):
+    return dict(value) if isinstance(value, dict) else value
+
+
+def load_cached(path, loader):
+    """
+    讀取一張結果表，文件未改變時返回快取
+
+    Args:
+        path: 列式表目錄、CSV 或串流（.ndjson）路徑
+        loader: loader(path) -> dict，快取未命中時調用
+
+    Returns:
+        dict: 讀取結果（頂層為淺拷貝，陣列共享且唯讀）；loader 返回 None 時為 None
+    """
+    path = Path(path)
+    key = os.path.abspath(path)
+    stamp = _stamp(path)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and stamp is not None and entry[0] == stamp:
+            _entries.move_to_end(key)
+            _stats['hits'] += 1
+            return _copy(entry[1])
+
+    value = _freeze(loader(path))
+    with _lock:
+        _stats['misses'] += 1
+        if stamp is not None:
+            _entries[key] = (stamp, value)
+            _entries.move_to_end(key)
+            while len(_entries) > MAX_ENTRIES:
+                _entries.popitem(last=False)
+    return _copy(value)
+
+
+def clear_cache():
+    """清空快取（如外部工具原地改寫了結果文件）"""
+    with _lock:
+        _entries.clear()
+        _stats['hits'] = 0
+        _stats['misses'] = 0
+
+
+def cache_info() -> dict:
+    """快取統計: entries, hits, misses"""
+    with _lock:
+        return {'entries': len(_entries), **_stats}
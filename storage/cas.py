@@ -0,0 +1,128 @@
+"""
+內容定址對象庫（content-addressed store）
+
+結果目錄中的每個文件按 SHA-256 存入 result/objects/<前兩位>/<雜湊>，再以硬連結替換原文件：
+內容相同的文件（重複運行產生的相同 CSV / .npy、相同的 300 dpi PNG）在磁碟上只佔一份空間，
+結果目錄的佈局與讀取方式不變。
+
+- 對象的連結數（st_nlink）即引用數：只剩對象庫自身一個連結時，該對象已無任何運行引用，可被 prune 刪除
+- 檔案系統不支援硬連結（跨裝置、部分網路檔案系統）時保留原文件，只記錄雜湊（引用式去重）
+- 硬連結共用 inode，原地覆寫會同時改變所有引用；本項目的寫入端（save_columns、export_csv、
+  ResultShard.save、write_figure、SimpleTimer.save_json）一律寫入臨時檔後 os.replace，不會原地修改已去重的文件
+
+Input: 結果目錄
+Output: ObjectStore, file_digest()
+Position: 運行目錄（catalog.py）與保留策略（retention.py）之下的去重層
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+# 項目根目錄
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_RESULT_ROOT = PROJECT_ROOT / 'result'
+OBJECTS_DIR = 'objects'
+
+# 不去重的文件：每次運行不同且會被重寫的元數據
+_SKIP_NAMES = ('run.json',)
+_TMP_SUFFIX = '.cas-tmp'
+_CHUNK_BYTES = 1 << 20
+
+
+def file_digest(path) -> str:
+    """文件內容的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ObjectStore:
+    """
+    result/objects 下的內容定址對象庫
+
+    用法:
+        store = ObjectStore()
+        objects, saved_bytes = store.deduplicate(run_dir)
+        count, freed_bytes = store.prune()
+    """
+
+    def __init__(self, result_root=None):
+        self.result_root = Path(result_root) if result_root is not None else DEFAULT_RESULT_ROOT
+        self.objects_dir = self.result_root / OBJECTS_DIR
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def ingest(self, path) -> tuple:
+        """
+        把一個文件存入對象庫並以硬連結替換
+
+        Returns:
+            tuple: (雜湊, 節省的位元組數)
+        """
+        path = Path(path)
+        digest = file_digest(path)
+        obj = self.object_path(digest)
+        try:
+            if not obj.exists():
+                obj.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    os.link(path, obj)
+                    return digest, 0
+                except FileExistsError:
+                    pass  # 並行的另一次運行剛存入相同內容
+            if os.path.samefile(obj, path):
+                return digest, 0
+            size = path.stat().st_size
+            tmp_path = path.with_name(path.name + _TMP_SUFFIX)
+            os.link(obj, tmp_path)
+            os.replace(tmp_path, path)
+            return digest, size
+        except OSError:
+            # 不支援硬連結：保留原文件，只記錄雜湊
+            return digest, 0
+
+    def deduplicate(self, run_dir) -> tuple:
+        """
+        對結果目錄下的所有文件去重
+
+        Returns:
+            tuple: ({相對路徑: 雜湊}, 節省的位元組數)
+        """
+        run_dir = Path(run_dir)
+        objects = {}
+        saved = 0
+        for path in sorted(run_dir.rglob('*')):
+            if not path.is_file() or path.name in _SKIP_NAMES or path.name.endswith(_TMP_SUFFIX):
+                continue
+            digest, saved_bytes = self.ingest(path)
+            objects[path.relative_to(run_dir).as_posix()] = digest
+            saved += saved_bytes
+        return objects, saved
+
+    def unreferenced(self) -> list:
+        """已無任何結果目錄引用的對象（連結數為 1）"""
+        if not self.objects_dir.is_dir():
+            return []
+        return [path for path in self.objects_dir.glob('*/*') if path.is_file() and path.stat().st_nlink <= 1]
+
+    def prune(self, dry_run: bool = False) -> tuple:
+        """
+        刪除未被引用的對象
+
+        Returns:
+            tuple: (對象數, 釋放的位元組數)
+        """
+        paths = self.unreferenced()
+        freed = sum(path.stat().st_size for path in paths)
+        if not dry_run:
+            for path in paths:
+                path.unlink(missing_ok=True)
+        return len(paths), freed
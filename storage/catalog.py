@@ -0,0 +1,308 @@
+"""
+運行目錄（run catalog）
+
+每次保存結果時在 result/catalog.sqlite 記錄一行：結果種類（如 simulation/figure345）、識別參數
+（M、I_max、N 範圍……）、配置雜湊、引擎、種子、結果目錄與文件列表；同一份元數據也寫入結果目錄的
+run.json，目錄遺失或損壞時可由各結果目錄重建。
+
+載入函數按參數查詢「最新的匹配運行」，不再取 sorted(iterdir())[0]：
+- 索引 (kind, created_at) 讓查詢從最新的運行往回走，通常第一行即命中，與歷史運行數無關
+- 參數以 json_extract 比對，只比對查詢給定的鍵（M=100 只要求 M 相同）
+- 記錄的目錄已被刪除時移除該行並繼續查找
+
+舊版沒有 run.json 的結果目錄在重建時以其表級屬性（列式表 schema 的 attrs、CSV 中的 M、I_max 等常數欄、
+figure1_N{n} 文件名中的 N）推斷參數。
+
+連線每次操作時開啟（流水線的並行階段在不同線程保存結果）。
+
+Input: 結果種類, 結果目錄, 識別參數, 配置
+Output: RunCatalog, record_run(), find_latest_run(), config_hash()
+Position: 各 save_* / load_* 函數與 result/ 目錄之間的索引層
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import csv
+import hashlib
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from .cas import ObjectStore
+from .columnar import SCHEMA_FILE
+
+# 項目根目錄
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_RESULT_ROOT = PROJECT_ROOT / 'result'
+CATALOG_FILE = 'catalog.sqlite'
+RUN_FILE = 'run.json'
+
+# 登記在目錄中的結果種類（result/ 下的相對路徑；graph 與 performance 由 sync() 登記，參數為空）
+RESULT_KINDS = (
+    'analytical/figure1',
+    'analytical/figure2',
+    'analytical/figure345',
+    'simulation/figure345',
+    'simulation/traffic',
+    'simulation/acb',
+    'graph/figure1',
+    'graph/figure2',
+    'graph/figure3',
+    'graph/figure4',
+    'graph/figure5',
+    'performance',
+)
+
+# 舊版 CSV 中可能是表級屬性的欄（各行相同時才視為屬性）
+_LEGACY_ATTR_COLUMNS = ('M', 'N', 'I_max', 'barring_time')
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL UNIQUE,
+    params TEXT NOT NULL,
+    config_hash TEXT,
+    engine TEXT,
+    seed INTEGER,
+    files TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_kind_created ON runs (kind, created_at);
+"""
+
+
+def _canonical_json(value) -> str:
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=_json_default)
+
+
+def _json_default(value):
+    """numpy 純量 / 陣列轉為 Python 型別"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"無法序列化的參數型別: {type(value).__name__}")
+
+
+def config_hash(config: dict) -> str:
+    """配置的 SHA-256（鍵排序後的 JSON；None 時返回 None）"""
+    if config is None:
+        return None
+    return hashlib.sha256(_canonical_json(config).encode('utf-8')).hexdigest()
+
+
+def _infer_legacy_params(run_dir: Path) -> dict:
+    """由舊版結果目錄的表級屬性推斷識別參數"""
+    params = {}
+    n_values = []
+    for path in sorted(run_dir.iterdir()):
+        if '_N' in path.stem and path.stem.rsplit('_N', 1)[1].isdigit():
+            n_values.append(int(path.stem.rsplit('_N', 1)[1]))
+        if (path / SCHEMA_FILE).is_file():
+            with open(path / SCHEMA_FILE, 'r', encoding='utf-8') as f:
+                params.update(json.load(f).get('attrs', {}))
+        elif path.suffix == '.csv':
+            with open(path, 'r', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+            # 只取各行相同的欄（如 figure345 的 M、I_max；figure1 的 M 是數據欄）
+            for key in _LEGACY_ATTR_COLUMNS:
+                values = {row.get(key) for row in rows}
+                if len(values) == 1 and None not in values and '' not in values:
+                    params[key] = int(float(values.pop()))
+    if n_values:
+        params['n_values'] = sorted(set(n_values))
+    return params
+
+
+class RunCatalog:
+    """
+    result/ 下各次運行的索引
+
+    用法:
+        catalog = RunCatalog()
+        catalog.record('simulation/figure345', run_dir, {'M': 100, 'I_max': 10}, config=config)
+        run_dir = catalog.find_latest('simulation/figure345', M=100, I_max=10)
+    """
+
+    def __init__(self, result_root=None):
+        self.result_root = Path(result_root) if result_root is not None else DEFAULT_RESULT_ROOT
+        self.db_path = self.result_root / CATALOG_FILE
+
+    @contextmanager
+    def _connect(self):
+        """開啟連線（新建時先登記已有的運行目錄），正常結束時提交，總是關閉"""
+        is_new = not self.db_path.exists()
+        self.result_root.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            connection.executescript(_SCHEMA_SQL)
+            if is_new:
+                self._index_existing(connection)
+            yield connection
+            connection.commit()
+        finally:
+            connection.close()
+
+    def _insert(self, connection: sqlite3.Connection, meta: dict):
+        connection.execute(
+            "INSERT OR REPLACE INTO runs (kind, path, params, config_hash, engine, seed, files, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (meta['kind'], meta['path'], _canonical_json(meta['params']), meta.get('config_hash'),
+             meta.get('engine'), meta.get('seed'), _canonical_json(meta.get('files', [])), meta['created_at']),
+        )
+
+    def _index_existing(self, connection: sqlite3.Connection, only_new: bool = False) -> int:
+        """掃描 result/ 下已有的運行目錄並登記（目錄新建或重建時；only_new 時只登記尚未登記的目錄）"""
+        known = {row[0] for row in connection.execute("SELECT path FROM runs")} if only_new else set()
+        count = 0
+        for kind in RESULT_KINDS:
+            kind_dir = self.result_root / kind
+            if not kind_dir.is_dir():
+                continue
+            for run_dir in sorted(path for path in kind_dir.iterdir() if path.is_dir()):
+                if run_dir.relative_to(self.result_root).as_posix() in known:
+                    continue
+                run_file = run_dir / RUN_FILE
+                if run_file.is_file():
+                    with open(run_file, 'r', encoding='utf-8') as f:
+                        meta = json.load(f)
+                else:
+                    meta = {
+                        'kind': kind,
+                        'params': _infer_legacy_params(run_dir),
+                        'files': sorted(path.name for path in run_dir.iterdir()),
+                        # 舊版目錄名即時間戳 YYYYmmdd_HHMMSS
+                        'created_at': _timestamp_from_name(run_dir.name),
+                    }
+                meta['path'] = run_dir.relative_to(self.result_root).as_posix()
+                self._insert(connection, meta)
+                count += 1
+        return count
+
+    def sync(self) -> tuple:
+        """
+        登記尚未登記的結果目錄（如繪圖與性能報告目錄），移除目錄已不存在的行
+
+        Returns:
+            tuple: (新登記數, 移除數)
+        """
+        with self._connect() as connection:
+            added = self._index_existing(connection, only_new=True)
+            missing = [
+                (row_id,) for row_id, path in connection.execute("SELECT id, path FROM runs").fetchall()
+                if not (self.result_root / path).is_dir()
+            ]
+            connection.executemany("DELETE FROM runs WHERE id = ?", missing)
+        return added, len(missing)
+
+    def remove(self, path: str):
+        """移除一次運行的登記（結果目錄由調用方刪除）"""
+        with self._connect() as connection:
+            connection.execute("DELETE FROM runs WHERE path = ?", (path,))
+
+    def rebuild(self) -> int:
+        """清空並由各結果目錄重建目錄，返回登記的運行數"""
+        with self._connect() as connection:
+            connection.execute("DELETE FROM runs")
+            return self._index_existing(connection)
+
+    def record(self, kind: str, run_dir, params: dict, config: dict = None,
+               engine: str = None, seed: int = None) -> dict:
+        """
+        登記一次運行：結果文件存入內容定址對象庫去重，元數據（含各文件的雜湊）寫入 run_dir/run.json
+
+        Args:
+            kind: 結果種類（RESULT_KINDS 之一）
+            run_dir: 結果目錄
+            params: 識別參數（查詢時比對的鍵）
+            config: 運行配置（記錄其雜湊）
+            engine: 模擬引擎
+            seed: 根種子
+
+        Returns:
+            dict: 運行元數據
+        """
+        run_dir = Path(run_dir)
+        meta = {
+            'kind': kind,
+            'path': run_dir.relative_to(self.result_root).as_posix(),
+            'params': json.loads(_canonical_json(params)),
+            'config_hash': config_hash(config),
+            'engine': engine,
+            'seed': seed,
+            'files': sorted(path.name for path in run_dir.iterdir() if path.name != RUN_FILE),
+            'created_at': datetime.now().isoformat(timespec='microseconds'),
+        }
+        meta['objects'], _ = ObjectStore(self.result_root).deduplicate(run_dir)
+        with open(run_dir / RUN_FILE, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+        with self._connect() as connection:
+            self._insert(connection, meta)
+        return meta
+
+    def find_latest(self, kind: str, **params):
+        """
+        最新的匹配運行目錄
+
+        Args:
+            kind: 結果種類
+            **params: 要求相同的識別參數（值為 None 的鍵不比對）
+
+        Returns:
+            Path 或 None
+        """
+        conditions = ["kind = ?"]
+        arguments = [kind]
+        for key, value in params.items():
+            if value is None:
+                continue
+            conditions.append("json_extract(params, ?) = ?")
+            arguments.append(f'$."{key}"')
+            # 列表參數 json_extract 返回緊湊 JSON 文字
+            arguments.append(_canonical_json(value) if isinstance(value, (list, tuple, dict)) else value)
+
+        query = f"SELECT id, path FROM runs WHERE {' AND '.join(conditions)} ORDER BY created_at DESC"
+        with self._connect() as connection:
+            for row_id, path in connection.execute(query, arguments).fetchall():
+                run_dir = self.result_root / path
+                if run_dir.is_dir():
+                    return run_dir
+                connection.execute("DELETE FROM runs WHERE id = ?", (row_id,))
+        return None
+
+    def runs(self, kind: str = None) -> list:
+        """所有運行的元數據（按時間由新到舊）"""
+        query = "SELECT kind, path, params, config_hash, engine, seed, created_at FROM runs"
+        arguments = []
+        if kind is not None:
+            query += " WHERE kind = ?"
+            arguments.append(kind)
+        query += " ORDER BY created_at DESC"
+        with self._connect() as connection:
+            return [
+                {'kind': row[0], 'path': row[1], 'params': json.loads(row[2]), 'config_hash': row[3],
+                 'engine': row[4], 'seed': row[5], 'created_at': row[6]}
+                for row in connection.execute(query, arguments)
+            ]
+
+
+def _timestamp_from_name(name: str) -> str:
+    """由 YYYYmmdd_HHMMSS 目錄名得到 ISO 時間（無法解析時返回目錄名本身，仍可排序）"""
+    try:
+        return datetime.strptime(name, "%Y%m%d_%H%M%S").isoformat(timespec='microseconds')
+    except ValueError:
+        return name
+
+
+def record_run(kind: str, run_dir, params: dict, config: dict = None,
+               engine: str = None, seed: int = None) -> dict:
+    """在默認目錄（result/catalog.sqlite）登記一次運行"""
+    return RunCatalog().record(kind, run_dir, params, config=config, engine=engine, seed=seed)
+
+
+def find_latest_run(kind: str, **params):
+    """在默認目錄查詢最新的匹配運行目錄，找不到時返回 None"""
+    return RunCatalog().find_latest(kind, **params)
@@ -0,0 +1,186 @@
+"""
+列式二進位結果格式
+
+一張結果表保存為一個目錄：每欄一個 NumPy .npy 文件 + schema.json 描述欄位（鍵名、文件、dtype、
+CSV 表頭、是否可為空）與表級屬性（如 M、I_max）。讀取時以 mmap_mode='r' 內存映射各欄，
+只在實際訪問時從頁快取讀入，不再逐格 float(row[...]) 轉換。
+
+    figure1_N3/
+        schema.json
+        M_values.npy
+        M_over_N.npy
+        ...
+
+- 指定的整數欄位（如 M、N、樣本數）存為 int64，其餘數值欄位存為 float64，字串欄位存為定長 Unicode（如 analytical_method）
+- 可為空的欄位（如 Approximation Error）以 NaN 保存，讀取時還原為含 None 的列表
+- CSV 仍可導出（export_csv）：欄位按 schema 順序，表級屬性附加為常數欄，與舊版 CSV 佈局相同
+
+Input: {鍵名: 序列} 的欄位字典, 表級屬性
+Output: SCHEMA_FILE, save_columns(), load_columns(), is_columnar_table(), export_csv()
+Position: analytical/figure_analysis 與 simulation/figure_simulation 的 save_* / load_* 共用的存儲層
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import csv
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+SCHEMA_FILE = 'schema.json'
+FORMAT_NAME = 'columnar'
+FORMAT_VERSION = 1
+
+
+def _to_array(values, nullable: bool, integer: bool) -> np.ndarray:
+    """把欄位序列轉為 NumPy 陣列（數值欄默認 float64；可為空的欄位 None → NaN）"""
+    if nullable:
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    array = np.asarray(values)
+    if array.dtype == object:
+        raise TypeError(f"欄位包含無法存為定長型別的值: {array[:3]!r}")
+    if array.dtype.kind in 'US':
+        return array
+    return array.astype(np.int64 if integer else np.float64)
+
+
+def _json_default(value):
+    """表級屬性中的 numpy 純量轉為 Python 型別"""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"無法序列化的屬性型別: {type(value).__name__}")
+
+
+def save_columns(table_dir, columns: dict, attrs: dict = None, headers: dict = None,
+                 integer=(), nullable=(), csv_path=None) -> Path:
+    """
+    保存一張列式結果表
+
+    Args:
+        table_dir: 表目錄（不存在時自動創建）
+        columns: {鍵名: 序列}，各欄長度必須相同；鍵名即 .npy 文件名
+        attrs: 表級屬性（JSON 可序列化），導出 CSV 時附加為常數欄
+        headers: {鍵名: CSV 表頭}（默認與鍵名相同）
+        integer: 存為 int64 的欄位鍵名（其餘數值欄存為 float64，避免全為整數值的指標欄被推斷為整數）
+        nullable: 可為空的欄位鍵名
+        csv_path: 給定時同時導出 CSV
+
+    Returns:
+        Path: schema.json 路徑
+    """
+    table_dir = Path(table_dir)
+    table_dir.mkdir(parents=True, exist_ok=True)
+    headers = headers or {}
+    integer = set(integer)
+    nullable = set(nullable)
+
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"欄位長度不一致: { {k: len(v) for k, v in columns.items()} }")
+
+    schema_columns = []
+    for key, values in columns.items():
+        array = _to_array(values, key in nullable, key in integer)
+        # 臨時檔 + os.replace：不原地覆寫可能已被去重（硬連結到對象庫）的文件
+        tmp_path = table_dir / f"{key}.npy.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, array, allow_pickle=False)
+        os.replace(tmp_path, table_dir / f"{key}.npy")
+        schema_columns.append({
+            'key': key,
+            'file': f"{key}.npy",
+            'dtype': array.dtype.str,
+            'header': headers.get(key, key),
+            'nullable': key in nullable,
+        })
+
+    schema = {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'rows': lengths.pop() if lengths else 0,
+        'columns': schema_columns,
+        'attrs': attrs or {},
+    }
+    # schema 最後原子寫入：讀取端以 schema 的存在判斷表已完整
+    schema_path = table_dir / SCHEMA_FILE
+    tmp_path = schema_path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(schema, f, indent=2, ensure_ascii=False, default=_json_default)
+    os.replace(tmp_path, schema_path)
+
+    if csv_path is not None:
+        export_csv(table_dir, csv_path)
+    return schema_path
+
+
+def is_columnar_table(table_dir) -> bool:
+    """目錄是否為完整的列式結果表"""
+    return (Path(table_dir) / SCHEMA_FILE).is_file()
+
+
+def _read_schema(table_dir: Path) -> dict:
+    with open(table_dir / SCHEMA_FILE, 'r', encoding='utf-8') as f:
+        schema = json.load(f)
+    if schema.get('format') != FORMAT_NAME or schema.get('version', 0) > FORMAT_VERSION:
+        raise ValueError(f"不支援的結果格式: {schema.get('format')} v{schema.get('version')} ({table_dir})")
+    return schema
+
+
+def load_columns(table_dir, mmap: bool = True) -> tuple:
+    """
+    讀取一張列式結果表
+
+    Args:
+        table_dir: 表目錄
+        mmap: 以唯讀內存映射讀取各欄（False 時讀入記憶體）
+
+    Returns:
+        tuple: ({鍵名: 陣列}, 表級屬性)；可為空的欄位為含 None 的列表
+    """
+    table_dir = Path(table_dir)
+    schema = _read_schema(table_dir)
+    # 零長度的 .npy 無法內存映射
+    mmap_mode = 'r' if mmap and schema['rows'] > 0 else None
+
+    columns = {}
+    for column in schema['columns']:
+        array = np.load(table_dir / column['file'], mmap_mode=mmap_mode, allow_pickle=False)
+        if column['nullable']:
+            columns[column['key']] = [None if np.isnan(v) else float(v) for v in array]
+        else:
+            columns[column['key']] = array
+    return columns, schema['attrs']
+
+
+def export_csv(table_dir, csv_path=None) -> Path:
+    """
+    把列式結果表導出為 CSV（表級屬性附加為常數欄，可為空欄位的 None 寫為空字串）
+
+    Args:
+        table_dir: 表目錄
+        csv_path: 輸出路徑（默認與表目錄同名的 .csv）
+
+    Returns:
+        Path: CSV 路徑
+    """
+    table_dir = Path(table_dir)
+    csv_path = Path(csv_path) if csv_path is not None else table_dir.with_suffix('.csv')
+    schema = _read_schema(table_dir)
+    columns, attrs = load_columns(table_dir)
+
+    keys = [column['key'] for column in schema['columns']]
+    tmp_path = csv_path.with_name(csv_path.name + '.tmp')
+    with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow([column['header'] for column in schema['columns']] + list(attrs))
+        for i in range(schema['rows']):
+            row = []
+            for key in keys:
+                value = columns[key][i]
+                row.append('' if value is None else (value.item() if hasattr(value, 'item') else value))
+            writer.writerow(row + list(attrs.values()))
+    os.replace(tmp_path, csv_path)
+    return csv_path
@@ -0,0 +1,153 @@
+"""
+結果保留策略與垃圾回收（gc）
+
+python main.py gc 依 config/storage/retention.yaml 清理 result/：
+
+1. 同步運行目錄：登記尚未登記的結果 / 繪圖 / 性能報告目錄，移除已不存在的行
+2. keep_last: 每個參數組合（結果種類 + 識別參數）只保留最新的 K 次運行
+3. max_total_mb: 去重後的總大小仍超出上限時，從最舊的運行開始刪除，
+   但每個參數組合的最新一次運行總是保留
+4. 保留的運行目錄存入內容定址對象庫（cas.py）去重，刪除已無引用的對象
+
+大小按內容雜湊計算（相同內容只計一次），與是否已去重無關，因此 dry_run 的預估與實際刪除一致。
+result/cache、result/checkpoint 與 result/pipeline 有各自的淘汰機制，不在此處理。
+
+Input: 保留策略（keep_last, max_total_mb）
+Output: DEFAULT_KEEP_LAST, collect_garbage(), plan_retention()
+Position: 運行目錄與對象庫之上的清理層
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import json
+import shutil
+from collections import defaultdict
+from pathlib import Path
+
+from .cas import ObjectStore, file_digest
+from .catalog import RUN_FILE, RunCatalog, _canonical_json
+
+DEFAULT_KEEP_LAST = 3
+
+
+def _run_objects(run_dir: Path) -> dict:
+    """{相對路徑: (雜湊, 大小)}：run.json 記錄了雜湊時直接使用，否則計算"""
+    recorded = {}
+    run_file = run_dir / RUN_FILE
+    if run_file.is_file():
+        with open(run_file, 'r', encoding='utf-8') as f:
+            recorded = json.load(f).get('objects') or {}
+    objects = {}
+    for path in run_dir.rglob('*'):
+        if path.is_file():
+            relative = path.relative_to(run_dir).as_posix()
+            digest = recorded.get(relative) or file_digest(path)
+            objects[relative] = (digest, path.stat().st_size)
+    return objects
+
+
+def plan_retention(runs: list, run_objects: dict, keep_last: int = DEFAULT_KEEP_LAST,
+                   max_total_bytes: int = None) -> tuple:
+    """
+    決定要刪除的運行
+
+    Args:
+        runs: 運行目錄的元數據列表（按時間由新到舊）
+        run_objects: {path: {相對路徑: (雜湊, 大小)}}
+        keep_last: 每個參數組合保留的運行數
+        max_total_bytes: 去重後總大小上限（None 表示不限）
+
+    Returns:
+        tuple: (要刪除的 path 列表, 刪除前總位元組數, 刪除後總位元組數)
+    """
+    digest_size = {}
+    digest_runs = defaultdict(set)
+    for path, objects in run_objects.items():
+        for digest, size in objects.values():
+            digest_size[digest] = size
+            digest_runs[digest].add(path)
+    total_before = sum(digest_size.values())
+
+    groups = defaultdict(list)
+    for run in runs:
+        groups[(run['kind'], _canonical_json(run['params']))].append(run['path'])
+
+    delete = []
+    protected = set()
+    for paths in groups.values():
+        protected.add(paths[0])
+        delete.extend(paths[max(1, keep_last):])
+
+    def release(path):
+        for digest, _ in run_objects.get(path, {}).values():
+            digest_runs[digest].discard(path)
+
+    for path in delete:
+        release(path)
+    total = sum(size for digest, size in digest_size.items() if digest_runs[digest])
+
+    if max_total_bytes is not None:
+        deleted = set(delete)
+        # 從最舊的運行開始刪除，每個參數組合的最新一次運行除外
+        for run in reversed(runs):
+            if total <= max_total_bytes:
+                break
+            if run['path'] in deleted or run['path'] in protected:
+                continue
+            delete.append(run['path'])
+            deleted.add(run['path'])
+            release(run['path'])
+            total = sum(size for digest, size in digest_size.items() if digest_runs[digest])
+
+    return delete, total_before, total
+
+
+def collect_garbage(keep_last: int = DEFAULT_KEEP_LAST, max_total_mb: float = None,
+                    dry_run: bool = False, result_root=None) -> dict:
+    """
+    按保留策略清理 result/ 並去重
+
+    Args:
+        keep_last: 每個參數組合保留的運行數（至少 1）
+        max_total_mb: 去重後總大小上限（MB，None 表示不限）
+        dry_run: 只計算，不刪除也不去重
+        result_root: 結果根目錄（默認 result/）
+
+    Returns:
+        dict: deleted (path 列表), total_before / total_after (位元組), dedup_saved (位元組),
+              pruned_objects, pruned_bytes
+    """
+    catalog = RunCatalog(result_root)
+    store = ObjectStore(catalog.result_root)
+    catalog.sync()
+    runs = catalog.runs()
+    run_objects = {run['path']: _run_objects(catalog.result_root / run['path']) for run in runs}
+
+    max_total_bytes = int(max_total_mb * 1024 * 1024) if max_total_mb is not None else None
+    delete, total_before, total_after = plan_retention(runs, run_objects, keep_last, max_total_bytes)
+
+    report = {
+        'runs': len(runs),
+        'deleted': delete,
+        'total_before': total_before,
+        'total_after': total_after,
+        'dedup_saved': 0,
+        'pruned_objects': 0,
+        'pruned_bytes': 0,
+    }
+    if dry_run:
+        return report
+
+    for path in delete:
+        shutil.rmtree(catalog.result_root / path, ignore_errors=True)
+        catalog.remove(path)
+
+    deleted = set(delete)
+    for run in runs:
+        if run['path'] not in deleted:
+            _, saved = store.deduplicate(catalog.result_root / run['path'])
+            report['dedup_saved'] += saved
+
+    report['pruned_objects'], report['pruned_bytes'] = store.prune()
+    return report
@@ -0,0 +1,136 @@
+"""
+逐點串流結果（NDJSON）
+
+長時間的掃描（Figure 3-5 模擬的各 N 點、Figure 1 解析的各 (N, M) 點）每完成一個點就追加一行 JSON
+到 result/stream/<結果種類>.ndjson，不必等整個掃描結束才有結果可看：
+
+    {"format": "ndjson-stream", "version": 1, "kind": "simulation/figure345", "attrs": {"M": 100, ...}, ...}
+    {"N": 5, "P_S": 0.99, ...}
+    {"N": 6, "P_S": 0.98, ...}
+    {"_end": true}
+
+- 每行寫入後 flush，fsync=True 時再 os.fsync（斷電也不丟已完成的點，但每點多一次磁碟同步）
+- 每次運行開始時截斷重寫；續跑時已完成的點（檢查點 / 快取）會被重新寫出
+- 讀取端容忍寫到一半的最後一行（崩潰或正在寫入），只返回完整的行；末行 {"_end": true} 表示掃描已完成
+- 完整結果仍在掃描結束時保存為列式結果表並登記到運行目錄，串流只用於運行中 / 崩潰後查看
+
+Input: 結果種類, 表級屬性, 逐點記錄
+Output: StreamWriter, read_stream(), stream_path()
+Position: 掃描迴圈與 result/stream/ 之間的逐點寫入層
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+# 項目根目錄
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_STREAM_DIR = PROJECT_ROOT / 'result' / 'stream'
+FORMAT_NAME = 'ndjson-stream'
+FORMAT_VERSION = 1
+END_KEY = '_end'
+
+
+def _json_default(value):
+    """numpy 純量轉為 Python 型別"""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"無法序列化的記錄型別: {type(value).__name__}")
+
+
+def stream_path(kind: str, stream_dir=None) -> Path:
+    """結果種類（如 simulation/figure345）對應的串流文件"""
+    stream_dir = Path(stream_dir) if stream_dir is not None else DEFAULT_STREAM_DIR
+    return stream_dir / f"{kind}.ndjson"
+
+
+class StreamWriter:
+    """
+    追加式逐點結果寫入器
+
+    用法:
+        with StreamWriter('simulation/figure345', {'M': 100, 'I_max': 10}) as stream:
+            for N in N_range:
+                ...
+                stream.append({'N': N, 'P_S': P_S, ...})
+            stream.finish()
+    """
+
+    def __init__(self, kind: str, attrs: dict = None, fsync: bool = False, stream_dir=None):
+        self.kind = kind
+        self.path = stream_path(kind, stream_dir)
+        self.fsync = fsync
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._write({
+            'format': FORMAT_NAME,
+            'version': FORMAT_VERSION,
+            'kind': kind,
+            'attrs': attrs or {},
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+        })
+
+    def _write(self, record: dict):
+        self._file.write(json.dumps(record, ensure_ascii=False, default=_json_default) + '\n')
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def append(self, record: dict):
+        """追加一個完成的點"""
+        self._write(record)
+
+    def finish(self):
+        """標記掃描已完成"""
+        self._write({END_KEY: True})
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_stream(path) -> tuple:
+    """
+    讀取串流文件（可在寫入中讀取）
+
+    Args:
+        path: .ndjson 路徑
+
+    Returns:
+        tuple: (表頭, 記錄列表, 是否已完成)；文件不存在或表頭不完整時返回 None
+    """
+    path = Path(path)
+    if not path.is_file():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    # 最後一行沒有換行符時可能尚未寫完
+    if lines and not lines[-1].endswith('\n'):
+        lines.pop()
+    if not lines:
+        return None
+
+    header = json.loads(lines[0])
+    if header.get('format') != FORMAT_NAME or header.get('version', 0) > FORMAT_VERSION:
+        raise ValueError(f"不支援的串流格式: {header.get('format')} v{header.get('version')} ({path})")
+
+    records = []
+    complete = False
+    for line in lines[1:]:
+        record = json.loads(line)
+        if record.get(END_KEY):
+            complete = True
+            break
+        records.append(record)
+    return header, records, complete
@@ -0,0 +1,38 @@
+"""
+執行後端的測試
+
+Input: simulation.core.backend, simulation.core.cpu_planner
+Output: pytest 測試
+Position: 驗證 BLAS 線程數只在進程池存續期間限制，工作進程繼承、關閉後父進程恢復原值
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import os
+
+from simulation.core.backend import make_executor
+from simulation.core.cpu_planner import BLAS_THREAD_VARS
+
+
+def test_blas_limit_restored_after_pool(monkeypatch):
+    monkeypatch.setenv('OMP_NUM_THREADS', '8')
+    monkeypatch.delenv('OPENBLAS_NUM_THREADS', raising=False)
+    with make_executor('process', 1, 'spawn') as executor:
+        worker_env = executor.submit(os.getenv, 'OMP_NUM_THREADS').result()
+        assert executor.submit(os.getenv, 'OPENBLAS_NUM_THREADS').result() == '1'
+    assert worker_env == '1'
+    assert os.environ['OMP_NUM_THREADS'] == '8'
+    assert 'OPENBLAS_NUM_THREADS' not in os.environ
+
+
+def test_nested_pools_restore_once(monkeypatch):
+    for name in BLAS_THREAD_VARS:
+        monkeypatch.delenv(name, raising=False)
+    outer = make_executor('process', 1, 'spawn')
+    inner = make_executor('process', 1, 'spawn')
+    outer.shutdown()
+    assert os.environ['OMP_NUM_THREADS'] == '1'
+    inner.shutdown()
+    inner.shutdown()
+    assert not any(name in os.environ for name in BLAS_THREAD_VARS)
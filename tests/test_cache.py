@@ -0,0 +1,116 @@
+"""
+進程內結果快取的測試
+
+Input: storage.cache, storage.columnar
+Output: pytest 測試
+Position: 驗證以文件狀態（inode, mtime, size）判斷的快取命中與失效
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from storage import cache_info, clear_cache, load_cached, load_columns, save_columns
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+class _CountingLoader:
+    def __init__(self, loader):
+        self.loader = loader
+        self.calls = 0
+
+    def __call__(self, path):
+        self.calls += 1
+        return self.loader(path)
+
+
+def _read_csv(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return {'rows': [line.strip() for line in f]}
+
+
+def _read_table(path):
+    columns, attrs = load_columns(path)
+    return {'columns': columns, 'attrs': attrs}
+
+
+def test_unchanged_file_hits(tmp_path):
+    path = tmp_path / 'results.csv'
+    path.write_text('N,P_S\n5,0.9\n', encoding='utf-8')
+    loader = _CountingLoader(_read_csv)
+    first = load_cached(path, loader)
+    second = load_cached(path, loader)
+    assert loader.calls == 1
+    assert first == second and first is not second
+    assert cache_info() == {'entries': 1, 'hits': 1, 'misses': 1}
+
+
+def test_replaced_file_invalidates_with_same_mtime_and_size(tmp_path):
+    path = tmp_path / 'results.csv'
+    path.write_text('N,P_S\n5,0.9\n', encoding='utf-8')
+    loader = _CountingLoader(_read_csv)
+    assert load_cached(path, loader)['rows'][1] == '5,0.9'
+
+    # 寫入端以臨時檔 + os.replace 更新：inode 改變，即使 mtime 與大小相同也要失效
+    stat = path.stat()
+    tmp = tmp_path / 'results.csv.tmp'
+    tmp.write_text('N,P_S\n5,0.8\n', encoding='utf-8')
+    os.utime(tmp, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(tmp, path)
+    assert load_cached(path, loader)['rows'][1] == '5,0.8'
+    assert loader.calls == 2
+
+
+def test_in_place_append_invalidates(tmp_path):
+    path = tmp_path / 'stream.ndjson'
+    path.write_text('{"N": 5}\n', encoding='utf-8')
+    loader = _CountingLoader(_read_csv)
+    load_cached(path, loader)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"N": 6}\n')
+    assert len(load_cached(path, loader)['rows']) == 2
+    assert loader.calls == 2
+
+
+def test_columnar_table_keyed_on_schema(tmp_path):
+    table = tmp_path / 'table'
+    save_columns(table, {'N': [5, 6], 'P_S': [0.9, 0.8]}, integer=('N',))
+    loader = _CountingLoader(_read_table)
+    first = load_cached(table, loader)
+    assert load_cached(table, loader)['columns']['N'] is first['columns']['N']
+    assert loader.calls == 1
+
+    save_columns(table, {'N': [5, 6, 7], 'P_S': [0.9, 0.8, 0.7]}, integer=('N',))
+    second = load_cached(table, loader)
+    assert loader.calls == 2
+    np.testing.assert_array_equal(second['columns']['N'], [5, 6, 7])
+
+
+def test_cached_values_are_read_only(tmp_path):
+    table = tmp_path / 'table'
+    save_columns(table, {'N': [5, 6], 'P_S': [0.9, 0.8]}, integer=('N',))
+    value = load_cached(table, lambda path: {'array': np.arange(3), 'items': [1, 2],
+                                             'columns': load_columns(path)[0]})
+    assert not value['array'].flags.writeable
+    assert not value['columns']['P_S'].flags.writeable
+    assert value['items'] == (1, 2)
+    value['extra'] = True
+    assert 'extra' not in load_cached(table, _read_table)
+
+
+def test_missing_path_not_cached(tmp_path):
+    loader = _CountingLoader(lambda path: None)
+    assert load_cached(tmp_path / 'missing.csv', loader) is None
+    assert load_cached(tmp_path / 'missing.csv', loader) is None
+    assert loader.calls == 2
+    assert cache_info()['entries'] == 0
@@ -0,0 +1,86 @@
+"""
+掃描檢查點續跑的測試
+
+Input: simulation.core.checkpoint, figure345 模擬點
+Output: pytest 測試
+Position: 驗證中斷後從檢查點續跑與不中斷運行的結果相同，已完成的點續跑時回傳空累加器
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import numpy as np
+import pytest
+
+from simulation.core.checkpoint import SweepCheckpoint
+from simulation.core.metrics import MetricsAccumulator
+from simulation.core.one_shot_access import simulate_group_paging_multi_samples
+from simulation.core.shards import ResultShard, simulation_point_params
+from simulation.figure_simulation.figure345_simulation import _simulate_point
+
+SEED = 4242
+PARAMS = simulation_point_params(30, 5, 4, 'numpy', 'PCG64', 64, 'integers')
+
+
+def _run_point(**kwargs):
+    return _simulate_point(PARAMS, 640, 1, SEED, backend='thread', target_task_sec=None, **kwargs)
+
+
+class _InterruptedCheckpoint(SweepCheckpoint):
+    """寫入第 stop_after 份檢查點後模擬 Ctrl-C"""
+
+    def __init__(self, path, meta, stop_after):
+        super().__init__(path, meta, interval=0)
+        self.stop_after = stop_after
+        self.saves = 0
+
+    def maybe_save(self) -> bool:
+        self.save()
+        self.saves += 1
+        if self.saves == self.stop_after:
+            raise KeyboardInterrupt
+        return True
+
+
+def test_checkpoint_resume_matches_uninterrupted(tmp_path):
+    uninterrupted = _run_point()
+
+    path = tmp_path / 'figure345.json'
+    checkpoint = _InterruptedCheckpoint(path, {'seed': SEED, 'num_samples': 640}, stop_after=1)
+    partial = ResultShard(PARAMS)
+    checkpoint.shards[PARAMS['N']] = partial
+    with pytest.raises(KeyboardInterrupt):
+        _run_point(shard=partial, checkpoint=checkpoint)
+
+    restored = SweepCheckpoint.load(path)
+    saved = restored.shards[PARAMS['N']]
+    assert 0 < saved.num_samples < 640
+    resumed = _run_point(shard=saved, checkpoint=restored)
+    for name in MetricsAccumulator.METRICS:
+        assert resumed.accumulator.stats[name][0] == uninterrupted.accumulator.stats[name][0]
+        np.testing.assert_allclose(resumed.accumulator.stats[name][1:],
+                                   uninterrupted.accumulator.stats[name][1:], rtol=1e-12)
+    assert resumed.streams == uninterrupted.streams
+
+
+def test_resume_of_finished_point_returns_empty_accumulator():
+    finished = _run_point()
+    stats_before = {name: list(values) for name, values in finished.accumulator.stats.items()}
+    resumed = _run_point(shard=finished)
+    assert resumed.accumulator.stats == stats_before
+
+    skipped = simulate_group_paging_multi_samples(
+        PARAMS['M'], PARAMS['N'], PARAMS['I_max'], 640, 1, seed=SEED, block_size=PARAMS['block_size'],
+        skip_blocks=finished.blocks(SEED), backend='thread', target_task_sec=None,
+    )
+    assert isinstance(skipped, MetricsAccumulator)
+    assert skipped.num_samples == 0
+    merged = MetricsAccumulator().merge(finished.accumulator).merge(skipped)
+    assert merged.num_samples == 640
+
+
+def test_missing_or_corrupt_checkpoint(tmp_path):
+    assert SweepCheckpoint.load(tmp_path / 'missing.json') is None
+    corrupt = tmp_path / 'corrupt.json'
+    corrupt.write_text('{"meta": ', encoding='utf-8')
+    assert SweepCheckpoint.load(corrupt) is None
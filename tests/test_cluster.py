@@ -0,0 +1,131 @@
+"""
+分佈式協調器的容錯測試
+
+Input: simulation.core.cluster, simulation.core.one_shot_access
+Output: pytest 測試
+Position: 驗證工作節點在任務中途被殺時任務重新分配，合併結果與本機運行相同；
+          任務持續失敗時協調器在嘗試上限後停止，不會無限重試
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import multiprocessing
+import threading
+import time
+
+import psutil
+import pytest
+
+from simulation.core.cluster import Coordinator, run_worker
+from simulation.core.metrics import MetricsAccumulator, tallies_to_results
+from simulation.core.one_shot_access import simulate_group_paging_multi_samples
+from simulation.core.rng import plan_sample_blocks
+
+M, I_MAX, SEED, BLOCK_SIZE, NUM_SAMPLES = 100, 10, 777, 256, 2048
+N_VALUES = (20, 35)
+
+
+def _params(N):
+    return {'M': M, 'N': N, 'I_max': I_MAX, 'bit_generator': 'PCG64', 'barring_factor': 1.0,
+            'barring_time': 0, 'engine': 'numpy', 'draw_mode': 'integers'}
+
+
+def _local_metrics(N):
+    tallies = simulate_group_paging_multi_samples(
+        M, N, I_MAX, NUM_SAMPLES, 1, seed=SEED, block_size=BLOCK_SIZE, return_tallies=True,
+        target_task_sec=None
+    )
+    return MetricsAccumulator.from_results(tallies_to_results(tallies, M, I_MAX * N))
+
+
+def _wait_for(predicate, timeout=60.0):
+    deadline = time.time() + timeout
+    while not predicate():
+        if time.time() > deadline:
+            raise TimeoutError
+        time.sleep(0.01)
+
+
+def _kill_tree(pid):
+    """殺掉工作節點及其進程池（模擬整台機器掉線，不留下孤兒進程）"""
+    parent = psutil.Process(pid)
+    processes = [parent] + parent.children(recursive=True)
+    for process in processes:
+        process.kill()
+    psutil.wait_procs(processes, timeout=30)
+
+
+def test_killed_worker_tasks_are_reassigned():
+    blocks = plan_sample_blocks(NUM_SAMPLES, BLOCK_SIZE)
+    tasks = [{'params': _params(N), 'seed': SEED, 'blocks': blocks[start:start + 2]}
+             for N in N_VALUES for start in range(0, len(blocks), 2)]
+
+    merged = {N: MetricsAccumulator() for N in N_VALUES}
+
+    def on_result(task, accumulator):
+        merged[task['params']['N']].merge(accumulator)
+
+    coordinator = Coordinator(tasks, '127.0.0.1:0', on_result, task_timeout=120)
+    server = threading.Thread(target=coordinator.run, daemon=True)
+    server.start()
+    _wait_for(lambda: coordinator.address is not None)
+
+    context = multiprocessing.get_context('spawn')
+    doomed = context.Process(target=run_worker, args=(coordinator.address, 1))
+    doomed.start()
+    survivor = None
+    try:
+        # 第一個工作節點拿到任務後立即殺掉，它手上的任務必須重新排隊
+        _wait_for(lambda: coordinator._in_flight)
+        _kill_tree(doomed.pid)
+        doomed.join(timeout=30)
+        _wait_for(lambda: not coordinator._in_flight or len(coordinator._done) == len(tasks))
+
+        survivor = context.Process(target=run_worker, args=(coordinator.address, 1))
+        survivor.start()
+        server.join(timeout=300)
+        assert not server.is_alive()
+    finally:
+        for process in (doomed, survivor):
+            if process is not None and process.is_alive():
+                process.kill()
+
+    for N in N_VALUES:
+        local = _local_metrics(N)
+        assert merged[N].num_samples == NUM_SAMPLES
+        for name in MetricsAccumulator.METRICS:
+            assert merged[N].stats[name][0] == local.stats[name][0]
+            assert merged[N].stats[name][1:] == pytest.approx(local.stats[name][1:], rel=1e-12, abs=1e-12)
+
+
+def test_failing_task_stops_after_max_attempts():
+    # N=0 讓模擬核心拋出 ValueError：工作節點回報 error 並繼續領取任務，協調器在嘗試上限後停止
+    blocks = plan_sample_blocks(BLOCK_SIZE, BLOCK_SIZE)
+    tasks = [{'params': _params(0), 'seed': SEED, 'blocks': blocks}]
+    coordinator = Coordinator(tasks, '127.0.0.1:0', task_timeout=120, max_attempts=2)
+    errors = []
+
+    def run():
+        try:
+            coordinator.run()
+        except RuntimeError as e:
+            errors.append(e)
+
+    server = threading.Thread(target=run, daemon=True)
+    server.start()
+    _wait_for(lambda: coordinator.address is not None)
+
+    worker = multiprocessing.get_context('spawn').Process(target=run_worker, args=(coordinator.address, 1))
+    worker.start()
+    try:
+        server.join(timeout=120)
+        assert not server.is_alive()
+        worker.join(timeout=60)
+        assert not worker.is_alive()
+    finally:
+        if worker.is_alive():
+            worker.kill()
+
+    assert len(errors) == 1 and '任務 0' in str(errors[0])
+    assert coordinator._failures[0] == 2
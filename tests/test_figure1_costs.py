@@ -0,0 +1,47 @@
+"""
+Figure 1 解析的成本規劃測試
+
+Input: analytical.figure_analysis.figure1_analysis
+Output: pytest 測試
+Position: 驗證每個點的精確公式成本只計算一次，方法選擇與預估耗時一致
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import pytest
+
+from analytical.figure_analysis import figure1_analysis
+from analytical.figure_analysis.figure1_analysis import (
+    POINT_BASE_SEC,
+    choose_exact_method,
+    estimate_point_seconds,
+    plan_point_costs,
+)
+
+
+def test_costs_match_per_point_estimates():
+    M_range = range(1, 60)
+    methods, costs = plan_point_costs(M_range, 14, budget_sec=1.0, fallback='closed_form')
+    assert methods == [choose_exact_method(M, 14, 1.0, 'closed_form') for M in M_range]
+    assert costs == [estimate_point_seconds(M, 14, method) for M, method in zip(M_range, methods)]
+    assert 'enumeration' in methods and 'closed_form' in methods
+    assert all(cost == POINT_BASE_SEC for cost, method in zip(costs, methods) if method != 'enumeration')
+
+
+def test_exact_work_computed_once_per_point(monkeypatch):
+    calls = []
+    original = figure1_analysis.exact_formula_work
+
+    def counting(M, N):
+        calls.append((M, N))
+        return original(M, N)
+
+    monkeypatch.setattr(figure1_analysis, 'exact_formula_work', counting)
+    plan_point_costs(range(1, 30), 10, budget_sec=1e-3)
+    assert sorted(calls) == [(M, 10) for M in range(1, 30)]
+
+
+def test_unknown_fallback_rejected():
+    with pytest.raises(ValueError):
+        plan_point_costs(range(1, 3), 3, budget_sec=1.0, fallback='skip')
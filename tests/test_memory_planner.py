@@ -0,0 +1,54 @@
+"""
+記憶體規劃的結果模式測試
+
+Input: simulation.core.memory_planner, simulation.core.one_shot_access
+Output: pytest 測試
+Position: 驗證不需要逐樣本結果時默認串流累加，需要時保留結果矩陣
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import numpy as np
+import pytest
+
+from simulation.core.memory_planner import plan_memory
+from simulation.core.metrics import MetricsAccumulator, calculate_performance_metrics
+from simulation.core.one_shot_access import simulate_group_paging_multi_samples
+
+
+def _plan(**kwargs):
+    return plan_memory(10 ** 7, 2048, 4, np.uint16, 16, **kwargs)
+
+
+def test_stream_by_default_without_budget():
+    plan = _plan()
+    assert plan['mode'] == 'stream'
+    assert plan['resident_bytes'] == 0
+    assert plan['budget_bytes'] is None
+
+
+def test_keep_samples_materializes():
+    stream = _plan()
+    kept = _plan(keep_samples=True)
+    assert kept['mode'] == 'materialize'
+    assert kept['resident_bytes'] > 0
+    assert stream['peak_bytes'] <= kept['peak_bytes']
+
+
+def test_budget_too_small_for_samples_raises():
+    stream = _plan(max_memory_mb=1e6)
+    with pytest.raises(MemoryError):
+        _plan(max_memory_mb=stream['peak_bytes'] / 1024 ** 2 + 1, keep_samples=True)
+    assert _plan(max_memory_mb=stream['peak_bytes'] / 1024 ** 2 + 1)['mode'] == 'stream'
+
+
+def test_simulation_returns_accumulator_unless_samples_kept():
+    args = (10, 3, 4, 200, 1, 1.0, 0, 'numpy', 7)
+    accumulator = simulate_group_paging_multi_samples(*args, block_size=64, target_task_sec=None)
+    assert isinstance(accumulator, MetricsAccumulator)
+    results = simulate_group_paging_multi_samples(*args, block_size=64, target_task_sec=None,
+                                                  keep_samples=True)
+    assert results.shape == (200, 3)
+    means, _ = accumulator.metrics()
+    np.testing.assert_allclose(means, calculate_performance_metrics(results)[0], rtol=1e-12)
@@ -0,0 +1,63 @@
+"""
+可合併性能指標累加器的測試
+
+Input: simulation.core.metrics
+Output: pytest 測試
+Position: 驗證 Chan 合併與一次性計算整批結果相同
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import numpy as np
+import pytest
+
+from simulation.core.metrics import MetricsAccumulator, calculate_performance_metrics
+
+
+def _results(num_samples, seed):
+    rng = np.random.default_rng(seed)
+    results = np.column_stack([
+        rng.random(num_samples),
+        rng.uniform(1, 10, num_samples),
+        rng.random(num_samples),
+    ])
+    # 沒有成功設備的樣本 T_a 為 -1，不計入 T_a 的均值
+    results[rng.random(num_samples) < 0.2, 1] = -1
+    return results
+
+
+@pytest.mark.parametrize('splits', [[1000], [1, 999], [300, 300, 400], [7] * 100 + [300]])
+def test_merge_matches_concatenation(splits):
+    results = _results(sum(splits), seed=len(splits))
+    accumulator = MetricsAccumulator()
+    start = 0
+    for size in splits:
+        accumulator.merge(MetricsAccumulator.from_results(results[start:start + size]))
+        start += size
+
+    expected_means, expected_cis = calculate_performance_metrics(results)
+    means, cis = accumulator.metrics()
+    assert accumulator.num_samples == len(results)
+    assert accumulator.stats['T_a'][0] == int(np.sum(results[:, 1] >= 0))
+    np.testing.assert_allclose(means, expected_means, rtol=1e-12)
+    np.testing.assert_allclose(cis, expected_cis, rtol=1e-9)
+
+
+def test_merge_order_and_empty_chunks():
+    results = _results(500, seed=3)
+    no_success = results[:50].copy()
+    no_success[:, 1] = -1
+    forward = MetricsAccumulator.from_results(no_success).merge(MetricsAccumulator.from_results(results[50:]))
+    backward = MetricsAccumulator().merge(MetricsAccumulator.from_results(results[50:]))
+    backward.merge(MetricsAccumulator.from_results(no_success)).merge(MetricsAccumulator())
+    for name in MetricsAccumulator.METRICS:
+        assert forward.stats[name][0] == backward.stats[name][0]
+        np.testing.assert_allclose(forward.stats[name][1:], backward.stats[name][1:], rtol=1e-12)
+
+
+def test_dict_round_trip():
+    accumulator = MetricsAccumulator.from_results(_results(100, seed=5))
+    restored = MetricsAccumulator.from_dict(accumulator.to_dict())
+    assert restored.stats == accumulator.stats
+    assert MetricsAccumulator().metrics() == ((0, 0, 0), (0, 0, 0))
@@ -0,0 +1,50 @@
+"""
+打包低位元抽樣（PackedChoiceStream）的均勻性測試
+
+Input: simulation.core.rng, performance.rng_benchmark 的卡方右尾概率
+Output: pytest 測試
+Position: 驗證 draw_mode='packed' 與 rng.integers 有相同的 [0, N) 均勻分佈
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import numpy as np
+import pytest
+
+from performance.rng_benchmark import _chi2_survival
+from simulation.core.rng import PackedChoiceStream, make_block_generator
+
+NUM_DRAWS = 200_000
+SIGNIFICANCE = 1e-4
+
+
+def _chi2_p(counts: np.ndarray) -> float:
+    expected = counts.sum() / counts.size
+    return _chi2_survival(float(((counts - expected) ** 2 / expected).sum()), counts.size - 1)
+
+
+# 2 的冪（無拒絕）、非 2 的冪（拒絕採樣，含接受率接近 1/2 的 3、5、129）與邊界 N=1、N=256
+@pytest.mark.parametrize('N', [2, 3, 5, 7, 20, 45, 64, 100, 129, 255, 256])
+def test_packed_choices_are_uniform(N):
+    stream = PackedChoiceStream(make_block_generator('PCG64', 2026, 0), N)
+    choices = np.concatenate([stream.take(size) for size in (1, 999, NUM_DRAWS - 1000)])
+
+    assert choices.size == NUM_DRAWS
+    assert choices.min() >= 0 and choices.max() < N
+    assert _chi2_p(np.bincount(choices, minlength=N)) >= SIGNIFICANCE
+    if N <= 20:
+        # 同一 64 位整數切出的相鄰欄位互相獨立
+        pairs = choices.reshape(-1, 2)
+        assert _chi2_p(np.bincount(pairs[:, 0] * N + pairs[:, 1], minlength=N * N)) >= SIGNIFICANCE
+
+
+def test_single_rao_always_chooses_zero():
+    stream = PackedChoiceStream(make_block_generator('PCG64', 2026, 0), 1)
+    assert not stream.take(10_000).any()
+
+
+def test_packed_stream_is_reproducible():
+    first = PackedChoiceStream(make_block_generator('Philox', 7, 3), 45).take(5000)
+    second = PackedChoiceStream(make_block_generator('Philox', 7, 3), 45)
+    np.testing.assert_array_equal(first, np.concatenate([second.take(1234), second.take(3766)]))
@@ -0,0 +1,51 @@
+"""
+流水線中斷的測試
+
+Input: pipeline.dag, simulation.core.one_shot_access
+Output: pytest 測試
+Position: 驗證主線程被中斷時後台階段的模擬在自己的線程中收到 KeyboardInterrupt 並及時停止
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import time
+
+import pytest
+
+from pipeline.dag import Stage, StageStore, run_stages
+from simulation.core.cancellation import stop_requested
+from simulation.core.one_shot_access import simulate_group_paging_multi_samples
+
+
+def test_interrupt_stops_background_stage(tmp_path):
+    started = []
+    interrupted = []
+
+    def simulate(inputs, workers):
+        started.append(time.time())
+        try:
+            # 單線程約需數十秒；小目標任務時長讓每個分塊很快完成
+            simulate_group_paging_multi_samples(100, 5, 10, 10 ** 6, 1, seed=1, backend='thread',
+                                                target_task_sec=0.05)
+        except KeyboardInterrupt:
+            interrupted.append(time.time())
+            raise
+
+    def interrupt(inputs, workers):
+        while not started:
+            time.sleep(0.01)
+        time.sleep(0.3)
+        raise KeyboardInterrupt
+
+    stages = [
+        Stage('simulation', simulate, parallel=True, cacheable=False),
+        Stage('plot', interrupt, cacheable=False, main_thread=True),
+    ]
+    start_time = time.time()
+    with pytest.raises(KeyboardInterrupt):
+        run_stages(stages, cpu_budget=1, store=StageStore(tmp_path))
+
+    # run_stages 返回前後台階段已經停止，停止請求已清除
+    assert interrupted and interrupted[0] - start_time < 10
+    assert not stop_requested()
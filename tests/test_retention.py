@@ -0,0 +1,66 @@
+"""
+結果保留策略的測試
+
+Input: storage.retention.plan_retention
+Output: pytest 測試
+Position: 驗證 keep_last、總大小上限與按內容雜湊去重後的大小計算
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+from storage import plan_retention
+
+
+def _run(path, kind='simulation/figure345', **params):
+    return {'path': path, 'kind': kind, 'params': params or {'M': 100}}
+
+
+# 按時間由新到舊：figure345 (M=100) 四次、figure345 (M=50) 一次、acb 兩次
+RUNS = [
+    _run('sim/f345/4'),
+    _run('sim/acb/2', kind='simulation/acb'),
+    _run('sim/f345/3'),
+    _run('sim/f345/m50', M=50),
+    _run('sim/f345/2'),
+    _run('sim/acb/1', kind='simulation/acb'),
+    _run('sim/f345/1'),
+]
+
+# 每次運行一個獨有對象（100 位元組）；f345/1 與 f345/2 共用一個 1000 位元組的對象
+RUN_OBJECTS = {run['path']: {'data.npy': (f"own-{run['path']}", 100)} for run in RUNS}
+RUN_OBJECTS['sim/f345/1']['shared.npy'] = ('shared', 1000)
+RUN_OBJECTS['sim/f345/2']['shared.npy'] = ('shared', 1000)
+
+
+def test_keep_last_per_parameter_group():
+    delete, before, after = plan_retention(RUNS, RUN_OBJECTS, keep_last=2)
+    assert delete == ['sim/f345/2', 'sim/f345/1']
+    assert before == 7 * 100 + 1000
+    assert after == 5 * 100
+
+
+def test_keep_last_never_drops_latest():
+    delete, _, _ = plan_retention(RUNS, RUN_OBJECTS, keep_last=0)
+    assert set(delete) == {'sim/f345/3', 'sim/f345/2', 'sim/f345/1', 'sim/acb/1'}
+
+
+def test_shared_objects_counted_once():
+    # 只刪 f345/1 時共用對象仍被 f345/2 引用，只釋放 f345/1 的獨有對象
+    runs = [run for run in RUNS if run['path'] != 'sim/f345/3']
+    delete, before, after = plan_retention(runs, RUN_OBJECTS, keep_last=2)
+    assert delete == ['sim/f345/1']
+    assert before - after == 100
+
+
+def test_size_limit_deletes_oldest_first():
+    delete, _, after = plan_retention(RUNS, RUN_OBJECTS, keep_last=10, max_total_bytes=1300)
+    # 最舊的 f345/1 刪除後共用對象仍在，繼續刪 acb/1、f345/2 才降到上限內
+    assert delete == ['sim/f345/1', 'sim/acb/1', 'sim/f345/2']
+    assert after == 400
+
+
+def test_size_limit_keeps_latest_of_each_group():
+    delete, _, after = plan_retention(RUNS, RUN_OBJECTS, keep_last=10, max_total_bytes=0)
+    assert set(delete) == {'sim/f345/1', 'sim/acb/1', 'sim/f345/2', 'sim/f345/3'}
+    assert after == 3 * 100
@@ -0,0 +1,68 @@
+"""
+區塊隨機數流的重現性測試
+
+Input: simulation.core.rng, simulation.core.one_shot_access
+Output: pytest 測試
+Position: 驗證每個樣本區塊的隨機數流只由 (bit_generator, 根種子, 區塊編號) 決定
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import numpy as np
+import pytest
+
+from simulation.core.one_shot_access import simulate_group_paging_multi_samples
+from simulation.core.rng import BIT_GENERATORS, make_block_generator, plan_sample_blocks, split_blocks
+
+
+@pytest.mark.parametrize('bit_generator', list(BIT_GENERATORS))
+def test_block_stream_reproducible(bit_generator):
+    first = make_block_generator(bit_generator, 2026, 7).integers(0, 2 ** 32, 64)
+    again = make_block_generator(bit_generator, 2026, 7).integers(0, 2 ** 32, 64)
+    np.testing.assert_array_equal(first, again)
+
+
+@pytest.mark.parametrize('bit_generator', list(BIT_GENERATORS))
+def test_blocks_and_seeds_differ(bit_generator):
+    streams = [make_block_generator(bit_generator, 2026, block).integers(0, 2 ** 32, 64)
+               for block in range(4)]
+    for i in range(len(streams)):
+        for j in range(i + 1, len(streams)):
+            assert not np.array_equal(streams[i], streams[j])
+    other_seed = make_block_generator(bit_generator, 2027, 0).integers(0, 2 ** 32, 64)
+    assert not np.array_equal(streams[0], other_seed)
+
+
+def test_unknown_bit_generator():
+    with pytest.raises(ValueError):
+        make_block_generator('MT19937', 1, 0)
+
+
+def test_plan_and_split_blocks():
+    blocks = plan_sample_blocks(1000, 256, first_block=3)
+    assert blocks == [(3, 256), (4, 256), (5, 256), (6, 232)]
+    for num_chunks in (1, 2, 3, 4, 10):
+        chunks = split_blocks(blocks, num_chunks)
+        assert len(chunks) == min(num_chunks, len(blocks))
+        assert [block for chunk in chunks for block in chunk] == blocks
+
+
+@pytest.mark.parametrize('bit_generator', list(BIT_GENERATORS))
+def test_results_independent_of_chunking(bit_generator):
+    def run(num_workers, **kwargs):
+        return simulate_group_paging_multi_samples(
+            30, 5, 4, 500, num_workers, seed=99, bit_generator=bit_generator, block_size=64,
+            return_tallies=True, **kwargs
+        )
+
+    single = run(1, target_task_sec=None)
+    np.testing.assert_array_equal(single, run(2, backend='thread'))
+    np.testing.assert_array_equal(single, run(3, target_task_sec=None, backend='thread'))
+    # 跳過已完成的區塊（續跑）或從後面的區塊開始（補充樣本）：其餘區塊與完整運行相同
+    np.testing.assert_array_equal(single[128:], run(1, target_task_sec=None, skip_blocks={0, 1}))
+    tail = simulate_group_paging_multi_samples(
+        30, 5, 4, 372, 1, seed=99, bit_generator=bit_generator, block_size=64,
+        first_block=2, return_tallies=True, target_task_sec=None
+    )
+    np.testing.assert_array_equal(single[128:], tail)
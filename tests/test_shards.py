@@ -0,0 +1,111 @@
+"""
+可合併結果分片的測試
+
+Input: simulation.core.shards
+Output: pytest 測試
+Position: 驗證重疊的隨機數流拒絕合併、不重疊的分片合併與一次性模擬等價，補充樣本時引擎不可用則拒絕
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from simulation.core.metrics import MetricsAccumulator
+from simulation.core.one_shot_access import simulate_group_paging_multi_samples
+from simulation.core.shards import ResultShard, simulation_point_params, streams_from_blocks
+
+SEED = 4242
+BLOCK_SIZE = 64
+PARAMS = simulation_point_params(30, 5, 4, 'numpy', 'PCG64', BLOCK_SIZE, 'integers')
+
+
+def _simulate(num_samples, first_block=0, seed=SEED):
+    """模擬一段區塊並包成分片"""
+    tallies = simulate_group_paging_multi_samples(
+        30, 5, 4, num_samples, 1, seed=seed, block_size=BLOCK_SIZE, first_block=first_block,
+        return_tallies=True, backend='thread', target_task_sec=None
+    )
+    blocks = [(first_block + i, min(BLOCK_SIZE, num_samples - i * BLOCK_SIZE))
+              for i in range((num_samples + BLOCK_SIZE - 1) // BLOCK_SIZE)]
+    return ResultShard(PARAMS, MetricsAccumulator.from_results(tallies), streams_from_blocks(seed, blocks))
+
+
+def _assert_same_metrics(actual: ResultShard, expected: ResultShard):
+    for name in MetricsAccumulator.METRICS:
+        assert actual.accumulator.stats[name][0] == expected.accumulator.stats[name][0]
+        np.testing.assert_allclose(actual.accumulator.stats[name][1:], expected.accumulator.stats[name][1:],
+                                   rtol=1e-12)
+
+
+def test_disjoint_shards_merge_like_one_run():
+    whole = _simulate(640)
+    head = _simulate(256)
+    tail = _simulate(384, first_block=head.next_block(SEED))
+    merged = head.merge(tail)
+    _assert_same_metrics(merged, whole)
+    assert merged.streams == whole.streams == [{'seed': SEED, 'first_block': 0, 'num_samples': 640}]
+    assert merged.next_block(SEED) == 10
+
+
+def test_other_seed_merges_as_separate_stream():
+    merged = _simulate(128).merge(_simulate(128, seed=SEED + 1))
+    assert merged.num_samples == 256
+    assert merged.blocks(SEED) == merged.blocks(SEED + 1) == {0, 1}
+
+
+def test_overlapping_streams_rejected():
+    shard = _simulate(256)
+    before = shard.to_dict()
+    with pytest.raises(ValueError, match='重疊'):
+        shard.merge(_simulate(128, first_block=3))
+    with pytest.raises(ValueError, match='重疊'):
+        shard.merge(_simulate(256))
+    assert shard.to_dict() == before
+
+
+def test_param_mismatch_rejected():
+    other = ResultShard(dict(PARAMS, N=6))
+    with pytest.raises(ValueError, match='參數不同'):
+        _simulate(64).merge(other)
+
+
+def test_save_and_load(tmp_path):
+    shard = _simulate(200)
+    shard.save(tmp_path / 'N5.json')
+    loaded = ResultShard.load(tmp_path / 'N5.json')
+    assert loaded.to_dict() == shard.to_dict()
+
+
+def test_save_does_not_write_through_hard_links(tmp_path):
+    # gc 去重後兩次運行的分片可能是同一 inode 的硬連結，重新保存不可改動另一個引用
+    first = tmp_path / 'a' / 'N5.json'
+    _simulate(64).save(first)
+    linked = tmp_path / 'b' / 'N5.json'
+    linked.parent.mkdir()
+    os.link(first, linked)
+    before = linked.read_bytes()
+    _simulate(128).save(first)
+    assert linked.read_bytes() == before
+    assert ResultShard.load(first).num_samples == 128
+    assert not list(tmp_path.rglob('*.tmp'))
+
+
+def test_top_up_refuses_unavailable_engine(monkeypatch):
+    from simulation.core import jit_kernel
+    from simulation.figure_simulation import figure345_simulation
+
+    numba_shard = ResultShard(simulation_point_params(30, 5, 4, 'numba', 'PCG64', BLOCK_SIZE, None),
+                              MetricsAccumulator(), [])
+    monkeypatch.setattr(jit_kernel, 'NUMBA_AVAILABLE', False)
+    monkeypatch.setattr(figure345_simulation, 'load_figure345_simulation_shards', lambda **_: {5: numba_shard})
+
+    def fail(*args, **kwargs):
+        raise AssertionError("不應以其他引擎補充樣本")
+    monkeypatch.setattr(figure345_simulation, '_simulate_point', fail)
+
+    config = {'simulation': {'M': 30, 'I_max': 4}, 'performance': {'num_workers': 1}}
+    assert figure345_simulation.top_up_figure345_simulation(config, BLOCK_SIZE) is None
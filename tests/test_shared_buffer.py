@@ -0,0 +1,50 @@
+"""
+共享記憶體結果緩衝區的測試
+
+Input: simulation.core.one_shot_access, simulation.core.shared_buffer
+Output: pytest 測試
+Position: 驗證共享記憶體路徑與默認路徑逐位相同，中斷時緩衝區正常釋放
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import numpy as np
+import pytest
+
+from simulation.core.metrics import compact_tally_dtype
+from simulation.core.one_shot_access import simulate_group_paging_multi_samples
+from simulation.core.shared_buffer import SharedResultBuffer
+
+M, N, I_MAX = 30, 5, 4
+SAMPLES = 640
+
+
+def _simulate(**kwargs):
+    return simulate_group_paging_multi_samples(
+        M, N, I_MAX, SAMPLES, 2, seed=7, block_size=64, backend='thread', target_task_sec=None, **kwargs
+    )
+
+
+@pytest.mark.parametrize('return_tallies', [True, False])
+def test_shared_memory_matches_default(return_tallies):
+    default = _simulate(return_tallies=return_tallies, keep_samples=True)
+    shared = _simulate(return_tallies=return_tallies, keep_samples=True, shared_memory=True)
+    np.testing.assert_array_equal(shared, default)
+
+
+def test_caller_buffer_returns_view():
+    default = _simulate(return_tallies=True)
+    with SharedResultBuffer.create((SAMPLES, 3), compact_tally_dtype(M, M * I_MAX, I_MAX * N)) as buffer:
+        tallies = _simulate(return_tallies=True, result_buffer=buffer)
+        assert np.shares_memory(tallies, buffer.array)
+        np.testing.assert_array_equal(tallies, default)
+        del tallies
+
+
+def test_interrupt_releases_owned_buffer():
+    def interrupt(blocks, chunk_results):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        _simulate(keep_samples=True, shared_memory=True, on_chunk_done=interrupt)
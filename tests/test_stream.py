@@ -0,0 +1,73 @@
+"""
+逐點串流結果的測試
+
+Input: storage.stream
+Output: pytest 測試
+Position: 驗證讀取端只返回完整的行（容忍寫到一半的最後一行）與完成標記
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from storage import StreamWriter, read_stream, stream_path
+
+KIND = 'simulation/figure345'
+
+
+def test_records_and_end_marker(tmp_path):
+    with StreamWriter(KIND, {'M': 100}, fsync=True, stream_dir=tmp_path) as stream:
+        stream.append({'N': 5, 'P_S': np.float64(0.99), 'count': np.int64(3)})
+        header, records, complete = read_stream(stream.path)
+        assert header['kind'] == KIND and header['attrs'] == {'M': 100}
+        assert records == [{'N': 5, 'P_S': 0.99, 'count': 3}]
+        assert not complete
+        stream.append({'N': 6, 'P_S': 0.98})
+        stream.finish()
+    _, records, complete = read_stream(stream_path(KIND, tmp_path))
+    assert [record['N'] for record in records] == [5, 6]
+    assert complete
+
+
+def test_torn_last_line_ignored(tmp_path):
+    with StreamWriter(KIND, stream_dir=tmp_path) as stream:
+        stream.append({'N': 5, 'P_S': 0.99})
+        stream.append({'N': 6, 'P_S': 0.98})
+    line = json.dumps({'N': 7, 'P_S': 0.97})
+    for cut in (1, len(line) // 2, len(line)):
+        torn = tmp_path / f'torn{cut}.ndjson'
+        torn.write_text(stream.path.read_text(encoding='utf-8') + line[:cut], encoding='utf-8')
+        _, records, complete = read_stream(torn)
+        assert [record['N'] for record in records] == [5, 6]
+        assert not complete
+
+
+def test_torn_or_missing_header(tmp_path):
+    assert read_stream(tmp_path / 'missing.ndjson') is None
+    torn = tmp_path / 'torn.ndjson'
+    torn.write_text('{"format": "ndjson-str', encoding='utf-8')
+    assert read_stream(torn) is None
+    torn.write_text('', encoding='utf-8')
+    assert read_stream(torn) is None
+
+
+def test_newer_format_rejected(tmp_path):
+    path = tmp_path / 'future.ndjson'
+    path.write_text(json.dumps({'format': 'ndjson-stream', 'version': 99}) + '\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        read_stream(path)
+
+
+def test_new_run_truncates(tmp_path):
+    with StreamWriter(KIND, stream_dir=tmp_path) as stream:
+        stream.append({'N': 5})
+        stream.finish()
+    with StreamWriter(KIND, stream_dir=tmp_path) as stream:
+        stream.append({'N': 8})
+    _, records, complete = read_stream(stream.path)
+    assert records == [{'N': 8}]
+    assert not complete
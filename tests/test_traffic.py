@@ -0,0 +1,38 @@
+"""
+隨機到達流量模擬的重現性測試
+
+Input: simulation.core.traffic
+Output: pytest 測試
+Position: 驗證區塊隨機數流使結果與並行數、分塊方式無關
+
+注意：一旦此文件被更新，請同步更新：
+- 項目根目錄 README.md
+"""
+
+import numpy as np
+
+from simulation.core.traffic import simulate_traffic_multi_samples, uniform_arrival_probabilities
+
+GROUPS = [{'M': 20, 'start_slot': 0}, {'M': 20, 'start_slot': 3}]
+PROBABILITIES = uniform_arrival_probabilities(8)
+
+
+def _run(num_workers, **kwargs):
+    return simulate_traffic_multi_samples(
+        GROUPS, PROBABILITIES, 5, 4, 300, num_workers, seed=12345, block_size=64,
+        return_tallies=True, **kwargs
+    )
+
+
+def test_identical_across_worker_counts():
+    single = _run(1, target_task_sec=None)
+    assert single.shape == (300, 3)
+    np.testing.assert_array_equal(single, _run(2))
+    np.testing.assert_array_equal(single, _run(3, target_task_sec=None, backend='thread'))
+
+
+def test_seed_changes_results():
+    other = simulate_traffic_multi_samples(
+        GROUPS, PROBABILITIES, 5, 4, 300, 1, seed=54321, block_size=64, return_tallies=True
+    )
+    assert not np.array_equal(_run(1), other)